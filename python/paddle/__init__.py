@@ -79,33 +79,24 @@ else:
     Tensor.__qualname__ = 'Tensor'
 
 import paddle.distributed.fleet
-import paddle.text
-import paddle.vision
 from paddle import (  # noqa: F401
     amp,
-    audio,
     autograd,
-    dataset,
     decomposition,
     device,
     distributed,
     distribution,
-    geometric,
     incubate,
     inference,
     io,
     jit,
     metric,
     nn,
-    onnx,
     optimizer,
-    quantization,
     reader,
     regularizer,
-    sparse,
     static,
     sysconfig,
-    vision,
 )
 
 # high-level api
@@ -114,10 +105,28 @@ from . import (  # noqa: F401
     _typing as _typing,
     callbacks,
     fft,
-    hub,
     linalg,
     signal,
 )
+from .utils.lazy_import import attach_lazy_submodules as _attach_lazy
+
+# NOTE: These submodules are heavy and not needed by most programs, they are
+# imported on first access of `paddle.xxx` to reduce the startup time.
+__getattr__, __dir__ = _attach_lazy(
+    __name__,
+    globals(),
+    [
+        'audio',
+        'dataset',
+        'geometric',
+        'hub',
+        'onnx',
+        'quantization',
+        'sparse',
+        'text',
+        'vision',
+    ],
+)
 from .autograd import (
     enable_grad,
     grad,
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import warnings
+import weakref
 from collections import defaultdict
 from enum import Enum
 
@@ -163,6 +164,10 @@ class AmpScaler:
                 )
                 self._cache_founf_inf = None
                 self._optimizer_states = defaultdict(_refresh_optimizer_state)
+                # optimizer -> (param groups signature, flattened params,
+                # whether all params are fp16/bf16/fp32), dropped together
+                # with the optimizer
+                self._optimizer_params_cache = weakref.WeakKeyDictionary()
 
     def scale(self, var):
         """
@@ -336,55 +341,48 @@ class AmpScaler:
         elif optimizer_state["state"] is OptimizerState.STEPPED:
             raise RuntimeError("unscale_() is being called after step().")
 
-        if getattr(optimizer, '_param_groups', None) and isinstance(
-            optimizer._param_groups[0], dict
-        ):
-            param_grads = []
-            param_grads_fp16 = []
-            param_grads_bf16 = []
-            param_grads_fp32 = []
-            for group in optimizer._param_groups:
-                for param in group['params']:
-                    if param._grad_ivar() is not None:
-                        param_grads.append(param._grad_ivar())
-                        if param._grad_ivar().dtype == paddle.float16:
-                            param_grads_fp16.append(param._grad_ivar())
-                        elif param._grad_ivar().dtype == paddle.bfloat16:
-                            param_grads_bf16.append(param._grad_ivar())
-                        else:
-                            param_grads_fp32.append(param._grad_ivar())
-        else:
-            if in_dynamic_mode():
+        if in_dynamic_mode():
+            params, is_grads_lists_supported = self._get_unscale_params(
+                optimizer
+            )
+            if is_grads_lists_supported:
                 # It is very time-consuming to call c++ functions in a loop on the python side.
                 # We put this part of the code on the c++ side to improve the speed in eager mode.
                 (
                     param_grads_fp16,
                     param_grads_bf16,
                     param_grads_fp32,
-                ) = core.eager.get_grads_lists(optimizer._parameter_list)
+                ) = core.eager.get_grads_lists(params)
             else:
-                # Keep the original code to support legacy mode.
-                # Delete the else branch when the legacy mode exits.
-                param_grads = [
-                    param._grad_ivar()
-                    for param in optimizer._parameter_list
-                    if param._grad_ivar() is not None
-                ]
-                param_grads_fp16 = [
-                    param
-                    for param in param_grads
-                    if param.dtype == paddle.float16
-                ]
-                param_grads_bf16 = [
-                    param
-                    for param in param_grads
-                    if param.dtype == paddle.bfloat16
-                ]
-                param_grads_fp32 = [
-                    param
-                    for param in param_grads
-                    if param.dtype == paddle.float32
-                ]
+                param_grads_fp16 = []
+                param_grads_bf16 = []
+                param_grads_fp32 = []
+                for param in params:
+                    grad = param._grad_ivar()
+                    if grad is not None:
+                        if grad.dtype == paddle.float16:
+                            param_grads_fp16.append(grad)
+                        elif grad.dtype == paddle.bfloat16:
+                            param_grads_bf16.append(grad)
+                        else:
+                            param_grads_fp32.append(grad)
+        else:
+            # Keep the original code to support legacy mode.
+            # Delete the else branch when the legacy mode exits.
+            param_grads = [
+                param._grad_ivar()
+                for param in self._get_unscale_params(optimizer)[0]
+                if param._grad_ivar() is not None
+            ]
+            param_grads_fp16 = [
+                param for param in param_grads if param.dtype == paddle.float16
+            ]
+            param_grads_bf16 = [
+                param for param in param_grads if param.dtype == paddle.bfloat16
+            ]
+            param_grads_fp32 = [
+                param for param in param_grads if param.dtype == paddle.float32
+            ]
         self._found_inf = self._temp_found_inf_value_false
         if len(param_grads_fp16):
             _legacy_C_ops.check_finite_and_unscale(
@@ -419,6 +417,53 @@ class AmpScaler:
 
         optimizer_state["state"] = OptimizerState.UNSCALED
 
+    def _get_unscale_params(self, optimizer):
+        """
+        Get the parameters to unscale of the optimizer, flattened across its param groups.
+        The result is cached per optimizer and only rebuilt when its param groups change,
+        so optimizers with param groups share the fast path of those without.
+
+        Args:
+            optimizer(Optimizer):  The optimizer used to update parameters.
+        Returns:
+            tuple, the list of parameters and whether all of them are float16, bfloat16 or float32,
+            which is required by `core.eager.get_grads_lists`.
+        """
+        param_groups = getattr(optimizer, '_param_groups', None)
+        if not (param_groups and isinstance(param_groups[0], dict)):
+            return optimizer._parameter_list, True
+
+        # the cached signature holds the param lists, so that their ids
+        # can't be reused by new lists
+        cached = self._optimizer_params_cache.get(optimizer)
+        if (
+            cached is not None
+            and len(cached[0]) == len(param_groups)
+            and all(
+                group['params'] is group_params
+                and len(group_params) == num_params
+                for group, (group_params, num_params) in zip(
+                    param_groups, cached[0]
+                )
+            )
+        ):
+            return cached[1], cached[2]
+
+        params = [param for group in param_groups for param in group['params']]
+        is_grads_lists_supported = all(
+            param.dtype in (paddle.float16, paddle.bfloat16, paddle.float32)
+            for param in params
+        )
+        signature = tuple(
+            (group['params'], len(group['params'])) for group in param_groups
+        )
+        self._optimizer_params_cache[optimizer] = (
+            signature,
+            params,
+            is_grads_lists_supported,
+        )
+        return params, is_grads_lists_supported
+
     def _update(self):
         """
         Updates the loss_scaling.
@@ -14,7 +14,7 @@
 
 import wave
 from pathlib import Path
-from typing import Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -34,6 +34,49 @@ def _error_message():
     return warn_msg
 
 
+def _open_wave(filepath):
+    if hasattr(filepath, 'read'):
+        file_obj = filepath
+    else:
+        file_obj = open(filepath, 'rb')
+
+    try:
+        file_ = wave.open(file_obj)
+    except wave.Error:
+        file_obj.seek(0)
+        file_obj.close()
+        err_msg = _error_message()
+        raise NotImplementedError(err_msg)
+    return file_obj, file_
+
+
+def _get_frame_range(frames, frame_offset, num_frames):
+    start = min(max(frame_offset, 0), frames)
+    if num_frames == -1:
+        return start, frames
+    return start, min(start + num_frames, frames)
+
+
+def _to_waveform(audio_content, channels, normalize):
+    # default_subtype = "PCM_16", only support PCM16 WAV
+    audio_as_np16 = np.frombuffer(audio_content, dtype=np.int16)
+    audio_as_np32 = audio_as_np16.astype(np.float32)
+    if normalize:
+        # dtype = "float32"
+        audio_norm = audio_as_np32 / (2**15)
+    else:
+        # dtype = "int16"
+        audio_norm = audio_as_np32
+    return np.reshape(audio_norm, (-1, channels))
+
+
+def _to_tensor(waveform, channels_first):
+    waveform = paddle.to_tensor(waveform)
+    if channels_first:
+        waveform = paddle.transpose(waveform, perm=[1, 0])
+    return waveform
+
+
 def info(filepath: str) -> AudioInfo:
     """Get signal information of input audio file.
 
@@ -62,18 +105,7 @@ def info(filepath: str) -> AudioInfo:
             >>> wav_info = paddle.audio.info(filepath)
     """
 
-    if hasattr(filepath, 'read'):
-        file_obj = filepath
-    else:
-        file_obj = open(filepath, 'rb')
-
-    try:
-        file_ = wave.open(file_obj)
-    except wave.Error:
-        file_obj.seek(0)
-        file_obj.close()
-        err_msg = _error_message()
-        raise NotImplementedError(err_msg)
+    file_obj, file_ = _open_wave(filepath)
 
     channels = file_.getnchannels()
     sample_rate = file_.getframerate()
@@ -126,43 +158,167 @@ def load(
             >>> paddle.audio.save(filepath, waveform, sample_rate)
             >>> wav_data_read, sr = paddle.audio.load(filepath)
     """
-    if hasattr(filepath, 'read'):
-        file_obj = filepath
-    else:
-        file_obj = open(filepath, 'rb')
-
-    try:
-        file_ = wave.open(file_obj)
-    except wave.Error:
-        file_obj.seek(0)
-        file_obj.close()
-        err_msg = _error_message()
-        raise NotImplementedError(err_msg)
+    file_obj, file_ = _open_wave(filepath)
 
     channels = file_.getnchannels()
     sample_rate = file_.getframerate()
     frames = file_.getnframes()  # audio frame
 
-    audio_content = file_.readframes(frames)
+    # only read and convert the requested frames
+    start, end = _get_frame_range(frames, frame_offset, num_frames)
+    if start > 0:
+        file_.setpos(start)
+    audio_content = file_.readframes(end - start)
     file_obj.close()
 
-    # default_subtype = "PCM_16", only support PCM16 WAV
-    audio_as_np16 = np.frombuffer(audio_content, dtype=np.int16)
-    audio_as_np32 = audio_as_np16.astype(np.float32)
-    if normalize:
-        # dtype = "float32"
-        audio_norm = audio_as_np32 / (2**15)
-    else:
-        # dtype = "int16"
-        audio_norm = audio_as_np32
+    waveform = _to_waveform(audio_content, channels, normalize)
+    return _to_tensor(waveform, channels_first), sample_rate
 
-    waveform = np.reshape(audio_norm, (frames, channels))
-    if num_frames != -1:
-        waveform = waveform[frame_offset : frame_offset + num_frames, :]
-    waveform = paddle.to_tensor(waveform)
-    if channels_first:
-        waveform = paddle.transpose(waveform, perm=[1, 0])
-    return waveform, sample_rate
+
+def stream(
+    filepath: Union[str, Path],
+    chunk_frames: int,
+    overlap_frames: int = 0,
+    frame_offset: int = 0,
+    num_frames: int = -1,
+    normalize: bool = True,
+    channels_first: bool = True,
+) -> Iterator[paddle.Tensor]:
+    """Read audio data from file in chunks of chunk_frames, and consecutive chunks overlap by overlap_frames.
+    Only one chunk is in memory at a time, which suits feature extraction of long audio.
+
+    Args:
+        chunk_frames: number frames of every chunk, the last chunk may be shorter,
+        overlap_frames: number frames shared by consecutive chunks, from 0 to chunk_frames - 1,
+        frame_offset: from 0 to total frames,
+        num_frames: from -1 (means total frames) or number frames which want to read,
+        normalize:
+            if True: return audio which norm to (-1, 1), dtype=float32
+            if False: return audio with raw data, dtype=int16
+
+        channels_first:
+            if True: return audio with shape (channels, time)
+
+    Return:
+        Iterator[paddle.Tensor]: the chunks of audio content
+
+    Examples:
+        .. code-block:: python
+
+            >>> import os
+            >>> import paddle
+            >>> from paddle.audio.backends import wave_backend
+
+            >>> sample_rate = 16000
+            >>> wav_duration = 0.5
+            >>> num_channels = 1
+            >>> num_frames = sample_rate * wav_duration
+            >>> wav_data = paddle.linspace(-1.0, 1.0, num_frames) * 0.1
+            >>> waveform = wav_data.tile([num_channels, 1])
+            >>> base_dir = os.getcwd()
+            >>> filepath = os.path.join(base_dir, "test.wav")
+
+            >>> paddle.audio.save(filepath, waveform, sample_rate)
+            >>> for chunk in wave_backend.stream(filepath, 4000, 1000):
+            ...     print(chunk.shape)
+            [1, 4000]
+            [1, 4000]
+            [1, 2000]
+    """
+    if chunk_frames <= 0:
+        raise ValueError(
+            f"chunk_frames should be positive, but got {chunk_frames}"
+        )
+    if not 0 <= overlap_frames < chunk_frames:
+        raise ValueError(
+            f"overlap_frames should be in [0, {chunk_frames}), but got {overlap_frames}"
+        )
+
+    file_obj, file_ = _open_wave(filepath)
+    try:
+        channels = file_.getnchannels()
+        start, end = _get_frame_range(
+            file_.getnframes(), frame_offset, num_frames
+        )
+        if start > 0:
+            file_.setpos(start)
+
+        # the overlap is kept from the last chunk instead of being read again
+        tail = None
+        while start < end:
+            read_frames = (
+                chunk_frames if tail is None else chunk_frames - overlap_frames
+            )
+            read_frames = min(read_frames, end - start)
+            waveform = _to_waveform(
+                file_.readframes(read_frames), channels, normalize
+            )
+            start += read_frames
+            if tail is not None:
+                waveform = np.concatenate([tail, waveform])
+            yield _to_tensor(waveform, channels_first)
+            tail = waveform[waveform.shape[0] - overlap_frames :]
+    finally:
+        file_obj.close()
+
+
+def index_windows(
+    filepaths: List[Union[str, Path]],
+    window_frames: int,
+    hop_frames: Optional[int] = None,
+) -> np.ndarray:
+    """Index the windows of window_frames in audio files from their info, without decoding them.
+    A random crop dataset can sample a row, and read the window by load(filepaths[i], frame_offset, window_frames).
+
+    Args:
+        filepaths: audio paths,
+        window_frames: number frames of every window,
+        hop_frames: number frames between the start of consecutive windows, None means window_frames.
+
+    Return:
+        np.ndarray: int64 array with shape (num_windows, 2), whose rows are (file index, frame_offset).
+        The files shorter than window_frames have no window.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import os
+            >>> import paddle
+            >>> from paddle.audio.backends import wave_backend
+
+            >>> sample_rate = 16000
+            >>> wav_duration = 0.5
+            >>> num_channels = 1
+            >>> num_frames = sample_rate * wav_duration
+            >>> wav_data = paddle.linspace(-1.0, 1.0, num_frames) * 0.1
+            >>> waveform = wav_data.tile([num_channels, 1])
+            >>> base_dir = os.getcwd()
+            >>> filepath = os.path.join(base_dir, "test.wav")
+
+            >>> paddle.audio.save(filepath, waveform, sample_rate)
+            >>> windows = wave_backend.index_windows([filepath], 3000, 2000)
+            >>> print(windows.tolist())
+            [[0, 0], [0, 2000], [0, 4000]]
+            >>> file_index, frame_offset = windows[1]
+            >>> window, sr = paddle.audio.load(filepath, frame_offset, 3000)
+    """
+    if hop_frames is None:
+        hop_frames = window_frames
+    if window_frames <= 0 or hop_frames <= 0:
+        raise ValueError(
+            f"window_frames and hop_frames should be positive, but got {window_frames} and {hop_frames}"
+        )
+
+    windows = []
+    for file_index, filepath in enumerate(filepaths):
+        frames = info(filepath).num_samples
+        offsets = np.arange(0, frames - window_frames + 1, hop_frames)
+        windows.append(
+            np.stack([np.full_like(offsets, file_index), offsets], axis=1)
+        )
+    if not windows:
+        return np.zeros([0, 2], dtype='int64')
+    return np.concatenate(windows).astype('int64')
 
 
 def save(
@@ -11,8 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import collections
+import hashlib
+import os
 from typing import List
 
+import numpy as np
+
 import paddle
 
 from ..features import MFCC, LogMelSpectrogram, MelSpectrogram, Spectrogram
@@ -25,6 +30,42 @@ feat_funcs = {
     'spectrogram': Spectrogram,
 }
 
+# feature extractors are reused by all samples and datasets with the same
+# config, since creating one computes its window and filter banks, the least
+# recently used ones are dropped
+_feature_extractors = collections.OrderedDict()
+_max_feature_extractors = 16
+
+
+def _get_feature_extractor(feat_type, sample_rate, feat_config):
+    key = (feat_type, sample_rate, repr(sorted(feat_config.items())))
+    if key in _feature_extractors:
+        _feature_extractors.move_to_end(key)
+        return _feature_extractors[key]
+
+    feat_func = feat_funcs[feat_type]
+    if feat_type != 'spectrogram':
+        feature_extractor = feat_func(sr=sample_rate, **feat_config)
+    else:
+        feature_extractor = feat_func(**feat_config)
+    _feature_extractors[key] = feature_extractor
+    if len(_feature_extractors) > _max_feature_extractors:
+        _feature_extractors.popitem(last=False)
+    return feature_extractor
+
+
+def _get_stft_config(feature_extractor):
+    """Return (n_fft, hop_length, center) of the STFT of the extractor."""
+    layer = feature_extractor
+    for name in ('_log_melspectrogram', '_melspectrogram', '_spectrogram'):
+        layer = getattr(layer, name, layer)
+    config = layer._stft.keywords
+    n_fft = config['n_fft']
+    hop_length = config['hop_length']
+    if hop_length is None:
+        hop_length = n_fft // 4
+    return n_fft, hop_length, config['center']
+
 
 class AudioClassificationDataset(paddle.io.Dataset):
     """
@@ -37,6 +78,7 @@ class AudioClassificationDataset(paddle.io.Dataset):
         labels: List[int],
         feat_type: str = 'raw',
         sample_rate: int = None,
+        cache_dir: str = None,
         **kwargs,
     ):
         """
@@ -45,6 +87,9 @@ class AudioClassificationDataset(paddle.io.Dataset):
             labels (:obj:`List[int]`): Labels of audio files.
             feat_type (:obj:`str`, `optional`, defaults to `raw`):
                 It identifies the feature type that user wants to extract an audio file.
+            cache_dir (:obj:`str`, `optional`, defaults to `None`):
+                The directory to cache the extracted features, which are keyed on
+                the path and mtime of the audio file and the feature config.
         """
         super().__init__()
 
@@ -61,35 +106,183 @@ class AudioClassificationDataset(paddle.io.Dataset):
         self.feat_config = (
             kwargs  # Pass keyword arguments to customize feature config
         )
+        self.cache_dir = cache_dir
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
 
     def _get_data(self, input_file: str):
         raise NotImplementedError
 
-    def _convert_to_record(self, idx):
-        file, label = self.files[idx], self.labels[idx]
+    def _load_waveform(self, file):
         waveform, sample_rate = paddle.audio.load(file)
-        self.sample_rate = sample_rate
-
-        feat_func = feat_funcs[self.feat_type]
-
-        record = {}
         if len(waveform.shape) == 2:
             waveform = waveform.squeeze(0)  # 1D input
         waveform = paddle.to_tensor(waveform, dtype=paddle.float32)
-        if feat_func is not None:
+        return waveform, sample_rate
+
+    def _get_cache_file(self, file):
+        stat = os.stat(file)
+        key = repr(
+            (
+                os.path.abspath(file),
+                stat.st_mtime_ns,
+                self.feat_type,
+                sorted(self.feat_config.items()),
+            )
+        )
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.npy')
+
+    def _save_feature(self, cache_file, feat):
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            np.save(f, feat.numpy())
+        os.replace(tmp_file, cache_file)
+
+    def _convert_to_record(self, idx):
+        file, label = self.files[idx], self.labels[idx]
+
+        record = {}
+        record['label'] = label
+        if self.feat_type != 'raw' and self.cache_dir is not None:
+            cache_file = self._get_cache_file(file)
+            if os.path.exists(cache_file):
+                feat = np.load(cache_file, mmap_mode='r')
+                record['feat'] = paddle.to_tensor(feat)
+                return record
+
+        waveform, sample_rate = self._load_waveform(file)
+        self.sample_rate = sample_rate
+
+        if self.feat_type != 'raw':
+            feature_extractor = _get_feature_extractor(
+                self.feat_type, self.sample_rate, self.feat_config
+            )
             waveform = waveform.unsqueeze(0)  # (batch_size, T)
-            if self.feat_type != 'spectrogram':
-                feature_extractor = feat_func(
-                    sr=self.sample_rate, **self.feat_config
-                )
-            else:
-                feature_extractor = feat_func(**self.feat_config)
             record['feat'] = feature_extractor(waveform).squeeze(0)
+            if self.cache_dir is not None:
+                self._save_feature(cache_file, record['feat'])
         else:
             record['feat'] = waveform
-        record['label'] = label
         return record
 
+    def extract_features(self, batch_size: int = 16, buffer_size: int = None):
+        """
+        Extract the features of all audio files in batches, and save them to
+        :attr:`cache_dir`. The audio files with the same sample rate are
+        buffered and sorted by length, and the ones of similar lengths are
+        padded to a batch. The frames which see the padding are extracted
+        again from the unpadded waveform, so the features are the same as
+        the ones extracted file by file. The audio files already in the
+        cache are skipped.
+
+        Args:
+            batch_size (int, optional): The number of audio files extracted
+                together. Default: 16.
+            buffer_size (int, optional): The max number of waveforms buffered
+                in memory to be sorted by length. Default: None, means
+                8 * batch_size.
+        """
+        if self.feat_type == 'raw':
+            return
+        if self.cache_dir is None:
+            raise ValueError(
+                "cache_dir should be set to save the extracted features"
+            )
+
+        if self.feat_config.get('top_db') is not None:
+            # top_db thresholds the features at the peak of the whole batch
+            batch_size = 1
+        if buffer_size is None:
+            buffer_size = 8 * batch_size
+        buffer_size = max(buffer_size, batch_size)
+
+        # sample_rate -> [(cache_file, waveform)]
+        pending = {}
+        num_pending = 0
+        for file in self.files:
+            cache_file = self._get_cache_file(file)
+            if os.path.exists(cache_file):
+                continue
+            waveform, sample_rate = self._load_waveform(file)
+            pending.setdefault(sample_rate, []).append((cache_file, waveform))
+            num_pending += 1
+            if num_pending >= buffer_size:
+                # flush the largest buffer
+                sample_rate = max(pending, key=lambda k: len(pending[k]))
+                num_pending -= len(pending[sample_rate])
+                self._extract_buffer(
+                    sample_rate, pending.pop(sample_rate), batch_size
+                )
+
+        for sample_rate, buffer in pending.items():
+            self._extract_buffer(sample_rate, buffer, batch_size)
+
+    def _extract_buffer(self, sample_rate, buffer, batch_size):
+        buffer.sort(key=lambda item: item[1].shape[0])
+        for start in range(0, len(buffer), batch_size):
+            self._extract_batch(sample_rate, buffer[start : start + batch_size])
+
+    def _extract_batch(self, sample_rate, batch):
+        cache_files, waveforms = zip(*batch)
+        feature_extractor = _get_feature_extractor(
+            self.feat_type, sample_rate, self.feat_config
+        )
+        lengths = [waveform.shape[0] for waveform in waveforms]
+        max_length = max(lengths)
+        if min(lengths) == max_length:
+            feats = feature_extractor(paddle.stack(waveforms))
+            for cache_file, feat in zip(cache_files, feats.unbind(0)):
+                self._save_feature(cache_file, feat)
+            return
+
+        padded = paddle.stack(
+            [
+                paddle.nn.functional.pad(
+                    waveform, [0, max_length - waveform.shape[0]]
+                )
+                for waveform in waveforms
+            ]
+        )
+        feats = feature_extractor(padded)
+        for cache_file, waveform, feat in zip(
+            cache_files, waveforms, feats.unbind(0)
+        ):
+            feat = self._unpad_feature(feature_extractor, waveform, feat)
+            self._save_feature(cache_file, feat)
+
+    def _unpad_feature(self, feature_extractor, waveform, feat):
+        """
+        Crop the feature of the zero padded waveform to its own frames, and
+        extract the frames whose windows see the padding again.
+        """
+        n_fft, hop_length, center = _get_stft_config(feature_extractor)
+        length = waveform.shape[0]
+        if not center:
+            # the frames of the waveform don't reach the padding
+            return feat[..., : 1 + (length - n_fft) // hop_length]
+
+        half = n_fft // 2
+        num_frames = 1 + length // hop_length
+        # frame t covers [t * hop_length - half, t * hop_length - half + n_fft)
+        num_exact = max((length + half - n_fft) // hop_length + 1, 0)
+        if num_exact >= num_frames:
+            return feat[..., :num_frames]
+
+        # the frames of a segment starting at a multiple of hop_length are
+        # the ones of the waveform, except the first ones seeing the reflect
+        # padding of the segment start
+        num_skipped = -(-half // hop_length)
+        start_frame = num_exact - num_skipped
+        if start_frame <= 0 or length - start_frame * hop_length <= half:
+            return feature_extractor(waveform.unsqueeze(0)).squeeze(0)
+        tail = feature_extractor(
+            waveform[start_frame * hop_length :].unsqueeze(0)
+        ).squeeze(0)
+        return paddle.concat(
+            [feat[..., :num_exact], tail[..., num_skipped:]], axis=-1
+        )
+
     def __getitem__(self, idx):
         record = self._convert_to_record(idx)
         return record['feat'], record['label']
@@ -41,6 +41,7 @@ class TESS(AudioClassificationDataset):
        split (int, optional): It specify the fold of dev dataset. Defaults to 1.
        feat_type (str, optional): It identifies the feature type that user wants to extract of an audio file. Defaults to raw.
        archive(dict): it tells where to download the audio archive. Defaults to None.
+       cache_dir (str, optional): The directory to cache the extracted features. Defaults to None.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of TESS dataset.
@@ -12,18 +12,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bz2
 import errno
+import functools
 import glob
+import gzip
 import hashlib
 import importlib
+import io
+import itertools
+import json
+import lzma
+import multiprocessing
 import os
 import pickle
 import re
 import shutil
 import sys
+import tarfile
 import tempfile
+import threading
 
 import httpx
+import numpy as np
 
 import paddle
 import paddle.dataset
@@ -228,3 +239,316 @@ def _check_exists_and_download(path, url, md5, module_name, download=True):
         return paddle.dataset.common.download(url, module_name, md5)
     else:
         raise ValueError(f'{path} not exists and auto download disabled')
+
+
+_COMPRESSED_OPENERS = (
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+)
+
+
+def _get_opener(path):
+    with open(path, 'rb') as f:
+        magic = f.read(6)
+    for prefix, opener in _COMPRESSED_OPENERS:
+        if magic.startswith(prefix):
+            return opener
+    return None
+
+
+def _write_atomic(path, write):
+    """
+    Write a file by ``write(f)`` through a temporary file, so that readers in
+    other processes never see a partial file. Returns False if the directory
+    is not writable.
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+class TarIndex:
+    """
+    Random access reader of the regular files in a tar archive.
+
+    The offset and size of every member are scanned once and persisted to
+    ``<archive>.index`` next to the archive, so that later instances do not
+    scan the archive again. Every process opens its own file descriptor on
+    first read and reads the byte range of a member with ``os.pread``, so an
+    instance can be shared by forked DataLoader workers.
+
+    Members of a compressed archive are read through a decompressing stream,
+    which is fast only if members are read in the order of ``names()``. Set
+    ``decompress`` to decompress the archive once to ``<archive>.tar`` for
+    fast random access.
+
+    Args:
+        path (str): Path of the tar archive.
+        decompress (bool, optional): Whether to decompress a compressed
+            archive to a file for random access. Default: False.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, decompress=False):
+        self.path = path
+        self._data_path = path
+        self._opener = _get_opener(path)
+        if self._opener is not None and decompress:
+            tar_path = path + '.tar'
+            if self._is_up_to_date(tar_path) or self._decompress(tar_path):
+                self._data_path = tar_path
+                self._opener = None
+
+        self._members = self._load_index()
+        self._init_reader()
+
+    def _is_up_to_date(self, derived_path):
+        if not os.path.exists(derived_path):
+            return False
+        return os.path.getmtime(derived_path) >= os.path.getmtime(self.path)
+
+    def _decompress(self, tar_path):
+        def write(f):
+            with self._opener(self.path, 'rb') as src:
+                shutil.copyfileobj(src, f, 1 << 20)
+
+        return _write_atomic(tar_path, write)
+
+    def _load_index(self):
+        index_path = self.path + '.index'
+        stat = os.stat(self._data_path)
+        key = {
+            'version': self.VERSION,
+            'data_path': os.path.basename(self._data_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+        }
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r') as f:
+                    index = json.load(f)
+                if index['key'] == key:
+                    return {
+                        name: tuple(member)
+                        for name, member in index['members'].items()
+                    }
+            except (OSError, ValueError, KeyError):
+                pass
+
+        members = {}
+        with tarfile.open(self._data_path) as tar:
+            for member in tar:
+                if member.isfile():
+                    members[member.name] = (member.offset_data, member.size)
+
+        # keep the index in memory only if the directory is not writable
+        _write_atomic(
+            index_path,
+            lambda f: f.write(
+                json.dumps({'key': key, 'members': members}).encode()
+            ),
+        )
+        return members
+
+    def _init_reader(self):
+        self._pid = None
+        self._file = None
+        self._lock = threading.RLock()
+
+    def _get_file(self):
+        # file descriptors inherited from the parent share the file offset
+        # with it, so a forked worker opens its own one
+        with self._lock:
+            if self._pid != os.getpid():
+                if self._file is not None:
+                    # only closes the copy of this process
+                    self._file.close()
+                if self._opener is not None:
+                    self._file = self._opener(self._data_path, 'rb')
+                else:
+                    self._file = open(self._data_path, 'rb')
+                self._pid = os.getpid()
+            return self._file
+
+    def names(self):
+        """
+        Get the names of the regular files in the order of the archive.
+        """
+        return sorted(self._members, key=lambda name: self._members[name][0])
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def __len__(self):
+        return len(self._members)
+
+    def read(self, name):
+        """
+        Read the content of the member ``name`` as bytes.
+        """
+        if name not in self._members:
+            raise KeyError(f"{name} not found in {self.path}")
+        offset, size = self._members[name]
+
+        if self._opener is None and hasattr(os, 'pread'):
+            fd = self._get_file().fileno()
+            chunks = []
+            while size > 0:
+                chunk = os.pread(fd, size, offset)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offset += len(chunk)
+                size -= len(chunk)
+            return b''.join(chunks)
+
+        with self._lock:
+            f = self._get_file()
+            f.seek(offset)
+            return f.read(size)
+
+    def open(self, name):
+        """
+        Open the member ``name`` as a binary file object.
+        """
+        return io.BytesIO(self.read(name))
+
+    def close(self):
+        if self._file is not None and self._pid == os.getpid():
+            self._file.close()
+        self._pid = None
+        self._file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_pid', '_file', '_lock'):
+            state.pop(key)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_reader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _load_cached_arrays(cache_prefix, source_paths, build):
+    """
+    Load the arrays decoded from ``source_paths`` by ``build()``, which
+    returns a dict from names to arrays.
+
+    The arrays are saved to ``<cache_prefix>.<name>.npy`` on first call and
+    memory-mapped copy-on-write by later calls, so that the decoded data is
+    shared by all processes through the page cache. The cache is rebuilt once
+    the source files change. Returns the arrays in memory if the cache can
+    not be written.
+    """
+    sources = [os.path.abspath(path) for path in source_paths]
+    source_mtime = max(os.path.getmtime(path) for path in sources)
+    meta_path = cache_prefix + '.json'
+
+    def load(names):
+        return {
+            name: np.load(f'{cache_prefix}.{name}.npy', mmap_mode='c')
+            for name in names
+        }
+
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta['sources'] == sources and all(
+            os.path.getmtime(f'{cache_prefix}.{name}.npy') >= source_mtime
+            for name in meta['names']
+        ):
+            return load(meta['names'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    arrays = build()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if not _write_atomic(
+            f'{cache_prefix}.{name}.npy', functools.partial(np.save, arr=array)
+        ):
+            return arrays
+    # write the meta file last, which marks the cache as complete
+    meta = {'sources': sources, 'names': list(arrays)}
+    if not _write_atomic(
+        meta_path, lambda f: f.write(json.dumps(meta).encode())
+    ):
+        return arrays
+    return load(arrays)
+
+
+class _RaggedArray:
+    """
+    Sequences of variable lengths stored as one flat array of values and the
+    offsets of every sequence in it, whose items are zero-copy slices.
+    """
+
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_sequences(cls, sequences, dtype='int32'):
+        lengths = np.fromiter(
+            (len(seq) for seq in sequences), dtype='int64', count=len(sequences)
+        )
+        offsets = np.zeros([len(sequences) + 1], dtype='int64')
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.fromiter(
+            itertools.chain.from_iterable(sequences),
+            dtype=dtype,
+            count=offsets[-1],
+        )
+        return cls(values, offsets)
+
+    @classmethod
+    def from_arrays(cls, arrays, name):
+        return cls(arrays[name + '_values'], arrays[name + '_offsets'])
+
+    def to_arrays(self, name):
+        return {name + '_values': self.values, name + '_offsets': self.offsets}
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def __getitem__(self, idx):
+        return self.values[self.offsets[idx] : self.offsets[idx + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+def _map_in_chunks(func, items, chunk_size=1024, num_workers=0):
+    """
+    Apply ``func`` to the chunks of ``items``, and return the results of the
+    chunks in order. They run in a pool of ``num_workers`` processes if it is
+    positive, which are spawned instead of forked, since forking a process
+    with CUDA or DataLoader threads may deadlock. It still runs in the
+    current process if the chunks are few, or the current process is a
+    daemon, e.g. a DataLoader worker, which can not have child processes.
+    """
+    chunks = [
+        items[i : i + chunk_size] for i in range(0, len(items), chunk_size)
+    ]
+    num_workers = min(num_workers, len(chunks))
+    if num_workers <= 1 or multiprocessing.current_process().daemon:
+        return [func(chunk) for chunk in chunks]
+    with multiprocessing.get_context("spawn").Pool(num_workers) as pool:
+        return pool.map(func, chunks)
@@ -49,6 +49,7 @@ set_field_default_config(BASE, "all_ranks", False)
 set_field_default_config(BASE, "split_data", True)
 set_field_default_config(BASE, "seed", None)
 set_field_default_config(BASE, "reinit", False)  # Only for debug
+set_field_default_config(BASE, "completion_cache_dir", None)
 
 #########################################
 # recompute configuration
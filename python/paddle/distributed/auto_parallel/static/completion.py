@@ -63,6 +63,21 @@ __skip_dims_mapping_op__ = [
 _skip_propagation_prefix = "Auto_Parallel_Completion_Skipped"
 _max_propagation_step = 500
 
+# The results of the SPMD rules, keyed on the op type, the op attributes, and
+# the shapes and dist attributes of the inputs and outputs. The same layers
+# repeated in a model, and the programs of the modes, hit the same results.
+_g_spmd_rule_cache = collections.OrderedDict()
+_g_spmd_rule_cache_stats = {"hits": 0, "misses": 0}
+_max_spmd_rule_cache_size = 8192
+# The attributes which don't affect the SPMD rules, but differ between ops.
+_spmd_rule_cache_skipped_attrs = [
+    "op_callstack",
+    "op_namescope",
+    "op_device",
+    "op_role_var",
+    "with_quant_attr",
+]
+
 
 def mark_as_sharding_propagation_skip_op(op):
     prefix = op.attr("op_namescope") if op.has_attr("op_namescope") else '/'
@@ -194,6 +209,141 @@ def _can_apply_infer_spmd_rule(dist_op):
     return enable and contains_spmd_rule(op_type) and op_type in __adapted_ops__
 
 
+def _use_incremental_completion():
+    enable = os.getenv("FLAGS_incremental_completion", True)
+    if isinstance(enable, str):
+        enable = enable.lower()
+        enable = True if enable == 'true' else False
+    return bool(enable)
+
+
+def spmd_rule_cache_info():
+    """The hits, misses and size of the SPMD rule cache."""
+    return {
+        "hits": _g_spmd_rule_cache_stats["hits"],
+        "misses": _g_spmd_rule_cache_stats["misses"],
+        "size": len(_g_spmd_rule_cache),
+    }
+
+
+def clear_spmd_rule_cache():
+    """Clear the SPMD rule cache and its statistics."""
+    _g_spmd_rule_cache.clear()
+    _g_spmd_rule_cache_stats["hits"] = 0
+    _g_spmd_rule_cache_stats["misses"] = 0
+
+
+def _get_op_tensor_dist_attrs(dist_op):
+    # (is_input, name, dist_attr) of all the inputs and outputs in order
+    serial_op = dist_op.serial_op
+    op_dist_attr = dist_op.dist_attr
+    tensor_dist_attrs = []
+    for slot in serial_op.input_names:
+        for name in serial_op.input(slot):
+            tensor_dist_attrs.append(
+                (True, name, op_dist_attr.get_input_dist_attr(name))
+            )
+    for slot in serial_op.output_names:
+        for name in serial_op.output(slot):
+            tensor_dist_attrs.append(
+                (False, name, op_dist_attr.get_output_dist_attr(name))
+            )
+    return tensor_dist_attrs
+
+
+def _get_spmd_rule_cache_key(dist_op, tensor_dist_attrs):
+    serial_op = dist_op.serial_op
+    attrs = []
+    for name in sorted(serial_op.attr_names):
+        if name in _spmd_rule_cache_skipped_attrs:
+            continue
+        # the rules of the ops with block or variable attributes are not
+        # cached
+        if serial_op.attr_type(name) not in [
+            core.AttrType.BOOL,
+            core.AttrType.INT,
+            core.AttrType.LONG,
+            core.AttrType.FLOAT,
+            core.AttrType.FLOAT64,
+            core.AttrType.STRING,
+            core.AttrType.BOOLS,
+            core.AttrType.INTS,
+            core.AttrType.LONGS,
+            core.AttrType.FLOATS,
+            core.AttrType.FLOAT64S,
+            core.AttrType.STRINGS,
+        ]:
+            return None
+        value = serial_op.attr(name)
+        if isinstance(value, list):
+            value = tuple(value)
+        attrs.append((name, value))
+
+    tensors = []
+    for is_input, name, tensor_dist_attr in tensor_dist_attrs:
+        if tensor_dist_attr is None:
+            return None
+        tensors.append(
+            (
+                is_input,
+                tuple(serial_op.block._var_recursive(name).shape),
+                tuple(tensor_dist_attr.process_mesh.process_ids),
+                tuple(tensor_dist_attr.process_mesh.shape),
+                tuple(tensor_dist_attr.dims_mapping),
+                tuple(sorted(tensor_dist_attr._partial_dims())),
+            )
+        )
+    process_mesh = dist_op.dist_attr.process_mesh
+    return (
+        serial_op.type,
+        tuple(attrs),
+        tuple(process_mesh.process_ids),
+        tuple(process_mesh.shape),
+        tuple(tensors),
+    )
+
+
+def _update_dims_mapping_with_cache(dist_op_container, dist_op):
+    tensor_dist_attrs = _get_op_tensor_dist_attrs(dist_op)
+    cache_key = _get_spmd_rule_cache_key(dist_op, tensor_dist_attrs)
+    if cache_key is None:
+        return dist_op_container.update_dims_mapping(dist_op)
+
+    if cache_key in _g_spmd_rule_cache:
+        _g_spmd_rule_cache_stats["hits"] += 1
+        updated, results = _g_spmd_rule_cache[cache_key]
+        op_dist_attr = dist_op.dist_attr
+        for (is_input, name, _), (dims_mapping, partial_dims) in zip(
+            tensor_dist_attrs, results
+        ):
+            if is_input:
+                if op_dist_attr.get_input_dims_mapping(name) != dims_mapping:
+                    op_dist_attr.set_input_dims_mapping(name, dims_mapping)
+                continue
+            if op_dist_attr.get_output_dims_mapping(name) != dims_mapping:
+                op_dist_attr.set_output_dims_mapping(name, dims_mapping)
+            output_dist_attr = op_dist_attr.get_output_dist_attr(name)
+            if sorted(output_dist_attr._partial_dims()) != partial_dims:
+                output_dist_attr._clean_partial_status()
+                output_dist_attr._set_partial_dims(partial_dims)
+        return updated
+
+    _g_spmd_rule_cache_stats["misses"] += 1
+    updated = dist_op_container.update_dims_mapping(dist_op)
+    # the rule may replace the dist attrs, so they are got again
+    results = [
+        (
+            list(tensor_dist_attr.dims_mapping),
+            sorted(tensor_dist_attr._partial_dims()),
+        )
+        for _, _, tensor_dist_attr in _get_op_tensor_dist_attrs(dist_op)
+    ]
+    _g_spmd_rule_cache[cache_key] = (updated, results)
+    if len(_g_spmd_rule_cache) > _max_spmd_rule_cache_size:
+        _g_spmd_rule_cache.popitem(last=False)
+    return updated
+
+
 def _update_op_dims_mapping_and_distoperatorimpl(
     dist_op, original_op_dist_attr, changed
 ):
@@ -202,7 +352,7 @@ def _update_op_dims_mapping_and_distoperatorimpl(
         f"Update Op [{dist_op.serial_op.type}] using DistOpContainer [{dist_op_container.type}]."
     )
 
-    updated = dist_op_container.update_dims_mapping(dist_op)
+    updated = _update_dims_mapping_with_cache(dist_op_container, dist_op)
     changed = updated or changed
     # TODO(ljz) remove the below code once we introduce general reshard to replace specific distopimpls
     reverted = dist_op_container.mapping_to_dist_operator_impl(
@@ -503,10 +653,29 @@ class Completer:
                         )
                         tensor_dist_attr.dims_mapping = op_dims_mapping
 
+    def _mark_dims_mapping_dirty(self, node, dirty_nodes):
+        # The update of a node only depends on the dist attrs of itself and
+        # its neighbors, so only they need to be revisited.
+        for related_node in [node, *node.inputs, *node.outputs]:
+            for nodes in dirty_nodes.values():
+                nodes.add(_node_id(related_node))
+
     def _update_dims_mapping(self):
         # Complete dims_mapping for each node
         step = 0
         reach_fix_point = False
+        # The nodes to visit in each direction. In the incremental mode,
+        # a node is only revisited if the dims mapping of itself or its
+        # neighbors changed since its last visit, otherwise the visit
+        # wouldn't change anything.
+        incremental = _use_incremental_completion()
+        dirty_nodes = {
+            is_fwd: {
+                _node_id(node)
+                for node in self._dist_context.serial_ordered_nodes
+            }
+            for is_fwd in [True, False]
+        }
 
         while (not reach_fix_point) and (step < _max_propagation_step):
             changed = False
@@ -517,21 +686,35 @@ class Completer:
                     else reversed(self._dist_context.serial_ordered_nodes)
                 )
                 for node in all_nodes:
+                    if incremental:
+                        node_id = _node_id(node)
+                        if node_id not in dirty_nodes[is_fwd]:
+                            continue
+                        dirty_nodes[is_fwd].remove(node_id)
+                    node_changed = False
                     if node.is_var() and node.var() is not None:
                         tensor_changed = self._update_tensor_node_dims_mapping(
                             node, fwd=is_fwd
                         )
                         if tensor_changed:
-                            changed = True
+                            node_changed = True
                     if node.is_op() and node.op() is not None:
                         op_changed = self._update_op_node_dims_mapping(
                             node, fwd=is_fwd
                         )
                         if op_changed:
-                            changed = True
+                            node_changed = True
+                    if node_changed:
+                        changed = True
+                        if incremental:
+                            self._mark_dims_mapping_dirty(node, dirty_nodes)
                 graph_changed = self._update_dims_mapping_between_graphs()
                 if graph_changed:
                     changed = True
+                    if incremental:
+                        for nodes in self._node_pairs_between_graphs:
+                            for node in nodes:
+                                self._mark_dims_mapping_dirty(node, dirty_nodes)
 
             if changed:
                 reach_fix_point = False
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import logging
 import os
 import pickle
@@ -72,6 +73,103 @@ class Planner:
     def completer(self):
         return self._completer
 
+    def _set_dist_attrs(self, dist_attrs):
+        # set the dist attrs saved by the tuner or the completion cache
+        for key, op_dist_attr in dist_attrs["op"].items():
+            serial_op = self._dist_context._dist_ops_for_program[key].serial_op
+            # clear dist attr
+            serial_op.dist_attr = OperatorDistAttr(serial_op.desc)
+            serial_op.dist_attr.parse_from_string(op_dist_attr)
+            self._dist_context._dist_ops_for_program[key] = DistributedOperator(
+                serial_op
+            )
+
+        for key, tensor_dist_attr in dist_attrs["tensor"].items():
+            serial_tensor = self._dist_context._dist_tensors_for_program[
+                key
+            ].serial_tensor
+            # clear dist attr
+            serial_tensor.dist_attr = TensorDistAttr(serial_tensor.desc)
+            serial_tensor.dist_attr.parse_from_string(tensor_dist_attr)
+            self._dist_context._dist_tensors_for_program[
+                key
+            ] = DistributedTensor(serial_tensor)
+
+        process_meshes = []
+        for process_ids, shape in dist_attrs["process_meshes"]:
+            process_meshes.append(
+                ProcessMesh(np.array(process_ids).reshape(shape).tolist())
+            )
+        self._dist_context.process_meshes = process_meshes
+
+    def _get_completion_cache_path(self):
+        cache_dir = self._strategy.completion_cache_dir
+        if not cache_dir:
+            return None
+        # the completion result is determined by the serial program, its
+        # annotations, the strategy and the flags of the spmd rules
+        md5 = hashlib.md5()
+
+        def update(value):
+            md5.update(value if isinstance(value, bytes) else value.encode())
+
+        update(
+            self._dist_context.serial_main_program.desc.serialize_to_string()
+        )
+        for key in sorted(self._dist_context._dist_tensors_for_program):
+            dist_tensor = self._dist_context._dist_tensors_for_program[key]
+            update(str(key))
+            update(dist_tensor.dist_attr.serialize_to_string())
+        for key in sorted(self._dist_context._dist_ops_for_program):
+            dist_op = self._dist_context._dist_ops_for_program[key]
+            update(str(key))
+            update(dist_op.dist_attr.serialize_to_string())
+        for process_mesh in self._dist_context.process_meshes:
+            update(str((process_mesh.process_ids, process_mesh.shape)))
+        update(repr(self._strategy))
+        for flag in ["FLAGS_infer_spmd_enable", "PARALLEL_CROSS_ENTROPY"]:
+            update(f"{flag}={os.getenv(flag)}")
+        return os.path.join(cache_dir, f"completion_{md5.hexdigest()}.pkl")
+
+    def _load_completion_cache(self, path):
+        if path is None or not os.path.exists(path):
+            return False
+        logger = get_logger(logging.INFO)
+        try:
+            with open(path, "rb") as f:
+                dist_attrs = pickle.load(f)
+            self._set_dist_attrs(dist_attrs)
+        except Exception as e:
+            logger.info(
+                f"Failed to load the completed dist attrs from {path}: {e}, so we run the completion again."
+            )
+            return False
+        logger.info(f"The completed dist attrs have been loaded from {path}")
+        return True
+
+    def _save_completion_cache(self, path):
+        if path is None:
+            return
+        dist_attrs = {"tensor": {}, "op": {}, "process_meshes": []}
+        dist_tensors = self._dist_context._dist_tensors_for_program
+        for key, dist_tensor in dist_tensors.items():
+            dist_attrs["tensor"][
+                key
+            ] = dist_tensor.dist_attr.serialize_to_string()
+        dist_ops = self._dist_context._dist_ops_for_program
+        for key, dist_op in dist_ops.items():
+            dist_attrs["op"][key] = dist_op.dist_attr.serialize_to_string()
+        for process_mesh in self._dist_context.process_meshes:
+            dist_attrs["process_meshes"].append(
+                [process_mesh.process_ids, process_mesh.shape]
+            )
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # the ranks may save the same file at the same time
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(dist_attrs, f)
+        os.replace(tmp_path, path)
+
     def plan(self):
         logger = get_logger(logging.INFO)
         path = None
@@ -84,9 +182,6 @@ class Planner:
             try:
                 with open(path, "rb") as f:
                     dist_attrs = pickle.load(f)
-                tensor_dist_attrs = dist_attrs["tensor"]
-                op_dist_attrs = dist_attrs["op"]
-                process_meshes = dist_attrs["process_meshes"]
                 cluster = dist_attrs["cluster"]
                 last_gpu_model = cluster.machines[0].devices[0].model
                 last_gpu_memory = cluster.machines[0].devices[0].memory
@@ -119,43 +214,7 @@ class Planner:
                 need_set_dist_attr = False
 
             if need_set_dist_attr:
-                for key in op_dist_attrs:
-                    serial_op = self._dist_context._dist_ops_for_program[
-                        key
-                    ].serial_op
-                    # clear dist attr
-                    serial_op.dist_attr = OperatorDistAttr(serial_op.desc)
-                    serial_op.dist_attr.parse_from_string(op_dist_attrs[key])
-                    self._dist_context._dist_ops_for_program[
-                        key
-                    ] = DistributedOperator(serial_op)
-
-                for key in tensor_dist_attrs:
-                    serial_tensor = (
-                        self._dist_context._dist_tensors_for_program[
-                            key
-                        ].serial_tensor
-                    )
-                    # clear dist attr
-                    serial_tensor.dist_attr = TensorDistAttr(serial_tensor.desc)
-                    serial_tensor.dist_attr.parse_from_string(
-                        tensor_dist_attrs[key]
-                    )
-                    self._dist_context._dist_tensors_for_program[
-                        key
-                    ] = DistributedTensor(serial_tensor)
-
-                process_meshes = []
-                for item in dist_attrs["process_meshes"]:
-                    process_ids = item[0]
-                    shape = item[1]
-                    process_meshes.append(
-                        ProcessMesh(
-                            np.array(process_ids).reshape(shape).tolist()
-                        )
-                    )
-
-                self._dist_context.process_meshes = process_meshes
+                self._set_dist_attrs(dist_attrs)
                 self._load = True
 
                 logger.info(
@@ -166,7 +225,10 @@ class Planner:
             if self._strategy.auto_mode != "semi":
                 self._parallel_tuner.tune()
             else:
-                self._completer.complete_forward_annotation()
+                cache_path = self._get_completion_cache_path()
+                if not self._load_completion_cache(cache_path):
+                    self._completer.complete_forward_annotation()
+                    self._save_completion_cache(cache_path)
 
         if os.getenv("PADDLE_AUTO_PARALLEL_STAGE", "run") != "run":
             sys.exit()
@@ -1071,6 +1071,11 @@ class Resharder:
     """
 
     while_block_info = {}
+    # the op description sequences of the reshard transitions, see
+    # find_op_desc_seq
+    _op_desc_seq_cache = OrderedDict()
+    _op_desc_seq_cache_size = 4096
+    _op_desc_seq_cache_stats = {"hits": 0, "misses": 0}
 
     def __init__(
         self,
@@ -1152,6 +1157,22 @@ class Resharder:
     def has_allgather(self):
         return self._has_allgather
 
+    @staticmethod
+    def op_desc_seq_cache_info():
+        """The hits, misses and size of the op description sequence cache."""
+        return {
+            "hits": Resharder._op_desc_seq_cache_stats["hits"],
+            "misses": Resharder._op_desc_seq_cache_stats["misses"],
+            "size": len(Resharder._op_desc_seq_cache),
+        }
+
+    @staticmethod
+    def clear_op_desc_seq_cache():
+        """Clear the op description sequence cache and its statistics."""
+        Resharder._op_desc_seq_cache.clear()
+        Resharder._op_desc_seq_cache_stats["hits"] = 0
+        Resharder._op_desc_seq_cache_stats["misses"] = 0
+
     @staticmethod
     def compute_partition_shape(complete_shape, dims_mapping, process_shape):
         """Compute the shape of partition."""
@@ -1526,7 +1547,96 @@ class Resharder:
             if not serial
             else source_tensor.shape
         )
+        is_bool = source_tensor.dtype == paddle.bool
+        # the op desc sequence only depends on the transition, so it is
+        # shared by the tensors with the same transition, and by the
+        # resharders of all the programs, e.g. the ones in auto tuning.
+        cache_key = (
+            tuple(complete_shape),
+            serial,
+            is_bool,
+            tuple(tensor_dist_attr.process_mesh.process_ids),
+            tuple(tensor_dist_attr.process_mesh.shape),
+            tuple(source_dims_mapping),
+            tuple(source_process_group),
+            tuple(source_process_shape),
+            tuple(target_dims_mapping),
+            tuple(target_process_group),
+            tuple(target_process_shape),
+        )
+        cache = Resharder._op_desc_seq_cache
+        if cache_key in cache:
+            Resharder._op_desc_seq_cache_stats["hits"] += 1
+            op_desc_seq, p2p_pairs = cache[cache_key]
+        else:
+            Resharder._op_desc_seq_cache_stats["misses"] += 1
+            op_desc_seq, p2p_pairs = self._compute_op_desc_seq(
+                dist_tensor,
+                complete_shape,
+                source_dims_mapping,
+                source_process_group,
+                source_process_shape,
+                target_dims_mapping,
+                target_process_group,
+                target_process_shape,
+                serial,
+                is_bool,
+            )
+            cache[cache_key] = (op_desc_seq, p2p_pairs)
+            if len(cache) > Resharder._op_desc_seq_cache_size:
+                cache.popitem(last=False)
+
+        # TODO(zhaoyingli): Remove the method to a pass.
+        # Current method to get all pp_ranks' relationship must rely on reshard.
+        # When reshard insert send/recv pair, the process_group has the pp relationship.
+        # But the method to obtain pp_ranks' relationship is only supported in 'reshard_input',
+        # cause 'reshard_output' only has current process_group view instead of global view.
+        if p2p_pairs:
+            op_role = dist_attr[-1]
+            if int(op_role) == int(OpRole.Forward):
+                for send_process, recv_process in p2p_pairs:
+                    self.dist_context.up_down_streams.add_pair_stream(
+                        send_process, recv_process
+                    )
+
+        # the op descs are not modified by the callers, but the lists are
+        # copied in case they are appended to
+        return OrderedDict(
+            (process, list(op_desc_list))
+            for process, op_desc_list in op_desc_seq.items()
+        )
+
+    def _compute_op_desc_seq(
+        self,
+        dist_tensor,
+        complete_shape,
+        source_dims_mapping,
+        source_process_group,
+        source_process_shape,
+        target_dims_mapping,
+        target_process_group,
+        target_process_shape,
+        serial,
+        is_bool,
+    ):
+        """
+        Compute the op description sequence of find_op_desc_seq, and the
+        (send process, recv process) pairs of the send and recv op descs.
+        """
         op_desc_seq = OrderedDict()
+        p2p_pairs = []
+        # the partition index of each source process, which is looked up by
+        # all the target processes
+        source_partition_indices = {
+            source_process: Resharder.compute_partition_index(
+                source_process,
+                complete_shape,
+                source_dims_mapping,
+                source_process_shape,
+                source_process_group,
+            )
+            for source_process in source_process_group
+        }
 
         # TODO: if the target process group has the same process with source process group
         if set(target_process_group).intersection(
@@ -1538,13 +1648,9 @@ class Resharder:
             partition_process_mapping_list = []
             for source_process in source_process_group:
                 # get partition index of source process
-                source_partition_index = Resharder.compute_partition_index(
-                    source_process,
-                    complete_shape,
-                    source_dims_mapping,
-                    source_process_shape,
-                    source_process_group,
-                )
+                source_partition_index = source_partition_indices[
+                    source_process
+                ]
                 if not partition_process_mapping_list:
                     # the item in partition_process_mapping_list is source_partition_index, which processes and whether has been used
                     partition_process_mapping_list.append(
@@ -1583,13 +1689,9 @@ class Resharder:
                 partition_index_list = []
                 all_partition_index_list = []
                 for source_process in source_process_group:
-                    source_partition_index = Resharder.compute_partition_index(
-                        source_process,
-                        complete_shape,
-                        source_dims_mapping,
-                        source_process_shape,
-                        source_process_group,
-                    )
+                    source_partition_index = source_partition_indices[
+                        source_process
+                    ]
                     to_send_process = None
                     if (
                         all(
@@ -1636,7 +1738,6 @@ class Resharder:
                         all_partition_index_list.append(source_partition_index)
 
                         # append send and recv op desc
-                        is_bool = dist_tensor.serial_tensor.dtype == paddle.bool
                         send_op_desc = SendOpDesc(
                             source_partition_index,
                             to_send_process,
@@ -1655,16 +1756,7 @@ class Resharder:
                         Resharder.concat_partitions(
                             partition_index_list, source_partition_index
                         )
-                        # TODO(zhaoyingli): Remove the method to a pass.
-                        # Current method to get all pp_ranks' relationship must rely on reshard.
-                        # When reshard insert send/recv pair, the process_group has the pp relationship.
-                        # But the method to obtain pp_ranks' relationship is only supported in 'reshard_input',
-                        # cause 'reshard_output' only has current process_group view instead of global view.
-                        op_role = dist_attr[-1]
-                        if int(op_role) == int(OpRole.Forward):
-                            self.dist_context.up_down_streams.add_pair_stream(
-                                to_send_process, target_process
-                            )
+                        p2p_pairs.append((to_send_process, target_process))
 
                 # append concat op desc
                 op_desc_seq[target_process].append(
@@ -1702,13 +1794,9 @@ class Resharder:
             all_partition_index_list = []
             process_index = []
             for source_process in source_process_group:
-                source_partition_index = Resharder.compute_partition_index(
-                    source_process,
-                    complete_shape,
-                    source_dims_mapping,
-                    source_process_shape,
-                    source_process_group,
-                )
+                source_partition_index = source_partition_indices[
+                    source_process
+                ]
                 if source_partition_index not in partition_index_list:
                     partition_index_list.append(source_partition_index)
                     process_index.append(
@@ -1743,15 +1831,9 @@ class Resharder:
                         target_process_group,
                     )
                     for _process in group:
-                        source_partition_index = (
-                            Resharder.compute_partition_index(
-                                _process,
-                                complete_shape,
-                                source_dims_mapping,
-                                source_process_shape,
-                                source_process_group,
-                            )
-                        )
+                        source_partition_index = source_partition_indices[
+                            _process
+                        ]
                         if not all(
                             _
                             for _ in list(
@@ -1824,7 +1906,7 @@ class Resharder:
                             AllGatherOpDesc(
                                 group=min_comm_group,
                                 shape=allgather_shape,
-                                is_bool=(source_tensor.dtype == paddle.bool),
+                                is_bool=is_bool,
                                 need_split=False,
                             ),
                             EndOpDesc(None),
@@ -1835,9 +1917,7 @@ class Resharder:
                                 AllGatherOpDesc(
                                     group=min_comm_group,
                                     shape=allgather_shape,
-                                    is_bool=(
-                                        source_tensor.dtype == paddle.bool
-                                    ),
+                                    is_bool=is_bool,
                                 ),
                                 ConcatOpDesc(
                                     partition_index_list=all_partition_index_list_copied
@@ -1848,7 +1928,7 @@ class Resharder:
                             else [slice_op_desc]
                         )
 
-        return op_desc_seq
+        return op_desc_seq, p2p_pairs
 
     def parse_op_desc(
         self,
@@ -0,0 +1,445 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Offline simulator of the pipeline parallel schedules.
+
+The job lists follow the dygraph schedules of fleet.meta_parallel (
+PipelineParallel, PipelineParallelWithInterleave,
+PipelineParallelWithInterleaveFthenB and PipelineParallelZeroBubble), and
+use the job types of the static pipeline_scheduler_pass. Given the cost of
+each stage, the simulator replays the job lists of all the stages to get
+the timeline of one step, the bubble ratio and the peak activation memory
+of each stage, without launching any trial on the cluster.
+"""
+
+import json
+
+FORWARD = "forward"
+BACKWARD = "backward"
+BACKWARD_B = "backward_b"
+BACKWARD_W = "backward_w"
+
+SCHEDULE_MODES = ["FThenB", "1F1B", "VPP", "ZBH1"]
+
+_JOB_NAMES = {FORWARD: "F", BACKWARD: "B", BACKWARD_B: "B", BACKWARD_W: "W"}
+# the same colors as the profile records of PipelineParallel
+_JOB_COLORS = {
+    FORWARD: "thread_state_running",
+    BACKWARD: "rail_idle",
+    BACKWARD_B: "rail_idle",
+    BACKWARD_W: "rail_response",
+}
+
+__all__ = []
+
+
+def _1f1b_job_list(stage_id, num_stages, num_micro_batches, num_split=0):
+    # the backward of the first `num_split` micro batches is split into
+    # backward_b and backward_w, and the backward_w is deferred to the end
+    startup_steps = min(num_stages - stage_id - 1, num_micro_batches)
+    steady_steps = num_micro_batches - startup_steps
+
+    def backward(micro_batch_id):
+        if micro_batch_id < num_split:
+            return (BACKWARD_B, 0, micro_batch_id)
+        return (BACKWARD, 0, micro_batch_id)
+
+    job_list = [(FORWARD, 0, i) for i in range(startup_steps)]
+    for i in range(steady_steps):
+        job_list.append((FORWARD, 0, startup_steps + i))
+        job_list.append(backward(i))
+    for i in range(startup_steps):
+        job_list.append(backward(steady_steps + i))
+    for i in range(min(num_split, num_micro_batches)):
+        job_list.append((BACKWARD_W, 0, i))
+    return job_list
+
+
+def _interleave_job_list(stage_id, num_stages, num_micro_batches, vpp_degree):
+    first_chunk_acc = num_micro_batches % num_stages + num_stages
+    first_chunk_steps = first_chunk_acc * vpp_degree
+
+    def get_virtual_pp_rank(micro_step, forward):
+        if micro_step < first_chunk_steps:
+            virtual_pp_stage = micro_step // first_chunk_acc
+        else:
+            micro_step -= first_chunk_steps
+            virtual_pp_stage = micro_step % (num_stages * vpp_degree)
+            virtual_pp_stage = virtual_pp_stage // num_stages
+        if not forward:
+            virtual_pp_stage = vpp_degree - virtual_pp_stage - 1
+        return virtual_pp_stage
+
+    num_steps = num_micro_batches * vpp_degree
+    startup_steps = (num_stages - stage_id - 1) * 2
+    startup_steps += (vpp_degree - 1) * first_chunk_acc
+    startup_steps = min(startup_steps, num_steps)
+    steady_steps = num_steps - startup_steps
+
+    forward_counter = [0] * vpp_degree
+    backward_counter = [0] * vpp_degree
+
+    def forward(micro_step):
+        chunk_id = get_virtual_pp_rank(micro_step, forward=True)
+        forward_counter[chunk_id] += 1
+        return (FORWARD, chunk_id, forward_counter[chunk_id] - 1)
+
+    def backward(micro_step):
+        chunk_id = get_virtual_pp_rank(micro_step, forward=False)
+        backward_counter[chunk_id] += 1
+        return (BACKWARD, chunk_id, backward_counter[chunk_id] - 1)
+
+    job_list = [forward(i) for i in range(startup_steps)]
+    for i in range(steady_steps):
+        job_list.append(forward(startup_steps + i))
+        job_list.append(backward(i))
+    for i in range(steady_steps, num_steps):
+        job_list.append(backward(i))
+    return job_list
+
+
+def _fthenb_job_list(num_micro_batches, vpp_degree):
+    job_list = []
+    for chunk_id in range(vpp_degree):
+        for i in range(num_micro_batches):
+            job_list.append((FORWARD, chunk_id, i))
+    for chunk_id in reversed(range(vpp_degree)):
+        for i in range(num_micro_batches):
+            job_list.append((BACKWARD, chunk_id, i))
+    return job_list
+
+
+def get_job_list(
+    schedule_mode, stage_id, num_stages, num_micro_batches, vpp_degree=1
+):
+    """
+    Get the jobs run by a pipeline stage in one step.
+
+    Args:
+        schedule_mode (str): One of "FThenB", "1F1B", "VPP" (the interleaved
+            1F1B) and "ZBH1" (the zero bubble schedule ZB-H1).
+        stage_id (int): The id of the pipeline stage.
+        num_stages (int): The pipeline parallel degree.
+        num_micro_batches (int): The number of micro batches, i.e.
+            accumulate_steps.
+        vpp_degree (int, optional): The number of model chunks of each stage.
+            Only "FThenB" and "VPP" support vpp_degree > 1. Default: 1.
+
+    Returns:
+        list: The jobs in the order of running, each of them is a tuple of
+        (job_type, chunk_id, micro_batch_id). The job_type is "forward",
+        "backward", or "backward_b" and "backward_w" for the split backward.
+    """
+    assert (
+        schedule_mode in SCHEDULE_MODES
+    ), f"schedule_mode should be one of {SCHEDULE_MODES}, but got {schedule_mode}"
+    assert (
+        0 <= stage_id < num_stages
+    ), f"stage_id({stage_id}) should be in [0, {num_stages})"
+    assert (
+        num_micro_batches > 0
+    ), f"num_micro_batches({num_micro_batches}) should be positive"
+    assert vpp_degree > 0, f"vpp_degree({vpp_degree}) should be positive"
+
+    if schedule_mode == "FThenB":
+        return _fthenb_job_list(num_micro_batches, vpp_degree)
+
+    if schedule_mode == "VPP":
+        assert (
+            num_micro_batches >= num_stages
+        ), f"num_micro_batches({num_micro_batches}) should be greater than or equal to num_stages({num_stages}) for the interleaved schedule"
+        return _interleave_job_list(
+            stage_id, num_stages, num_micro_batches, vpp_degree
+        )
+
+    assert (
+        vpp_degree == 1
+    ), f"{schedule_mode} does not support vpp_degree({vpp_degree}) > 1"
+    num_split = stage_id if schedule_mode == "ZBH1" else 0
+    return _1f1b_job_list(stage_id, num_stages, num_micro_batches, num_split)
+
+
+class PipelineSimulator:
+    """
+    Simulate one step of a pipeline parallel schedule.
+
+    Each stage runs its jobs in order, and a job starts once the stage is
+    idle and the job it depends on is done: the forward of a micro batch
+    depends on the forward at the previous virtual stage, and the backward
+    depends on the backward at the next virtual stage. The p2p communication
+    between stages is modeled as a fixed latency `comm_time`, which does not
+    block the sender.
+
+    The costs are given for a whole stage, each of them is either a number
+    for all the stages or a list with one number per stage. With
+    vpp_degree > 1, the layers of a stage are evenly split into the model
+    chunks, so that a chunk costs 1 / vpp_degree of the stage.
+
+    Args:
+        num_stages (int): The pipeline parallel degree.
+        num_micro_batches (int): The number of micro batches.
+        schedule_mode (str, optional): One of "FThenB", "1F1B", "VPP" and
+            "ZBH1", see get_job_list. Default: "1F1B".
+        vpp_degree (int, optional): The number of model chunks of each stage.
+            Default: 1.
+        forward_time (float|list, optional): The forward time of one micro
+            batch. Default: 1.0.
+        backward_time (float|list, optional): The time to compute the input
+            gradients (B) of one micro batch. Default: 1.0.
+        weight_grad_time (float|list, optional): The time to compute the
+            weight gradients (W) of one micro batch. A backward job which is
+            not split costs backward_time + weight_grad_time. Default: 1.0.
+        activation_size (float|list, optional): The activation memory kept
+            by the forward of one micro batch, until its backward is done.
+            Default: 1.0.
+        comm_time (float, optional): The p2p latency between two stages.
+            Default: 0.0.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import os
+            >>> import tempfile
+            >>> from paddle.distributed.auto_tuner.pipeline_simulator import PipelineSimulator
+            >>> simulator = PipelineSimulator(4, 8, schedule_mode="1F1B")
+            >>> result = simulator.simulate()
+            >>> print(round(result.bubble_ratio, 4))
+            0.2727
+            >>> with tempfile.TemporaryDirectory() as path:
+            ...     trace = result.to_chrome_trace(
+            ...         os.path.join(path, "pipeline_profile.json")
+            ...     )
+            >>> print(len(trace["traceEvents"]))
+            64
+    """
+
+    def __init__(
+        self,
+        num_stages,
+        num_micro_batches,
+        schedule_mode="1F1B",
+        vpp_degree=1,
+        forward_time=1.0,
+        backward_time=1.0,
+        weight_grad_time=1.0,
+        activation_size=1.0,
+        comm_time=0.0,
+    ):
+        assert num_stages > 0, f"num_stages({num_stages}) should be positive"
+        self.num_stages = num_stages
+        self.num_micro_batches = num_micro_batches
+        self.schedule_mode = schedule_mode
+        self.vpp_degree = vpp_degree
+        self.forward_time = self._per_stage(forward_time, "forward_time")
+        self.backward_time = self._per_stage(backward_time, "backward_time")
+        self.weight_grad_time = self._per_stage(
+            weight_grad_time, "weight_grad_time"
+        )
+        self.activation_size = self._per_stage(
+            activation_size, "activation_size"
+        )
+        self.comm_time = comm_time
+        self.job_lists = [
+            get_job_list(
+                schedule_mode,
+                stage_id,
+                num_stages,
+                num_micro_batches,
+                vpp_degree,
+            )
+            for stage_id in range(num_stages)
+        ]
+
+    def _per_stage(self, value, name):
+        if isinstance(value, (list, tuple)):
+            assert (
+                len(value) == self.num_stages
+            ), f"{name} should have {self.num_stages} values, but got {len(value)}"
+            return [float(v) for v in value]
+        return [float(value)] * self.num_stages
+
+    def _job_time(self, job_type, stage_id):
+        if job_type == FORWARD:
+            cost = self.forward_time[stage_id]
+        elif job_type == BACKWARD:
+            cost = (
+                self.backward_time[stage_id] + self.weight_grad_time[stage_id]
+            )
+        elif job_type == BACKWARD_B:
+            cost = self.backward_time[stage_id]
+        else:
+            cost = self.weight_grad_time[stage_id]
+        return cost / self.vpp_degree
+
+    def _dependency(self, job_type, stage_id, chunk_id, micro_batch_id):
+        # returns the key of the job depended on and whether it is on
+        # another stage
+        virtual_stage = chunk_id * self.num_stages + stage_id
+        num_virtual_stages = self.num_stages * self.vpp_degree
+        if job_type == FORWARD:
+            if virtual_stage == 0:
+                return None, False
+            virtual_stage -= 1
+            job_type = FORWARD
+        elif job_type == BACKWARD_W:
+            return (BACKWARD, virtual_stage, micro_batch_id), False
+        elif virtual_stage == num_virtual_stages - 1:
+            return (FORWARD, virtual_stage, micro_batch_id), False
+        else:
+            virtual_stage += 1
+            job_type = BACKWARD
+        return (job_type, virtual_stage, micro_batch_id), True
+
+    def simulate(self):
+        """
+        Run the simulation.
+
+        Returns:
+            PipelineSimulationResult: The simulated step.
+        """
+        # the end time of the done jobs, the backward_b is recorded as the
+        # backward since its successors only need the input gradients
+        end_times = {}
+        stage_times = [0.0] * self.num_stages
+        positions = [0] * self.num_stages
+        timeline = [[] for _ in range(self.num_stages)]
+        num_jobs = sum(len(job_list) for job_list in self.job_lists)
+        num_done = 0
+
+        while num_done < num_jobs:
+            progress = False
+            for stage_id in range(self.num_stages):
+                job_list = self.job_lists[stage_id]
+                while positions[stage_id] < len(job_list):
+                    job_type, chunk_id, micro_batch_id = job_list[
+                        positions[stage_id]
+                    ]
+                    dependency, remote = self._dependency(
+                        job_type, stage_id, chunk_id, micro_batch_id
+                    )
+                    start = stage_times[stage_id]
+                    if dependency is not None:
+                        if dependency not in end_times:
+                            break
+                        ready = end_times[dependency]
+                        if remote:
+                            ready += self.comm_time
+                        start = max(start, ready)
+                    end = start + self._job_time(job_type, stage_id)
+
+                    virtual_stage = chunk_id * self.num_stages + stage_id
+                    key_type = BACKWARD if job_type == BACKWARD_B else job_type
+                    end_times[(key_type, virtual_stage, micro_batch_id)] = end
+                    stage_times[stage_id] = end
+                    timeline[stage_id].append(
+                        (job_type, chunk_id, micro_batch_id, start, end)
+                    )
+                    positions[stage_id] += 1
+                    num_done += 1
+                    progress = True
+            if not progress:
+                blocked = {
+                    stage_id: self.job_lists[stage_id][positions[stage_id]]
+                    for stage_id in range(self.num_stages)
+                    if positions[stage_id] < len(self.job_lists[stage_id])
+                }
+                raise RuntimeError(
+                    f"The {self.schedule_mode} schedule is deadlocked, the blocked jobs of the stages are {blocked}"
+                )
+
+        return PipelineSimulationResult(
+            timeline, self._peak_memory(), self.vpp_degree
+        )
+
+    def _peak_memory(self):
+        peak_memory = []
+        for stage_id, job_list in enumerate(self.job_lists):
+            size = self.activation_size[stage_id] / self.vpp_degree
+            memory = 0.0
+            peak = 0.0
+            for job_type, _, _ in job_list:
+                if job_type == FORWARD:
+                    memory += size
+                    peak = max(peak, memory)
+                elif job_type in [BACKWARD, BACKWARD_W]:
+                    # the split backward keeps the activations for backward_w
+                    memory -= size
+            peak_memory.append(peak)
+        return peak_memory
+
+
+class PipelineSimulationResult:
+    """
+    The result of PipelineSimulator.simulate.
+
+    Attributes:
+        timeline (list): The jobs run by each stage, each of them is a tuple
+            of (job_type, chunk_id, micro_batch_id, start_time, end_time).
+        step_time (float): The time of the step.
+        bubble_ratio (float): The ratio of the idle time of all the stages
+            in the step.
+        peak_memory (list): The peak activation memory of each stage.
+    """
+
+    def __init__(self, timeline, peak_memory, vpp_degree=1):
+        self.timeline = timeline
+        self.peak_memory = peak_memory
+        self._vpp_degree = vpp_degree
+        self.step_time = max(
+            (jobs[-1][-1] for jobs in timeline if jobs), default=0.0
+        )
+        busy_time = sum(
+            end - start for jobs in timeline for *_, start, end in jobs
+        )
+        total_time = self.step_time * len(timeline)
+        self.bubble_ratio = (
+            1.0 - busy_time / total_time if total_time > 0 else 0.0
+        )
+
+    def to_chrome_trace(self, path=None):
+        """
+        Export the timeline in the Chrome trace format, in the same style as
+        the profile records of PipelineParallel. The time is taken as
+        milliseconds.
+
+        Args:
+            path (str, optional): The json file to write. Default: None.
+
+        Returns:
+            dict: The Chrome trace.
+        """
+        events = []
+        for stage_id, jobs in enumerate(self.timeline):
+            for job_type, chunk_id, micro_batch_id, start, end in jobs:
+                name = f"{_JOB_NAMES[job_type]}{micro_batch_id}"
+                if self._vpp_degree > 1:
+                    name += f"_VP{chunk_id}"
+                events.append(
+                    {
+                        "name": name,
+                        "cat": "pipeline timeline",
+                        "ph": "X",
+                        "pid": 0,
+                        "tid": stage_id + 1,
+                        "ts": start * 1000,
+                        "dur": (end - start) * 1000,
+                        "cname": _JOB_COLORS[job_type],
+                    }
+                )
+        trace = {"traceEvents": events}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
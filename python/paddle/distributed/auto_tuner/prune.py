@@ -17,6 +17,8 @@ import logging
 import os
 import subprocess
 
+from .pipeline_simulator import PipelineSimulator
+
 logger = logging.getLogger('auto_tuner')
 _PRUNE_FUNC = []
 _PRUNE_HISTORY_FUNC = []
@@ -303,6 +305,112 @@ def prune_by_vpp_history(tuner_cfg, cur_cfg, history_cfgs=[], pruned_cfgs=[]):
     return False
 
 
+def _get_pipeline_schedule_mode(
+    schedule_mode, pp_degree, vpp_degree, acc_steps
+):
+    # the schedule run by fleet.distributed_model for the candidate, the
+    # model chunks are always interleaved with vpp_degree > 1
+    if vpp_degree > 1:
+        return "VPP" if acc_steps >= 2 * pp_degree else "FThenB"
+    if schedule_mode in ["FThenB", "ZBH1"]:
+        return schedule_mode
+    return "1F1B"
+
+
+def _get_pipeline_stage_costs(pipeline_cost, num_layers, pp_degree, vpp_degree):
+    """
+    Get the costs of the stages for PipelineSimulator. A cost given as a
+    list has either one value per stage or one value per layer, the layers
+    are evenly split into pp_degree * vpp_degree model chunks, and chunk i
+    is placed on stage i % pp_degree. Returns None if a list matches
+    neither.
+    """
+    stage_costs = {}
+    for name, value in pipeline_cost.items():
+        if not isinstance(value, (list, tuple)) or len(value) == pp_degree:
+            stage_costs[name] = value
+            continue
+        num_chunks = pp_degree * vpp_degree
+        if len(value) != num_layers or num_layers % num_chunks != 0:
+            return None
+        layers_per_chunk = num_layers // num_chunks
+        stage_cost = [0.0] * pp_degree
+        for i in range(num_chunks):
+            chunk = value[i * layers_per_chunk : (i + 1) * layers_per_chunk]
+            stage_cost[i % pp_degree] += sum(chunk)
+        stage_costs[name] = stage_cost
+    return stage_costs
+
+
+@register_prune
+def prune_by_pipeline_simulation(tuner_cfg, cur_cfg, history_cfgs=[]):
+    """
+    Prune by the pipeline schedule simulated offline, it works only when
+    max_bubble_ratio is set. The costs are read from pipeline_cost in
+    tuner_cfg, see PipelineSimulator, and a list of costs has one value
+    either per stage or per layer of model_cfg num_layers. The schedule is
+    the one run for the candidate: pipeline_schedule_mode ("1F1B" by
+    default, "FThenB" or "ZBH1") with vpp_degree 1, or the interleaved
+    schedule with vpp_degree > 1. The rule is:
+    1. The simulated bubble ratio should not exceed max_bubble_ratio.
+    """
+    max_bubble_ratio = tuner_cfg.get("max_bubble_ratio", None)
+    pp_degree = cur_cfg.get("pp_degree", None)
+    vpp_degree = cur_cfg.get("vpp_degree", None) or 1
+    if max_bubble_ratio is None or pp_degree is None or pp_degree == 1:
+        return False
+
+    global_batch_size = (
+        cur_cfg["global_batch_size"]
+        if "global_batch_size" in cur_cfg
+        else tuner_cfg["model_cfg"].get("global_batch_size", None)
+    )
+    if not global_batch_size or global_batch_size == "auto":
+        return False
+    acc_steps = (
+        global_batch_size
+        // cur_cfg["dp_degree"]
+        // cur_cfg["sharding_degree"]
+        // cur_cfg["micro_batch_size"]
+    )
+    # invalid acc_steps are pruned by prune_by_mbs
+    if acc_steps < pp_degree:
+        return False
+
+    schedule_mode = _get_pipeline_schedule_mode(
+        tuner_cfg.get("pipeline_schedule_mode", "1F1B"),
+        pp_degree,
+        vpp_degree,
+        acc_steps,
+    )
+    stage_costs = _get_pipeline_stage_costs(
+        tuner_cfg.get("pipeline_cost", {}),
+        tuner_cfg["model_cfg"].get("num_layers", None),
+        pp_degree,
+        vpp_degree,
+    )
+    if stage_costs is None:
+        logger.warning(
+            f"Skip the pipeline simulation of pp_degree {pp_degree} and vpp_degree {vpp_degree}, because the costs in pipeline_cost have neither {pp_degree} values nor one value per layer of {pp_degree * vpp_degree} even model chunks."
+        )
+        return False
+
+    simulator = PipelineSimulator(
+        pp_degree,
+        acc_steps,
+        schedule_mode=schedule_mode,
+        vpp_degree=vpp_degree,
+        **stage_costs,
+    )
+    bubble_ratio = simulator.simulate().bubble_ratio
+    if bubble_ratio > max_bubble_ratio:
+        pruned_reason = f"the simulated bubble ratio {bubble_ratio:.4f} of the {schedule_mode} schedule exceeds max_bubble_ratio {max_bubble_ratio}."
+        log_pruned_info(cur_cfg, pruned_reason, tuner_cfg)
+        return True
+
+    return False
+
+
 @register_prune
 def prune_by_mbs(tuner_cfg, cur_cfg, history_cfgs=[]):
     """
@@ -1681,6 +1681,11 @@ class DistributedStrategy:
 
             **micro_batch_size**: the number of small batches in each user defined batch
 
+            **schedule_mode**: the pipeline schedule. In dynamic graph mode without virtual
+            pipeline stages, "ZBH1" selects the zero bubble schedule, which defers the weight
+            gradients of ZeroBubbleLinear layers to fill the pipeline bubbles, other values
+            select 1F1B. Default "1F1B".
+
         Examples:
             .. code-block:: python
 
@@ -28,6 +28,11 @@ from .pipeline_parallel import (  # noqa: F401
     PipelineParallel,
     PipelineParallelWithInterleave,
     PipelineParallelWithInterleaveFthenB,
+    PipelineParallelZeroBubble,
+)
+from .pp_utils.zero_bubble_utils import (  # noqa: F401
+    WeightGradStore,
+    ZeroBubbleLinear,
 )
 from .segment_parallel import SegmentParallel  # noqa: F401
 from .sharding_parallel import ShardingParallel  # noqa: F401
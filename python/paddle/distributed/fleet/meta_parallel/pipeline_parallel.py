@@ -31,6 +31,7 @@ from ..utils.hybrid_parallel_util import (
 from ..utils.log_util import logger
 from .meta_parallel_base import MetaParallelBase
 from .parallel_layers.pp_layers import PipelineLayer
+from .pp_utils.zero_bubble_utils import WeightGradStore
 
 _use_four_directions = os.environ.get(
     'PADDLE_USE_FOUR_DIRECTIONS_P2P', paddle.base.core.is_compiled_with_xpu()
@@ -45,6 +46,7 @@ from paddle.distributed.fleet.utils.tensor_fusion_helper import (
     HOOK_ACTION,
     FusedCommBuffer,
     assign_group_by_size,
+    get_ramp_group_sizes,
 )
 
 __all__ = []
@@ -210,6 +212,9 @@ class PipelineParallel(MetaParallelBase):
         self._release_gradients = self._strategy.hybrid_configs[
             "pp_configs"
         ].release_gradients
+        self._rebuild_comm_buckets = self._strategy.hybrid_configs[
+            "pp_configs"
+        ].rebuild_comm_buckets
 
         self._sharding_split_param = self._strategy.hybrid_configs[
             "sharding_configs"
@@ -274,9 +279,14 @@ class PipelineParallel(MetaParallelBase):
         ), "Cannot use dp pp overlap and sharding pp overlap at the same time."
 
         self._chunk_2_comm_buffers = defaultdict(list)
+        self._param_2_comm_buffer = {}
         self._comm_overlap = (
             self._dp_comm_overlap or self._sharding_comm_overlap
         )
+        # param name -> the order its gradient gets ready in the first step,
+        # recorded to rebuild the comm buffers
+        self._grad_ready_order = None
+        self._comm_buffer_args = None
 
         if self._enable_timer:
             if not timer.is_timer_initialized():
@@ -348,7 +358,13 @@ class PipelineParallel(MetaParallelBase):
         self._virtual_pp_rank = rank
 
     def fused_gradient(
-        self, model, comm_group, acc_steps, dp, group_size=128 * 1024 * 1024
+        self,
+        model,
+        comm_group,
+        acc_steps,
+        dp,
+        group_size=128 * 1024 * 1024,
+        grad_ready_order=None,
     ):
         if model.get_num_virtual_stages() > 1:
             models = model.get_model_chunks()
@@ -390,7 +406,22 @@ class PipelineParallel(MetaParallelBase):
                 if act == HOOK_ACTION.REDUCE:
                     # parse the relative dst rank to absolute dst rank for sharding
                     dst = comm_group.ranks[dst]
-                var_groups = assign_group_by_size(parameter_list, group_size)
+                if grad_ready_order is not None:
+                    # group the params by the order their gradients get
+                    # ready, the params without gradients are put last
+                    parameter_list = sorted(
+                        parameter_list,
+                        key=lambda p: grad_ready_order.get(
+                            p.name, len(grad_ready_order)
+                        ),
+                    )
+                    var_groups = assign_group_by_size(
+                        parameter_list, get_ramp_group_sizes(group_size)
+                    )
+                else:
+                    var_groups = assign_group_by_size(
+                        parameter_list, group_size
+                    )
 
                 for group_idx, parameters in var_groups.items():
                     buffer = FusedCommBuffer(
@@ -403,13 +434,77 @@ class PipelineParallel(MetaParallelBase):
                         release_grads=self._release_gradients,
                     )
                     self._chunk_2_comm_buffers[chunk_idx].append(buffer)
+                    for param in parameters:
+                        self._param_2_comm_buffer[param.name] = buffer
 
         return self._chunk_2_comm_buffers
 
-    def bw_hook_func(self, buffer, param):
+    def _rebuild_comm_buffers(self):
+        """
+        Rebuild the comm buffers by the order the gradients got ready in the
+        first step, so that the buffers get ready one by one in backward. It's
+        called after the gradients are cleared, as the gradients are not
+        copied to the new buffers.
+        """
+        grad_ready_order = self._grad_ready_order
+        self._grad_ready_order = None
+        self._rebuild_comm_buckets = False
+        if self._sharding_split_param:
+            # the sharding optimizer holds the views of the buffers
+            logger.warning(
+                "rebuild_comm_buckets is not supported with sharding split_param, skip rebuilding."
+            )
+            return
+        self._chunk_2_comm_buffers = defaultdict(list)
+        self._param_2_comm_buffer = {}
+        self.fused_gradient(
+            *self._comm_buffer_args, grad_ready_order=grad_ready_order
+        )
+        logger.info(
+            f"rebuild comm buffers: {[len(b) for b in self._chunk_2_comm_buffers.values()]}"
+        )
+
+    def comm_buffer_stats(self):
+        """
+        The stats of the dp/sharding comm buffers in the last step, see
+        FusedCommBuffer.comm_stats, where the timestamps are relative to the
+        first gradient added to the buffers.
+
+        Returns:
+            Dict[int, List[dict]]: the stats of the buffers of each chunk.
+        """
+        stats = {
+            chunk_idx: [buffer.comm_stats for buffer in buffers]
+            for chunk_idx, buffers in self._chunk_2_comm_buffers.items()
+        }
+        start_times = [
+            s["first_ready_time"]
+            for chunk_stats in stats.values()
+            for s in chunk_stats
+            if s is not None and "first_ready_time" in s
+        ]
+        if not start_times:
+            return stats
+        start_time = min(start_times)
+        for chunk_stats in stats.values():
+            for i, s in enumerate(chunk_stats):
+                if s is None:
+                    continue
+                chunk_stats[i] = {
+                    k: (v - start_time if k.endswith("_time") else v)
+                    for k, v in s.items()
+                }
+        return stats
+
+    def bw_hook_func(self, param):
         @paddle.autograd.no_grad()
         def fused_allreduce(*_):
-            buffer.add_grad(param)
+            if self._grad_ready_order is not None:
+                self._grad_ready_order.setdefault(
+                    param.name, len(self._grad_ready_order)
+                )
+            # look up the buffer, since the buffers can be rebuilt
+            self._param_2_comm_buffer[param.name].add_grad(param)
 
         return fused_allreduce
 
@@ -417,13 +512,14 @@ class PipelineParallel(MetaParallelBase):
         self, model, comm_group, acc_steps, dp, group_size=128 * 1024 * 1024
     ):
         # register hook
+        self._comm_buffer_args = (model, comm_group, acc_steps, dp, group_size)
+        if self._rebuild_comm_buckets:
+            self._grad_ready_order = {}
         self.fused_gradient(model, comm_group, acc_steps, dp, group_size)
         for _, buffers in self._chunk_2_comm_buffers.items():
             for buffer in buffers:
                 for param in buffer._params:
-                    param._register_backward_hook(
-                        self.bw_hook_func(buffer, param)
-                    )
+                    param._register_backward_hook(self.bw_hook_func(param))
 
     def timer_printer(self):
         if not self._enable_timer:
@@ -612,6 +708,7 @@ class PipelineParallel(MetaParallelBase):
         if static_scheduler:
             return schedule
 
+        self._run_deferred_backward()
         self._flush_records()
 
         if self._comm_overlap:
@@ -886,6 +983,11 @@ class PipelineParallel(MetaParallelBase):
                 self.timers("backward_step").stop()
             return input_tensor_grad
 
+    def _run_deferred_backward(self):
+        # run the backward computations deferred by the schedule after the
+        # backward steps of all micro batches, nothing to do for 1F1B
+        pass
+
     def _check_micro_batch_data_valid(self, micro_batch_data):
         if isinstance(micro_batch_data, (tuple, list)):
             for data in micro_batch_data:
@@ -983,6 +1085,9 @@ class PipelineParallel(MetaParallelBase):
         else:
             self.optimizer.clear_grad()
 
+        if self._rebuild_comm_buckets and self._grad_ready_order:
+            self._rebuild_comm_buffers()
+
         if self.lr_scheduler:
             self.lr_scheduler.step()
 
@@ -1007,6 +1112,77 @@ class PipelineParallel(MetaParallelBase):
         return self.forward_backward_pipeline(data=None, static_scheduler=True)
 
 
+class PipelineParallelZeroBubble(PipelineParallel):
+    """
+    Zero bubble pipeline schedule (ZB-H1), which splits the backward of a
+    micro batch into the input gradient part (B) and the weight gradient
+    part (W). Only B is on the critical path of the pipeline, so that the
+    W of the first `stage_id` micro batches is deferred to the end of the
+    schedule, to fill the bubbles of the cooldown phase. It keeps the order
+    of forward and backward steps of 1F1B, but not its peak memory: the
+    deferred W keeps the inputs and output gradients of the split layers of
+    those micro batches alive until the end of the step, so that every stage
+    holds about as many activations as the first one, e.g. 4/4/4/4 micro
+    batches against 4/3/2/1 of 1F1B with 4 stages.
+
+    The weight gradients are deferred by the layers which support to split
+    the backward, e.g. ZeroBubbleLinear, see WeightGradStore. The backward
+    of other layers is computed as a whole in B.
+    """
+
+    def __init__(self, layers, hcg, strategy):
+        super().__init__(layers, hcg, strategy)
+        # the deferred weight gradients do not trigger the hooks of comm
+        # buffers on time
+        assert (
+            not self._comm_overlap
+        ), "dp_comm_overlap and sharding_comm_overlap are not supported by the zero bubble pipeline schedule"
+        self._w_color = "rail_response"
+        self._backward_micro_step = 0
+
+    def forward_backward_pipeline(
+        self,
+        data,
+        scaler=None,
+        static_scheduler=False,
+        return_micro_batch_loss=False,
+    ):
+        self._backward_micro_step = 0
+        WeightGradStore.clear()
+        return super().forward_backward_pipeline(
+            data,
+            scaler=scaler,
+            static_scheduler=static_scheduler,
+            return_micro_batch_loss=return_micro_batch_loss,
+        )
+
+    def _backward_step(self, input_tensor, output_tensor, output_tensor_grad):
+        micro_step = self._backward_micro_step
+        self._backward_micro_step += 1
+        if micro_step >= self.stage_id:
+            return super()._backward_step(
+                input_tensor, output_tensor, output_tensor_grad
+            )
+
+        WeightGradStore.enabled = True
+        try:
+            input_tensor_grad = super()._backward_step(
+                input_tensor, output_tensor, output_tensor_grad
+            )
+        finally:
+            WeightGradStore.enabled = False
+        WeightGradStore.flush()
+        return input_tensor_grad
+
+    def _run_deferred_backward(self):
+        micro_step = 0
+        while WeightGradStore.size() > 0:
+            self._record_stamp("W", micro_step, '"B"', self._w_color)
+            WeightGradStore.pop()
+            self._record_stamp("W", micro_step, '"E"', self._w_color)
+            micro_step += 1
+
+
 class PipelineParallelWithInterleave(PipelineParallel):
     # pipeline parallel with interleave scheduler
 
@@ -1203,17 +1379,22 @@ class PipelineParallelWithInterleave(PipelineParallel):
 
         return input_tensor_grad
 
-    def bw_hook_func(self, buffer, param):
+    def bw_hook_func(self, param):
         # For pipeline with interleave, we need to add grad to buffer without communication.
         # Use communication where appropriate to avoid dp communication and pp scheduling conflicts.
         # all reduce hook
         @paddle.autograd.no_grad()
         def fused_allreduce(*_):
-            buffer.add_grad(param, use_comm=False)
+            self._param_2_comm_buffer[param.name].add_grad(
+                param, use_comm=False
+            )
 
         return fused_allreduce
 
     def register_allreduce_overlap_hook(self, model, comm_group, acc_steps, dp):
+        # each chunk has one buffer, whose comm is launched by the schedule,
+        # so there is nothing to rebuild
+        self._rebuild_comm_buckets = False
         super().register_allreduce_overlap_hook(
             model, comm_group, acc_steps, dp, group_size=sys.maxsize
         )
@@ -0,0 +1,143 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+import paddle
+from paddle import nn
+from paddle.autograd import PyLayer
+
+__all__ = []
+
+
+class WeightGradStore:
+    """
+    Store of the weight gradient computations deferred by the zero bubble
+    pipeline schedule, which splits the backward of a micro batch into the
+    input gradient part (B) and the weight gradient part (W).
+
+    While enabled, the layers supporting the split, e.g. ZeroBubbleLinear,
+    only compute the input gradients in backward, and put the computations
+    of the weight gradients into the store. `flush` packs the computations
+    of one micro batch, and `pop` runs the oldest pack.
+    """
+
+    enabled = False
+    cache = []
+    funcs_queue = collections.deque()
+
+    @classmethod
+    def put(cls, func):
+        cls.cache.append(func)
+
+    @classmethod
+    def flush(cls):
+        cls.funcs_queue.append(cls.cache)
+        cls.cache = []
+
+    @classmethod
+    def pop(cls):
+        assert len(cls.funcs_queue) > 0, "no weight gradients to compute"
+        for func in cls.funcs_queue.popleft():
+            func()
+
+    @classmethod
+    def size(cls):
+        return len(cls.funcs_queue)
+
+    @classmethod
+    def clear(cls):
+        cls.enabled = False
+        cls.cache = []
+        cls.funcs_queue.clear()
+
+
+def _accumulate_grad(param, grad):
+    if hasattr(param, "main_grad"):
+        grad = paddle.cast(grad, paddle.float32)
+        if param.main_grad is None:
+            param.main_grad = grad
+        else:
+            param.main_grad.add_(grad)
+    else:
+        grad = paddle.cast(grad, param.dtype)
+        if param.grad is None:
+            param.grad = grad
+        else:
+            param.grad.add_(grad)
+
+
+class _SplitBackwardLinear(PyLayer):
+    @staticmethod
+    def forward(ctx, x, weight, bias):
+        ctx.save_for_backward(x, weight, bias)
+        return paddle._C_ops.linear(x, weight, bias)
+
+    @staticmethod
+    def backward(ctx, dy):
+        x, weight, bias = ctx.saved_tensor()
+        # under auto_cast, the inputs are cast inside _C_ops.linear, so that
+        # the saved inputs may differ from the dtype of dy, and the backward
+        # runs out of auto_cast
+        if dy.dtype == weight.dtype:
+            dx = paddle.matmul(dy, weight, transpose_y=True)
+        else:
+            dx = paddle.matmul(
+                dy, paddle.cast(weight, dtype=dy.dtype), transpose_y=True
+            )
+        if dx.dtype != x.dtype:
+            dx = paddle.cast(dx, x.dtype)
+
+        def weight_grad():
+            x_2d = x.reshape([-1, x.shape[-1]])
+            if x_2d.dtype != dy.dtype:
+                x_2d = paddle.cast(x_2d, dy.dtype)
+            dy_2d = dy.reshape([-1, dy.shape[-1]])
+            dw = paddle.matmul(x_2d, dy_2d, transpose_x=True)
+            db = None if bias is None else paddle.sum(dy_2d, axis=0)
+            return dw, db
+
+        if WeightGradStore.enabled:
+
+            def accumulate():
+                dw, db = weight_grad()
+                if not weight.stop_gradient:
+                    _accumulate_grad(weight, dw)
+                if bias is not None and not bias.stop_gradient:
+                    _accumulate_grad(bias, db)
+
+            WeightGradStore.put(accumulate)
+            dw, db = None, None
+        else:
+            dw, db = weight_grad()
+            dw = None if weight.stop_gradient else paddle.cast(dw, weight.dtype)
+            if bias is not None and not bias.stop_gradient:
+                db = paddle.cast(db, bias.dtype)
+            else:
+                db = None
+
+        if bias is None:
+            return dx, dw
+        return dx, dw, db
+
+
+class ZeroBubbleLinear(nn.Linear):
+    """
+    Linear layer whose weight gradients can be deferred by the zero bubble
+    pipeline schedule, see WeightGradStore. It is the same as nn.Linear
+    out of the schedule.
+    """
+
+    def forward(self, input):
+        return _SplitBackwardLinear.apply(input, self.weight, self.bias)
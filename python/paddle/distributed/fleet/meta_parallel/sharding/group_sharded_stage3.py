@@ -89,6 +89,14 @@ class GroupShardedStage3(nn.Layer):
     .. warning: GroupShardedStage3 encapsulates the layer strategy and integrates it into the nn.Layer.
 
     .. ZeRO: https://arxiv.org/pdf/1910.02054.pdf.
+
+    The layers' execution order is recorded in the first step. Then the full
+    parameters of the next `prefetch_layers` layers are all-gathered ahead,
+    in the forward order in forward and in the reverse order in backward.
+    The prefetched parameters in flight are limited by `prefetch_buffer_size`
+    bytes. With `reuse_params`, the full parameters of the first
+    `prefetch_layers` layers gathered in backward are kept for the forward
+    of the next micro batch, until the optimizer updates the slices.
     """
 
     # TODO (Baibaifan)
@@ -111,6 +119,9 @@ class GroupShardedStage3(nn.Layer):
         sync_comm=False,
         dp_group=None,
         exclude_layer=None,
+        prefetch_layers=1,
+        prefetch_buffer_size=None,
+        reuse_params=False,
     ):
         super().__init__()
 
@@ -138,6 +149,11 @@ class GroupShardedStage3(nn.Layer):
         assert segment_size >= 0, "segment_size must be GE than 0."
         self._segment_size = segment_size
 
+        assert prefetch_layers >= 1, "prefetch_layers must be GE than 1."
+        assert not (
+            reuse_params and offload
+        ), "reuse_params is not supported with offload."
+
         global DEV
         DEV = (
             "cpu"
@@ -229,7 +245,11 @@ class GroupShardedStage3(nn.Layer):
         self._order_tracer["layer"] = []
 
         # Register task flow
-        self._task_flow = TaskFlow()
+        self._task_flow = TaskFlow(
+            prefetch_layers=prefetch_layers,
+            prefetch_buffer_size=prefetch_buffer_size,
+            reuse_params=reuse_params,
+        )
 
         # Register forward hooks
         self._register_forward_hooks(self._layer)
@@ -271,6 +291,7 @@ class GroupShardedStage3(nn.Layer):
 
     def _clear_gradients(self):
         assert len(self._trainable_params.keys()) > 0
+        self._release_prefetched_params()
         current_layer_params = self._layer.parameters(include_sublayers=True)
         # 1.Handle param's slice
         trainable_params = list(
@@ -330,6 +351,7 @@ class GroupShardedStage3(nn.Layer):
 
     # Update param memory slice
     def _update_params_slice(self):
+        self._release_prefetched_params()
         update_list = self._update_params()
 
         if not isinstance(self._optim._param_groups[0], dict):
@@ -784,24 +806,48 @@ class GroupShardedStage3(nn.Layer):
             if param.name in self._task_flow.full_param.keys():
                 if param.status == "all":
                     param.use_count = 0
-                    param._clear_data()
-                    start, end = self._param2buffer[param.name][self._rank]
-                    param.fw_storage = (
-                        self._task_flow.full_param[param.name][0]
-                        ._slice(start, end)
-                        .detach()
-                        .clone()
-                    )
-                    param.status = "part"
-                    del self._task_flow.full_param[param.name]
-
-                    if self._offload:
-                        # revert back to cpu for offload update
-                        param.fw_storage._clear_data()
-                        param.master_weight._share_buffer_to(param.fw_storage)
+                    # the reused params are kept for the next micro batch
+                    if param.name not in self._task_flow.reused_params:
+                        self._release_full_param(param)
 
         return allreduce_
 
+    def _release_full_param(self, param):
+        param._clear_data()
+        start, end = self._param2buffer[param.name][self._rank]
+        param.fw_storage = (
+            self._task_flow.full_param[param.name][0]
+            ._slice(start, end)
+            .detach()
+            .clone()
+        )
+        param.status = "part"
+        del self._task_flow.full_param[param.name]
+
+        if self._offload:
+            # revert back to cpu for offload update
+            param.fw_storage._clear_data()
+            param.master_weight._share_buffer_to(param.fw_storage)
+
+    @paddle.autograd.no_grad()
+    def _release_prefetched_params(self):
+        """
+        Release the reused full params and drop the prefetched params in
+        flight, which are stale once the param slices are updated.
+        """
+        task_flow = self._task_flow
+        if not task_flow.reused_params and not task_flow.prefetched:
+            return
+        for param in self._layer.parameters(include_sublayers=True):
+            if param.name in task_flow.reused_params:
+                self._release_full_param(param)
+            elif param.name in task_flow.prefetched:
+                _, task = task_flow.full_param.pop(param.name)
+                task.wait()
+        task_flow.reused_params.clear()
+        task_flow.prefetched.clear()
+        task_flow.prefetched_layers.clear()
+
     def _param2align(self, param):
         # CUDA alignment 256 bytes
         size = param._numel() * align[param.dtype]
@@ -866,6 +912,10 @@ def ForwardPreHooks(
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
     else:
+        order_ = order_tracer[layer_id]
+        if order_ == 0:
+            # a new forward pass
+            task_flow.prefetched_layers.clear()
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
         # wait current layer params
@@ -877,11 +927,23 @@ def ForwardPreHooks(
             use_calc,
             offload,
         )
+        task_flow.prefetched_layers.discard(layer_id)
+        task_flow.reused_params.difference_update(
+            param.name for param in trainable_params[layer_id]
+        )
 
-        if layer_id == order_tracer["layer"][-1]:
-            return
-        order_ = order_tracer[layer_id]
-        layer_id = order_tracer["layer"][order_ + 1]
+        # prefetch the next layers
+        _prefetch_layers(
+            order_tracer["layer"][
+                order_ + 1 : order_ + 1 + task_flow.prefetch_layers
+            ],
+            trainable_params,
+            group,
+            param2buffer_size,
+            task_flow,
+            offload,
+        )
+        return
 
     _allgather_buffer(
         trainable_params[layer_id],
@@ -971,23 +1033,39 @@ class ForwardPostHooks(PyLayer):
                 offload,
             )
 
+        task_flow.prefetched_layers.discard(layer_id)
+
         # Create params's grad
         _create_params_grad(
             trainable_params[layer_id], param2buffer_size, task_flow
         )
 
+        order_ = order_tracer[layer_id]
+        if (
+            task_flow.reuse_params
+            and not sync_comm
+            and order_ < task_flow.prefetch_layers
+        ):
+            # keep the full params for the forward of the next micro batch
+            task_flow.reused_params.update(
+                param.name
+                for param in trainable_params[layer_id]
+                if param.trainable
+            )
+
         # Whether to use calc stream
         task_flow.use_calc[layer_id] = use_calc
         if layer_id != order_tracer["layer"][0] and not sync_comm:
-            layer_next_id = order_tracer["layer"][order_tracer[layer_id] - 1]
-            _allgather_buffer(
-                trainable_params[layer_next_id],
+            # prefetch the previous layers in the reverse order
+            _prefetch_layers(
+                order_tracer["layer"][
+                    max(order_ - task_flow.prefetch_layers, 0) : order_
+                ][::-1],
+                trainable_params,
                 group,
-                param2buffer_size=param2buffer_size,
-                use_calc_stream=use_calc,
-                task_flow=task_flow,
-                sync_wait=sync_wait,
-                offload=offload,
+                param2buffer_size,
+                task_flow,
+                offload,
             )
 
         return args
@@ -1004,11 +1082,23 @@ class TaskFlow:
         full_grad={},
         use_calc={},
         callback=None,
+        prefetch_layers=1,
+        prefetch_buffer_size=None,
+        reuse_params=False,
     ):
         self.full_param = full_param
         self.full_grad = full_grad
         self.use_calc = use_calc
         self.callback = callback
+        self.prefetch_layers = prefetch_layers
+        self.prefetch_buffer_size = prefetch_buffer_size
+        self.reuse_params = reuse_params
+        # {param.name: bytes} of the prefetched params in flight
+        self.prefetched = {}
+        # the layers prefetched and not run yet
+        self.prefetched_layers = set()
+        # the params kept all-gathered from the last backward
+        self.reused_params = set()
 
 
 def _release_param(
@@ -1055,6 +1145,7 @@ def _wait_layer(
             param.fw_storage = None
             param.status = "all"
             param.use_count += 1
+            task_flow.prefetched.pop(param.name, None)
         else:
             _allgather_buffer(
                 trainable_params,
@@ -1114,10 +1205,66 @@ def _allgather_buffer(
                 param.fw_storage = None
                 param.status = "all"
                 param.use_count += 1
+                task_flow.prefetched.pop(param.name, None)
         task_flow.full_param[param.name] = (full_param, task)
     return task_flow
 
 
+def _prefetch_layers(
+    layer_ids,
+    trainable_params,
+    group,
+    param2buffer_size,
+    task_flow,
+    offload=False,
+):
+    """
+    All-gather the params of the layers asynchronously in order, until the
+    params in flight exceed the prefetch_buffer_size of the task flow.
+    """
+    for layer_id in layer_ids:
+        if layer_id in task_flow.prefetched_layers:
+            continue
+        params = []
+        prefetch_size = {}
+        for param in trainable_params[layer_id]:
+            if param.name in task_flow.reused_params:
+                continue
+            if param.status != "all" and param.name in task_flow.full_param:
+                # the param shared with another layer is in flight
+                continue
+            params.append(param)
+            if param.status != "all":
+                prefetch_size[param.name] = (
+                    param2buffer_size[param.name] * param.element_size()
+                )
+
+        buffer_size = task_flow.prefetch_buffer_size
+        if (
+            buffer_size is not None
+            and task_flow.prefetched
+            and sum(task_flow.prefetched.values()) + sum(prefetch_size.values())
+            > buffer_size
+        ):
+            break
+
+        # the reused params are all-gathered already
+        task_flow.reused_params.difference_update(
+            param.name for param in trainable_params[layer_id]
+        )
+        _allgather_buffer(
+            params,
+            group,
+            param2buffer_size=param2buffer_size,
+            use_calc_stream=False,
+            task_flow=task_flow,
+            sync_wait=False,
+            offload=offload,
+        )
+        task_flow.prefetched.update(prefetch_size)
+        task_flow.prefetched_layers.add(layer_id)
+
+
 @paddle.autograd.no_grad()
 def _create_params_grad(trainable_params, param2buffer_size, task_flow):
     for param in trainable_params:
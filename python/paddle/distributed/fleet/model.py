@@ -21,6 +21,7 @@ from .meta_parallel import (
     PipelineParallel,
     PipelineParallelWithInterleave,
     PipelineParallelWithInterleaveFthenB,
+    PipelineParallelZeroBubble,
     SegmentParallel,
     ShardingParallel,
     TensorParallel,
@@ -156,8 +157,16 @@ def distributed_model(model):
             model, PipelineLayer
         ), "For pipeline parallel, the model should an instance of PipelineLayer"
         if model.get_num_virtual_stages() == 1:
-            # 1f1b pipeline
-            model = PipelineParallel(model, fleet_env._hcg, strategy=strategy)
+            if strategy.pipeline_configs['schedule_mode'] == "ZBH1":
+                # zero bubble pipeline
+                model = PipelineParallelZeroBubble(
+                    model, fleet_env._hcg, strategy=strategy
+                )
+            else:
+                # 1f1b pipeline
+                model = PipelineParallel(
+                    model, fleet_env._hcg, strategy=strategy
+                )
         else:
             accumulate_steps = strategy.pipeline_configs['accumulate_steps']
             pp_degree = fleet_env._hcg.get_pipe_parallel_world_size()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .offload import ActivationOffloader  # noqa: F401
 from .recompute import recompute, recompute_sequential  # noqa: F401
 from .recompute_hybrid import recompute_hybrid  # noqa: F401
 
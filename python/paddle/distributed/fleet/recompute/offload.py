@@ -0,0 +1,234 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import weakref
+
+import paddle
+from paddle.base.framework import EagerParamBase
+from paddle.framework import core
+
+__all__ = []
+
+
+class _OffloadedTensor:
+    """
+    The host copy of a tensor saved for backward, and the device copy
+    loaded back in backward.
+    """
+
+    def __init__(self, tensor, cpu_tensor, block, size):
+        self.shape = tensor.shape
+        self.dtype = tensor.dtype
+        self.stop_gradient = tensor.stop_gradient
+        self.cpu_tensor = cpu_tensor
+        self.block = block
+        self.size = size
+        self.device_tensor = None
+        self.event = None
+
+
+class _OffloadBlock:
+    def __init__(self):
+        self.tensors = []
+
+    def live_tensors(self):
+        tensors = [ref() for ref in self.tensors]
+        return [t for t in tensors if t is not None]
+
+
+class ActivationOffloader:
+    """
+    Offload the activations saved for backward to pinned host memory, as an
+    alternative to recompute. The activations are copied to the host on a
+    side stream in forward, and copied back in backward, where the
+    activations of the next blocks in the reverse order are prefetched, so
+    that the copies are overlapped with the computation.
+
+    Call the offloader to run a block of the model, e.g. a transformer layer.
+    The blocks run by recompute and by the offloader can be mixed in a model.
+    A block of recompute(use_reentrant=True) can also be run by the
+    offloader, to offload the inputs kept by recompute.
+
+    Args:
+        max_offload_size (int, optional): The max bytes of the host memory
+            held by the offloaded activations, the activations beyond it are
+            kept on the device. Default: None, means no limit.
+        min_tensor_size (int, optional): The activations smaller than it, in
+            bytes, are kept on the device. Default: 1MB.
+        prefetch_blocks (int, optional): The number of blocks prefetched
+            ahead in backward. Default: 1.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +REQUIRES(env:GPU)
+            >>> import paddle
+            >>> from paddle.distributed.fleet.recompute import ActivationOffloader
+            >>> from paddle.distributed.fleet.utils import recompute
+
+            >>> blocks = [paddle.nn.Linear(1024, 1024) for _ in range(4)]
+            >>> offloader = ActivationOffloader(max_offload_size=2**30)
+            >>> x = paddle.rand([512, 1024])
+            >>> x.stop_gradient = False
+            >>> for i, block in enumerate(blocks):
+            ...     if i % 2 == 0:
+            ...         x = offloader(block, x)
+            ...     else:
+            ...         x = recompute(block, x)
+            >>> x.mean().backward()
+    """
+
+    def __init__(
+        self, max_offload_size=None, min_tensor_size=2**20, prefetch_blocks=1
+    ):
+        assert (
+            prefetch_blocks >= 0
+        ), f"prefetch_blocks should be non-negative, but got {prefetch_blocks}"
+        self.max_offload_size = max_offload_size
+        self.min_tensor_size = min_tensor_size
+        self.prefetch_blocks = prefetch_blocks
+        self._offload_size = 0
+        # the blocks with offloaded activations, in the forward order
+        self._blocks = []
+        # the sources of the copies to the host and the events recorded
+        # after the copies, in the order of the copies
+        self._copying = []
+        self._stream = None
+
+    @property
+    def offload_size(self):
+        """
+        The bytes of the host memory held by the offloaded activations.
+        """
+        return self._offload_size
+
+    def _get_stream(self):
+        if self._stream is None:
+            self._stream = paddle.device.Stream()
+        return self._stream
+
+    def _need_offload(self, tensor):
+        if not isinstance(tensor, core.eager.Tensor):
+            return False
+        if isinstance(tensor, EagerParamBase) or tensor.persistable:
+            return False
+        if not tensor._is_initialized() or not tensor.place.is_gpu_place():
+            return False
+        size = tensor._numel() * tensor.element_size()
+        if size < self.min_tensor_size:
+            return False
+        if (
+            self.max_offload_size is not None
+            and self._offload_size + size > self.max_offload_size
+        ):
+            return False
+        return True
+
+    def _release(self, size):
+        self._offload_size -= size
+
+    def _release_copied(self):
+        # the memory of a source is reused by the computation once it is
+        # freed, so it is kept alive until the copy on the side stream is
+        # done, no matter whether its host copy is still used
+        while self._copying and self._copying[0][0].query():
+            self._copying.pop(0)
+
+    def _pack(self, tensor, block):
+        if not self._need_offload(tensor):
+            return tensor
+
+        self._release_copied()
+        size = tensor._numel() * tensor.element_size()
+        stream = self._get_stream()
+        stream.wait_stream(paddle.device.current_stream())
+        with paddle.device.stream_guard(stream):
+            cpu_tensor = tensor._copy_to(core.CUDAPinnedPlace(), False)
+            self._copying.append((stream.record_event(), tensor))
+
+        offloaded = _OffloadedTensor(tensor, cpu_tensor, block, size)
+        self._offload_size += size
+        weakref.finalize(offloaded, self._release, size)
+        block.tensors.append(weakref.ref(offloaded))
+        return offloaded
+
+    def _load(self, block):
+        self._release_copied()
+        tensors = [t for t in block.live_tensors() if t.device_tensor is None]
+        # the device tensors are allocated on the compute stream, where they
+        # are used and freed, so that their memory is not reused by the side
+        # stream before the computation is done
+        for offloaded in tensors:
+            offloaded.device_tensor = paddle.empty(
+                offloaded.shape, dtype=offloaded.dtype
+            )
+        stream = self._get_stream()
+        stream.wait_stream(paddle.device.current_stream())
+        with paddle.device.stream_guard(stream):
+            for offloaded in tensors:
+                offloaded.device_tensor.copy_(offloaded.cpu_tensor, False)
+            event = stream.record_event()
+        for offloaded in tensors:
+            offloaded.event = event
+
+    def _prefetch(self, block):
+        self._blocks = [b for b in self._blocks if b.live_tensors()]
+        if block not in self._blocks:
+            return
+        index = self._blocks.index(block)
+        for prev in reversed(
+            self._blocks[max(index - self.prefetch_blocks, 0) : index]
+        ):
+            if any(t.device_tensor is None for t in prev.live_tensors()):
+                self._load(prev)
+
+    def _unpack(self, offloaded):
+        if not isinstance(offloaded, _OffloadedTensor):
+            return offloaded
+
+        if offloaded.device_tensor is None:
+            self._load(offloaded.block)
+            self._prefetch(offloaded.block)
+        paddle.device.current_stream().wait_event(offloaded.event)
+        tensor = offloaded.device_tensor
+        tensor.stop_gradient = offloaded.stop_gradient
+        return tensor
+
+    def __call__(self, function, *args, **kwargs):
+        """
+        Run the function with its saved activations offloaded.
+
+        Args:
+            function (paddle.nn.Layer|callable): The block to run.
+            *args, **kwargs: The inputs of the function.
+
+        Returns:
+            Output of function on args and kwargs.
+        """
+        if not paddle.in_dynamic_mode() or not paddle.is_grad_enabled():
+            return function(*args, **kwargs)
+
+        block = _OffloadBlock()
+        self._blocks.append(block)
+
+        def pack(tensor):
+            return self._pack(tensor, block)
+
+        with paddle.autograd.saved_tensors_hooks(pack, self._unpack):
+            outputs = function(*args, **kwargs)
+
+        if not block.tensors:
+            self._blocks.remove(block)
+        self._release_copied()
+        return outputs
@@ -443,6 +443,59 @@ def _handle_errors(max_time_out=None):
     return decorator
 
 
+class _MetaCache:
+    """
+    A TTL cache of the metadata of HDFS paths, e.g. whether a path exists.
+    """
+
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._entries = {}
+
+    @staticmethod
+    def _norm(fs_path):
+        fs_path = fs_path.strip()
+        return fs_path.rstrip("/") or fs_path
+
+    def get(self, kind, fs_path):
+        key = (kind, self._norm(fs_path))
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expire_time, value = entry
+        if time.time() >= expire_time:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, kind, fs_path, value):
+        if self._ttl <= 0:
+            return
+        self._entries[(kind, self._norm(fs_path))] = (
+            time.time() + self._ttl,
+            value,
+        )
+
+    def invalidate(self, *fs_paths):
+        """
+        Drop the entries of the paths, their children and their parents.
+        """
+        paths = [self._norm(p) for p in fs_paths]
+        for key in list(self._entries.keys()):
+            cached = key[1]
+            for path in paths:
+                if (
+                    cached == path
+                    or cached.startswith(path + "/")
+                    or path.startswith(cached + "/")
+                ):
+                    del self._entries[key]
+                    break
+
+    def clear(self):
+        self._entries.clear()
+
+
 class HDFSClient(FS):
     """
     A tool of HDFS.
@@ -451,6 +504,12 @@ class HDFSClient(FS):
         hadoop_home(str): Hadoop home.
         configs(dict): Hadoop config. It is a dictionary and needs to contain the
             keys: "fs.default.name" and "hadoop.job.ugi".
+        time_out(int): The timeout of the retried operations, in milliseconds.
+        sleep_inter(int): The interval between the retries, in milliseconds.
+        cache_ttl(float): The seconds for which the results of `is_exist`,
+            `is_dir` and `ls_dir` are cached. The cache is invalidated by the
+            modifications made by this client, but not by the others. Default
+            is 0, means no cache.
 
     Examples:
 
@@ -476,8 +535,9 @@ class HDFSClient(FS):
         hadoop_home,
         configs,
         time_out=5 * 60 * 1000,  # ms
-        sleep_inter=1000,
-    ):  # ms
+        sleep_inter=1000,  # ms
+        cache_ttl=0,  # s
+    ):
         self.pre_commands = []
         hadoop_bin = '%s/bin/hadoop' % hadoop_home
         self.pre_commands.append(hadoop_bin)
@@ -495,6 +555,8 @@ class HDFSClient(FS):
         self._bd_err_re = re.compile(
             r'\s?responseErrorMsg\s?\:.*, errorCode\:\s?[0-9]+, path\:'
         )
+        self._not_found_re = re.compile(r"[`'](.+)': No such file or directory")
+        self._cache = _MetaCache(cache_ttl)
 
     def _run_cmd(self, cmd, redirect_stderr=False, retry_times=5):
         exe_cmd = f"{self._base_cmd} -{cmd}"
@@ -504,7 +566,7 @@ class HDFSClient(FS):
         for x in range(retry_times + 1):
             ret, output = core.shell_execute_cmd(exe_cmd, 0, 0, redirect_stderr)
             ret = int(ret)
-            if ret == 0:
+            if ret == 0 or x == retry_times:
                 break
             time.sleep(retry_sleep_second)
         if ret == 134:
@@ -609,6 +671,10 @@ class HDFSClient(FS):
         return self._ls_dir(fs_path)
 
     def _ls_dir(self, fs_path):
+        cached = self._cache.get("ls", fs_path)
+        if cached is not None:
+            return list(cached[0]), list(cached[1])
+
         cmd = f"ls {fs_path}"
         ret, lines = self._run_cmd(cmd)
 
@@ -628,6 +694,13 @@ class HDFSClient(FS):
             else:
                 files.append(p)
 
+        self._cache.set("ls", fs_path, (list(dirs), list(files)))
+        # the listing of a directory answers the queries of its children too
+        if self._cache.get("dir", fs_path):
+            parent = fs_path.rstrip("/")
+            for p in dirs + files:
+                self._cache.set("exist", f"{parent}/{p}", True)
+                self._cache.set("dir", f"{parent}/{p}", p in dirs)
         return dirs, files
 
     def _test_match(self, lines):
@@ -672,6 +745,10 @@ class HDFSClient(FS):
         return self._is_dir(fs_path)
 
     def _is_dir(self, fs_path):
+        cached = self._cache.get("dir", fs_path)
+        if cached is not None:
+            return cached
+
         cmd = f"test -d {fs_path}"
         ret, lines = self._run_cmd(cmd, redirect_stderr=True, retry_times=1)
         if ret:
@@ -681,8 +758,10 @@ class HDFSClient(FS):
                 print('\n'.join(lines))
                 raise ExecuteError(cmd)
 
+            self._cache.set("dir", fs_path, False)
             return False
 
+        self._cache.set("dir", fs_path, True)
         return True
 
     def is_file(self, fs_path):
@@ -746,13 +825,92 @@ class HDFSClient(FS):
                 >>> ret = client.is_exist("hdfs:/test_hdfs_client")
 
         """
+        cached = self._cache.get("exist", fs_path)
+        if cached is not None:
+            return cached
+
         cmd = f"test -e {fs_path} "
         ret, out = self._run_cmd(cmd, redirect_stderr=True, retry_times=1)
+        self._cache.set("exist", fs_path, ret == 0)
         if ret != 0:
             return False
 
         return True
 
+    @_handle_errors()
+    def batch_is_exist(self, fs_paths):
+        """
+        Whether the remote HDFS paths exist. The paths missed by the metadata
+        cache are listed together by one `ls -d` command for every 100 paths,
+        instead of starting a hadoop client for each of them.
+
+        Args:
+            fs_paths(list): The hdfs file paths.
+
+        Returns:
+            List: Whether each path exists.
+
+        Examples:
+
+            .. code-block:: python
+
+                >>> # doctest: +REQUIRES(env:DISTRIBUTED)
+                >>> from paddle.distributed.fleet.utils import HDFSClient
+
+                >>> hadoop_home = "/home/client/hadoop-client/hadoop/"
+                >>> configs = {
+                ...     "fs.default.name": "hdfs://xxx.hadoop.com:54310",
+                ...     "hadoop.job.ugi": "hello,hello123"
+                ... }
+
+                >>> client = HDFSClient(hadoop_home, configs)
+                >>> ret = client.batch_is_exist(["hdfs:/a", "hdfs:/b"])
+
+        """
+        exists = [self._cache.get("exist", p) for p in fs_paths]
+        missed = list(
+            dict.fromkeys(p for p, e in zip(fs_paths, exists) if e is None)
+        )
+        missed_exists = {}
+        for i in range(0, len(missed), 100):
+            missed_exists.update(self._ls_paths(missed[i : i + 100]))
+        return [
+            missed_exists[p] if e is None else e
+            for p, e in zip(fs_paths, exists)
+        ]
+
+    def _ls_paths(self, fs_paths):
+        cmd = "ls -d " + " ".join(fs_paths)
+        ret, lines = self._run_cmd(cmd, redirect_stderr=True, retry_times=0)
+
+        # ls prints a line for each existing path, and reports the missing
+        # ones, it fails if any of the paths is missing
+        listed = {}
+        not_found = set()
+        for line in lines:
+            arr = line.split()
+            if len(arr) == 8 and arr[0][0] in "d-":
+                listed[_MetaCache._norm(arr[7])] = arr[0][0] == 'd'
+                continue
+            m = self._not_found_re.search(line)
+            if m is not None:
+                not_found.add(_MetaCache._norm(m.group(1)))
+
+        exists = {}
+        for p in fs_paths:
+            path = _MetaCache._norm(p)
+            if path in listed:
+                exists[p] = True
+                self._cache.set("exist", p, True)
+                self._cache.set("dir", p, listed[path])
+            elif path in not_found:
+                exists[p] = False
+                self._cache.set("exist", p, False)
+            else:
+                # the output of some clients can't be matched to the path
+                exists[p] = self.is_exist(p)
+        return exists
+
     def upload_dir(self, local_dir, dest_dir, overwrite=False):
         """
         upload dir to hdfs
@@ -851,9 +1009,12 @@ class HDFSClient(FS):
         # complete the processes
         for proc in procs:
             proc.join()
+        # the paths are uploaded by the child processes
+        self._cache.invalidate(fs_path)
 
     @_handle_errors()
     def _try_upload(self, local_path, fs_path):
+        self._cache.invalidate(fs_path)
         cmd = f"put {local_path} {fs_path}"
         ret = 0
         try:
@@ -968,6 +1129,7 @@ class HDFSClient(FS):
 
         out_hdfs = False
 
+        self._cache.invalidate(fs_path)
         cmd = f"mkdir {fs_path} "
         ret, out = self._run_cmd(cmd, redirect_stderr=True)
         if ret != 0:
@@ -979,6 +1141,7 @@ class HDFSClient(FS):
                 raise ExecuteError(cmd)
 
         if out_hdfs and not self.is_exist(fs_path):
+            self._cache.invalidate(fs_path)
             cmd = f"mkdir -p {fs_path}"
             ret, _ = self._run_cmd(cmd)
             if ret != 0:
@@ -1025,6 +1188,7 @@ class HDFSClient(FS):
 
     @_handle_errors()
     def _try_mv(self, fs_src_path, fs_dst_path):
+        self._cache.invalidate(fs_src_path, fs_dst_path)
         cmd = f"mv {fs_src_path} {fs_dst_path}"
         ret = 0
         try:
@@ -1037,12 +1201,14 @@ class HDFSClient(FS):
             raise e
 
     def _rmr(self, fs_path):
+        self._cache.invalidate(fs_path)
         cmd = f"rmr {fs_path}"
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
             raise ExecuteError(cmd)
 
     def _rm(self, fs_path):
+        self._cache.invalidate(fs_path)
         cmd = f"rm {fs_path}"
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
@@ -1117,6 +1283,7 @@ class HDFSClient(FS):
 
     @_handle_errors()
     def _touchz(self, fs_path):
+        self._cache.invalidate(fs_path)
         cmd = f"touchz {fs_path}"
         ret, _ = self._run_cmd(cmd)
         if ret != 0:
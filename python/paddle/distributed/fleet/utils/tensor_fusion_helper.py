@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import itertools
+import time
 import weakref
 from collections import OrderedDict
 
@@ -71,10 +72,19 @@ def get_current_device_type():
 
 
 def assign_group_by_size(parameters, group_size=128 * 1024 * 1024):
+    """
+    Assign the parameters to groups in order. group_size is the bytes of a
+    group, or a list of them for the successive groups, where the last one
+    is used for the rest groups.
+    """
     is_sparse_gradient = [False] * len(parameters)
 
+    if isinstance(group_size, (list, tuple)):
+        group_size_limits = list(group_size)
+    else:
+        group_size_limits = [group_size, group_size]
     group_indices = core.eager_assign_group_by_size(
-        parameters, is_sparse_gradient, [group_size, group_size]
+        parameters, is_sparse_gradient, group_size_limits
     )
 
     var_groups = OrderedDict()
@@ -84,6 +94,15 @@ def assign_group_by_size(parameters, group_size=128 * 1024 * 1024):
     return var_groups
 
 
+def get_ramp_group_sizes(group_size, num_ramp_groups=3):
+    """
+    Get the group sizes starting from group_size / 2**num_ramp_groups and
+    doubled for each group up to group_size, so that the communication of
+    the first ready groups can be launched earlier.
+    """
+    return [max(group_size >> i, 1) for i in range(num_ramp_groups, -1, -1)]
+
+
 def flatten_dense_tensors(
     parameters,
     use_main_grad=False,
@@ -383,6 +402,9 @@ class FusedCommBuffer:
         self._params_step_dict = {}
         self._params_checked_in = 0
         self._grads_to_addr = {}
+        # the host timestamps of the current step and the last finished one
+        self._step_times = {}
+        self._comm_stats = None
 
         self._act = act
         if self._act == HOOK_ACTION.ALL_REDUCE:
@@ -516,6 +538,20 @@ class FusedCommBuffer:
         self._task = None
         self._init_step_dict()
         self._params_checked_in = 0
+        self._step_times = {}
+
+    @property
+    def comm_stats(self):
+        """
+        The stats of the last finished step of the buffer, with the host
+        timestamps in seconds, given by time.perf_counter():
+        first_ready_time: the first gradient of the buffer is added,
+        ready_time: all the gradients of the buffer are added,
+        comm_start_time: the communication is launched,
+        comm_end_time: the communication is waited for.
+        It's None before the first step finishes.
+        """
+        return self._comm_stats
 
     @property
     def _all_params_checked_in(self):
@@ -540,13 +576,16 @@ class FusedCommBuffer:
             self._copy_grad_to_buffer(param)
 
         self._params_step_dict[param.name] += 1
+        self._step_times.setdefault("first_ready_time", time.perf_counter())
 
         if self._params_step_dict[param.name] == self._acc_steps:
             self._params_checked_in += 1
             self._params_step_dict.pop(param.name)
 
-        if self._all_params_checked_in and use_comm:
-            self.comm_grads()
+        if self._all_params_checked_in:
+            self._step_times["ready_time"] = time.perf_counter()
+            if use_comm:
+                self.comm_grads()
 
     @imperative_base.no_grad
     def assign_slice_grad(self, param, slice_param):
@@ -631,11 +670,19 @@ class FusedCommBuffer:
                 sync_op=False,
             )
         self._task = task
+        self._step_times["comm_start_time"] = time.perf_counter()
 
     @imperative_base.no_grad
     def scale_grads(self):
         assert self._task is not None, "Task is not initialized."
         self._task.wait()
+        self._step_times["comm_end_time"] = time.perf_counter()
+        self._comm_stats = {
+            "id": self._id,
+            "num_params": len(self._params),
+            "numel": sum(p._numel() for p in self._params),
+            **self._step_times,
+        }
 
         # scale will be skiped when use reduce_avg comm operation
         if self._scale_after_comm and not self._use_reduce_avg:
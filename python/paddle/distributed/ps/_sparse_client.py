@@ -0,0 +1,347 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import threading
+
+import numpy as np
+
+__all__ = []
+
+
+class _PullRequest:
+    def __init__(self, keys):
+        self.keys = keys
+        self.rows = None
+        self.error = None
+        # set if the request is served, or its thread should serve the
+        # pending requests
+        self.event = threading.Event()
+        self.lead = False
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+        return self.rows
+
+
+class _CacheEntry:
+    __slots__ = ["row", "freq", "version"]
+
+    def __init__(self, row, freq, version):
+        self.row = row
+        self.freq = freq
+        self.version = version
+
+
+class _SparseTableState:
+    def __init__(self, table_id):
+        self.table_id = table_id
+        self.lock = threading.Lock()
+        # key -> _CacheEntry of the hot rows
+        self.cache = {}
+        # the number of the pushes flushed to the server, the cached rows
+        # pulled max_staleness versions ago are expired
+        self.version = 0
+        self.pending_pulls = []
+        self.pulling = False
+        self.push_keys = []
+        self.push_grads = []
+        self.num_push_rows = 0
+
+
+class SparseTableClient:
+    """
+    A prototype client of the sparse tables of the parameter server, which
+    reduces the traffic of the sparse pulls and pushes of a trainer:
+
+    1. The keys of a pull are deduplicated, and the hot rows are cached by
+       LFU, with bounded staleness. A cached row is used until max_staleness
+       pushes of its table are flushed since it is pulled.
+    2. The pulls of the threads of the trainer, which arrive while a pull of
+       the same table is running, are merged into the next pull.
+    3. The gradients of a push are summed by key, and the pushes are buffered
+       until push_batch_rows rows are pending.
+
+    It is not used by the runtime of the parameter server yet, and works
+    with any server stub of the methods below.
+
+    Args:
+        server (object): The server stub, which has the method
+            ``pull_sparse(table_id, keys)`` returning the rows of the keys
+            as an array of shape [len(keys), dim], and the method
+            ``push_sparse(table_id, keys, grads)``.
+        cache_size (int, optional): The max number of the cached rows of each
+            table, 0 means no cache. Default: 100000.
+        max_staleness (int, optional): The number of the flushed pushes of a
+            table, after which its cached rows are pulled again. Default: 0,
+            means the cached rows are only used until the next flush.
+        push_batch_rows (int, optional): The pushes of a table are sent to
+            the server once the pending rows reach it. Default: 0, means the
+            pushes are sent at once.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from paddle.distributed.ps._sparse_client import SparseTableClient
+
+            >>> class Server:
+            ...     def __init__(self, dim):
+            ...         self.rows = {}
+            ...         self.dim = dim
+            ...     def pull_sparse(self, table_id, keys):
+            ...         return np.stack([
+            ...             self.rows.setdefault(k, np.zeros(self.dim))
+            ...             for k in keys.tolist()
+            ...         ])
+            ...     def push_sparse(self, table_id, keys, grads):
+            ...         for k, g in zip(keys.tolist(), grads):
+            ...             self.rows[k] = self.rows[k] - 0.1 * g
+
+            >>> client = SparseTableClient(Server(8), max_staleness=2)
+            >>> rows = client.pull(0, [3, 1, 3, 7])
+            >>> rows.shape
+            (4, 8)
+            >>> client.push(0, [3, 1, 3, 7], np.ones([4, 8]))
+            >>> client.stats["pulled_rows"], client.stats["pushed_rows"]
+            (3, 3)
+    """
+
+    def __init__(
+        self, server, cache_size=100000, max_staleness=0, push_batch_rows=0
+    ):
+        assert (
+            cache_size >= 0
+        ), f"cache_size should be non-negative, but got {cache_size}"
+        assert (
+            max_staleness >= 0
+        ), f"max_staleness should be non-negative, but got {max_staleness}"
+        self._server = server
+        self._cache_size = cache_size
+        self._max_staleness = max_staleness
+        self._push_batch_rows = push_batch_rows
+        self._tables = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "pull_keys": 0,
+            "cache_hits": 0,
+            "pull_requests": 0,
+            "pulled_rows": 0,
+            "push_keys": 0,
+            "push_requests": 0,
+            "pushed_rows": 0,
+        }
+
+    @property
+    def stats(self):
+        """
+        The counters of the client: the keys requested by the pulls, the
+        keys hit in the cache, the pull requests and the rows sent to the
+        server, the keys of the pushes, and the push requests and the rows
+        sent to the server.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _add_stats(self, **kwargs):
+        with self._lock:
+            for name, value in kwargs.items():
+                self._stats[name] += value
+
+    def _get_table(self, table_id):
+        with self._lock:
+            if table_id not in self._tables:
+                self._tables[table_id] = _SparseTableState(table_id)
+            return self._tables[table_id]
+
+    def _is_valid(self, table, entry):
+        return table.version - entry.version <= self._max_staleness
+
+    def _update_cache(self, table, keys, rows, version):
+        # called with the lock of the table held
+        cache = table.cache
+        for key, row in zip(keys.tolist(), rows):
+            entry = cache.get(key)
+            if entry is None:
+                cache[key] = _CacheEntry(row.copy(), 1, version)
+            elif entry.version <= version:
+                entry.row = row.copy()
+                entry.version = version
+        if len(cache) > self._cache_size:
+            # evict the least frequently used rows in bulk, to amortize the
+            # cost of the selection
+            num_evicted = len(cache) - max(1, int(self._cache_size * 0.9))
+            for _, key in heapq.nsmallest(
+                num_evicted, ((e.freq, k) for k, e in cache.items())
+            ):
+                del cache[key]
+
+    def _serve_pulls(self, table, requests):
+        # the requests are always answered, with the rows or the error, so
+        # that no thread waits for them forever
+        try:
+            keys = np.unique(np.concatenate([r.keys for r in requests]))
+            with table.lock:
+                version = table.version
+            rows = np.asarray(self._server.pull_sparse(table.table_id, keys))
+            if len(rows) != len(keys):
+                raise ValueError(
+                    f"The server returned {len(rows)} rows for {len(keys)} keys of table {table.table_id}"
+                )
+            self._add_stats(pull_requests=1, pulled_rows=len(keys))
+
+            if self._cache_size > 0:
+                with table.lock:
+                    self._update_cache(table, keys, rows, version)
+            for r in requests:
+                r.rows = rows[np.searchsorted(keys, r.keys)]
+        except BaseException as e:
+            for r in requests:
+                r.error = e
+        finally:
+            for r in requests:
+                r.event.set()
+
+    def _merged_pull(self, table, keys):
+        request = _PullRequest(keys)
+        with table.lock:
+            table.pending_pulls.append(request)
+            lead = not table.pulling
+            table.pulling = True
+        if not lead:
+            request.event.wait()
+            if not request.lead:
+                return request.result()
+
+        # serve the pending requests, including its own, and hand over to
+        # the thread of the next pending request
+        with table.lock:
+            requests, table.pending_pulls = table.pending_pulls, []
+        try:
+            self._serve_pulls(table, requests)
+        finally:
+            with table.lock:
+                if table.pending_pulls:
+                    next_request = table.pending_pulls[0]
+                    next_request.lead = True
+                    next_request.event.set()
+                else:
+                    table.pulling = False
+        return request.result()
+
+    def pull(self, table_id, keys):
+        """
+        Pull the rows of the keys from the table.
+
+        Args:
+            table_id (int): The id of the sparse table.
+            keys (list|numpy.ndarray): The keys, i.e. the feature signs.
+
+        Returns:
+            numpy.ndarray, the rows of the keys, of shape [len(keys), dim].
+        """
+        keys = np.asarray(keys).reshape([-1])
+        if len(keys) == 0:
+            return np.asarray(self._server.pull_sparse(table_id, keys))
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        table = self._get_table(table_id)
+
+        rows = [None] * len(unique_keys)
+        missing = []
+        with table.lock:
+            for i, key in enumerate(unique_keys.tolist()):
+                entry = table.cache.get(key)
+                if entry is not None:
+                    entry.freq += 1
+                    if self._is_valid(table, entry):
+                        rows[i] = entry.row
+                        continue
+                missing.append(i)
+        self._add_stats(
+            pull_keys=len(keys), cache_hits=len(unique_keys) - len(missing)
+        )
+
+        if missing:
+            pulled_rows = self._merged_pull(table, unique_keys[missing])
+            for i, row in zip(missing, pulled_rows):
+                rows[i] = row
+        return np.stack(rows)[inverse]
+
+    def push(self, table_id, keys, grads):
+        """
+        Push the gradients of the keys to the table. The gradients of the
+        same key are summed.
+
+        Args:
+            table_id (int): The id of the sparse table.
+            keys (list|numpy.ndarray): The keys, i.e. the feature signs.
+            grads (numpy.ndarray): The gradients of the keys, of shape
+                [len(keys), dim].
+        """
+        keys = np.asarray(keys).reshape([-1])
+        if len(keys) == 0:
+            return
+        grads = np.asarray(grads).reshape([len(keys), -1])
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        merged_grads = np.zeros(
+            [len(unique_keys), grads.shape[1]], dtype=grads.dtype
+        )
+        np.add.at(merged_grads, inverse, grads)
+        self._add_stats(push_keys=len(keys))
+
+        table = self._get_table(table_id)
+        with table.lock:
+            table.push_keys.append(unique_keys)
+            table.push_grads.append(merged_grads)
+            table.num_push_rows += len(unique_keys)
+            need_flush = table.num_push_rows >= self._push_batch_rows
+        if need_flush:
+            self._flush_table(table)
+
+    def _flush_table(self, table):
+        with table.lock:
+            if not table.push_keys:
+                return
+            keys = np.concatenate(table.push_keys)
+            grads = np.concatenate(table.push_grads)
+            table.push_keys, table.push_grads = [], []
+            table.num_push_rows = 0
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        if len(unique_keys) < len(keys):
+            merged_grads = np.zeros(
+                [len(unique_keys), grads.shape[1]], dtype=grads.dtype
+            )
+            np.add.at(merged_grads, inverse, grads)
+            keys, grads = unique_keys, merged_grads
+        self._server.push_sparse(table.table_id, keys, grads)
+        self._add_stats(push_requests=1, pushed_rows=len(keys))
+        with table.lock:
+            table.version += 1
+
+    def flush(self, table_id=None):
+        """
+        Send the buffered pushes to the server.
+
+        Args:
+            table_id (int, optional): The id of the sparse table to flush.
+                Default: None, means all the tables.
+        """
+        if table_id is not None:
+            self._flush_table(self._get_table(table_id))
+            return
+        with self._lock:
+            tables = list(self._tables.values())
+        for table in tables:
+            self._flush_table(table)
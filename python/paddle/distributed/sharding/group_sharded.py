@@ -50,6 +50,9 @@ def group_sharded_parallel(
     sync_comm=False,
     dp_group=None,
     exclude_layer=None,
+    prefetch_layers=1,
+    prefetch_buffer_size=None,
+    reuse_params=False,
 ):
     """
     Use group_sharded_parallel can perform group shared configuration on the model, optimizer and GradScaler. Level has three string options, 'os', 'os_g' and 'p_g_os' corresponds to three different usage scenarios: optimizer state segmentation, optimizer state + gradient segmentation, and parameter + gradient + optimizer state segmentation.
@@ -68,6 +71,9 @@ def group_sharded_parallel(
         sync_comm (bool, optional): Whether to use synchronous communication, only in `p_g_os` used. Defaults to False, indicating that asynchronous communication is used.
         dp_group(Group, optional): dp communication group, support to combine stage2 or stage3 with dp hybrid communication.
         exclude_layer(list, optional): exclude some layers for slicing for sharding stage3, for example, exclude_layer=["GroupNorm", id(model.gpt.linear)], exclude_layer must contain the layers' name or one layer's id.
+        prefetch_layers(int, optional): The number of layers whose parameters are all-gathered ahead in `p_g_os`, in the execution order in forward and in the reverse order in backward. Defaults to 1.
+        prefetch_buffer_size(int, optional): The max bytes of the parameters prefetched in flight in `p_g_os`. Defaults to None, indicating that only prefetch_layers limits the prefetch.
+        reuse_params(bool, optional): Whether to keep the full parameters of the first prefetch_layers layers gathered in backward for the forward of the next micro batch in `p_g_os`, until the optimizer steps. Defaults to False.
 
     Returns:
         model: A wrapper for group sharded given model.
@@ -171,6 +177,9 @@ def group_sharded_parallel(
             dp_group=dp_group,
             device=device,
             exclude_layer=exclude_layer,
+            prefetch_layers=prefetch_layers,
+            prefetch_buffer_size=prefetch_buffer_size,
+            reuse_params=reuse_params,
         )
     else:
         raise ValueError("Please enter the correct level.")
@@ -15,7 +15,12 @@
 from .math import segment_max, segment_mean, segment_min, segment_sum
 from .message_passing import send_u_recv, send_ue_recv, send_uv
 from .reindex import reindex_graph, reindex_heter_graph
-from .sampling import sample_neighbors, weighted_sample_neighbors
+from .sampling import (
+    GraphStore,
+    NeighborLoader,
+    sample_neighbors,
+    weighted_sample_neighbors,
+)
 
 __all__ = [
     'send_u_recv',
@@ -29,4 +34,6 @@ __all__ = [
     'reindex_heter_graph',
     'sample_neighbors',
     'weighted_sample_neighbors',
+    'GraphStore',
+    'NeighborLoader',
 ]
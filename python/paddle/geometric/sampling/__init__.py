@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .loader import GraphStore, NeighborLoader  # noqa: F401
 from .neighbors import sample_neighbors, weighted_sample_neighbors  # noqa: F401
 
 __all__ = []
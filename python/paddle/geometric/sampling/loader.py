@@ -0,0 +1,419 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+
+__all__ = []
+
+_GRAPH_ARRAYS = ('row', 'colptr', 'node_feat', 'node_label')
+
+
+def _to_numpy(data):
+    if data is None:
+        return None
+    if isinstance(data, paddle.Tensor):
+        return data.numpy()
+    if isinstance(data, np.ndarray):
+        return data
+    return np.asarray(data)
+
+
+def _take_random(segment, value, counts):
+    """
+    Take ``counts[i]`` of the distinct values of every segment ``i`` at
+    random, returns the segments and the values ordered by segment.
+    """
+    # sort the values by a random key within every segment, which is a
+    # random permutation of every segment, and take the first counts[i]
+    order = np.lexsort((np.random.random(len(segment)), segment))
+    sorted_segment = segment[order]
+    rank = np.arange(len(order)) - np.searchsorted(
+        sorted_segment, sorted_segment
+    )
+    picked = order[rank < counts[sorted_segment]]
+    return segment[picked], value[picked]
+
+
+def _segmented_sample(degrees, counts):
+    """
+    Sample ``counts[i]`` of ``range(degrees[i])`` without replacement for
+    every segment ``i`` at once, returns the sampled indices concatenated in
+    the order of the segments.
+    """
+    segments = np.arange(len(degrees))
+
+    # permute all the indices of the segments which are not much larger than
+    # their samples
+    dense = segments[degrees <= 4 * counts]
+    dense_degrees = degrees[dense]
+    segment = np.repeat(dense, dense_degrees)
+    value = np.arange(len(segment)) - np.repeat(
+        np.cumsum(dense_degrees) - dense_degrees, dense_degrees
+    )
+    results = [_take_random(segment, value, counts)]
+
+    # draw more random indices than needed for the others, without
+    # enumerating their indices, a random subset of the distinct ones is
+    # still a uniform sample
+    sparse = segments[degrees > 4 * counts]
+    scale = int(degrees.max()) + 1 if len(degrees) else 1
+    codes = np.empty([0], dtype='int64')
+    missing = sparse
+    while len(missing) > 0:
+        num_draws = 2 * counts[missing]
+        segment = np.repeat(missing, num_draws)
+        value = np.floor(
+            np.random.random(len(segment)) * degrees[segment]
+        ).astype('int64')
+        codes = np.union1d(codes, segment * scale + value)
+        num_distinct = np.bincount(codes // scale, minlength=len(degrees))
+        missing = sparse[num_distinct[sparse] < counts[sparse]]
+    results.append(_take_random(codes // scale, codes % scale, counts))
+
+    segment = np.concatenate([r[0] for r in results])
+    value = np.concatenate([r[1] for r in results])
+    return value[np.argsort(segment, kind='stable')]
+
+
+class GraphStore:
+    """
+    Graph stored in CSC (Compressed Sparse Column) format, with optional node
+    features and labels, which supports multi-hop neighbor sampling.
+
+    The in-edges of node ``v`` come from ``row[colptr[v]:colptr[v + 1]]``,
+    the same format as :ref:`api_paddle_geometric_sample_neighbors`. All
+    arrays are kept as numpy arrays, which can be memory-mapped by
+    :meth:`load`, so that DataLoader workers share them without copies.
+
+    Args:
+        row (numpy.ndarray|Tensor): The source nodes of the edges, with shape [num_edges].
+        colptr (numpy.ndarray|Tensor): The offsets of the in-edges of every node in
+            ``row``, with shape [num_nodes + 1].
+        node_feat (numpy.ndarray|Tensor, optional): The node features, with shape
+            [num_nodes, ...]. Default: None.
+        node_label (numpy.ndarray|Tensor, optional): The node labels, with shape
+            [num_nodes, ...]. Default: None.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import paddle
+
+            >>> # edges: (3, 0), (7, 0), (0, 1), (9, 1), (1, 2), (4, 3), (2, 4),
+            >>> #        (9, 5), (3, 5), (9, 6), (1, 6), (9, 8), (7, 8)
+            >>> src = [3, 7, 0, 9, 1, 4, 2, 9, 3, 9, 1, 9, 7]
+            >>> dst = [0, 0, 1, 1, 2, 3, 4, 5, 5, 6, 6, 8, 8]
+            >>> graph = paddle.geometric.GraphStore.from_edges(
+            ...     src, dst, num_nodes=10, node_feat=np.random.rand(10, 4)
+            ... )
+            >>> print(graph.num_nodes, graph.num_edges)
+            10 13
+            >>> batch = graph.sample([0, 8], [2, 2])
+            >>> print(batch['nodes'][:2])
+            [0 8]
+    """
+
+    def __init__(self, row, colptr, node_feat=None, node_label=None):
+        self.row = _to_numpy(row).reshape([-1])
+        self.colptr = _to_numpy(colptr).reshape([-1])
+        self.node_feat = _to_numpy(node_feat)
+        self.node_label = _to_numpy(node_label)
+
+        if self.colptr[-1] != len(self.row):
+            raise ValueError(
+                f"colptr[-1] should be the number of edges {len(self.row)}, "
+                f"but got {self.colptr[-1]}"
+            )
+        for name in ('node_feat', 'node_label'):
+            data = getattr(self, name)
+            if data is not None and len(data) != self.num_nodes:
+                raise ValueError(
+                    f"The length of {name} should be the number of nodes "
+                    f"{self.num_nodes}, but got {len(data)}"
+                )
+
+    @classmethod
+    def from_edges(
+        cls, src, dst, num_nodes=None, node_feat=None, node_label=None
+    ):
+        """
+        Build a graph store from the edges (src[i], dst[i]).
+
+        Args:
+            src (numpy.ndarray|Tensor|list): The source nodes of the edges.
+            dst (numpy.ndarray|Tensor|list): The destination nodes of the edges.
+            num_nodes (int, optional): The number of nodes. Default: None, which
+                means the max node id plus one.
+            node_feat (numpy.ndarray|Tensor, optional): Same as ``GraphStore``. Default: None.
+            node_label (numpy.ndarray|Tensor, optional): Same as ``GraphStore``. Default: None.
+
+        Returns:
+            GraphStore, the graph store of the edges.
+        """
+        src = _to_numpy(src).reshape([-1]).astype('int64')
+        dst = _to_numpy(dst).reshape([-1]).astype('int64')
+        if num_nodes is None:
+            num_nodes = int(max(src.max(), dst.max())) + 1 if len(src) else 0
+
+        order = np.argsort(dst, kind='stable')
+        row = src[order]
+        colptr = np.zeros([num_nodes + 1], dtype='int64')
+        np.cumsum(np.bincount(dst, minlength=num_nodes), out=colptr[1:])
+        return cls(row, colptr, node_feat, node_label)
+
+    @property
+    def num_nodes(self):
+        return len(self.colptr) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.row)
+
+    def save(self, path):
+        """
+        Save the graph store to the directory ``path`` as ``.npy`` files.
+
+        Args:
+            path (str): The directory to save the graph store.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in _GRAPH_ARRAYS:
+            data = getattr(self, name)
+            if data is not None:
+                np.save(os.path.join(path, name + '.npy'), data)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load the graph store saved by :meth:`save`.
+
+        Args:
+            path (str): The directory of the saved graph store.
+            mmap (bool, optional): Whether to memory-map the arrays instead of
+                reading them into memory. Default: True.
+
+        Returns:
+            GraphStore, the loaded graph store.
+        """
+        arrays = {}
+        for name in _GRAPH_ARRAYS:
+            file = os.path.join(path, name + '.npy')
+            if os.path.exists(file):
+                arrays[name] = np.load(file, mmap_mode='r' if mmap else None)
+        return cls(**arrays)
+
+    def sample(self, seeds, sample_sizes):
+        """
+        Sample the multi-hop neighbors of the seed nodes, and reindex the
+        sampled subgraph.
+
+        The nodes of the subgraph are reindexed in the order they are sampled,
+        so the seeds are ``0, ..., len(seeds) - 1``. At the k-th hop, up to
+        ``sample_sizes[k]`` in-neighbors of every node sampled before the hop,
+        i.e. ``nodes[:num_dst_nodes[k]]``, are sampled without replacement,
+        all of the in-neighbors if it is -1. So the edges of every hop form a
+        block whose dst nodes are all the nodes of the previous layer, the
+        same as the layer-wise sampling of GraphSAGE.
+
+        Args:
+            seeds (numpy.ndarray|Tensor|list): The unique seed nodes.
+            sample_sizes (list[int]): The number of neighbors to sample of
+                every hop.
+
+        Returns:
+            dict, the sampled subgraph, whose items are
+
+            - nodes (numpy.ndarray): The original ids of the subgraph nodes.
+            - batch_size (int): The number of seeds.
+            - edges (list): The [src_index, dst_index] of the sampled edges of
+              every hop, which are the reindexed ids of the nodes.
+            - num_dst_nodes (list[int]): The number of nodes before every hop,
+              which are the dst nodes of the hop, and can be the ``out_size``
+              of :ref:`api_paddle_geometric_send_u_recv`.
+            - x (numpy.ndarray): The features of the nodes, if ``node_feat`` is set.
+            - y (numpy.ndarray): The labels of the seeds, if ``node_label`` is set.
+        """
+        seeds = _to_numpy(seeds).reshape([-1]).astype('int64')
+        nodes = seeds
+        edges = []
+        num_dst_nodes = []
+
+        for sample_size in sample_sizes:
+            num_dst_nodes.append(len(nodes))
+            starts = self.colptr[nodes].astype('int64')
+            degrees = self.colptr[nodes + 1].astype('int64') - starts
+            counts = degrees
+            if sample_size >= 0:
+                counts = np.minimum(degrees, sample_size)
+
+            # the positions of the sampled edges in row, all in-edges first
+            offsets = np.cumsum(counts) - counts
+            positions = np.arange(counts.sum(), dtype='int64')
+            positions += np.repeat(starts - offsets, counts)
+            sampled = np.nonzero(counts < degrees)[0]
+            if len(sampled) > 0:
+                sampled_counts = counts[sampled]
+                index = np.arange(sampled_counts.sum(), dtype='int64')
+                index += np.repeat(
+                    offsets[sampled]
+                    - (np.cumsum(sampled_counts) - sampled_counts),
+                    sampled_counts,
+                )
+                positions[index] = np.repeat(
+                    starts[sampled], sampled_counts
+                ) + _segmented_sample(degrees[sampled], sampled_counts)
+
+            neighbors = self.row[positions].astype('int64')
+            dst_index = np.repeat(np.arange(len(nodes), dtype='int64'), counts)
+
+            # reindex the neighbors, the new ones in the order of appearance
+            uniq, first, inverse = np.unique(
+                neighbors, return_index=True, return_inverse=True
+            )
+            sorter = np.argsort(nodes, kind='stable')
+            pos = np.searchsorted(nodes, uniq, sorter=sorter)
+            pos = np.minimum(pos, len(nodes) - 1)
+            found = nodes[sorter[pos]] == uniq
+            uniq_index = np.empty([len(uniq)], dtype='int64')
+            uniq_index[found] = sorter[pos[found]]
+            new = np.nonzero(~found)[0]
+            new = new[np.argsort(first[new], kind='stable')]
+            uniq_index[new] = np.arange(len(nodes), len(nodes) + len(new))
+
+            edges.append([uniq_index[inverse].reshape([-1]), dst_index])
+            nodes = np.concatenate([nodes, uniq[new]])
+
+        batch = {
+            'nodes': nodes,
+            'batch_size': len(seeds),
+            'edges': edges,
+            'num_dst_nodes': num_dst_nodes,
+        }
+        if self.node_feat is not None:
+            batch['x'] = np.asarray(self.node_feat[nodes])
+        if self.node_label is not None:
+            batch['y'] = np.asarray(self.node_label[seeds])
+        return batch
+
+
+class _NodeDataset(Dataset):
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def __getitem__(self, idx):
+        return self.nodes[idx]
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class _NeighborSampler:
+    def __init__(self, graph, sample_sizes):
+        self.graph = graph
+        self.sample_sizes = sample_sizes
+
+    def __call__(self, seeds):
+        return self.graph.sample(seeds, self.sample_sizes)
+
+
+class NeighborLoader(DataLoader):
+    """
+    DataLoader of the multi-hop neighbor sampled subgraphs of mini-batches of
+    seed nodes.
+
+    Every batch is sampled by :meth:`GraphStore.sample` in the collate
+    function, which runs in the worker processes if ``num_workers > 0``, so
+    that sampling, reindexing and feature slicing overlap with training. The
+    batches are dicts, whose numpy arrays are converted to Tensors.
+
+    Args:
+        graph (GraphStore): The graph to sample.
+        sample_sizes (list[int]): The number of neighbors to sample of every
+            hop, -1 means all neighbors.
+        input_nodes (numpy.ndarray|Tensor|list, optional): The seed nodes.
+            Default: None, which means all nodes.
+        batch_size (int, optional): The number of seeds of a batch. Default: 1.
+        shuffle (bool, optional): Whether to shuffle the seeds every epoch.
+            Default: False.
+        drop_last (bool, optional): Whether to drop the last incomplete batch.
+            Default: False.
+        num_workers (int, optional): The number of worker processes to sample
+            the batches. Default: 0.
+        **kwargs: Other arguments of :ref:`api_paddle_io_DataLoader`.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import paddle
+
+            >>> src = [3, 7, 0, 9, 1, 4, 2, 9, 3, 9, 1, 9, 7]
+            >>> dst = [0, 0, 1, 1, 2, 3, 4, 5, 5, 6, 6, 8, 8]
+            >>> graph = paddle.geometric.GraphStore.from_edges(
+            ...     src, dst, num_nodes=10,
+            ...     node_feat=np.random.rand(10, 4).astype('float32'),
+            ... )
+            >>> loader = paddle.geometric.NeighborLoader(
+            ...     graph, [2, 2], batch_size=4, shuffle=True
+            ... )
+            >>> for batch in loader:
+            ...     x = batch['x']
+            ...     # aggregate the neighbors of the last hop first
+            ...     for (src, dst), out_size in zip(
+            ...         batch['edges'][::-1], batch['num_dst_nodes'][::-1]
+            ...     ):
+            ...         x = paddle.geometric.send_u_recv(
+            ...             x, src, dst, reduce_op='mean', out_size=out_size
+            ...         )
+            ...     print(x.shape[0] == batch['batch_size'])
+            True
+            True
+            True
+    """
+
+    def __init__(
+        self,
+        graph,
+        sample_sizes,
+        input_nodes=None,
+        batch_size=1,
+        shuffle=False,
+        drop_last=False,
+        num_workers=0,
+        **kwargs,
+    ):
+        if not isinstance(graph, GraphStore):
+            raise TypeError(
+                f"graph should be a GraphStore, but got {type(graph)}"
+            )
+        if input_nodes is None:
+            input_nodes = np.arange(graph.num_nodes, dtype='int64')
+        self.graph = graph
+        self.sample_sizes = list(sample_sizes)
+
+        super().__init__(
+            _NodeDataset(_to_numpy(input_nodes).reshape([-1])),
+            batch_size=batch_size,
+            shuffle=shuffle,
+            drop_last=drop_last,
+            collate_fn=_NeighborSampler(graph, self.sample_sizes),
+            num_workers=num_workers,
+            **kwargs,
+        )
@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import callbacks, hub, logger, progressbar, static_flops  # noqa: F401
+from ..utils.lazy_import import attach_lazy_submodules as _attach_lazy
+from . import callbacks, logger, progressbar, static_flops  # noqa: F401
 from .dynamic_flops import flops  # noqa: F401
+from .layer_profile import layer_profile  # noqa: F401
 from .model import Model  # noqa: F401
 from .model_summary import summary  # noqa: F401
 
+# NOTE: `hub` pulls in the http client of `paddle.utils.download`.
+__getattr__, __dir__ = _attach_lazy(__name__, globals(), ['hub'])
+
 logger.setup_logger()
 
 __all__ = []
@@ -0,0 +1,472 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numbers
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.base import core
+from paddle.base.framework import paddle_type_to_proto_type
+from paddle.jit.dy2static.program_translator import unwrap_decorators
+
+from .dynamic_flops import register_hooks
+from .static_flops import Table
+
+__all__ = []
+
+_SORT_KEYS = (
+    'forward_time',
+    'backward_time',
+    'flops',
+    'flops_per_second',
+    'activation_bytes',
+    'memory_delta',
+    'peak_memory_delta',
+)
+
+
+class _DeviceTimer:
+    """
+    Wall clock of the current device. Asynchronous devices are synchronized
+    before every reading, so the time between two readings covers the
+    kernels launched in between. CPU places are not synchronized.
+    """
+
+    def __init__(self):
+        self.place = paddle.framework._current_expected_place()
+        self.is_gpu = isinstance(self.place, core.CUDAPlace)
+        self.need_sync = not isinstance(self.place, core.CPUPlace)
+
+    def now(self):
+        if self.need_sync:
+            paddle.device.synchronize(self.place)
+        return time.perf_counter()
+
+    def memory(self):
+        if not self.is_gpu:
+            return None, None
+        device_id = self.place.get_device_id()
+        return (
+            paddle.device.cuda.memory_allocated(device_id),
+            paddle.device.cuda.max_memory_allocated(device_id),
+        )
+
+
+def _flatten_tensors(value):
+    if isinstance(value, (paddle.base.Variable, core.eager.Tensor)):
+        return [value]
+    elif isinstance(value, (list, tuple)):
+        return [t for v in value for t in _flatten_tensors(v)]
+    elif isinstance(value, dict):
+        return [t for v in value.values() for t in _flatten_tensors(v)]
+    return []
+
+
+def _get_shape(value):
+    if isinstance(value, (list, tuple)):
+        shapes = [_get_shape(v) for v in value]
+        return shapes[0] if len(shapes) == 1 else shapes
+    elif hasattr(value, 'shape'):
+        return list(value.shape)
+    return []
+
+
+def _tensor_nbytes(tensor):
+    dtype = tensor.dtype
+    if isinstance(dtype, core.DataType):
+        dtype = paddle_type_to_proto_type[dtype]
+    return int(np.prod(tensor.shape)) * core.size_of_dtype(dtype)
+
+
+def _is_shape(input_size):
+    return isinstance(input_size, (list, tuple)) and all(
+        isinstance(item, numbers.Number) or item is None for item in input_size
+    )
+
+
+def _build_input(input_size, dtypes):
+    if _is_shape(input_size):
+        shape = [
+            1 if (item is None or item == -1) else item for item in input_size
+        ]
+        dtype = dtypes[0] if isinstance(dtypes, (list, tuple)) else dtypes
+        return paddle.cast(paddle.rand(shape), dtype or 'float32')
+    if not isinstance(dtypes, (list, tuple)):
+        dtypes = [dtypes] * len(input_size)
+    return [_build_input(i, dtype) for i, dtype in zip(input_size, dtypes)]
+
+
+def _build_args(input_size, dtypes, input):
+    if input is not None:
+        if isinstance(input, (list, tuple)):
+            return tuple(input)
+        return (input,)
+    if input_size is None:
+        raise ValueError("input_size and input cannot be None at the same time")
+    if isinstance(input_size, paddle.static.InputSpec):
+        input_size = tuple(input_size.shape)
+    if _is_shape(input_size):
+        input_size = [input_size]
+    input_size = [
+        tuple(i.shape) if isinstance(i, paddle.static.InputSpec) else i
+        for i in input_size
+    ]
+    args = _build_input(input_size, dtypes)
+    for x in _flatten_tensors(args):
+        if x.dtype in (paddle.float16, paddle.bfloat16, paddle.float32):
+            x.stop_gradient = False
+    return tuple(args)
+
+
+def _count_flops(model, args, custom_ops):
+    """
+    Count the FLOPs of every leaf sublayer with the counting functions of
+    :ref:`api_paddle_flops`, returns a dict mapping each layer to its FLOPs.
+    """
+    handlers = []
+    counted = {}
+
+    def add_hooks(m):
+        if len(m._sub_layers) > 0:
+            return
+        flops_fn = custom_ops.get(type(m), register_hooks.get(type(m)))
+        if flops_fn is None:
+            return
+        m.register_buffer('total_ops', paddle.zeros([1], dtype='int64'))
+        counted[m] = None
+        handlers.append(m.register_forward_post_hook(flops_fn))
+
+    model.apply(add_hooks)
+    try:
+        with paddle.framework.no_grad():
+            model(*args)
+    finally:
+        for handler in handlers:
+            handler.remove()
+        for m in counted:
+            counted[m] = int(m._buffers.pop('total_ops'))
+    return counted
+
+
+def layer_profile(
+    net,
+    input_size=None,
+    dtypes=None,
+    input=None,
+    custom_ops=None,
+    warmup=1,
+    repeat=5,
+    backward=False,
+    sort_by=None,
+    print_detail=True,
+):
+    """Run real forward (and optionally backward) passes of the network and
+    measure the latency and memory of every leaf sublayer.
+
+    Unlike :ref:`api_paddle_summary` and :ref:`api_paddle_flops`, which only
+    report static information, the numbers here are measured on the current
+    device. For every leaf sublayer, the result contains:
+
+    - ``forward_time`` / ``backward_time``: mean wall time in seconds. The
+      ``backward_time`` is None if none of the inputs of the layer requires
+      gradient, e.g. the first layer of a network fed with ``input``.
+    - ``flops``: FLOPs counted in the same way as :ref:`api_paddle_flops`.
+    - ``flops_per_second``: achieved FLOP/s of the forward pass.
+    - ``activation_bytes``: bytes of the output tensors of the layer.
+    - ``memory_delta``: mean change of the allocated device memory after the
+      forward of the layer, only available on GPU.
+    - ``peak_memory_delta``: extra device memory allocated at the peak of the
+      forward of the layer, only available on GPU. Since the peak memory
+      statistics of the device cannot be reset, it is exact only when the
+      layer raises the peak memory of the device, otherwise it falls back to
+      ``memory_delta``.
+
+    Note:
+        The device is synchronized before and after every leaf sublayer, so
+        the sum of the per-layer time may be larger than the time of the
+        whole network, which can overlap kernels across layers.
+
+    Args:
+        net (paddle.nn.Layer): The network which must be a subclass of paddle.nn.Layer.
+        input_size (tuple|InputSpec|list[tuple|InputSpec], optional): Size of input tensor(s),
+                    the dim of batch_size can be None or -1. Default: None.
+        dtypes (str|list[str], optional): The dtypes of the input tensors, it only works
+                    with ``input_size``. Default: None, means 'float32'.
+        input (Tensor|list[Tensor], optional): The input tensor(s). If given, ``input_size``
+                    and ``dtypes`` are ignored. Default: None.
+        custom_ops (dict, optional): The FLOPs counting functions of specific layers, see
+                    :ref:`api_paddle_flops`. Default: None.
+        warmup (int, optional): The number of passes that are not measured. Default: 1.
+        repeat (int, optional): The number of measured passes. Default: 5.
+        backward (bool, optional): Whether to run and measure the backward pass, the loss
+                    is the sum of all float outputs of the network. The network runs in
+                    eval mode without backward, and in its current mode with backward.
+                    The modes and the gradients of the parameters are restored after
+                    profiling. Default: False.
+        sort_by (str, optional): Sort the printed table by this column in descending order,
+                    it can be one of 'forward_time', 'backward_time', 'flops', 'flops_per_second',
+                    'activation_bytes', 'memory_delta' and 'peak_memory_delta'. Default: None,
+                    means the order of execution.
+        print_detail (bool, optional): Whether to print the table. Default: True.
+
+    Returns:
+        dict: The profiling result of every leaf sublayer, whose key is the
+        structured name of the sublayer, in the order of execution.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> import paddle.nn as nn
+
+            >>> net = nn.Sequential(
+            ...     nn.Conv2D(1, 6, 3, stride=1, padding=1),
+            ...     nn.ReLU(),
+            ...     nn.Flatten(),
+            ...     nn.Linear(6 * 28 * 28, 10))
+            >>> result = paddle.hapi.layer_profile(
+            ...     net, (1, 1, 28, 28), backward=True, sort_by='forward_time', print_detail=False)
+            >>> print(list(result.keys()))
+            ['0', '1', '2', '3']
+            >>> print(result['3']['flops'])
+            47040
+    """
+    if not isinstance(net, nn.Layer):
+        raise TypeError(
+            f"The net must be an instance of paddle.nn.Layer, but got {type(net)}"
+        )
+    if not paddle.in_dynamic_mode():
+        raise RuntimeError("layer_profile only supports dynamic graph mode.")
+    if sort_by is not None and sort_by not in _SORT_KEYS:
+        raise ValueError(
+            f"sort_by should be one of {_SORT_KEYS}, but got {sort_by}"
+        )
+    if repeat < 1:
+        raise ValueError(f"repeat should be greater than 0, but got {repeat}")
+
+    # If net is a dy2stat model, net.forward is StaticFunction instance,
+    # we set net.forward to original forward function.
+    _, net.forward = unwrap_decorators(net.forward)
+
+    args = _build_args(input_size, dtypes, input)
+    # the modes and the gradients of the caller are restored after profiling
+    modes = [
+        (layer, layer.training) for layer in net.sublayers(include_self=True)
+    ]
+    saved_grads = []
+    if backward:
+        for p in net.parameters():
+            if p.grad is not None:
+                saved_grads.append((p, p.grad.clone()))
+        net.clear_gradients(set_to_zero=False)
+    else:
+        net.eval()
+
+    timer = _DeviceTimer()
+    names = {}
+    for name, layer in net.named_sublayers(include_self=True):
+        if len(layer._sub_layers) == 0:
+            names[layer] = name
+
+    result = OrderedDict()
+    pending = {}
+    handlers = []
+    measuring = [False]
+
+    def _new_record(layer, inputs, outputs):
+        return {
+            'type': type(layer).__name__,
+            'input_shape': _get_shape(inputs),
+            'output_shape': _get_shape(outputs),
+            'params': sum(
+                int(np.prod(p.shape))
+                for p in layer._parameters.values()
+                if p is not None
+            ),
+            'flops': 0,
+            'forward_time': 0.0,
+            'backward_time': None,
+            'flops_per_second': None,
+            'activation_bytes': 0,
+            'memory_delta': None,
+            'peak_memory_delta': None,
+        }
+
+    def _register_backward_timer(record, inputs, outputs):
+        # the gradient of the outputs is ready when the backward of the layer
+        # starts, and the gradient of the inputs when it ends.
+        span = [None, None]
+        for y in _flatten_tensors(outputs):
+            if not y.stop_gradient:
+
+                def _on_output_grad(grad):
+                    now = timer.now()
+                    span[0] = now if span[0] is None else min(span[0], now)
+
+                y.register_hook(_on_output_grad)
+        for x in _flatten_tensors(inputs):
+            if not x.stop_gradient:
+
+                def _on_input_grad(grad):
+                    now = timer.now()
+                    span[1] = now if span[1] is None else max(span[1], now)
+
+                x.register_hook(_on_input_grad)
+        record.setdefault('_backward_spans', []).append(span)
+
+    def pre_hook(layer, inputs):
+        if not measuring[0]:
+            return
+        allocated, peak = timer.memory()
+        pending[layer] = (allocated, peak, timer.now())
+
+    def post_hook(layer, inputs, outputs):
+        if not measuring[0] or layer not in pending:
+            return
+        end = timer.now()
+        allocated_before, peak_before, start = pending.pop(layer)
+        name = names[layer]
+        record = result.get(name)
+        if record is None:
+            record = result[name] = _new_record(layer, inputs, outputs)
+            record['activation_bytes'] = sum(
+                _tensor_nbytes(y) for y in _flatten_tensors(outputs)
+            )
+        record['forward_time'] += end - start
+        if allocated_before is not None:
+            allocated_after, peak_after = timer.memory()
+            memory_delta = allocated_after - allocated_before
+            if peak_after > peak_before:
+                peak_memory_delta = peak_after - allocated_before
+            else:
+                peak_memory_delta = max(memory_delta, 0)
+            record['memory_delta'] = (
+                record['memory_delta'] or 0
+            ) + memory_delta
+            record['peak_memory_delta'] = max(
+                record['peak_memory_delta'] or 0, peak_memory_delta
+            )
+        if backward:
+            _register_backward_timer(record, inputs, outputs)
+
+    def run_once():
+        if not backward:
+            with paddle.framework.no_grad():
+                net(*args)
+            return
+        outputs = [
+            y
+            for y in _flatten_tensors(net(*args))
+            if paddle.is_floating_point(y) and not y.stop_gradient
+        ]
+        if len(outputs) > 0:
+            paddle.add_n([y.sum() for y in outputs]).backward()
+        net.clear_gradients(set_to_zero=False)
+
+    try:
+        flops = _count_flops(net, args, custom_ops or {})
+        for layer in names:
+            handlers.append(layer.register_forward_pre_hook(pre_hook))
+            handlers.append(layer.register_forward_post_hook(post_hook))
+        for _ in range(warmup):
+            run_once()
+        measuring[0] = True
+        for _ in range(repeat):
+            run_once()
+    finally:
+        measuring[0] = False
+        for handler in handlers:
+            handler.remove()
+        for layer, training in modes:
+            layer.training = training
+        if backward:
+            net.clear_gradients(set_to_zero=False)
+            for p, grad in saved_grads:
+                p.grad = grad
+
+    for layer, name in names.items():
+        record = result.get(name)
+        if record is None:
+            continue
+        record['forward_time'] /= repeat
+        if record['memory_delta'] is not None:
+            record['memory_delta'] /= repeat
+        record['flops'] = flops.get(layer, 0)
+        if record['forward_time'] > 0:
+            record['flops_per_second'] = (
+                record['flops'] / record['forward_time']
+            )
+        spans = [
+            end - start
+            for start, end in record.pop('_backward_spans', [])
+            if start is not None and end is not None
+        ]
+        if len(spans) > 0:
+            record['backward_time'] = sum(spans) / len(spans)
+
+    if print_detail:
+        _print_profile(result, sort_by)
+    return result
+
+
+def _print_profile(result, sort_by):
+    def _fmt(value, scale=1.0, precision=3):
+        if value is None:
+            return '-'
+        return f'{value / scale:.{precision}f}'
+
+    items = list(result.items())
+    if sort_by is not None:
+        items.sort(key=lambda item: item[1][sort_by] or 0, reverse=True)
+
+    table = Table(
+        [
+            "Layer Name",
+            "Type",
+            "Output Shape",
+            "Flops",
+            "Forward (ms)",
+            "Backward (ms)",
+            "GFLOP/s",
+            "Activation (MB)",
+            "Mem Delta (MB)",
+            "Peak Mem Delta (MB)",
+        ]
+    )
+    for name, record in items:
+        table.add_row(
+            [
+                name,
+                record['type'],
+                record['output_shape'],
+                record['flops'],
+                _fmt(record['forward_time'], 1e-3),
+                _fmt(record['backward_time'], 1e-3),
+                _fmt(record['flops_per_second'], 1e9),
+                _fmt(record['activation_bytes'], 2**20),
+                _fmt(record['memory_delta'], 2**20),
+                _fmt(record['peak_memory_delta'], 2**20),
+            ]
+        )
+    table.print_table()
+    total_forward = sum(r['forward_time'] for r in result.values())
+    total_backward = sum(r['backward_time'] or 0 for r in result.values())
+    print(
+        f'Total Forward: {total_forward * 1e3:.3f} ms     '
+        f'Total Backward: {total_backward * 1e3:.3f} ms'
+    )
@@ -23,10 +23,6 @@ from paddle.base.data_feeder import (
 from paddle.base.framework import Variable
 from paddle.base.layer_helper import LayerHelper
 from paddle.framework import in_dynamic_or_pir_mode
-from paddle.geometric.message_passing.utils import (
-    convert_out_size_to_list,
-    get_out_size_tensor_inputs,
-)
 from paddle.utils import deprecated
 
 
@@ -135,6 +131,12 @@ def graph_send_recv(
             % pool_type
         )
 
+    # paddle.geometric is imported lazily by paddle
+    from paddle.geometric.message_passing.utils import (
+        convert_out_size_to_list,
+        get_out_size_tensor_inputs,
+    )
+
     # TODO(daisiming): Should we add judgement for out_size: max(dst_index) + 1.
     if in_dynamic_or_pir_mode():
         out_size = convert_out_size_to_list(out_size, 'graph_send_recv')
@@ -16,11 +16,13 @@
 
 from .dataloader import (
     BatchSampler,
+    BucketBatchSampler,
     ChainDataset,
     ComposeDataset,
     ConcatDataset,
     Dataset,
     DistributedBatchSampler,
+    DistributedBucketBatchSampler,
     IterableDataset,
     RandomSampler,
     Sampler,
@@ -42,6 +44,8 @@ __all__ = [
     'ChainDataset',
     'BatchSampler',
     'DistributedBatchSampler',
+    'BucketBatchSampler',
+    'DistributedBucketBatchSampler',
     'DataLoader',
     'get_worker_info',
     'Sampler',
@@ -14,7 +14,9 @@
 
 from .batch_sampler import (  # noqa: F401
     BatchSampler,
+    BucketBatchSampler,
     DistributedBatchSampler,
+    DistributedBucketBatchSampler,
 )
 from .dataset import (  # noqa: F401
     ChainDataset,
@@ -368,3 +368,277 @@ class DistributedBatchSampler(BatchSampler):
                 ...     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+
+
+class BucketBatchSampler(BatchSampler):
+    """
+    Batch sampler which groups samples of similar lengths into a mini-batch,
+    to reduce the padding of variable-length sequence data.
+
+    The sample indices are (shuffled and) split into buckets of
+    :attr:`bucket_size` samples, the samples in each bucket are sorted by
+    length, and then packed into mini-batches greedily, in which the number
+    of samples multiplied by the max length, i.e. the number of tokens after
+    padding, does not exceed :attr:`max_tokens`. A sample longer than
+    :attr:`max_tokens` forms a mini-batch alone. If :attr:`shuffle` is True,
+    the order of the mini-batches is also shuffled. The shuffling is
+    determined by :attr:`seed` and the epoch number.
+
+    Args:
+        lengths(list|tuple|numpy.ndarray|Dataset): the lengths of all samples,
+                or a dataset which implements :code:`get_lengths()` to
+                return the lengths of all samples.
+        max_tokens(int, optional): the max number of tokens after padding of
+                a mini-batch. Default None, no limit.
+        batch_size(int, optional): the max number of samples of a mini-batch.
+                Default None, no limit. At least one of :attr:`max_tokens`
+                and :attr:`batch_size` should be set.
+        bucket_size(int, optional): the number of samples sorted by length
+                together. A smaller bucket brings more randomness, and more
+                padding. Default None, sort all samples together.
+        shuffle(bool, optional): whether to shuffle the samples and
+                mini-batches. Default False.
+        seed(int, optional): the random seed used to shuffle. Default 0.
+
+    Returns:
+        BucketBatchSampler, an iterable object for indices iterating.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> from paddle.io import BucketBatchSampler
+
+            >>> lengths = [5, 12, 3, 8, 11, 4, 7, 6]
+            >>> bs = BucketBatchSampler(lengths, max_tokens=24)
+            >>> for batch_indices in bs:
+            ...     print(batch_indices)
+            [2, 5, 0, 7]
+            [6, 3]
+            [4, 1]
+    """
+
+    def __init__(
+        self,
+        lengths,
+        max_tokens=None,
+        batch_size=None,
+        bucket_size=None,
+        shuffle=False,
+        seed=0,
+    ):
+        if hasattr(lengths, 'get_lengths'):
+            lengths = lengths.get_lengths()
+        self.lengths = np.asarray(lengths, dtype='int64')
+        assert (
+            self.lengths.ndim == 1
+        ), f"lengths should be 1-D, but got shape {self.lengths.shape}"
+
+        assert (
+            max_tokens is not None or batch_size is not None
+        ), "either max_tokens or batch_size should be set"
+        assert max_tokens is None or (
+            isinstance(max_tokens, int) and max_tokens > 0
+        ), f"max_tokens should be a positive integer, but got {max_tokens}"
+        assert batch_size is None or (
+            isinstance(batch_size, int) and batch_size > 0
+        ), f"batch_size should be a positive integer, but got {batch_size}"
+        assert bucket_size is None or (
+            isinstance(bucket_size, int) and bucket_size > 0
+        ), f"bucket_size should be a positive integer, but got {bucket_size}"
+        assert isinstance(
+            shuffle, bool
+        ), f"shuffle should be a boolean value, but got {type(shuffle)}"
+        self.max_tokens = max_tokens
+        self.batch_size = batch_size
+        self.bucket_size = bucket_size or max(len(self.lengths), 1)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = False
+        self.epoch = 0
+        self._batches = None
+
+    def _pack(self, indices):
+        # the indices are sorted by length, so the length of the new sample
+        # is the max length of the mini-batch
+        batches = []
+        batch = []
+        for idx, length in zip(indices, self.lengths[indices].tolist()):
+            if batch and (
+                (self.batch_size is not None and len(batch) == self.batch_size)
+                or (
+                    self.max_tokens is not None
+                    and length * (len(batch) + 1) > self.max_tokens
+                )
+            ):
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _get_batches(self):
+        if self._batches is not None and self._batches[0] == self.epoch:
+            return self._batches[1]
+
+        rng = np.random.RandomState((self.seed + self.epoch) % 2**32)
+        if self.shuffle:
+            indices = rng.permutation(len(self.lengths))
+        else:
+            indices = np.arange(len(self.lengths))
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = indices[start : start + self.bucket_size]
+            # stable sort keeps the shuffled order of the same lengths
+            order = np.argsort(self.lengths[bucket], kind='stable')
+            batches.extend(self._pack(bucket[order].tolist()))
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        self._batches = (self.epoch, batches)
+        return batches
+
+    def __iter__(self):
+        yield from self._get_batches()
+        if self.shuffle:
+            self.epoch += 1
+
+    def __len__(self):
+        return len(self._get_batches())
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number. When :attr:`shuffle=True`, this number is used
+        with :attr:`seed` as the seed of random numbers. By default, the epoch
+        number increases after every epoch.
+
+        Arguments:
+            epoch (int): Epoch number.
+
+        Examples:
+            .. code-block:: python
+
+                >>> from paddle.io import BucketBatchSampler
+
+                >>> lengths = [5, 12, 3, 8, 11, 4, 7, 6]
+                >>> bs = BucketBatchSampler(lengths, max_tokens=24, shuffle=True)
+
+                >>> for epoch in range(10):
+                ...     bs.set_epoch(epoch)
+        """
+        self.epoch = epoch
+
+
+class DistributedBucketBatchSampler(BucketBatchSampler):
+    """
+    Distributed version of :ref:`api_paddle_io_BucketBatchSampler`, which
+    restricts each process to a subset of the mini-batches.
+
+    All processes build the same mini-batches with the same :attr:`seed` and
+    epoch number, and every :attr:`num_replicas` consecutive mini-batches are
+    dispatched to the processes, so that every process gets the same number
+    of mini-batches.
+
+    Args:
+        lengths(list|tuple|numpy.ndarray|Dataset): the lengths of all samples,
+                or a dataset which implements :code:`get_lengths()` to
+                return the lengths of all samples.
+        max_tokens(int, optional): the max number of tokens after padding of
+                a mini-batch. Default None, no limit.
+        batch_size(int, optional): the max number of samples of a mini-batch.
+                Default None, no limit. At least one of :attr:`max_tokens`
+                and :attr:`batch_size` should be set.
+        num_replicas(int, optional): process number in distributed training.
+            If :attr:`num_replicas` is None, :attr:`num_replicas` will be
+            retrieved from :ref:`api_paddle_distributed_ParallelEnv` .
+            Default None.
+        rank(int, optional): the rank of the current process among :attr:`num_replicas`
+            processes. If :attr:`rank` is None, :attr:`rank` is retrieved from
+            :ref:`api_paddle_distributed_ParallelEnv`. Default None.
+        bucket_size(int, optional): the number of samples sorted by length
+                together. Default None, sort all samples together.
+        shuffle(bool, optional): whether to shuffle the samples and
+                mini-batches. Default False.
+        drop_last(bool, optional): whether to drop the last mini-batches which
+                can not be dispatched to all processes evenly. Default False,
+                dispatch the first mini-batches again to fill them up.
+        seed(int, optional): the random seed used to shuffle, which should be
+                the same in all processes. Default 0.
+
+    Returns:
+        DistributedBucketBatchSampler, an iterable object for indices iterating.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> from paddle.io import DistributedBucketBatchSampler
+
+            >>> lengths = [5, 12, 3, 8, 11, 4, 7, 6]
+            >>> bs = DistributedBucketBatchSampler(
+            ...     lengths, max_tokens=24, num_replicas=2, rank=0
+            ... )
+            >>> for batch_indices in bs:
+            ...     print(batch_indices)
+            [2, 5, 0, 7]
+            [4, 1]
+    """
+
+    def __init__(
+        self,
+        lengths,
+        max_tokens=None,
+        batch_size=None,
+        num_replicas=None,
+        rank=None,
+        bucket_size=None,
+        shuffle=False,
+        drop_last=False,
+        seed=0,
+    ):
+        super().__init__(
+            lengths,
+            max_tokens=max_tokens,
+            batch_size=batch_size,
+            bucket_size=bucket_size,
+            shuffle=shuffle,
+            seed=seed,
+        )
+        assert isinstance(
+            drop_last, bool
+        ), "drop_last should be a boolean number"
+        self.drop_last = drop_last
+
+        from paddle.distributed import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+    def _get_batches(self):
+        if self._batches is not None and self._batches[0] == self.epoch:
+            return self._batches[1]
+
+        batches = super()._get_batches()
+        num_batches = len(batches) // self.nranks * self.nranks
+        if not self.drop_last and num_batches < len(batches):
+            num_batches += self.nranks
+            # add extra mini-batches to make it evenly divisible
+            batches = batches * math.ceil(num_batches / len(batches))
+        batches = batches[self.local_rank : num_batches : self.nranks]
+
+        self._batches = (self.epoch, batches)
+        return batches
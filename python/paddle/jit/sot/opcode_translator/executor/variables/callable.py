@@ -567,6 +567,8 @@ class PaddleLayerVariable(LayerVariable):
                 and value._forward_pre_hooks
                 or hasattr(value, "_forward_post_hooks")
                 and value._forward_post_hooks
+                or paddle.nn.layer.layers._global_forward_pre_hooks
+                or paddle.nn.layer.layers._global_forward_post_hooks
                 or is_not_supported_paddle_layer(type(value))
             ):
                 return None
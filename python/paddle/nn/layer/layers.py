@@ -313,6 +313,197 @@ class LayerOpsRecorder:
         self.hooks = hooks
 
 
+# Bumped on every mutation of any forward hook container, so that the
+# cached forward call plans of all layers can be validated with a single
+# integer comparison.
+_forward_hooks_generation = 0
+
+# Source of the per-layer structure generations, bumped on every mutation of
+# the parameters, buffers, sublayers or state_dict hooks of a layer, see
+# `Layer._bump_structure_generation`.
+_layer_structure_generation = 0
+
+
+class _VersionedOrderedDict(collections.OrderedDict):
+    """
+    OrderedDict that calls `on_change` whenever it is modified.
+    """
+
+    def __init__(self, *args, on_change=None, **kwargs):
+        # set before filling the dict, which calls `__setitem__`
+        self._on_change = on_change
+        super().__init__(*args, **kwargs)
+
+    def __reduce__(self):
+        # the callback is bound to its owner, which restores it when the
+        # owner is unpickled or deep copied
+        return (collections.OrderedDict, (list(self.items()),))
+
+    def _bump_generation(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def __setitem__(self, key, value):
+        if key in self and self[key] is value:
+            return
+        super().__setitem__(key, value)
+        self._bump_generation()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._bump_generation()
+
+    def move_to_end(self, key, last=True):
+        super().move_to_end(key, last=last)
+        self._bump_generation()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._bump_generation()
+        return value
+
+    def popitem(self, last=True):
+        item = super().popitem(last=last)
+        self._bump_generation()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._bump_generation()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._bump_generation()
+
+
+class _ForwardHookDict(_VersionedOrderedDict):
+    """
+    OrderedDict that stores forward hooks and invalidates the cached
+    forward call plans of layers whenever it is modified.
+    """
+
+    def _bump_generation(self):
+        global _forward_hooks_generation
+        _forward_hooks_generation += 1
+
+
+class _LayerStructureDict(_VersionedOrderedDict):
+    """
+    OrderedDict that stores the parameters, buffers, sublayers or state_dict
+    hooks of a layer and invalidates the cached structure indexes of the
+    layer and its ancestors whenever it is modified.
+    """
+
+    def __init__(self, layer, *args):
+        # hold the layer weakly, so that it is still freed by refcount
+        layer_ref = weakref.ref(layer)
+        self._layer_ref = layer_ref
+
+        def on_change():
+            layer = layer_ref()
+            if layer is not None:
+                layer._bump_structure_generation()
+
+        super().__init__(*args, on_change=on_change)
+
+
+# Attributes of Layer that must always hold a `_LayerStructureDict`.
+_LAYER_STRUCTURE_DICT_NAMES = frozenset(
+    ['_parameters', '_buffers', '_sub_layers', '_state_dict_hooks']
+)
+
+
+def _join_structured_name(prefix, name):
+    if not prefix:
+        return name
+    return prefix + ('.' if name else '') + name
+
+
+class _LayerStructureIndex:
+    """
+    Flattened (qualified name -> parameter/buffer/sublayer) view of a layer tree.
+
+    It is built once per structure generation and shared by `named_sublayers`,
+    `named_parameters`, `named_buffers`, `state_dict` and `flat_state_dict`,
+    so that these APIs don't need to walk the layer tree and rebuild the
+    prefixed names on every call.
+    """
+
+    __slots__ = [
+        'generation',
+        'named_sublayers',
+        'named_parameters',
+        'named_buffers',
+        'persistable_state',
+        'full_state',
+        'state_names',
+        'state_tensors',
+        'has_state_dict_hooks',
+    ]
+
+    def __init__(self, layer):
+        self.generation = layer._structure_generation
+        self.named_sublayers = tuple(
+            layer.named_sublayers(include_self=True, layers_set=set())
+        )
+
+        named_parameters = []
+        named_buffers = []
+        params_set = set()
+        buffers_set = set()
+        for layer_prefix, sublayer in self.named_sublayers:
+            for key, param in sublayer._parameters.items():
+                if param is None or param in params_set:
+                    continue
+                params_set.add(param)
+                named_parameters.append(
+                    (_join_structured_name(layer_prefix, key), param)
+                )
+            for key, buffer in sublayer._buffers.items():
+                if buffer is None or buffer in buffers_set:
+                    continue
+                buffers_set.add(buffer)
+                named_buffers.append(
+                    (_join_structured_name(layer_prefix, key), buffer)
+                )
+        self.named_parameters = tuple(named_parameters)
+        self.named_buffers = tuple(named_buffers)
+        self.has_state_dict_hooks = any(
+            sublayer._state_dict_hooks for _, sublayer in self.named_sublayers
+        )
+
+        # Same traversal as `Layer._state_dict_impl`: shared sublayers are
+        # visited once per path and later names overwrite earlier ones.
+        self.persistable_state = collections.OrderedDict()
+        self.full_state = collections.OrderedDict()
+        self._collect_state(layer, "")
+        self.state_names = tuple(self.persistable_state.keys())
+        self.state_tensors = tuple(self.persistable_state.values())
+
+    def _collect_state(self, layer, prefix):
+        for name, data in layer._parameters.items():
+            if data is not None:
+                self.persistable_state[prefix + name] = data
+                self.full_state[prefix + name] = data
+        for name, buffer in layer._buffers.items():
+            if buffer is not None:
+                if name not in layer._non_persistable_buffer_names_set:
+                    self.persistable_state[prefix + name] = buffer
+                self.full_state[prefix + name] = buffer
+        for layer_name, layer_item in layer._sub_layers.items():
+            if layer_item is not None:
+                # so that the changes of the sublayers reach this index
+                layer_item._add_parent_layer(layer)
+                self._collect_state(layer_item, prefix + layer_name + ".")
+
+
+# Forward hooks applied to every Layer, registered by
+# `register_layer_forward_pre_hook` and `register_layer_forward_post_hook`.
+_global_forward_pre_hooks = _ForwardHookDict()
+_global_forward_post_hooks = _ForwardHookDict()
+
+
 class HookRemoveHelper:
     """A HookRemoveHelper that can be used to remove hook."""
 
@@ -329,6 +520,81 @@ class HookRemoveHelper:
             del hooks[self._hook_id]
 
 
+def register_layer_forward_pre_hook(hook):
+    """
+
+    Register a forward pre-hook shared by all Layers. The hook will be called before the `forward`
+    function of every Layer, ahead of the pre-hooks registered on the Layer itself.
+
+    Registering a global hook once is much cheaper than registering the same hook on thousands
+    of sublayers, both at registration time and on every call.
+
+    hook(Layer, input) -> None or modified input
+
+    Parameters:
+        hook(function): a function registered as a global forward pre-hook
+
+    Returns:
+        HookRemoveHelper, a HookRemoveHelper object that can be used to remove the added hook by calling `hook_remove_helper.remove()` .
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.nn.utils import register_layer_forward_pre_hook
+
+            >>> called_layers = []
+            >>> def forward_pre_hook(layer, input):
+            ...     called_layers.append(layer.full_name())
+            ...
+            >>> model = paddle.nn.Sequential(paddle.nn.Linear(2, 2), paddle.nn.ReLU())
+            >>> handle = register_layer_forward_pre_hook(forward_pre_hook)
+            >>> out = model(paddle.rand([1, 2]))
+            >>> handle.remove()
+            >>> print(len(called_layers))
+            3
+    """
+    hook_remove_helper = HookRemoveHelper(_global_forward_pre_hooks)
+    _global_forward_pre_hooks[hook_remove_helper._hook_id] = hook
+    return hook_remove_helper
+
+
+def register_layer_forward_post_hook(hook):
+    """
+
+    Register a forward post-hook shared by all Layers. The hook will be called after the `forward`
+    function of every Layer, ahead of the post-hooks registered on the Layer itself.
+
+    hook(Layer, input, output) -> None or modified output
+
+    Parameters:
+        hook(function): a function registered as a global forward post-hook
+
+    Returns:
+        HookRemoveHelper, a HookRemoveHelper object that can be used to remove the added hook by calling `hook_remove_helper.remove()` .
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.nn.utils import register_layer_forward_post_hook
+
+            >>> output_shapes = {}
+            >>> def forward_post_hook(layer, input, output):
+            ...     output_shapes[layer.full_name()] = output.shape
+            ...
+            >>> linear = paddle.nn.Linear(2, 3)
+            >>> handle = register_layer_forward_post_hook(forward_post_hook)
+            >>> out = linear(paddle.rand([4, 2]))
+            >>> handle.remove()
+            >>> print(output_shapes[linear.full_name()])
+            [4, 3]
+    """
+    hook_remove_helper = HookRemoveHelper(_global_forward_post_hooks)
+    _global_forward_post_hooks[hook_remove_helper._hook_id] = hook
+    return hook_remove_helper
+
+
 class Layer:
     """
     Dynamic graph Layer based on OOD, includes the parameters of the layer, the structure of the forward graph and so on.
@@ -384,6 +650,12 @@ class Layer:
              [-0.68077987]])
     """
 
+    # (hooks generation, pre-hooks, post-hooks), see `_get_forward_call_plan`
+    _forward_call_plan = (-1, (), ())
+    # see `_get_structure_index`
+    _structure_index = None
+    _structure_generation = 0
+
     def __init__(self, name_scope=None, dtype="float32"):
         self.training = True
         if name_scope is None:
@@ -395,24 +667,26 @@ class Layer:
         self._dtype = dtype
         self._init_in_dynamic_mode = in_dygraph_mode()
 
-        self._parameters = collections.OrderedDict()
+        self._parameters = _LayerStructureDict(self)
         # Buffers the variable (not parameter) created in layer
-        self._buffers = collections.OrderedDict()
+        self._buffers = _LayerStructureDict(self)
+        # NOTE: this set is always modified together with `_buffers`, which
+        # invalidates the cached structure index.
         self._non_persistable_buffer_names_set = set()
-        self._sub_layers = collections.OrderedDict()
+        self._sub_layers = _LayerStructureDict(self)
         self._loaddict_holder = collections.OrderedDict()
 
         # Record generated op_descs in this layer
         self._op_recorder = LayerOpsRecorder(ops=[], hooks=[])
         self._customized_attrs = {}
 
-        self._forward_pre_hooks = collections.OrderedDict()
-        self._forward_post_hooks = collections.OrderedDict()
+        self._forward_pre_hooks = _ForwardHookDict()
+        self._forward_post_hooks = _ForwardHookDict()
 
         # only used in AMP Training
         self._cast_to_low_precision = True
 
-        self._state_dict_hooks = collections.OrderedDict()
+        self._state_dict_hooks = _LayerStructureDict(self)
         # Records original functions after @to_static to support to rollback
         self._original_funcs = collections.OrderedDict()
 
@@ -1137,6 +1411,13 @@ class Layer:
                  [-0.62100595,  0.22293305,  0.28229684, -0.03687060, -0.59323978,
                  0.08411229,  0.53275704,  0.40431368,  0.03171402, -0.17922515]])
         """
+        if include_sublayers:
+            index = self._get_structure_index()
+            if index is not None:
+                for name, param in index.named_parameters:
+                    yield _join_structured_name(prefix, name), param
+                return
+
         params_set = (
             ValueSet() if in_pir_mode() and not in_to_static_mode() else set()
         )
@@ -1181,6 +1462,14 @@ class Layer:
                 1 Linear(in_features=3, out_features=10, dtype=float32)
         """
         if layers_set is None:
+            index = self._get_structure_index()
+            if index is not None:
+                named_sublayers = index.named_sublayers
+                if not include_self:
+                    named_sublayers = named_sublayers[1:]
+                for name, layer in named_sublayers:
+                    yield _join_structured_name(prefix, name), layer
+                return
             layers_set = set()
         if include_self and self not in layers_set:
             layers_set.add(self)
@@ -1255,10 +1544,7 @@ class Layer:
             )
         else:
             self._buffers[name] = tensor
-            if persistable:
-                self._non_persistable_buffer_names_set.discard(name)
-            else:
-                self._non_persistable_buffer_names_set.add(name)
+            self._set_buffer_persistable(name, persistable)
 
     def buffers(self, include_sublayers=True):
         """
@@ -1334,6 +1620,13 @@ class Layer:
                 1.buf_name_2 Tensor(shape=[1], dtype=float32, place=Place(cpu), stop_gradient=True,
                 [1.])
         """
+        if include_sublayers:
+            index = self._get_structure_index()
+            if index is not None:
+                for name, buffer in index.named_buffers:
+                    yield _join_structured_name(prefix, name), buffer
+                return
+
         buffers_set = set()
         named_sublayers = (
             self.named_sublayers(prefix=prefix, include_self=True)
@@ -1381,11 +1674,120 @@ class Layer:
             if p.trainable:
                 p.clear_gradient(set_to_zero)
 
+    def _add_parent_layer(self, parent):
+        parents = self.__dict__.get('_parent_layers', None)
+        if parents is None:
+            parents = {}
+            object.__setattr__(self, '_parent_layers', parents)
+        if id(parent) not in parents:
+            parents[id(parent)] = weakref.ref(parent)
+
+    def _bump_structure_generation(self):
+        """
+        Invalidate the cached structure indexes of this layer and of the
+        layers it has been indexed under. The parents are never removed, a
+        detached sublayer only invalidates its former ancestors needlessly.
+        """
+        global _layer_structure_generation
+        _layer_structure_generation += 1
+        generation = _layer_structure_generation
+        layers = [self]
+        while layers:
+            layer = layers.pop()
+            if layer.__dict__.get('_structure_generation') == generation:
+                continue
+            object.__setattr__(layer, '_structure_generation', generation)
+            for parent_ref in layer.__dict__.get('_parent_layers', {}).values():
+                parent = parent_ref()
+                if parent is not None:
+                    layers.append(parent)
+
+    def _set_buffer_persistable(self, name, persistable):
+        # the persistable buffers are indexed for state_dict, so the index
+        # is invalidated once the flag of a buffer changes
+        names = self._non_persistable_buffer_names_set
+        if persistable == (name not in names):
+            return
+        if persistable:
+            names.discard(name)
+        else:
+            names.add(name)
+        self._bump_structure_generation()
+
+    def _get_structure_index(self):
+        """
+        Return the cached `_LayerStructureIndex` of this layer, rebuilding it
+        if any parameter, buffer, sublayer or state_dict hook of this layer or
+        its sublayers has been modified since it was built. Return None if not
+        in dynamic graph mode, where parameters may be replaced by static
+        variables.
+        """
+        if in_to_static_mode() or not in_dygraph_mode():
+            return None
+        index = self._structure_index
+        if index is None or index.generation != self._structure_generation:
+            index = _LayerStructureIndex(self)
+            # bypass Layer.__setattr__, which is too heavy for this cache
+            object.__setattr__(self, '_structure_index', index)
+        return index
+
+    def flat_state_dict(self):
+        """
+        Get the names and tensors of all parameters and persistable buffers of current layer and its sub-layers,
+        as two tuples in the same stable order as the keys of `state_dict()`.
+
+        The tuples are cached and only rebuilt after parameters, buffers or sublayers are added, removed or
+        replaced, which makes this API suitable for per-step use like EMA or gradient clipping.
+
+        Returns:
+            tuple, a tuple ``(names, tensors)`` of a tuple of str and a tuple of Tensor.
+
+        Examples:
+            .. code-block:: python
+
+                >>> import paddle
+
+                >>> model = paddle.nn.Sequential(paddle.nn.Linear(2, 3), paddle.nn.BatchNorm1D(3))
+                >>> names, tensors = model.flat_state_dict()
+                >>> print(names)
+                ('0.weight', '0.bias', '1.weight', '1.bias', '1._mean', '1._variance')
+        """
+        index = self._get_structure_index()
+        if index is None:
+            state = self._obtain_parameters_buffers()
+            return tuple(state.keys()), tuple(state.values())
+        return index.state_names, index.state_tensors
+
     def _build_once(self, *args, **kwargs):
         pass
 
+    def _get_forward_call_plan(self):
+        """
+        Return the cached forward call plan ``(generation, pre_hooks, post_hooks)``
+        of this layer, where the hooks are flattened into tuples with the global
+        hooks in front. The plan is only rebuilt after some forward hook container
+        has been modified, so calls don't need to iterate the hook dicts.
+        """
+        plan = self._forward_call_plan
+        if plan[0] != _forward_hooks_generation:
+            plan = (
+                _forward_hooks_generation,
+                (
+                    *_global_forward_pre_hooks.values(),
+                    *self._forward_pre_hooks.values(),
+                ),
+                (
+                    *_global_forward_post_hooks.values(),
+                    *self._forward_post_hooks.values(),
+                ),
+            )
+            # bypass Layer.__setattr__, which is too heavy for the call path
+            object.__setattr__(self, '_forward_call_plan', plan)
+        return plan
+
     def _dygraph_call_func(self, *inputs, **kwargs):
-        for forward_pre_hook in self._forward_pre_hooks.values():
+        _, forward_pre_hooks, forward_post_hooks = self._get_forward_call_plan()
+        for forward_pre_hook in forward_pre_hooks:
             hook_result = forward_pre_hook(self, inputs)
             if hook_result is not None:
                 if not isinstance(hook_result, tuple):
@@ -1402,11 +1804,14 @@ class Layer:
                 self.__class__.__name__, profiler.TracerEventType.Forward
             ):
                 outputs = self.forward(*inputs, **kwargs)
+        elif in_dygraph_mode():
+            # name_struct only records the call path in static graph
+            outputs = self.forward(*inputs, **kwargs)
         else:
             with name_struct(self.__class__.__name__):
                 outputs = self.forward(*inputs, **kwargs)
 
-        for forward_post_hook in self._forward_post_hooks.values():
+        for forward_post_hook in forward_post_hooks:
             hook_result = forward_post_hook(self, inputs, outputs)
             if hook_result is not None:
                 outputs = hook_result
@@ -1416,16 +1821,17 @@ class Layer:
     def __call__(self, *inputs, **kwargs):
         if (
             (not in_to_static_mode())
-            and (not self._forward_pre_hooks)
-            and (not self._forward_post_hooks)
-            and (not self._built)
             and in_dygraph_mode()
             and (not in_profiler_mode())
         ):
-            self._build_once(*inputs, **kwargs)
-            return self.forward(*inputs, **kwargs)
-        else:
-            return self._dygraph_call_func(*inputs, **kwargs)
+            plan = self._forward_call_plan
+            if plan[0] != _forward_hooks_generation:
+                plan = self._get_forward_call_plan()
+            if not (plan[1] or plan[2]):
+                if not self._built:
+                    self._build_once(*inputs, **kwargs)
+                return self.forward(*inputs, **kwargs)
+        return self._dygraph_call_func(*inputs, **kwargs)
 
     def forward(self, *inputs, **kwargs):
         """
@@ -1623,10 +2029,28 @@ class Layer:
             self._op_recorder.hooks.append(post_hook_helper)
 
     def __getstate__(self):
-        return self.__dict__
+        state = dict(self.__dict__)
+        # the weak references can't be pickled, the parents register
+        # themselves again when their indexes are rebuilt
+        state.pop('_parent_layers', None)
+        # the caches hold the global forward hooks, and their generations
+        # are meaningless in another process
+        state.pop('_forward_call_plan', None)
+        state.pop('_structure_index', None)
+        state.pop('_structure_generation', None)
+        return state
 
     def __setstate__(self, state):
         self.__dict__.update(state)
+        for name in ('_forward_pre_hooks', '_forward_post_hooks'):
+            hooks = self.__dict__.get(name, None)
+            if hooks is not None and not isinstance(hooks, _ForwardHookDict):
+                self.__dict__[name] = _ForwardHookDict(hooks)
+        for name in _LAYER_STRUCTURE_DICT_NAMES:
+            items = self.__dict__.get(name, None)
+            if items is not None:
+                # the unpickled dicts are plain OrderedDicts
+                self.__dict__[name] = _LayerStructureDict(self, items)
 
     def __getattr__(self, name):
         if '_parameters' in self.__dict__:
@@ -1711,7 +2135,7 @@ class Layer:
                     # Set persistable=False by default. Only `register_buffer` can
                     # add a persistable buffer.
                     if name not in self._buffers:
-                        self._non_persistable_buffer_names_set.add(name)
+                        self._set_buffer_persistable(name, False)
                     if not value.name:
                         value.name = unique_name.generate('_buffers_' + name)
                     _buffers[name] = value
@@ -1749,6 +2173,14 @@ class Layer:
                         # it will be remarked as a buffer with same `persistable` attribute.
                         _buffers[name] = None
                 else:
+                    if name in _LAYER_STRUCTURE_DICT_NAMES:
+                        # e.g. LayerList rebuilds `_sub_layers` on deletion
+                        if (
+                            not isinstance(value, _LayerStructureDict)
+                            or value._layer_ref() is not self
+                        ):
+                            value = _LayerStructureDict(self, value)
+                        value._bump_generation()
                     object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
@@ -1758,7 +2190,7 @@ class Layer:
             del self._sub_layers[name]
         elif name in self._buffers:
             del self._buffers[name]
-            self._non_persistable_buffer_names_set.discard(name)
+            self._set_buffer_persistable(name, True)
         else:
             object.__delattr__(self, name)
 
@@ -1838,6 +2270,14 @@ class Layer:
         The difference from state_dict() is that state_dict_hook will not be called,
         but the original types of parameters and buffers will be maintained.
         """
+        if destination is None and include_sublayers:
+            index = self._get_structure_index()
+            if index is not None:
+                return collections.OrderedDict(
+                    (structured_name_prefix + name, data)
+                    for name, data in index.persistable_state.items()
+                )
+
         if destination is None:
             destination = collections.OrderedDict()
         for name, data in self._parameters.items():
@@ -1884,6 +2324,24 @@ class Layer:
             keep_vars(bool, optional) : If false, the returned tensors in the state dict are detached from autograd. Default: True.
         """
 
+        if destination is None and include_sublayers:
+            index = self._get_structure_index()
+            if index is not None and not (
+                use_hook and index.has_state_dict_hooks
+            ):
+                state = (
+                    index.full_state
+                    if include_non_persistable_buffer
+                    else index.persistable_state
+                )
+                return collections.OrderedDict(
+                    (
+                        structured_name_prefix + name,
+                        data if keep_vars else data.detach(),
+                    )
+                    for name, data in state.items()
+                )
+
         if destination is None:
             destination = collections.OrderedDict()
         for name, data in self._parameters.items():
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ..layer.layers import (
+    register_layer_forward_post_hook,
+    register_layer_forward_pre_hook,
+)
 from .clip_grad_norm_ import clip_grad_norm_
 from .clip_grad_value_ import clip_grad_value_
 from .spectral_norm_hook import spectral_norm
@@ -30,4 +34,6 @@ __all__ = [
     'vector_to_parameters',
     'clip_grad_norm_',
     'clip_grad_value_',
+    'register_layer_forward_pre_hook',
+    'register_layer_forward_post_hook',
 ]
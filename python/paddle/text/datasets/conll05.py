@@ -13,11 +13,10 @@
 # limitations under the License.
 
 import gzip
-import tarfile
 
 import numpy as np
 
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import TarIndex, _check_exists_and_download
 from paddle.io import Dataset
 
 __all__ = []
@@ -203,13 +202,9 @@ class Conll05st(Dataset):
         return d
 
     def _load_anno(self):
-        tf = tarfile.open(self.data_file)
-        wf = tf.extractfile(
-            "conll05st-release/test.wsj/words/test.wsj.words.gz"
-        )
-        pf = tf.extractfile(
-            "conll05st-release/test.wsj/props/test.wsj.props.gz"
-        )
+        with TarIndex(self.data_file) as tf:
+            wf = tf.open("conll05st-release/test.wsj/words/test.wsj.words.gz")
+            pf = tf.open("conll05st-release/test.wsj/props/test.wsj.props.gz")
         self.sentences = []
         self.predicates = []
         self.labels = []
@@ -273,7 +268,6 @@ class Conll05st(Dataset):
 
         pf.close()
         wf.close()
-        tf.close()
 
     def __getitem__(self, idx):
         sentence = self.sentences[idx]
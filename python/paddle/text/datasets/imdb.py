@@ -13,13 +13,19 @@
 # limitations under the License.
 
 import collections
+import functools
 import re
 import string
-import tarfile
 
 import numpy as np
 
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    TarIndex,
+    _check_exists_and_download,
+    _load_cached_arrays,
+    _map_in_chunks,
+    _RaggedArray,
+)
 from paddle.io import Dataset
 
 __all__ = []
@@ -28,6 +34,28 @@ URL = 'https://dataset.bj.bcebos.com/imdb%2FaclImdb_v1.tar.gz'
 MD5 = '7c2ac02c03563afcf9b574c7e56c153a'
 
 
+def _tokenize(text):
+    # newline and punctuations removal and ad-hoc tokenization.
+    return (
+        text.rstrip(b'\n\r')
+        .translate(None, string.punctuation.encode('latin-1'))
+        .lower()
+        .split()
+    )
+
+
+def _count_words(texts):
+    word_freq = collections.Counter()
+    for text in texts:
+        word_freq.update(_tokenize(text))
+    return word_freq
+
+
+def _to_ids(texts, word_idx):
+    UNK = word_idx['<unk>']
+    return [[word_idx.get(w, UNK) for w in _tokenize(text)] for text in texts]
+
+
 class Imdb(Dataset):
     """
     Implementation of `IMDB <https://www.imdb.com/interfaces/>`_ dataset.
@@ -39,6 +67,8 @@ class Imdb(Dataset):
         cutoff(int): cutoff number for building word dictionary. Default 150.
         download(bool): whether to download dataset automatically if
             :attr:`data_file` is not set. Default True
+        num_workers(int): the number of processes to tokenize the corpus if
+            it is not cached yet, 0 means in the current process. Default 0
 
     Returns:
         Dataset: instance of IMDB dataset
@@ -82,12 +112,20 @@ class Imdb(Dataset):
 
     """
 
-    def __init__(self, data_file=None, mode='train', cutoff=150, download=True):
+    def __init__(
+        self,
+        data_file=None,
+        mode='train',
+        cutoff=150,
+        download=True,
+        num_workers=0,
+    ):
         assert mode.lower() in [
             'train',
             'test',
         ], f"mode should be 'train', 'test', but got {mode}"
         self.mode = mode.lower()
+        self.num_workers = num_workers
 
         self.data_file = data_file
         if self.data_file is None:
@@ -98,18 +136,39 @@ class Imdb(Dataset):
                 data_file, URL, MD5, 'imdb', download
             )
 
+        # tokenize the corpus once, and memory-map the token ids later
+        arrays = _load_cached_arrays(
+            f'{self.data_file}.{self.mode}.{cutoff}',
+            [self.data_file],
+            functools.partial(self._build_arrays, cutoff),
+        )
+        words = arrays['words'].tolist()
+        self.word_idx = dict(zip(words, range(len(words))))
+        self.word_idx['<unk>'] = len(words)
+        self.docs = _RaggedArray.from_arrays(arrays, 'docs')
+        self.labels = arrays['labels']
+
+    def _build_arrays(self, cutoff):
         # Build a word dictionary from the corpus
         self.word_idx = self._build_work_dict(cutoff)
 
-        # read dataset into memory
         self._load_anno()
 
+        words = sorted(self.word_idx, key=self.word_idx.get)[:-1]
+        arrays = {
+            'words': np.array(words, dtype='S'),
+            'labels': np.array(self.labels, dtype='int64'),
+        }
+        arrays.update(self.docs.to_arrays('docs'))
+        return arrays
+
     def _build_work_dict(self, cutoff):
-        word_freq = collections.defaultdict(int)
+        word_freq = collections.Counter()
         pattern = re.compile(r"aclImdb/((train)|(test))/((pos)|(neg))/.*\.txt$")
-        for doc in self._tokenize(pattern):
-            for word in doc:
-                word_freq[word] += 1
+        for chunk_freq in _map_in_chunks(
+            _count_words, self._read(pattern), num_workers=self.num_workers
+        ):
+            word_freq.update(chunk_freq)
 
         # Not sure if we should prune less-frequent words here.
         word_freq = [x for x in word_freq.items() if x[1] > cutoff]
@@ -120,42 +179,38 @@ class Imdb(Dataset):
         word_idx['<unk>'] = len(words)
         return word_idx
 
-    def _tokenize(self, pattern):
-        data = []
-        with tarfile.open(self.data_file) as tarf:
-            tf = tarf.next()
-            while tf is not None:
-                if bool(pattern.match(tf.name)):
-                    # newline and punctuations removal and ad-hoc tokenization.
-                    data.append(
-                        tarf.extractfile(tf)
-                        .read()
-                        .rstrip(b'\n\r')
-                        .translate(None, string.punctuation.encode('latin-1'))
-                        .lower()
-                        .split()
-                    )
-                tf = tarf.next()
-
-        return data
+    def _read(self, pattern):
+        with TarIndex(self.data_file) as tarf:
+            return [
+                tarf.read(name)
+                for name in tarf.names()
+                if bool(pattern.match(name))
+            ]
 
     def _load_anno(self):
-        pos_pattern = re.compile(fr"aclImdb/{self.mode}/pos/.*\.txt$")
-        neg_pattern = re.compile(fr"aclImdb/{self.mode}/neg/.*\.txt$")
-
-        UNK = self.word_idx['<unk>']
+        pos_pattern = re.compile(rf"aclImdb/{self.mode}/pos/.*\.txt$")
+        neg_pattern = re.compile(rf"aclImdb/{self.mode}/neg/.*\.txt$")
 
-        self.docs = []
+        to_ids = functools.partial(_to_ids, word_idx=self.word_idx)
+        docs = []
         self.labels = []
-        for doc in self._tokenize(pos_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(0)
-        for doc in self._tokenize(neg_pattern):
-            self.docs.append([self.word_idx.get(w, UNK) for w in doc])
-            self.labels.append(1)
+        for label, pattern in enumerate([pos_pattern, neg_pattern]):
+            for chunk_docs in _map_in_chunks(
+                to_ids, self._read(pattern), num_workers=self.num_workers
+            ):
+                docs.extend(chunk_docs)
+                self.labels.extend([label] * len(chunk_docs))
+        self.docs = _RaggedArray.from_sequences(docs)
 
     def __getitem__(self, idx):
-        return (np.array(self.docs[idx]), np.array([self.labels[idx]]))
+        return self.docs[idx], np.array([self.labels[idx]])
+
+    def get_lengths(self):
+        """
+        Get the number of tokens of every document, e.g. to batch documents
+        of similar lengths together.
+        """
+        return self.docs.lengths
 
     def __len__(self):
         return len(self.docs)
@@ -13,11 +13,17 @@
 # limitations under the License.
 
 import collections
-import tarfile
+import functools
 
 import numpy as np
 
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    TarIndex,
+    _check_exists_and_download,
+    _load_cached_arrays,
+    _map_in_chunks,
+    _RaggedArray,
+)
 from paddle.io import Dataset
 
 __all__ = []
@@ -26,6 +32,24 @@ URL = 'https://dataset.bj.bcebos.com/imikolov%2Fsimple-examples.tgz'
 MD5 = '30177ea32e27c525793142b6bf2c8e2d'
 
 
+def _to_ids(lines, word_idx, data_type, window_size):
+    UNK = word_idx['<unk>']
+    seqs = []
+    for l in lines:
+        l = ['<s>'] + l.strip().split() + ['<e>']
+        if data_type == 'NGRAM':
+            if len(l) < window_size:
+                continue
+        elif data_type == 'SEQ':
+            # the source and target sequences are slices of it
+            if window_size > 0 and len(l) - 1 > window_size:
+                continue
+        else:
+            raise AssertionError('Unknow data type')
+        seqs.append([word_idx.get(w, UNK) for w in l])
+    return seqs
+
+
 class Imikolov(Dataset):
     """
     Implementation of imikolov dataset.
@@ -39,6 +63,8 @@ class Imikolov(Dataset):
         min_word_freq(int): minimal word frequence for building word dictionary. Default 50.
         download(bool): whether to download dataset automatically if
             :attr:`data_file` is not set. Default True
+        num_workers(int): the number of processes to tokenize the corpus if
+            it is not cached yet, 0 means in the current process. Default 0
 
     Returns:
         Dataset: instance of imikolov dataset
@@ -89,12 +115,14 @@ class Imikolov(Dataset):
         mode='train',
         min_word_freq=50,
         download=True,
+        num_workers=0,
     ):
         assert data_type.upper() in [
             'NGRAM',
             'SEQ',
         ], f"data type should be 'NGRAM', 'SEQ', but got {data_type}"
         self.data_type = data_type.upper()
+        self.num_workers = num_workers
 
         assert mode.lower() in [
             'train',
@@ -117,8 +145,16 @@ class Imikolov(Dataset):
         # Build a word dictionary from the corpus
         self.word_idx = self._build_work_dict(min_word_freq)
 
-        # read dataset into memory
-        self._load_anno()
+        # tokenize the corpus once, and memory-map the token ids later
+        arrays = _load_cached_arrays(
+            f'{self.data_file}.{self.mode}.{self.data_type}.{window_size}.'
+            f'{min_word_freq}',
+            [self.data_file],
+            self._load_anno,
+        )
+        self.seqs = _RaggedArray.from_arrays(arrays, 'seqs')
+        if self.data_type == 'NGRAM':
+            self.ngram_starts = arrays['ngram_starts']
 
     def word_count(self, f, word_freq=None):
         if word_freq is None:
@@ -135,9 +171,9 @@ class Imikolov(Dataset):
     def _build_work_dict(self, cutoff):
         train_filename = './simple-examples/data/ptb.train.txt'
         test_filename = './simple-examples/data/ptb.valid.txt'
-        with tarfile.open(self.data_file) as tf:
-            trainf = tf.extractfile(train_filename)
-            testf = tf.extractfile(test_filename)
+        with TarIndex(self.data_file) as tf:
+            trainf = tf.open(train_filename)
+            testf = tf.open(test_filename)
             word_freq = self.word_count(testf, self.word_count(trainf))
             if '<unk>' in word_freq:
                 # remove <unk> for now, since we will set it as last index
@@ -155,33 +191,50 @@ class Imikolov(Dataset):
         return word_idx
 
     def _load_anno(self):
-        self.data = []
-        with tarfile.open(self.data_file) as tf:
+        if self.data_type == 'NGRAM':
+            assert self.window_size > -1, 'Invalid gram length'
+        with TarIndex(self.data_file) as tf:
             filename = f'./simple-examples/data/ptb.{self.mode}.txt'
-            f = tf.extractfile(filename)
-
-            UNK = self.word_idx['<unk>']
-            for l in f:
-                if self.data_type == 'NGRAM':
-                    assert self.window_size > -1, 'Invalid gram length'
-                    l = ['<s>'] + l.strip().split() + ['<e>']
-                    if len(l) >= self.window_size:
-                        l = [self.word_idx.get(w, UNK) for w in l]
-                        for i in range(self.window_size, len(l) + 1):
-                            self.data.append(tuple(l[i - self.window_size : i]))
-                elif self.data_type == 'SEQ':
-                    l = l.strip().split()
-                    l = [self.word_idx.get(w, UNK) for w in l]
-                    src_seq = [self.word_idx['<s>']] + l
-                    trg_seq = l + [self.word_idx['<e>']]
-                    if self.window_size > 0 and len(src_seq) > self.window_size:
-                        continue
-                    self.data.append((src_seq, trg_seq))
-                else:
-                    raise AssertionError('Unknow data type')
+            lines = list(tf.open(filename))
+
+        to_ids = functools.partial(
+            _to_ids,
+            word_idx=self.word_idx,
+            data_type=self.data_type,
+            window_size=self.window_size,
+        )
+        chunks = _map_in_chunks(to_ids, lines, num_workers=self.num_workers)
+        seqs = _RaggedArray.from_sequences(
+            [seq for chunk in chunks for seq in chunk]
+        )
+        arrays = seqs.to_arrays('seqs')
+        if self.data_type == 'NGRAM':
+            # the start of every window, which slides within one sequence
+            num_ngrams = seqs.lengths - self.window_size + 1
+            arrays['ngram_starts'] = np.repeat(
+                seqs.offsets[:-1] - np.cumsum(num_ngrams) + num_ngrams,
+                num_ngrams,
+            ) + np.arange(num_ngrams.sum())
+        return arrays
 
     def __getitem__(self, idx):
-        return tuple([np.array(d) for d in self.data[idx]])
+        if self.data_type == 'NGRAM':
+            start = self.ngram_starts[idx]
+            ngram = self.seqs.values[start : start + self.window_size]
+            return tuple([np.array(w) for w in ngram])
+        seq = self.seqs[idx]
+        return seq[:-1], seq[1:]
+
+    def get_lengths(self):
+        """
+        Get the number of tokens of every sample, e.g. to batch samples of
+        similar lengths together.
+        """
+        if self.data_type == 'NGRAM':
+            return np.full([len(self)], self.window_size, dtype='int64')
+        return self.seqs.lengths - 1
 
     def __len__(self):
-        return len(self.data)
+        if self.data_type == 'NGRAM':
+            return len(self.ngram_starts)
+        return len(self.seqs)
@@ -12,18 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import tarfile
+
+import functools
 
 import numpy as np
 
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    TarIndex,
+    _check_exists_and_download,
+    _load_cached_arrays,
+    _map_in_chunks,
+    _RaggedArray,
+)
 from paddle.io import Dataset
 
 __all__ = []
 
 URL_DEV_TEST = (
-    'http://www-lium.univ-lemans.fr/~schwenk/'
-    'cslm_joint_paper/data/dev+test.tgz'
+    'http://www-lium.univ-lemans.fr/~schwenk/cslm_joint_paper/data/dev+test.tgz'
 )
 MD5_DEV_TEST = '7d7897317ddd8ba0ae5c5fa7248d3ff5'
 # this is a small set of data for test. The original data is too large and
@@ -37,6 +43,29 @@ UNK = "<unk>"
 UNK_IDX = 2
 
 
+def _to_ids(lines, src_dict, trg_dict):
+    src_ids, trg_ids = [], []
+    for line in lines:
+        line_split = line.decode().strip().split('\t')
+        if len(line_split) != 2:
+            continue
+        src_seq = line_split[0]  # one source sequence
+        src_words = src_seq.split()
+        src = [src_dict.get(w, UNK_IDX) for w in [START] + src_words + [END]]
+
+        trg_seq = line_split[1]  # one target sequence
+        trg_words = trg_seq.split()
+        trg = [trg_dict.get(w, UNK_IDX) for w in trg_words]
+
+        # remove sequence whose length > 80 in training mode
+        if len(src) > 80 or len(trg) > 80:
+            continue
+        src_ids.append(src)
+        # both of the decoder input and output are slices of it
+        trg_ids.append([trg_dict[START]] + trg + [trg_dict[END]])
+    return src_ids, trg_ids
+
+
 class WMT14(Dataset):
     """
     Implementation of `WMT14 <http://www.statmt.org/wmt14/>`_ test dataset.
@@ -51,6 +80,8 @@ class WMT14(Dataset):
         dict_size(int): word dictionary size. Default -1.
         download(bool): whether to download dataset automatically if
             :attr:`data_file` is not set. Default True
+        num_workers(int): the number of processes to tokenize the corpus if
+            it is not cached yet, 0 means in the current process. Default 0
 
     Returns:
         Dataset: Instance of WMT14 dataset
@@ -96,7 +127,12 @@ class WMT14(Dataset):
     """
 
     def __init__(
-        self, data_file=None, mode='train', dict_size=-1, download=True
+        self,
+        data_file=None,
+        mode='train',
+        dict_size=-1,
+        download=True,
+        num_workers=0,
     ):
         assert mode.lower() in [
             'train',
@@ -104,6 +140,7 @@ class WMT14(Dataset):
             'gen',
         ], f"mode should be 'train', 'test' or 'gen', but got {mode}"
         self.mode = mode.lower()
+        self.num_workers = num_workers
 
         self.data_file = data_file
         if self.data_file is None:
@@ -129,68 +166,57 @@ class WMT14(Dataset):
                     break
             return out_dict
 
-        self.src_ids = []
-        self.trg_ids = []
-        self.trg_ids_next = []
-        with tarfile.open(self.data_file, mode='r') as f:
-            names = [
-                each_item.name
-                for each_item in f
-                if each_item.name.endswith("src.dict")
-            ]
+        with TarIndex(self.data_file) as f:
+            names = [name for name in f.names() if name.endswith("src.dict")]
             assert len(names) == 1
-            self.src_dict = __to_dict(f.extractfile(names[0]), self.dict_size)
-            names = [
-                each_item.name
-                for each_item in f
-                if each_item.name.endswith("trg.dict")
-            ]
+            self.src_dict = __to_dict(f.open(names[0]), self.dict_size)
+            names = [name for name in f.names() if name.endswith("trg.dict")]
             assert len(names) == 1
-            self.trg_dict = __to_dict(f.extractfile(names[0]), self.dict_size)
+            self.trg_dict = __to_dict(f.open(names[0]), self.dict_size)
+
+        # tokenize the corpus once, and memory-map the token ids later
+        arrays = _load_cached_arrays(
+            f'{self.data_file}.{self.mode}.{self.dict_size}',
+            [self.data_file],
+            self._build_arrays,
+        )
+        self.src_ids = _RaggedArray.from_arrays(arrays, 'src')
+        self.trg_ids = _RaggedArray.from_arrays(arrays, 'trg')
 
+    def _build_arrays(self):
+        with TarIndex(self.data_file) as f:
             file_name = f"{self.mode}/{self.mode}"
-            names = [
-                each_item.name
-                for each_item in f
-                if each_item.name.endswith(file_name)
-            ]
-            for name in names:
-                for line in f.extractfile(name):
-                    line = line.decode()
-                    line_split = line.strip().split('\t')
-                    if len(line_split) != 2:
-                        continue
-                    src_seq = line_split[0]  # one source sequence
-                    src_words = src_seq.split()
-                    src_ids = [
-                        self.src_dict.get(w, UNK_IDX)
-                        for w in [START] + src_words + [END]
-                    ]
-
-                    trg_seq = line_split[1]  # one target sequence
-                    trg_words = trg_seq.split()
-                    trg_ids = [self.trg_dict.get(w, UNK_IDX) for w in trg_words]
-
-                    # remove sequence whose length > 80 in training mode
-                    if len(src_ids) > 80 or len(trg_ids) > 80:
-                        continue
-                    trg_ids_next = trg_ids + [self.trg_dict[END]]
-                    trg_ids = [self.trg_dict[START]] + trg_ids
-
-                    self.src_ids.append(src_ids)
-                    self.trg_ids.append(trg_ids)
-                    self.trg_ids_next.append(trg_ids_next)
+            names = [name for name in f.names() if name.endswith(file_name)]
+            lines = [line for name in names for line in f.open(name)]
 
-    def __getitem__(self, idx):
-        return (
-            np.array(self.src_ids[idx]),
-            np.array(self.trg_ids[idx]),
-            np.array(self.trg_ids_next[idx]),
+        to_ids = functools.partial(
+            _to_ids, src_dict=self.src_dict, trg_dict=self.trg_dict
         )
+        src_ids, trg_ids = [], []
+        for chunk_src, chunk_trg in _map_in_chunks(
+            to_ids, lines, num_workers=self.num_workers
+        ):
+            src_ids.extend(chunk_src)
+            trg_ids.extend(chunk_trg)
+
+        arrays = _RaggedArray.from_sequences(src_ids).to_arrays('src')
+        arrays.update(_RaggedArray.from_sequences(trg_ids).to_arrays('trg'))
+        return arrays
+
+    def __getitem__(self, idx):
+        trg_ids = self.trg_ids[idx]
+        return self.src_ids[idx], trg_ids[:-1], trg_ids[1:]
 
     def __len__(self):
         return len(self.src_ids)
 
+    def get_lengths(self):
+        """
+        Get the number of tokens of every source and target sequence pair,
+        e.g. to batch sequences of similar lengths together.
+        """
+        return np.maximum(self.src_ids.lengths, self.trg_ids.lengths - 1)
+
     def get_dict(self, reverse=False):
         """
         Get the source and target dictionary.
@@ -13,14 +13,20 @@
 # limitations under the License.
 
 
+import functools
 import os
-import tarfile
 from collections import defaultdict
 
 import numpy as np
 
 import paddle
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    TarIndex,
+    _check_exists_and_download,
+    _load_cached_arrays,
+    _map_in_chunks,
+    _RaggedArray,
+)
 from paddle.io import Dataset
 
 __all__ = []
@@ -36,6 +42,33 @@ END_MARK = "<e>"
 UNK_MARK = "<unk>"
 
 
+def _to_ids(lines, src_col, src_dict, trg_dict):
+    # the index for start mark, end mark, and unk are the same in source
+    # language and target language. Here uses the source language
+    # dictionary to determine their indices.
+    start_id = src_dict[START_MARK]
+    end_id = src_dict[END_MARK]
+    unk_id = src_dict[UNK_MARK]
+    trg_col = 1 - src_col
+
+    src_ids, trg_ids = [], []
+    for line in lines:
+        line_split = line.decode().strip().split("\t")
+        if len(line_split) != 2:
+            continue
+        src_words = line_split[src_col].split()
+        src_ids.append(
+            [start_id] + [src_dict.get(w, unk_id) for w in src_words] + [end_id]
+        )
+
+        trg_words = line_split[trg_col].split()
+        # both of the decoder input and output are slices of it
+        trg_ids.append(
+            [start_id] + [trg_dict.get(w, unk_id) for w in trg_words] + [end_id]
+        )
+    return src_ids, trg_ids
+
+
 class WMT16(Dataset):
     """
     Implementation of `WMT16 <http://www.statmt.org/wmt16/>`_ test dataset.
@@ -65,6 +98,8 @@ class WMT16(Dataset):
         lang(str): source language, 'en' or 'de'. Default 'en'.
         download(bool): whether to download dataset automatically if
             :attr:`data_file` is not set. Default True.
+        num_workers(int): the number of processes to tokenize the corpus if
+            it is not cached yet, 0 means in the current process. Default 0.
 
     Returns:
         Dataset: Instance of WMT16 dataset. The instance of dataset has 3 fields:
@@ -117,6 +152,7 @@ class WMT16(Dataset):
         trg_dict_size=-1,
         lang='en',
         download=True,
+        num_workers=0,
     ):
         assert mode.lower() in [
             'train',
@@ -124,6 +160,7 @@ class WMT16(Dataset):
             'val',
         ], f"mode should be 'train', 'test' or 'val', but got {mode}"
         self.mode = mode.lower()
+        self.num_workers = num_workers
 
         self.data_file = data_file
         if self.data_file is None:
@@ -145,19 +182,34 @@ class WMT16(Dataset):
         )
 
         # load source and target word dict
+        trg_lang = "de" if lang == "en" else "en"
         self.src_dict = self._load_dict(lang, src_dict_size)
-        self.trg_dict = self._load_dict(
-            "de" if lang == "en" else "en", trg_dict_size
+        self.trg_dict = self._load_dict(trg_lang, trg_dict_size)
+
+        # tokenize the corpus once, and memory-map the token ids later
+        arrays = _load_cached_arrays(
+            os.path.join(
+                paddle.dataset.common.DATA_HOME,
+                f"wmt16/{self.mode}_{lang}_{src_dict_size}_{trg_dict_size}",
+            ),
+            [
+                self.data_file,
+                self._get_dict_path(lang, src_dict_size),
+                self._get_dict_path(trg_lang, trg_dict_size),
+            ],
+            self._load_data,
         )
+        self.src_ids = _RaggedArray.from_arrays(arrays, 'src')
+        self.trg_ids = _RaggedArray.from_arrays(arrays, 'trg')
 
-        # load data
-        self.data = self._load_data()
-
-    def _load_dict(self, lang, dict_size, reverse=False):
-        dict_path = os.path.join(
+    def _get_dict_path(self, lang, dict_size):
+        return os.path.join(
             paddle.dataset.common.DATA_HOME,
             "wmt16/%s_%d.dict" % (lang, dict_size),
         )
+
+    def _load_dict(self, lang, dict_size, reverse=False):
+        dict_path = self._get_dict_path(lang, dict_size)
         dict_found = False
         if os.path.exists(dict_path):
             with open(dict_path, "rb") as d:
@@ -176,8 +228,8 @@ class WMT16(Dataset):
 
     def _build_dict(self, dict_path, dict_size, lang):
         word_dict = defaultdict(int)
-        with tarfile.open(self.data_file, mode="r") as f:
-            for line in f.extractfile("wmt16/train"):
+        with TarIndex(self.data_file) as f:
+            for line in f.open("wmt16/train"):
                 line = line.decode()
                 line_split = line.strip().split("\t")
                 if len(line_split) != 2:
@@ -197,52 +249,40 @@ class WMT16(Dataset):
                 fout.write(b'\n')
 
     def _load_data(self):
-        # the index for start mark, end mark, and unk are the same in source
-        # language and target language. Here uses the source language
-        # dictionary to determine their indices.
-        start_id = self.src_dict[START_MARK]
-        end_id = self.src_dict[END_MARK]
-        unk_id = self.src_dict[UNK_MARK]
-
-        src_col = 0 if self.lang == "en" else 1
-        trg_col = 1 - src_col
-
-        self.src_ids = []
-        self.trg_ids = []
-        self.trg_ids_next = []
-        with tarfile.open(self.data_file, mode="r") as f:
-            for line in f.extractfile(f"wmt16/{self.mode}"):
-                line = line.decode()
-                line_split = line.strip().split("\t")
-                if len(line_split) != 2:
-                    continue
-                src_words = line_split[src_col].split()
-                src_ids = (
-                    [start_id]
-                    + [self.src_dict.get(w, unk_id) for w in src_words]
-                    + [end_id]
-                )
-
-                trg_words = line_split[trg_col].split()
-                trg_ids = [self.trg_dict.get(w, unk_id) for w in trg_words]
-
-                trg_ids_next = trg_ids + [end_id]
-                trg_ids = [start_id] + trg_ids
+        with TarIndex(self.data_file) as f:
+            lines = list(f.open(f"wmt16/{self.mode}"))
+
+        to_ids = functools.partial(
+            _to_ids,
+            src_col=0 if self.lang == "en" else 1,
+            src_dict=self.src_dict,
+            trg_dict=self.trg_dict,
+        )
+        src_ids, trg_ids = [], []
+        for chunk_src, chunk_trg in _map_in_chunks(
+            to_ids, lines, num_workers=self.num_workers
+        ):
+            src_ids.extend(chunk_src)
+            trg_ids.extend(chunk_trg)
 
-                self.src_ids.append(src_ids)
-                self.trg_ids.append(trg_ids)
-                self.trg_ids_next.append(trg_ids_next)
+        arrays = _RaggedArray.from_sequences(src_ids).to_arrays('src')
+        arrays.update(_RaggedArray.from_sequences(trg_ids).to_arrays('trg'))
+        return arrays
 
     def __getitem__(self, idx):
-        return (
-            np.array(self.src_ids[idx]),
-            np.array(self.trg_ids[idx]),
-            np.array(self.trg_ids_next[idx]),
-        )
+        trg_ids = self.trg_ids[idx]
+        return self.src_ids[idx], trg_ids[:-1], trg_ids[1:]
 
     def __len__(self):
         return len(self.src_ids)
 
+    def get_lengths(self):
+        """
+        Get the number of tokens of every source and target sequence pair,
+        e.g. to batch sequences of similar lengths together.
+        """
+        return np.maximum(self.src_ids.lengths, self.trg_ids.lengths - 1)
+
     def get_dict(self, lang, reverse=False):
         """
         return the word dictionary for the specified language.
@@ -16,7 +16,6 @@ from ..base.framework import require_version
 from . import (  # noqa: F401
     cpp_extension,
     dlpack,
-    download,
     image_util,
     layers_utils,
     unique_name,
@@ -51,7 +50,10 @@ from .layers_utils import (  # noqa: F401
     try_get_constant_shape_from_tensor,
     try_set_static_shape_tensor,
 )
-from .lazy_import import try_import
+from .lazy_import import attach_lazy_submodules as _attach_lazy, try_import
 from .op_version import OpLastCheckpointChecker  # noqa: F401
 
+# NOTE: `download` imports the http client, which is slow to import.
+__getattr__, __dir__ = _attach_lazy(__name__, globals(), ['download'])
+
 __all__ = ['deprecated', 'run_check', 'require_version', 'try_import']
@@ -12,17 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import hashlib
+import itertools
+import json
 import os
 import os.path as osp
 import shutil
 import sys
 import tarfile
+import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 try:
     from tqdm import tqdm
 except:
@@ -57,6 +67,13 @@ WEIGHTS_HOME = osp.expanduser("~/.cache/paddle/hapi/weights")
 
 DOWNLOAD_RETRY_LIMIT = 3
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# the number of parallel ranged requests for one file
+DOWNLOAD_NUM_CONNECTIONS = 4
+DOWNLOAD_MIN_PART_SIZE = 16 << 20
+# save the progress of ranged requests every this number of chunks
+DOWNLOAD_STATE_INTERVAL = 16
+
 
 def is_url(path):
     """
@@ -145,7 +162,11 @@ def get_path_from_url(
     if osp.exists(fullpath) and check_exist and _md5check(fullpath, md5sum):
         logger.info(f"Found {fullpath}")
     else:
-        if ParallelEnv().current_endpoint in unique_endpoints:
+        # the processes on one node share the download by a file lock
+        if (
+            ParallelEnv().current_endpoint in unique_endpoints
+            or fcntl is not None
+        ):
             fullpath = _download(url, root_dir, md5sum, method=method)
         else:
             while not os.path.exists(fullpath):
@@ -160,44 +181,246 @@ def get_path_from_url(
     return fullpath
 
 
-def _get_download(url, fullname):
-    # using requests.get method
+class _RangeHasher:
+    """
+    Compute the md5 of a file downloaded by several ranged requests while it
+    is being written. The chunks are hashed in memory if they are contiguous
+    with the hashed prefix, otherwise read back once the gap is filled.
+    """
+
+    def __init__(self, filename, parts):
+        self.filename = filename
+        # [start, end, done] of every part, in order of the file offsets
+        self.parts = parts
+        self.offset = 0
+        self.md5 = hashlib.md5()
+        self.lock = threading.Lock()
+
+    def update(self, part, chunk):
+        with self.lock:
+            if part[0] + part[2] == self.offset:
+                self.md5.update(chunk)
+                self.offset += len(chunk)
+            part[2] += len(chunk)
+            self._catch_up()
+
+    def _catch_up(self):
+        end = 0
+        for start, stop, done in self.parts:
+            end = start + done
+            if end < stop:
+                break
+        if self.offset >= end:
+            return
+        with open(self.filename, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < end:
+                data = f.read(min(DOWNLOAD_CHUNK_SIZE, end - self.offset))
+                self.md5.update(data)
+                self.offset += len(data)
+
+    def hexdigest(self):
+        with self.lock:
+            self._catch_up()
+            return self.md5.hexdigest()
+
+
+def _load_download_state(state_path, tmp_fullname, url, total_size):
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+        if (
+            state['url'] == url
+            and state['size'] == total_size
+            and osp.getsize(tmp_fullname) == total_size
+        ):
+            return state['parts']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_download_state(state_path, url, total_size, parts):
+    with open(state_path + '_tmp', 'w') as f:
+        json.dump({'url': url, 'size': total_size, 'parts': parts}, f)
+    os.replace(state_path + '_tmp', state_path)
+
+
+def _split_parts(total_size):
+    num_parts = max(
+        min(
+            DOWNLOAD_NUM_CONNECTIONS,
+            total_size // DOWNLOAD_MIN_PART_SIZE,
+        ),
+        1,
+    )
+    part_size = (total_size + num_parts - 1) // num_parts
+    return [
+        [start, min(start + part_size, total_size), 0]
+        for start in range(0, total_size, part_size)
+    ]
+
+
+def _download_part(client, url, tmp_fullname, part, hasher, pbar, on_chunk):
+    start, end, done = part
+    if start + done >= end:
+        return
+    headers = {'Range': f'bytes={start + done}-{end - 1}'}
+    with client.stream("GET", url, headers=headers) as req:
+        if req.status_code != 206:
+            raise RuntimeError(
+                f"Downloading from {url} failed with code "
+                f"{req.status_code} for range {headers['Range']}!"
+            )
+        with open(tmp_fullname, 'r+b') as f:
+            f.seek(start + done)
+            for chunk in req.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                chunk = chunk[: end - f.tell()]
+                f.write(chunk)
+                # make the data visible to the hasher before it is counted
+                f.flush()
+                hasher.update(part, chunk)
+                pbar.update(len(chunk))
+                on_chunk()
+                if f.tell() >= end:
+                    break
+
+
+def _get_download(url, fullname, md5sum=None):
+    # using httpx, download by parallel ranged requests if the server
+    # supports, and resume from the parts downloaded by last attempts
     fname = osp.basename(fullname)
+    tmp_fullname = fullname + "_tmp"
+    state_path = fullname + "_tmp.json"
     try:
-        with httpx.stream(
-            "GET", url, timeout=None, follow_redirects=True
-        ) as req:
-            if req.status_code != 200:
-                raise RuntimeError(
-                    f"Downloading from {url} failed with code "
-                    f"{req.status_code}!"
-                )
-
-            tmp_fullname = fullname + "_tmp"
-            total_size = req.headers.get('content-length')
-            with open(tmp_fullname, 'wb') as f:
-                if total_size:
-                    with tqdm(total=(int(total_size) + 1023) // 1024) as pbar:
-                        for chunk in req.iter_bytes(chunk_size=1024):
-                            f.write(chunk)
-                            pbar.update(1)
+        with httpx.Client(timeout=None, follow_redirects=True) as client:
+            # a one byte range request tells whether ranges are supported
+            with client.stream(
+                "GET", url, headers={'Range': 'bytes=0-0'}
+            ) as req:
+                content_range = req.headers.get('content-range', '')
+                total_size = content_range.rsplit('/', 1)[-1]
+                if req.status_code == 206 and total_size.isdigit():
+                    total_size = int(total_size)
+                elif req.status_code == 200:
+                    total_size = None
+                    calc_md5sum = _stream_download(req, tmp_fullname)
+                elif req.status_code in (206, 416):
+                    total_size = 0
                 else:
-                    for chunk in req.iter_bytes(chunk_size=1024):
-                        if chunk:
-                            f.write(chunk)
-            shutil.move(tmp_fullname, fullname)
-            return fullname
+                    raise RuntimeError(
+                        f"Downloading from {url} failed with code "
+                        f"{req.status_code}!"
+                    )
+
+            if total_size:
+                calc_md5sum = _ranged_download(
+                    client, url, tmp_fullname, state_path, total_size
+                )
+            elif total_size == 0:
+                # unknown size or empty file, fallback to one plain request
+                with client.stream("GET", url) as req:
+                    if req.status_code != 200:
+                        raise RuntimeError(
+                            f"Downloading from {url} failed with code "
+                            f"{req.status_code}!"
+                        )
+                    calc_md5sum = _stream_download(req, tmp_fullname)
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        if md5sum is not None and calc_md5sum != md5sum:
+            os.remove(tmp_fullname)
+            logger.info(
+                f"File {fullname} md5 check failed, {calc_md5sum}(calc) != "
+                f"{md5sum}(base)"
+            )
+            return False
+        shutil.move(tmp_fullname, fullname)
+        _save_md5_record(fullname, calc_md5sum)
+        return fullname
 
-    except Exception as e:  # requests.exceptions.ConnectionError
+    except Exception as e:  # httpx.HTTPError
         logger.info(
             f"Downloading {fname} from {url} failed with exception {str(e)}"
         )
         return False
 
 
+def _stream_download(req, tmp_fullname):
+    md5 = hashlib.md5()
+    total_size = req.headers.get('content-length')
+    with open(tmp_fullname, 'wb') as f, tqdm(
+        total=int(total_size) if total_size else None
+    ) as pbar:
+        for chunk in req.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if chunk:
+                f.write(chunk)
+                md5.update(chunk)
+                pbar.update(len(chunk))
+    return md5.hexdigest()
+
+
+def _ranged_download(client, url, tmp_fullname, state_path, total_size):
+    parts = _load_download_state(state_path, tmp_fullname, url, total_size)
+    if parts is None:
+        parts = _split_parts(total_size)
+        with open(tmp_fullname, 'wb') as f:
+            f.truncate(total_size)
+    else:
+        logger.info(f"Resuming {tmp_fullname}")
+
+    hasher = _RangeHasher(tmp_fullname, parts)
+    num_chunks = itertools.count(1)
+
+    def on_chunk():
+        # persist the progress from time to time, to resume from it
+        if next(num_chunks) % DOWNLOAD_STATE_INTERVAL == 0:
+            with hasher.lock:
+                _save_download_state(state_path, url, total_size, parts)
+
+    with tqdm(total=total_size) as pbar:
+        pbar.update(sum(done for _, _, done in parts))
+        try:
+            with ThreadPoolExecutor(len(parts)) as executor:
+                futures = [
+                    executor.submit(
+                        _download_part,
+                        client,
+                        url,
+                        tmp_fullname,
+                        part,
+                        hasher,
+                        pbar,
+                        on_chunk,
+                    )
+                    for part in parts
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            with hasher.lock:
+                _save_download_state(state_path, url, total_size, parts)
+    return hasher.hexdigest()
+
+
 _download_methods = {'get': _get_download}
 
 
+@contextlib.contextmanager
+def _file_lock(path):
+    # serialize the downloads of one file by all processes on the node
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
 def _download(url, path, md5sum=None, method='get'):
     """
     Download from url, save to path.
@@ -211,39 +434,70 @@ def _download(url, path, md5sum=None, method='get'):
     assert method in _download_methods, f'make sure `{method}` implemented'
 
     if not osp.exists(path):
-        os.makedirs(path)
+        os.makedirs(path, exist_ok=True)
 
     fname = osp.split(url)[-1]
     fullname = osp.join(path, fname)
     retry_cnt = 0
 
-    logger.info(f"Downloading {fname} from {url}")
-    while not (osp.exists(fullname) and _md5check(fullname, md5sum)):
-        logger.info(f"md5check {fullname} and {md5sum}")
-        if retry_cnt < DOWNLOAD_RETRY_LIMIT:
-            retry_cnt += 1
-        else:
-            raise RuntimeError(
-                f"Download from {url} failed. " "Retry limit reached"
-            )
+    with _file_lock(fullname + ".lock"):
+        # the file may be downloaded by another process holding the lock
+        if osp.exists(fullname) and _md5check(fullname, md5sum):
+            return fullname
 
-        if not _download_methods[method](url, fullname):
-            time.sleep(1)
-            continue
+        logger.info(f"Downloading {fname} from {url}")
+        while not (osp.exists(fullname) and _md5check(fullname, md5sum)):
+            logger.info(f"md5check {fullname} and {md5sum}")
+            if retry_cnt < DOWNLOAD_RETRY_LIMIT:
+                retry_cnt += 1
+            else:
+                raise RuntimeError(
+                    f"Download from {url} failed. Retry limit reached"
+                )
+
+            if not _download_methods[method](url, fullname, md5sum):
+                time.sleep(1)
+                continue
 
     return fullname
 
 
+def _save_md5_record(fullname, md5sum):
+    # record the md5 of a verified file, so that it is not read again
+    try:
+        with open(fullname + ".md5", 'w') as f:
+            f.write(f"{md5sum} {osp.getsize(fullname)}")
+    except OSError:
+        pass
+
+
+def _load_md5_record(fullname):
+    record = fullname + ".md5"
+    try:
+        if osp.getmtime(record) < osp.getmtime(fullname):
+            return None
+        with open(record) as f:
+            md5sum, size = f.read().split()
+        if int(size) == osp.getsize(fullname):
+            return md5sum
+    except (OSError, ValueError):
+        pass
+    return None
+
+
 def _md5check(fullname, md5sum=None):
     if md5sum is None:
         return True
 
-    logger.info(f"File {fullname} md5 checking...")
-    md5 = hashlib.md5()
-    with open(fullname, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            md5.update(chunk)
-    calc_md5sum = md5.hexdigest()
+    calc_md5sum = _load_md5_record(fullname)
+    if calc_md5sum is None:
+        logger.info(f"File {fullname} md5 checking...")
+        md5 = hashlib.md5()
+        with open(fullname, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                md5.update(chunk)
+        calc_md5sum = md5.hexdigest()
+        _save_md5_record(fullname, calc_md5sum)
 
     if calc_md5sum != md5sum:
         logger.info(
@@ -14,6 +14,7 @@
 """Lazy imports for heavy dependencies."""
 
 import importlib
+import os
 
 __all__ = []
 
@@ -39,3 +40,51 @@ def try_import(module_name, err_msg=None):
                 f"manually installed (usually with `pip install {install_name}`). "
             )
         raise ImportError(err_msg)
+
+
+def _is_lazy_import_enabled():
+    return os.environ.get('PADDLE_LAZY_IMPORT', '1').lower() not in (
+        '0',
+        'false',
+        'off',
+    )
+
+
+def attach_lazy_submodules(package_name, package_globals, submodules):
+    """
+    Defer importing the given submodules of a package until they are first
+    accessed as attributes of the package, e.g. ``paddle.vision``.
+
+    It returns the module level ``__getattr__`` and ``__dir__`` functions
+    (PEP 562) to be assigned in the ``__init__.py`` of the package. Explicit
+    imports such as ``import paddle.vision`` or ``from paddle import vision``
+    keep working as usual. Set the environment variable
+    ``PADDLE_LAZY_IMPORT=0`` to import all of them eagerly.
+
+    Args:
+        package_name (str): The ``__name__`` of the package.
+        package_globals (dict): The ``globals()`` of the package.
+        submodules (list[str]): Names of the submodules to load lazily.
+
+    Returns:
+        tuple, the ``__getattr__`` and ``__dir__`` functions of the package.
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name):
+        if name in submodules:
+            module = importlib.import_module(f'{package_name}.{name}')
+            package_globals[name] = module
+            return module
+        raise AttributeError(
+            f"module '{package_name}' has no attribute '{name}'"
+        )
+
+    def __dir__():
+        return sorted(set(package_globals) | submodules)
+
+    if not _is_lazy_import_enabled():
+        for name in sorted(submodules):
+            __getattr__(name)
+
+    return __getattr__, __dir__
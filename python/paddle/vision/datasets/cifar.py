@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numbers
 import pickle
-import tarfile
 
 import numpy as np
 from PIL import Image
 
 import paddle
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    TarIndex,
+    _check_exists_and_download,
+    _load_cached_arrays,
+)
 from paddle.io import Dataset
 
 __all__ = []
@@ -55,7 +59,9 @@ class Cifar10(Dataset):
             default backend is 'pil'. Default: None.
 
     Returns:
-        :ref:`api_paddle_io_Dataset`. An instance of Cifar10 dataset.
+        :ref:`api_paddle_io_Dataset`. An instance of Cifar10 dataset. Indexing it
+        with a slice or a list of indices returns the list of the samples,
+        each of which is an (image, label) pair as indexing with an integer.
 
     Examples:
 
@@ -138,7 +144,7 @@ class Cifar10(Dataset):
 
         self.transform = transform
 
-        # read dataset into memory
+        # decode dataset, which is memory-mapped from the cache later
         self._load_data()
 
         self.dtype = paddle.get_default_dtype()
@@ -149,30 +155,43 @@ class Cifar10(Dataset):
         self.flag = MODE_FLAG_MAP[self.mode + '10']
 
     def _load_data(self):
-        self.data = []
-        with tarfile.open(self.data_file, mode='r') as f:
-            names = (
-                each_item.name for each_item in f if self.flag in each_item.name
-            )
-
-            names = sorted(names)
+        arrays = _load_cached_arrays(
+            f'{self.data_file}.{self.flag}', [self.data_file], self._decode_data
+        )
+        self.images = arrays['images']
+        self.labels = arrays['labels']
+
+    def _decode_data(self):
+        images = []
+        labels = []
+        with TarIndex(self.data_file) as f:
+            names = sorted(name for name in f.names() if self.flag in name)
 
             for name in names:
-                batch = pickle.load(f.extractfile(name), encoding='bytes')
+                batch = pickle.load(f.open(name), encoding='bytes')
 
                 data = batch[b'data']
-                labels = batch.get(b'labels', batch.get(b'fine_labels', None))
-                assert labels is not None
-                for sample, label in zip(data, labels):
-                    self.data.append((sample, label))
+                batch_labels = batch.get(
+                    b'labels', batch.get(b'fine_labels', None)
+                )
+                assert batch_labels is not None
+                images.append(data)
+                labels.extend(batch_labels)
+
+        images = np.concatenate(images).reshape([-1, 3, 32, 32])
+        return {
+            'images': images.transpose([0, 2, 3, 1]),
+            'labels': np.array(labels, dtype='int64'),
+        }
 
     def __getitem__(self, idx):
-        image, label = self.data[idx]
-        image = np.reshape(image, [3, 32, 32])
-        image = image.transpose([1, 2, 0])
+        if not isinstance(idx, numbers.Integral):
+            return self._get_batch(idx)
+
+        image, label = self.images[idx], self.labels[idx]
 
         if self.backend == 'pil':
-            image = Image.fromarray(image.astype('uint8'))
+            image = Image.fromarray(np.asarray(image))
         if self.transform is not None:
             image = self.transform(image)
 
@@ -181,8 +200,21 @@ class Cifar10(Dataset):
 
         return image.astype(self.dtype), np.array(label).astype('int64')
 
+    def _get_batch(self, indices):
+        indices = np.arange(len(self))[indices]
+        if self.backend == 'pil' or self.transform is not None:
+            return [self[idx] for idx in indices]
+
+        # slice the whole batch out of the arrays without transform, in the
+        # same layout as the samples
+        images = self.images[indices].astype(self.dtype)
+        labels = self.labels[indices].astype('int64')
+        return [
+            (image, np.array(label)) for image, label in zip(images, labels)
+        ]
+
     def __len__(self):
-        return len(self.data)
+        return len(self.labels)
 
 
 class Cifar100(Cifar10):
@@ -12,14 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
-import tarfile
+import io
 
 import numpy as np
 from PIL import Image
 
 import paddle
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import TarIndex, _check_exists_and_download
 from paddle.io import Dataset
 from paddle.utils import try_import
 
@@ -157,11 +156,8 @@ class Flowers(Dataset):
 
         self.transform = transform
 
-        data_tar = tarfile.open(data_file)
-        self.data_path = data_file.replace(".tgz", "/")
-        if not os.path.exists(self.data_path):
-            os.mkdir(self.data_path)
-        data_tar.extractall(self.data_path)
+        # images are read randomly, so decompress the archive once
+        self.data_tar = TarIndex(data_file, decompress=True)
 
         scio = try_import('scipy.io')
         self.labels = scio.loadmat(label_file)['labels'][0]
@@ -171,11 +167,9 @@ class Flowers(Dataset):
         index = self.indexes[idx]
         label = np.array([self.labels[index - 1]])
         img_name = "jpg/image_%05d.jpg" % index
-        image = os.path.join(self.data_path, img_name)
-        if self.backend == 'pil':
-            image = Image.open(image)
-        elif self.backend == 'cv2':
-            image = np.array(Image.open(image))
+        image = Image.open(io.BytesIO(self.data_tar.read(img_name)))
+        if self.backend == 'cv2':
+            image = np.array(image)
 
         if self.transform is not None:
             image = self.transform(image)
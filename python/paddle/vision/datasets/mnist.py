@@ -13,13 +13,17 @@
 # limitations under the License.
 
 import gzip
+import numbers
 import struct
 
 import numpy as np
 from PIL import Image
 
 import paddle
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import (
+    _check_exists_and_download,
+    _load_cached_arrays,
+)
 from paddle.io import Dataset
 
 __all__ = []
@@ -44,7 +48,9 @@ class MNIST(Dataset):
             default backend is 'pil'. Default: None.
 
     Returns:
-        :ref:`api_paddle_io_Dataset`. An instance of MNIST dataset.
+        :ref:`api_paddle_io_Dataset`. An instance of MNIST dataset. Indexing it
+        with a slice or a list of indices returns the list of the samples,
+        each of which is an (image, label) pair as indexing with an integer.
 
     Examples:
 
@@ -160,67 +166,61 @@ class MNIST(Dataset):
 
         self.transform = transform
 
-        # read dataset into memory
+        # decode dataset, which is memory-mapped from the cache later
         self._parse_dataset()
 
         self.dtype = paddle.get_default_dtype()
 
-    def _parse_dataset(self, buffer_size=100):
-        self.images = []
-        self.labels = []
+    def _parse_dataset(self):
+        arrays = _load_cached_arrays(
+            self.image_path,
+            [self.image_path, self.label_path],
+            self._decode_dataset,
+        )
+        self.images = arrays['images']
+        self.labels = arrays['labels']
+
+    def _decode_dataset(self):
         with gzip.GzipFile(self.image_path, 'rb') as image_file:
             img_buf = image_file.read()
-            with gzip.GzipFile(self.label_path, 'rb') as label_file:
-                lab_buf = label_file.read()
-
-                step_label = 0
-                offset_img = 0
-                # read from Big-endian
-                # get file info from magic byte
-                # image file : 16B
-                magic_byte_img = '>IIII'
-                magic_img, image_num, rows, cols = struct.unpack_from(
-                    magic_byte_img, img_buf, offset_img
-                )
-                offset_img += struct.calcsize(magic_byte_img)
-
-                offset_lab = 0
-                # label file : 8B
-                magic_byte_lab = '>II'
-                magic_lab, label_num = struct.unpack_from(
-                    magic_byte_lab, lab_buf, offset_lab
-                )
-                offset_lab += struct.calcsize(magic_byte_lab)
-
-                while True:
-                    if step_label >= label_num:
-                        break
-                    fmt_label = '>' + str(buffer_size) + 'B'
-                    labels = struct.unpack_from(fmt_label, lab_buf, offset_lab)
-                    offset_lab += struct.calcsize(fmt_label)
-                    step_label += buffer_size
-
-                    fmt_images = '>' + str(buffer_size * rows * cols) + 'B'
-                    images_temp = struct.unpack_from(
-                        fmt_images, img_buf, offset_img
-                    )
-                    images = np.reshape(
-                        images_temp, (buffer_size, rows * cols)
-                    ).astype('float32')
-                    offset_img += struct.calcsize(fmt_images)
-
-                    for i in range(buffer_size):
-                        self.images.append(images[i, :])
-                        self.labels.append(
-                            np.array([labels[i]]).astype('int64')
-                        )
+        with gzip.GzipFile(self.label_path, 'rb') as label_file:
+            lab_buf = label_file.read()
+
+        # read from Big-endian
+        # get file info from magic byte
+        # image file : 16B
+        magic_byte_img = '>IIII'
+        _, image_num, rows, cols = struct.unpack_from(magic_byte_img, img_buf)
+        images = np.frombuffer(
+            img_buf,
+            dtype='uint8',
+            count=image_num * rows * cols,
+            offset=struct.calcsize(magic_byte_img),
+        ).reshape([image_num, rows, cols])
+
+        # label file : 8B
+        magic_byte_lab = '>II'
+        _, label_num = struct.unpack_from(magic_byte_lab, lab_buf)
+        labels = np.frombuffer(
+            lab_buf,
+            dtype='uint8',
+            count=label_num,
+            offset=struct.calcsize(magic_byte_lab),
+        )
+        labels = labels.astype('int64').reshape([label_num, 1])
+
+        return {'images': images, 'labels': labels}
 
     def __getitem__(self, idx):
+        if not isinstance(idx, numbers.Integral):
+            return self._get_batch(idx)
+
         image, label = self.images[idx], self.labels[idx]
-        image = np.reshape(image, [28, 28])
 
         if self.backend == 'pil':
-            image = Image.fromarray(image.astype('uint8'), mode='L')
+            image = Image.fromarray(np.asarray(image), mode='L')
+        else:
+            image = image.astype('float32')
 
         if self.transform is not None:
             image = self.transform(image)
@@ -230,6 +230,17 @@ class MNIST(Dataset):
 
         return image.astype(self.dtype), label.astype('int64')
 
+    def _get_batch(self, indices):
+        indices = np.arange(len(self))[indices]
+        if self.backend == 'pil' or self.transform is not None:
+            return [self[idx] for idx in indices]
+
+        # slice the whole batch out of the arrays without transform, in the
+        # same layout as the samples
+        images = self.images[indices].astype('float32').astype(self.dtype)
+        labels = self.labels[indices].astype('int64')
+        return list(zip(images, labels))
+
     def __len__(self):
         return len(self.labels)
 
@@ -13,13 +13,12 @@
 # limitations under the License.
 
 import io
-import tarfile
 
 import numpy as np
 from PIL import Image
 
 import paddle
-from paddle.dataset.common import _check_exists_and_download
+from paddle.dataset.common import TarIndex, _check_exists_and_download
 from paddle.io import Dataset
 
 __all__ = []
@@ -144,13 +143,10 @@ class VOC2012(Dataset):
         self.dtype = paddle.get_default_dtype()
 
     def _load_anno(self):
-        self.name2mem = {}
-        self.data_tar = tarfile.open(self.data_file)
-        for ele in self.data_tar.getmembers():
-            self.name2mem[ele.name] = ele
+        self.data_tar = TarIndex(self.data_file)
 
         set_file = SET_FILE.format(self.flag)
-        sets = self.data_tar.extractfile(self.name2mem[set_file])
+        sets = self.data_tar.open(set_file)
 
         self.data = []
         self.labels = []
@@ -166,8 +162,8 @@ class VOC2012(Dataset):
         data_file = self.data[idx]
         label_file = self.labels[idx]
 
-        data = self.data_tar.extractfile(self.name2mem[data_file]).read()
-        label = self.data_tar.extractfile(self.name2mem[label_file]).read()
+        data = self.data_tar.read(data_file)
+        label = self.data_tar.read(label_file)
         data = Image.open(io.BytesIO(data))
         label = Image.open(io.BytesIO(label))
 
@@ -187,5 +183,5 @@ class VOC2012(Dataset):
         return len(self.data)
 
     def __del__(self):
-        if self.data_tar:
+        if getattr(self, 'data_tar', None):
             self.data_tar.close()
@@ -239,9 +239,14 @@ def _affine_grid(theta, w, h, ow, oh):
         tmp = paddle.assign(np.array([0.5 * w, 0.5 * h], dtype="float32"))
 
     scaled_theta = theta.transpose((0, 2, 1)) / tmp
-    output_grid = base_grid.reshape((1, oh * ow, 3)).bmm(scaled_theta)
+    base_grid = base_grid.reshape((1, oh * ow, 3))
+    # a batch of theta warps every image of the batch with its own matrix
+    num_batches = theta.shape[0]
+    if num_batches > 1:
+        base_grid = base_grid.expand((num_batches, oh * ow, 3))
+    output_grid = base_grid.bmm(scaled_theta)
 
-    return output_grid.reshape((1, oh, ow, 2))
+    return output_grid.reshape((num_batches, oh, ow, 2))
 
 
 def _grid_transform(img, grid, mode, fill):
@@ -612,9 +617,9 @@ def crop(img, top, left, height, width, data_format='CHW'):
     _assert_image_tensor(img, data_format)
 
     if _is_channel_first(data_format):
-        return img[:, top : top + height, left : left + width]
+        return img[..., top : top + height, left : left + width]
     else:
-        return img[top : top + height, left : left + width, :]
+        return img[..., top : top + height, left : left + width, :]
 
 
 def erase(img, i, j, h, w, v, inplace=False):
@@ -814,7 +819,9 @@ def resize(img, size, interpolation='bilinear', data_format='CHW'):
     else:
         oh, ow = size
 
-    img = img.unsqueeze(0)
+    ndim = len(img.shape)
+    if ndim == 3:
+        img = img.unsqueeze(0)
     img = F.interpolate(
         img,
         size=(oh, ow),
@@ -822,7 +829,7 @@ def resize(img, size, interpolation='bilinear', data_format='CHW'):
         data_format='N' + data_format.upper(),
     )
 
-    return img.squeeze(0)
+    return img.squeeze(0) if ndim == 3 else img
 
 
 def adjust_brightness(img, brightness_factor):
@@ -953,3 +960,372 @@ def adjust_hue(img, hue_factor):
         raise ValueError("channels of input should be either 1 or 3.")
 
     return img_adjusted
+
+
+def _cast_back(img, dtype):
+    if dtype == img.dtype:
+        return img
+    if dtype == paddle.uint8:
+        img = img.round().clip(0, 255)
+    return img.astype(dtype)
+
+
+def _get_batched_factor(factor, img):
+    return paddle.to_tensor(
+        np.asarray(factor, dtype='float32'), place=img.place
+    ).reshape((-1, 1, 1, 1))
+
+
+def _blend_batched_images(img1, img2, ratio):
+    max_value = 1.0 if paddle.is_floating_point(img1) else 255.0
+    img1_f = img1.astype(paddle.float32)
+    img2_f = img2.astype(paddle.float32)
+    blended = img2_f + ratio * (img1_f - img2_f)
+    return blended.clip(0, max_value).astype(img1.dtype)
+
+
+def _get_batched_affine_matrix(center, angle, translate, scale, shear):
+    """Vectorized ``functional._get_affine_matrix``, which gets the inverse
+    affine matrix of every sample.
+
+    Args:
+        center (list|tuple): Center of the transform (x, y), relative to the
+            image center, shared by all samples.
+        angle (np.ndarray): Rotation angles in degrees, with shape (N,).
+        translate (np.ndarray): Translations (tx, ty), with shape (N, 2).
+        scale (np.ndarray): Scale factors, with shape (N,).
+        shear (np.ndarray): Shear angles (sx, sy) in degrees, with shape (N, 2).
+
+    Returns:
+        np.ndarray: Affine matrices with shape (N, 6).
+    """
+    rot = np.radians(angle)
+    sx = np.radians(shear[:, 0])
+    sy = np.radians(shear[:, 1])
+
+    a = np.cos(rot - sy) / np.cos(sy)
+    b = -np.cos(rot - sy) * np.tan(sx) / np.cos(sy) - np.sin(rot)
+    c = np.sin(rot - sy) / np.cos(sy)
+    d = -np.sin(rot - sy) * np.tan(sx) / np.cos(sy) + np.cos(rot)
+
+    cx, cy = center
+    tx, ty = translate[:, 0], translate[:, 1]
+
+    matrix = np.stack([d, -b, np.zeros_like(d), -c, a, np.zeros_like(d)], -1)
+    matrix = matrix / scale[:, None]
+    matrix[:, 2] += matrix[:, 0] * (-cx - tx) + matrix[:, 1] * (-cy - ty) + cx
+    matrix[:, 5] += matrix[:, 3] * (-cx - tx) + matrix[:, 4] * (-cy - ty) + cy
+    return matrix.astype('float32')
+
+
+def batched_affine(img, matrix, interpolation="nearest", fill=None):
+    """Affine every image of a batch by its own matrix, the whole batch is
+    warped by one grid sampling.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        matrix (np.ndarray): Affine matrices with shape (N, 6), which are
+            the same as the matrix of ``affine``.
+        interpolation (str, optional): Interpolation method, "nearest" or
+            "bilinear". Default: "nearest".
+        fill (int|float|list|tuple, optional): Pixel fill value for the area
+            outside the transformed image. Default: None.
+
+    Returns:
+        paddle.Tensor: Affined images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+
+    dtype = img.dtype
+    img = img.astype(paddle.float32)
+    theta = paddle.to_tensor(matrix, place=img.place).reshape((-1, 2, 3))
+    h, w = img.shape[-2:]
+
+    grid = _affine_grid(theta, w=w, h=h, ow=w, oh=h)
+    out = _grid_transform(img, grid, mode=interpolation, fill=fill)
+
+    return _cast_back(out, dtype)
+
+
+def batched_resized_crop(img, boxes, size, interpolation='bilinear'):
+    """Crop a box from every image of a batch and resize all the crops to
+    the same size, the whole batch is resampled by one grid sampling.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        boxes (np.ndarray): Crop boxes (top, left, height, width) with shape (N, 4).
+        size (list|tuple): Target size (height, width) of the crops.
+        interpolation (str, optional): Interpolation method, "nearest" or
+            "bilinear". Default: "bilinear".
+
+    Returns:
+        paddle.Tensor: Cropped and resized images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+
+    n, c, h, w = img.shape
+    oh, ow = size
+    top, left, height, width = np.asarray(boxes, dtype='float64').T
+
+    # map the output grid in [-1, 1] onto the crop box of the input image
+    theta = np.zeros((n, 2, 3), dtype='float32')
+    theta[:, 0, 0] = width / w
+    theta[:, 0, 2] = (2 * left + width) / w - 1
+    theta[:, 1, 1] = height / h
+    theta[:, 1, 2] = (2 * top + height) / h - 1
+    theta = paddle.to_tensor(theta, place=img.place)
+
+    dtype = img.dtype
+    img = img.astype(paddle.float32)
+    grid = F.affine_grid(theta, [n, c, oh, ow], align_corners=False)
+    out = _grid_transform(img, grid, mode=interpolation, fill=None)
+
+    return _cast_back(out, dtype)
+
+
+def batched_adjust_brightness(img, brightness_factor):
+    """Adjusts brightness of every image of a batch by its own factor.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        brightness_factor (np.ndarray): Brightness factors with shape (N,).
+
+    Returns:
+        paddle.Tensor: Brightness adjusted images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+    assert (
+        np.asarray(brightness_factor) >= 0
+    ).all(), "brightness_factor should be non-negative."
+
+    ratio = _get_batched_factor(brightness_factor, img)
+    return _blend_batched_images(img, paddle.zeros([1], img.dtype), ratio)
+
+
+def batched_adjust_contrast(img, contrast_factor):
+    """Adjusts contrast of every image of a batch by its own factor.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        contrast_factor (np.ndarray): Contrast factors with shape (N,).
+
+    Returns:
+        paddle.Tensor: Contrast adjusted images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+    assert (
+        np.asarray(contrast_factor) >= 0
+    ).all(), "contrast_factor should be non-negative."
+
+    channels = _get_image_num_channels(img, 'CHW')
+    img_f = img.astype(paddle.float32)
+    if channels == 3:
+        img_f = to_grayscale(img_f)
+    elif channels != 1:
+        raise ValueError("channels of input should be either 1 or 3.")
+    extreme_target = paddle.mean(img_f, axis=(-3, -2, -1), keepdim=True)
+
+    ratio = _get_batched_factor(contrast_factor, img)
+    return _blend_batched_images(img, extreme_target, ratio)
+
+
+def batched_adjust_saturation(img, saturation_factor):
+    """Adjusts color saturation of every image of a batch by its own factor.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        saturation_factor (np.ndarray): Saturation factors with shape (N,).
+
+    Returns:
+        paddle.Tensor: Saturation adjusted images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+    assert (
+        np.asarray(saturation_factor) >= 0
+    ).all(), "saturation_factor should be non-negative."
+
+    channels = _get_image_num_channels(img, 'CHW')
+    if channels == 1:
+        return img
+    elif channels != 3:
+        raise ValueError("channels of input should be either 1 or 3.")
+    extreme_target = to_grayscale(img.astype(paddle.float32))
+
+    ratio = _get_batched_factor(saturation_factor, img)
+    return _blend_batched_images(img, extreme_target, ratio)
+
+
+def batched_adjust_hue(img, hue_factor):
+    """Adjusts hue of every image of a batch by its own factor.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        hue_factor (np.ndarray): Hue factors in [-0.5, 0.5] with shape (N,).
+
+    Returns:
+        paddle.Tensor: Hue adjusted images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+    hue_factor = np.asarray(hue_factor)
+    assert (
+        (hue_factor >= -0.5) & (hue_factor <= 0.5)
+    ).all(), "hue_factor should be in range [-0.5, 0.5]"
+
+    channels = _get_image_num_channels(img, 'CHW')
+    if channels == 1:
+        return img
+    elif channels != 3:
+        raise ValueError("channels of input should be either 1 or 3.")
+
+    dtype = img.dtype
+    if dtype == paddle.uint8:
+        img = img.astype(paddle.float32) / 255.0
+
+    h, s, v = _rgb_to_hsv(img).unbind(axis=-3)
+    h = h + _get_batched_factor(hue_factor, img).squeeze(1)
+    h = h - h.floor()
+    img_adjusted = _hsv_to_rgb(paddle.stack([h, s, v], axis=-3))
+
+    if dtype == paddle.uint8:
+        img_adjusted = (img_adjusted * 255.0).astype(dtype)
+
+    return img_adjusted
+
+
+def fused_warp(img, matrix, size, interpolation='bilinear', fill=None):
+    """Warp a batch of images by the composed matrices of several geometric
+    transforms in one resampling.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        matrix (np.ndarray): Matrices with shape (N, 3, 3), which map the
+            pixel coordinates (x, y) of the output images to the ones of the
+            input images. The pixel (i, j) covers [j, j + 1) x [i, i + 1).
+        size (list|tuple): Size (width, height) of the output images.
+        interpolation (str, optional): Interpolation method, "nearest" or
+            "bilinear". Default: "bilinear".
+        fill (int|float|list|tuple, optional): Pixel fill value for the area
+            outside the input images. Default: None.
+
+    Returns:
+        paddle.Tensor: Warped images.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+
+    n, c, h, w = img.shape
+    ow, oh = size
+    # convert the matrices to the normalized coordinates of grid_sample
+    to_input = np.array([[2.0 / w, 0, -1], [0, 2.0 / h, -1], [0, 0, 1]])
+    from_output = np.array(
+        [[ow / 2.0, 0, ow / 2.0], [0, oh / 2.0, oh / 2.0], [0, 0, 1]]
+    )
+    theta = (to_input @ matrix @ from_output)[:, :2, :].astype('float32')
+    theta = paddle.to_tensor(theta, place=img.place)
+
+    dtype = img.dtype
+    img = img.astype(paddle.float32)
+    grid = F.affine_grid(theta, [n, c, oh, ow], align_corners=False)
+    if fill is None:
+        # resizing and cropping sample the border pixels like interpolate
+        out = F.grid_sample(
+            img,
+            grid,
+            mode=interpolation,
+            padding_mode='border',
+            align_corners=False,
+        )
+    else:
+        out = _grid_transform(img, grid, mode=interpolation, fill=fill)
+
+    return _cast_back(out, dtype)
+
+
+def _get_gray_weights(num_channels):
+    if num_channels == 3:
+        return np.array([0.2989, 0.5870, 0.1140])
+    return np.ones([num_channels])
+
+
+def _compose_pixel_affine(acc, step, img):
+    """Compose the per-pixel affine ``step`` after ``acc``.
+
+    ``step`` is (A, b, k, clip), which maps every pixel x of a sample to
+    ``A @ x + b + k * gray(mean(x))``, where ``mean(x)`` is the mean pixel of
+    the sample. A, b and k are arrays with shape (N, C, C), (N, C) and (N, C),
+    k can be None. ``acc`` is (A, b, mean) of the composed affine, where mean
+    is the mean pixel of the input images, or None.
+    """
+    num, channels = img.shape[:2]
+    if acc is None:
+        acc_a = np.tile(np.eye(channels), (num, 1, 1))
+        acc_b = np.zeros((num, channels))
+        mean = None
+    else:
+        acc_a, acc_b, mean = acc
+    a, b, k, _ = step
+
+    if k is not None:
+        if mean is None:
+            mean = img.astype(paddle.float32).mean(axis=(-2, -1)).numpy()
+        # the mean of an affined image is the affined mean of the image
+        cur_mean = np.einsum('nij,nj->ni', acc_a, mean) + acc_b
+        gray_mean = cur_mean @ _get_gray_weights(channels)
+        b = b + k * gray_mean[:, None]
+
+    acc_a = a @ acc_a
+    acc_b = np.einsum('nij,nj->ni', a, acc_b) + b
+    return acc_a, acc_b, mean
+
+
+def fused_pixel_affine(img, color=None, normalize=None):
+    """Apply the composed color adjustments and normalizations on a batch of
+    images in one per-pixel pass.
+
+    Args:
+        img (paddle.Tensor): Images with shape (N, C, H, W).
+        color (tuple, optional): The composed affine of the color adjustments,
+            whose result is clipped to the valid pixel range. Default: None.
+        normalize (tuple, optional): The composed affine of the normalizations,
+            which are applied after the color adjustments. Default: None.
+
+    Returns:
+        paddle.Tensor: Adjusted images, which are float32 if normalized.
+
+    """
+    _assert_image_tensor(img, 'CHW')
+
+    dtype = img.dtype
+    max_value = 1.0 if paddle.is_floating_point(img) else 255.0
+    num, channels = img.shape[:2]
+    out = img.astype(paddle.float32)
+
+    for acc, clip in ((color, True), (normalize, False)):
+        if acc is None:
+            continue
+        a, b, _ = acc
+        bias = paddle.to_tensor(b.astype('float32'), place=img.place).reshape(
+            (num, channels, 1, 1)
+        )
+        diagonal = np.diagonal(a, axis1=1, axis2=2)
+        if np.array_equal(a, diagonal[..., None] * np.eye(channels)):
+            # per-channel scaling, e.g. brightness, contrast and normalize
+            scale = paddle.to_tensor(
+                diagonal.astype('float32'), place=img.place
+            ).reshape((num, channels, 1, 1))
+            out = out * scale + bias
+        else:
+            a = paddle.to_tensor(a.astype('float32'), place=img.place)
+            out = paddle.einsum('nij,njhw->nihw', a, out) + bias
+        if clip:
+            out = out.clip(0, max_value)
+
+    if normalize is None:
+        out = _cast_back(out, dtype)
+    return out
@@ -22,7 +22,7 @@ import numpy as np
 
 import paddle
 
-from . import functional as F
+from . import functional as F, functional_tensor as F_t
 
 __all__ = []
 
@@ -69,6 +69,28 @@ def _check_input(
     return value
 
 
+def _select_samples(mask, transformed, images):
+    """Take the samples of ``transformed`` where ``mask`` is True, and the
+    samples of ``images`` otherwise."""
+    if mask.all():
+        return transformed
+    mask = paddle.to_tensor(mask, place=images.place).reshape((-1, 1, 1, 1))
+    return paddle.where(mask, transformed, images)
+
+
+def _get_centered_warp(matrix, size):
+    """Convert the (N, 6) affine matrices relative to the image center, see
+    ``functional_tensor.batched_affine``, to the (N, 3, 3) warp matrices of
+    the pixel coordinates."""
+    w, h = size
+    num = matrix.shape[0]
+    warp = np.tile(np.eye(3), (num, 1, 1))
+    warp[:, :2, :] = matrix.reshape((num, 2, 3))
+    to_center = np.array([[1, 0, -w / 2.0], [0, 1, -h / 2.0], [0, 0, 1]])
+    from_center = np.array([[1, 0, w / 2.0], [0, 1, h / 2.0], [0, 0, 1]])
+    return from_center @ warp @ to_center
+
+
 class Compose:
     """
     Composes several transforms together use for composing list of transforms
@@ -76,6 +98,19 @@ class Compose:
 
     Args:
         transforms (list|tuple): List/Tuple of transforms to compose.
+        batched (bool, optional): Whether to transform a batch of images at once,
+            e.g. in the ``collate_fn`` of ``paddle.io.DataLoader``. If True, the
+            input is a paddle.Tensor or numpy.ndarray with shape (N x C x H x W),
+            or a tuple whose first element is such a batch and the rest elements
+            are returned unchanged. If ``transforms`` contains a ``ToTensor``,
+            the input is a batch of HWC images with shape (N x H x W x C)
+            instead, which the transforms before ``ToTensor`` see as
+            (N x C x H x W), so ``Transpose`` and ``Normalize`` should be placed
+            after ``ToTensor``. The random parameters are drawn for every
+            sample, and the transforms which support batch mode process the
+            whole batch in one call, the other BaseTransform process the batch
+            sample by sample, and the other callables are called with the whole
+            batch. Default: False.
 
     Returns:
         A compose object which is callable, __call__ for this Compose
@@ -95,24 +130,195 @@ class Compose:
             (916, 608) [1]
             (758, 608) [1]
             (811, 608) [1]
+
+            >>> import paddle
+            >>> from paddle.vision.transforms import Compose, Normalize, RandomAffine
+            >>> transform = Compose(
+            ...     [RandomAffine(15, scale=(0.9, 1.1)), Normalize(0.5, 0.5)],
+            ...     batched=True,
+            ... )
+            >>> images = paddle.rand([8, 3, 32, 32])
+            >>> print(transform(images).shape)
+            [8, 3, 32, 32]
     """
 
-    def __init__(self, transforms):
+    def __init__(self, transforms, batched=False, fuse=False):
         self.transforms = transforms
+        self.batched = batched
+        self.fuse = fuse
 
     def __call__(self, data):
+        if self.batched:
+            return self._batch_call(data)
+        if self.fuse:
+            return self._fused_call(data)
+
         for f in self.transforms:
-            try:
-                data = f(data)
-            except Exception as e:
-                stack_info = traceback.format_exc()
-                print(
-                    f"fail to perform transform [{f}] with error: "
-                    f"{e} and stack:\n{str(stack_info)}"
-                )
-                raise e
+            data = self._apply_transform(f, data)
         return data
 
+    def _apply_transform(self, f, data, batched=False):
+        try:
+            if batched and isinstance(f, BaseTransform):
+                return f._apply_batch_image(data)
+            return f(data)
+        except Exception as e:
+            stack_info = traceback.format_exc()
+            print(
+                f"fail to perform transform [{f}] with error: "
+                f"{e} and stack:\n{str(stack_info)}"
+            )
+            raise e
+
+    def _fused_call(self, data):
+        idx = 0
+        while idx < len(self.transforms):
+            image = data[0] if isinstance(data, tuple) else data
+            end = idx
+            if F._is_tensor_image(image) and len(image.shape) == 3:
+                end, fused = self._fuse(idx, image.unsqueeze(0))
+                if end > idx:
+                    fused = fused.squeeze(0)
+                    if isinstance(data, tuple):
+                        data = (fused, *data[1:])
+                    else:
+                        data = fused
+            if end == idx:
+                data = self._apply_transform(self.transforms[idx], data)
+                end = idx + 1
+            idx = end
+        return data
+
+    def _batch_call(self, data):
+        if isinstance(data, tuple):
+            images, others = data[0], data[1:]
+        else:
+            images, others = data, ()
+
+        if not F._is_tensor_image(images):
+            images = paddle.to_tensor(np.asarray(images))
+        if len(images.shape) != 4:
+            raise ValueError(
+                f"The batch of images should be 4-D, but received {len(images.shape)}-D"
+            )
+
+        # the collated HWC images are transposed to N x C x H x W on entry,
+        # and ToTensor converts them to its data format
+        to_tensor_idx = next(
+            (
+                i
+                for i, f in enumerate(self.transforms)
+                if isinstance(f, ToTensor)
+            ),
+            None,
+        )
+        if to_tensor_idx is not None:
+            for f in self.transforms[:to_tensor_idx]:
+                if isinstance(f, (Transpose, Normalize)):
+                    raise ValueError(
+                        f"{f.__class__.__name__} depends on the data format of "
+                        "the images, it should be placed after ToTensor in "
+                        "batch mode"
+                    )
+            images = images.transpose((0, 3, 1, 2))
+
+        idx = 0
+        while idx < len(self.transforms):
+            end = idx
+            if self.fuse:
+                end, images = self._fuse(idx, images)
+            if end == idx:
+                images = self._apply_transform(
+                    self.transforms[idx], images, batched=True
+                )
+                end = idx + 1
+            idx = end
+
+        if len(others) > 0:
+            return (images, *others)
+        return images
+
+    def _fusible(self, idx):
+        if idx >= len(self.transforms):
+            return None
+        f = self.transforms[idx]
+        if isinstance(f, BaseTransform) and tuple(f.keys) == ('image',):
+            return f
+        return None
+
+    def _fuse(self, idx, images):
+        """
+        Fuse the transforms from ``idx`` on a N x C x H x W tensor, returns the
+        index of the first transform which is not fused and the result. The
+        consecutive geometric transforms are fused into one resampling, and
+        the consecutive color transforms and normalizations are fused into
+        one per-pixel pass.
+        """
+        end, images = self._fuse_warp(idx, images)
+        if end == idx:
+            end, images = self._fuse_pixel(idx, images)
+        return end, images
+
+    def _fuse_warp(self, idx, images):
+        num, _, height, width = images.shape
+        size = (width, height)
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        interpolation, fill = None, None
+
+        end = idx
+        while self._fusible(end) is not None:
+            warp = self.transforms[end]._get_warp(size, num)
+            if warp is None:
+                break
+            # the warp maps the output coordinates to the input ones, so
+            # the composed warp is applied from the last transform back
+            step_matrix, size, step_interpolation, step_fill = warp
+            matrix = matrix @ step_matrix
+            if step_interpolation is not None and interpolation != 'bilinear':
+                interpolation = step_interpolation
+            if step_fill is not None:
+                fill = step_fill
+            end += 1
+
+        if end == idx:
+            return end, images
+        if size == (width, height) and np.allclose(matrix, np.eye(3)):
+            return end, images
+        interpolation = (
+            'nearest' if interpolation in (None, 'nearest') else 'bilinear'
+        )
+        images = F_t.fused_warp(
+            images, matrix, size, interpolation=interpolation, fill=fill
+        )
+        return end, images
+
+    def _fuse_pixel(self, idx, images):
+        num, channels = images.shape[:2]
+        color = normalize = None
+
+        end = idx
+        while self._fusible(end) is not None:
+            steps = self.transforms[end]._get_pixel_affine(num, channels)
+            if steps is None:
+                break
+            # the clipped color adjustments should come before the
+            # normalizations in one fused pass
+            if normalize is not None and any(step[3] for step in steps):
+                break
+            for step in steps:
+                if step[3]:
+                    color = F_t._compose_pixel_affine(color, step, images)
+                else:
+                    normalize = F_t._compose_pixel_affine(
+                        normalize, step, images
+                    )
+            end += 1
+
+        if end == idx:
+            return end, images
+        images = F_t.fused_pixel_affine(images, color, normalize)
+        return end, images
+
     def __repr__(self):
         format_string = self.__class__.__name__ + '('
         for t in self.transforms:
@@ -138,6 +344,17 @@ class BaseTransform:
     If you want to implement a self-defined transform method for image,
     rewrite _apply_* method in subclass.
 
+    In the batch mode of ``Compose``, _apply_batch_image() is called with the
+    whole batch of images, which applies the transform sample by sample by
+    default. Rewrite it in subclass to transform the batch at once. Note that
+    the callables in ``Compose`` which are not BaseTransform are called with
+    the whole batch too.
+
+    In the fuse mode of ``Compose``, a geometric transform can be fused with
+    its neighbours into one resampling by rewriting _get_warp(), and a
+    per-pixel affine transform of the colors can be fused into one pass by
+    rewriting _get_pixel_affine().
+
     Args:
         keys (list[str]|tuple[str], optional): Input type. Input is a tuple contains different structures,
             key is used to specify the type of input. For example, if your input
@@ -274,6 +491,27 @@ class BaseTransform:
     def _apply_image(self, image):
         raise NotImplementedError
 
+    def _apply_batch_image(self, images):
+        return paddle.stack([self((image,)) for image in images.unbind(0)])
+
+    def _get_warp(self, size, num):
+        """
+        Get the geometric transform of ``num`` images with size (width, height),
+        as (matrix, output_size, interpolation, fill), where matrix is a
+        (num, 3, 3) array mapping the output pixel coordinates to the input
+        ones. Returns None if the transform can not be fused.
+        """
+        return None
+
+    def _get_pixel_affine(self, num, num_channels):
+        """
+        Get the per-pixel affine transforms of ``num`` images, as a list of
+        steps (A, b, k, clip), see ``functional_tensor._compose_pixel_affine``,
+        where clip is whether to clip the result to the valid pixel range.
+        Returns None if the transform can not be fused.
+        """
+        return None
+
     def _apply_boxes(self, boxes):
         raise NotImplementedError
 
@@ -342,6 +580,14 @@ class ToTensor(BaseTransform):
         """
         return F.to_tensor(img, self.data_format)
 
+    def _apply_batch_image(self, images):
+        # the collated HWC images are transposed to N x C x H x W by Compose
+        if self.data_format.upper() == 'HWC':
+            images = images.transpose((0, 2, 3, 1))
+        if images.dtype == paddle.uint8:
+            images = images.astype(paddle.float32) / 255.0
+        return images
+
 
 class Resize(BaseTransform):
     """Resize the input Image to the given size.
@@ -405,6 +651,26 @@ class Resize(BaseTransform):
     def _apply_image(self, img):
         return F.resize(img, self.size, self.interpolation)
 
+    def _apply_batch_image(self, images):
+        return F_t.resize(images, self.size, self.interpolation)
+
+    def _get_warp(self, size, num):
+        w, h = size
+        if isinstance(self.size, int):
+            if (w <= h and w == self.size) or (h <= w and h == self.size):
+                oh, ow = h, w
+            elif w < h:
+                ow = self.size
+                oh = int(self.size * h / w)
+            else:
+                oh = self.size
+                ow = int(self.size * w / h)
+        else:
+            oh, ow = self.size
+
+        matrix = np.tile(np.diag([w / ow, h / oh, 1.0]), (num, 1, 1))
+        return matrix, (ow, oh), self.interpolation, None
+
 
 class RandomResizedCrop(BaseTransform):
     """Crop the input data to random size and aspect ratio.
@@ -493,6 +759,12 @@ class RandomResizedCrop(BaseTransform):
                 return i, j, h, w
 
         # Fallback to central crop
+        h, w = self._get_central_crop_size(width, height)
+        i = (height - h) // 2
+        j = (width - w) // 2
+        return i, j, h, w
+
+    def _get_central_crop_size(self, width, height):
         in_ratio = float(width) / float(height)
         if in_ratio < min(self.ratio):
             w = width
@@ -504,9 +776,40 @@ class RandomResizedCrop(BaseTransform):
             # return whole image
             w = width
             h = height
-        i = (height - h) // 2
-        j = (width - w) // 2
-        return i, j, h, w
+        return h, w
+
+    def _batch_get_param(self, num, width, height, attempts=10):
+        area = height * width
+        log_ratio = tuple(math.log(x) for x in self.ratio)
+
+        # draw all the attempts of all the samples at once, and take the
+        # first valid attempt of every sample
+        target_area = np.random.uniform(*self.scale, (num, attempts)) * area
+        aspect_ratio = np.exp(np.random.uniform(*log_ratio, (num, attempts)))
+        w = np.round(np.sqrt(target_area * aspect_ratio)).astype('int64')
+        h = np.round(np.sqrt(target_area / aspect_ratio)).astype('int64')
+
+        valid = (w > 0) & (w <= width) & (h > 0) & (h <= height)
+        first = valid.argmax(axis=1)
+        found = valid[np.arange(num), first]
+        h = h[np.arange(num), first]
+        w = w[np.arange(num), first]
+
+        # Fallback to central crop
+        central_h, central_w = self._get_central_crop_size(width, height)
+        h = np.where(found, h, central_h)
+        w = np.where(found, w, central_w)
+        i = np.where(
+            found,
+            np.floor(np.random.random(num) * (height - h + 1)),
+            (height - h) // 2,
+        )
+        j = np.where(
+            found,
+            np.floor(np.random.random(num) * (width - w + 1)),
+            (width - w) // 2,
+        )
+        return np.stack([i, j, h, w], axis=1)
 
     def _static_get_param(self, image, attempts=10):
         width, height = _get_image_size(image)
@@ -611,6 +914,27 @@ class RandomResizedCrop(BaseTransform):
         cropped_img = F.crop(img, i, j, h, w)
         return F.resize(cropped_img, self.size, self.interpolation)
 
+    def _apply_batch_image(self, images):
+        if self.interpolation not in ('nearest', 'bilinear'):
+            return super()._apply_batch_image(images)
+
+        width, height = _get_image_size(images)
+        boxes = self._batch_get_param(images.shape[0], width, height)
+        return F_t.batched_resized_crop(
+            images, boxes, self.size, self.interpolation
+        )
+
+    def _get_warp(self, size, num):
+        i, j, h, w = self._batch_get_param(num, *size).T
+        oh, ow = self.size
+
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        matrix[:, 0, 0] = w / ow
+        matrix[:, 0, 2] = j
+        matrix[:, 1, 1] = h / oh
+        matrix[:, 1, 2] = i
+        return matrix, (ow, oh), self.interpolation, None
+
 
 class CenterCrop(BaseTransform):
     """Crops the given the input data at the center.
@@ -652,6 +976,20 @@ class CenterCrop(BaseTransform):
     def _apply_image(self, img):
         return F.center_crop(img, self.size)
 
+    def _apply_batch_image(self, images):
+        return F_t.center_crop(images, self.size)
+
+    def _get_warp(self, size, num):
+        w, h = size
+        th, tw = self.size
+        if th > h or tw > w:
+            return None
+
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        matrix[:, 0, 2] = int(round((w - tw) / 2.0))
+        matrix[:, 1, 2] = int(round((h - th) / 2.0))
+        return matrix, (tw, th), None, None
+
 
 class RandomHorizontalFlip(BaseTransform):
     """Horizontally flip the input data randomly with a given probability.
@@ -711,6 +1049,21 @@ class RandomHorizontalFlip(BaseTransform):
             lambda: img,
         )
 
+    def _apply_batch_image(self, images):
+        flip = np.random.random(images.shape[0]) < self.prob
+        if not flip.any():
+            return images
+        return _select_samples(flip, F_t.hflip(images), images)
+
+    def _get_warp(self, size, num):
+        w, h = size
+        flip = np.random.random(num) < self.prob
+
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        matrix[flip, 0, 0] = -1
+        matrix[flip, 0, 2] = w
+        return matrix, size, None, None
+
 
 class RandomVerticalFlip(BaseTransform):
     """Vertically flip the input data randomly with a given probability.
@@ -770,6 +1123,21 @@ class RandomVerticalFlip(BaseTransform):
             lambda: img,
         )
 
+    def _apply_batch_image(self, images):
+        flip = np.random.random(images.shape[0]) < self.prob
+        if not flip.any():
+            return images
+        return _select_samples(flip, F_t.vflip(images), images)
+
+    def _get_warp(self, size, num):
+        w, h = size
+        flip = np.random.random(num) < self.prob
+
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        matrix[flip, 1, 1] = -1
+        matrix[flip, 1, 2] = h
+        return matrix, size, None, None
+
 
 class Normalize(BaseTransform):
     """Normalize the input data with mean and standard deviation.
@@ -818,6 +1186,10 @@ class Normalize(BaseTransform):
         self, mean=0.0, std=1.0, data_format='CHW', to_rgb=False, keys=None
     ):
         super().__init__(keys)
+        # the scalars are broadcast to any number of channels in the batch
+        # and fuse modes of Compose
+        self._scalar_mean = isinstance(mean, numbers.Number)
+        self._scalar_std = isinstance(std, numbers.Number)
         if isinstance(mean, numbers.Number):
             mean = [mean, mean, mean]
 
@@ -829,11 +1201,38 @@ class Normalize(BaseTransform):
         self.data_format = data_format
         self.to_rgb = to_rgb
 
+    def _get_mean_std(self, num_channels):
+        mean = np.asarray(self.mean, 'float64').reshape(-1)
+        std = np.asarray(self.std, 'float64').reshape(-1)
+        if self._scalar_mean or len(mean) == 1:
+            mean = np.full(num_channels, mean[0])
+        if self._scalar_std or len(std) == 1:
+            std = np.full(num_channels, std[0])
+        return mean, std
+
     def _apply_image(self, img):
         return F.normalize(
             img, self.mean, self.std, self.data_format, self.to_rgb
         )
 
+    def _apply_batch_image(self, images):
+        if not paddle.is_floating_point(images):
+            images = images.astype(paddle.float32)
+        channel_axis = 1 if self.data_format.upper() == 'CHW' else -1
+        mean, std = self._get_mean_std(images.shape[channel_axis])
+        return F_t.normalize(
+            images, mean.tolist(), std.tolist(), self.data_format
+        )
+
+    def _get_pixel_affine(self, num, num_channels):
+        mean, std = self._get_mean_std(num_channels)
+        if self.data_format.upper() != 'CHW' or len(mean) != num_channels:
+            return None
+
+        a = np.tile(np.diag(1.0 / std), (num, 1, 1))
+        b = np.tile(-mean / std, (num, 1))
+        return [(a, b, None, False)]
+
 
 class Transpose(BaseTransform):
     """Transpose input data to a target format.
@@ -884,6 +1283,9 @@ class Transpose(BaseTransform):
             img = img[..., np.newaxis]
         return img.transpose(self.order)
 
+    def _apply_batch_image(self, images):
+        return images.transpose([0] + [axis + 1 for axis in self.order])
+
 
 class BrightnessTransform(BaseTransform):
     """Adjust brightness of the image.
@@ -931,6 +1333,23 @@ class BrightnessTransform(BaseTransform):
         brightness_factor = random.uniform(self.value[0], self.value[1])
         return F.adjust_brightness(img, brightness_factor)
 
+    def _apply_batch_image(self, images):
+        if self.value is None:
+            return images
+
+        brightness_factor = np.random.uniform(
+            self.value[0], self.value[1], images.shape[0]
+        )
+        return F_t.batched_adjust_brightness(images, brightness_factor)
+
+    def _get_pixel_affine(self, num, num_channels):
+        factor = np.ones(num)
+        if self.value is not None:
+            factor = np.random.uniform(self.value[0], self.value[1], num)
+
+        a = factor[:, None, None] * np.eye(num_channels)
+        return [(a, np.zeros((num, num_channels)), None, True)]
+
 
 class ContrastTransform(BaseTransform):
     """Adjust contrast of the image.
@@ -976,6 +1395,27 @@ class ContrastTransform(BaseTransform):
         contrast_factor = random.uniform(self.value[0], self.value[1])
         return F.adjust_contrast(img, contrast_factor)
 
+    def _apply_batch_image(self, images):
+        if self.value is None:
+            return images
+
+        contrast_factor = np.random.uniform(
+            self.value[0], self.value[1], images.shape[0]
+        )
+        return F_t.batched_adjust_contrast(images, contrast_factor)
+
+    def _get_pixel_affine(self, num, num_channels):
+        if num_channels not in (1, 3):
+            return None
+        factor = np.ones(num)
+        if self.value is not None:
+            factor = np.random.uniform(self.value[0], self.value[1], num)
+
+        # blend with the mean of the grayscale image
+        a = factor[:, None, None] * np.eye(num_channels)
+        k = np.tile((1.0 - factor)[:, None], (1, num_channels))
+        return [(a, np.zeros((num, num_channels)), k, True)]
+
 
 class SaturationTransform(BaseTransform):
     """Adjust saturation of the image.
@@ -1018,6 +1458,30 @@ class SaturationTransform(BaseTransform):
         saturation_factor = random.uniform(self.value[0], self.value[1])
         return F.adjust_saturation(img, saturation_factor)
 
+    def _apply_batch_image(self, images):
+        if self.value is None:
+            return images
+
+        saturation_factor = np.random.uniform(
+            self.value[0], self.value[1], images.shape[0]
+        )
+        return F_t.batched_adjust_saturation(images, saturation_factor)
+
+    def _get_pixel_affine(self, num, num_channels):
+        if num_channels not in (1, 3):
+            return None
+        factor = np.ones(num)
+        if self.value is not None and num_channels == 3:
+            factor = np.random.uniform(self.value[0], self.value[1], num)
+
+        # blend with the grayscale image
+        gray = np.tile(F_t._get_gray_weights(num_channels), (num_channels, 1))
+        a = (
+            factor[:, None, None] * np.eye(num_channels)
+            + (1.0 - factor)[:, None, None] * gray
+        )
+        return [(a, np.zeros((num, num_channels)), None, True)]
+
 
 class HueTransform(BaseTransform):
     """Adjust hue of the image.
@@ -1063,6 +1527,15 @@ class HueTransform(BaseTransform):
         hue_factor = random.uniform(self.value[0], self.value[1])
         return F.adjust_hue(img, hue_factor)
 
+    def _apply_batch_image(self, images):
+        if self.value is None:
+            return images
+
+        hue_factor = np.random.uniform(
+            self.value[0], self.value[1], images.shape[0]
+        )
+        return F_t.batched_adjust_hue(images, hue_factor)
+
 
 class ColorJitter(BaseTransform):
     """Randomly change the brightness, contrast, saturation and hue of an image.
@@ -1151,6 +1624,31 @@ class ColorJitter(BaseTransform):
         )
         return transform(img)
 
+    def _apply_batch_image(self, images):
+        # NOTE: the order of the adjustments is shared by the whole batch,
+        # while the factors are drawn for every sample.
+        transform = self._get_param(
+            self.brightness, self.contrast, self.saturation, self.hue
+        )
+        for t in transform.transforms:
+            images = t._apply_batch_image(images)
+        return images
+
+    def _get_pixel_affine(self, num, num_channels):
+        transform = self._get_param(
+            self.brightness, self.contrast, self.saturation, self.hue
+        )
+        if any(isinstance(t, HueTransform) for t in transform.transforms):
+            return None
+
+        steps = []
+        for t in transform.transforms:
+            t_steps = t._get_pixel_affine(num, num_channels)
+            if t_steps is None:
+                return None
+            steps.extend(t_steps)
+        return steps
+
 
 class RandomCrop(BaseTransform):
     """Crops the given CV Image at a random location.
@@ -1279,6 +1777,17 @@ class RandomCrop(BaseTransform):
 
         return F.crop(img, i, j, h, w)
 
+    def _get_warp(self, size, num):
+        w, h = size
+        th, tw = self.size
+        if self.padding is not None or th > h or tw > w:
+            return None
+
+        matrix = np.tile(np.eye(3), (num, 1, 1))
+        matrix[:, 0, 2] = np.random.randint(0, w - tw + 1, num)
+        matrix[:, 1, 2] = np.random.randint(0, h - th + 1, num)
+        return matrix, (tw, th), None, None
+
 
 class Pad(BaseTransform):
     """Pads the given CV Image on all sides with the given "pad" value.
@@ -1544,6 +2053,62 @@ class RandomAffine(BaseTransform):
             center=self.center,
         )
 
+    def _batch_get_param(self, num, img_size):
+        angle = np.random.uniform(self.degrees[0], self.degrees[1], num)
+
+        translations = np.zeros((num, 2))
+        if self.translate is not None:
+            max_dx = float(self.translate[0] * img_size[0])
+            max_dy = float(self.translate[1] * img_size[1])
+            translations[:, 0] = np.trunc(
+                np.random.uniform(-max_dx, max_dx, num)
+            )
+            translations[:, 1] = np.trunc(
+                np.random.uniform(-max_dy, max_dy, num)
+            )
+
+        if self.scale is not None:
+            scale = np.random.uniform(self.scale[0], self.scale[1], num)
+        else:
+            scale = np.ones(num)
+
+        shear = np.zeros((num, 2))
+        if self.shear is not None:
+            shear[:, 0] = np.random.uniform(self.shear[0], self.shear[1], num)
+            if len(self.shear) == 4:
+                shear[:, 1] = np.random.uniform(
+                    self.shear[2], self.shear[3], num
+                )
+
+        return angle, translations, scale, shear
+
+    def _apply_batch_image(self, images):
+        w, h = _get_image_size(images)
+        center = [0.0, 0.0]
+        if self.center is not None:
+            center = [c - s * 0.5 for c, s in zip(self.center, [w, h])]
+
+        ret = self._batch_get_param(images.shape[0], [w, h])
+        matrix = F_t._get_batched_affine_matrix(center, *ret)
+        return F_t.batched_affine(
+            images, matrix, interpolation=self.interpolation, fill=self.fill
+        )
+
+    def _get_warp(self, size, num):
+        w, h = size
+        center = [0.0, 0.0]
+        if self.center is not None:
+            center = [c - s * 0.5 for c, s in zip(self.center, [w, h])]
+
+        ret = self._batch_get_param(num, [w, h])
+        matrix = F_t._get_batched_affine_matrix(center, *ret)
+        return (
+            _get_centered_warp(matrix, size),
+            size,
+            self.interpolation,
+            self.fill,
+        )
+
 
 class RandomRotation(BaseTransform):
     """Rotates the image by angle.
@@ -1646,6 +2211,40 @@ class RandomRotation(BaseTransform):
             img, angle, self.interpolation, self.expand, self.center, self.fill
         )
 
+    def _apply_batch_image(self, images):
+        if self.expand:
+            # the expanded sizes differ from sample to sample
+            return super()._apply_batch_image(images)
+
+        w, h = _get_image_size(images)
+        matrix = self._batch_get_matrix(images.shape[0], w, h)
+        return F_t.batched_affine(
+            images, matrix, interpolation=self.interpolation, fill=self.fill
+        )
+
+    def _batch_get_matrix(self, num, w, h):
+        center = [0.0, 0.0]
+        if self.center is not None:
+            center = [c - s * 0.5 for c, s in zip(self.center, [w, h])]
+
+        angle = np.random.uniform(self.degrees[0], self.degrees[1], num)
+        # rotating counter clockwise is an affine of the negative angle
+        return F_t._get_batched_affine_matrix(
+            center, -angle, np.zeros((num, 2)), np.ones(num), np.zeros((num, 2))
+        )
+
+    def _get_warp(self, size, num):
+        if self.expand:
+            return None
+
+        matrix = self._batch_get_matrix(num, *size)
+        return (
+            _get_centered_warp(matrix, size),
+            size,
+            self.interpolation,
+            self.fill,
+        )
+
 
 class RandomPerspective(BaseTransform):
     """Random perspective transformation with a given probability.
@@ -1828,6 +2427,13 @@ class Grayscale(BaseTransform):
         """
         return F.to_grayscale(img, self.num_output_channels)
 
+    def _apply_batch_image(self, images):
+        dtype = images.dtype
+        images = F_t.to_grayscale(
+            images.astype(paddle.float32), self.num_output_channels
+        )
+        return F_t._cast_back(images, dtype)
+
 
 class RandomErasing(BaseTransform):
     """Erase the pixels in a rectangle region selected randomly.
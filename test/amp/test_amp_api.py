@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import unittest
+import weakref
 
 import numpy as np
 from amp_base_models import AmpTestBase
@@ -231,6 +233,69 @@ class TestGradScaler(AmpTestBase):
                 )
 
 
+@unittest.skipIf(
+    not core.is_compiled_with_cuda()
+    or paddle.device.cuda.get_device_capability()[0] < 7.0,
+    "run test when gpu's compute capability is at least 7.0.",
+)
+class TestGradScalerParamGroups(AmpTestBase):
+    def test_unscale_with_param_groups(self):
+        linear1 = paddle.nn.Linear(4, 4)
+        linear2 = paddle.nn.Linear(4, 4)
+        optimizer = paddle.optimizer.AdamW(
+            learning_rate=0.01,
+            parameters=[
+                {'params': linear1.parameters()},
+                {'params': linear2.parameters(), 'weight_decay': 0.0},
+            ],
+        )
+        scaler = paddle.amp.GradScaler(init_loss_scaling=1024)
+        data = paddle.rand([2, 4], dtype='float32')
+        with paddle.amp.auto_cast(level='O1', dtype='float16'):
+            loss = linear2(linear1(data)).mean()
+        loss.backward()
+        params = linear1.parameters() + linear2.parameters()
+        expected_grads = [param.grad.numpy() for param in params]
+        optimizer.clear_grad()
+
+        with paddle.amp.auto_cast(level='O1', dtype='float16'):
+            loss = linear2(linear1(data)).mean()
+        scaler.scale(loss).backward()
+        scaler.unscale_(optimizer)
+        for param, expected_grad in zip(params, expected_grads):
+            np.testing.assert_allclose(
+                param.grad.numpy(), expected_grad, rtol=1e-3, atol=1e-5
+            )
+        self.assertFalse(bool(scaler._found_inf))
+        scaler.step(optimizer)
+        scaler.update()
+
+        # the flattened parameters are cached until param groups change
+        cached_params, _ = scaler._get_unscale_params(optimizer)
+        self.assertIs(scaler._get_unscale_params(optimizer)[0], cached_params)
+        linear3 = paddle.nn.Linear(4, 4)
+        optimizer._add_param_group({'params': linear3.parameters()})
+        new_params, _ = scaler._get_unscale_params(optimizer)
+        self.assertEqual(len(new_params), len(cached_params) + 2)
+
+        # the cache doesn't keep the discarded optimizers alive
+        optimizer_ref = weakref.ref(optimizer)
+        del optimizer
+        gc.collect()
+        self.assertIsNone(optimizer_ref())
+        self.assertEqual(len(scaler._optimizer_params_cache), 0)
+
+        # a new optimizer gets its own parameters
+        optimizer = paddle.optimizer.AdamW(
+            learning_rate=0.01, parameters=[{'params': linear3.parameters()}]
+        )
+        params, _ = scaler._get_unscale_params(optimizer)
+        self.assertEqual(
+            [id(param) for param in params],
+            [id(param) for param in linear3.parameters()],
+        )
+
+
 @unittest.skipIf(
     not core.is_compiled_with_cuda()
     or paddle.device.cuda.get_device_capability()[0] < 7.0,
@@ -0,0 +1,168 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import paddle
+import paddle.nn.functional as F
+from paddle import nn, static, utils
+from paddle.distributed.auto_parallel.static import completion
+from paddle.distributed.auto_parallel.static.completion import Completer
+from paddle.distributed.auto_parallel.static.dist_context import (
+    DistributedContext,
+)
+from paddle.distributed.auto_parallel.static.planner_v2 import Planner
+from paddle.distributed.fleet import auto
+
+paddle.enable_static()
+
+_process_mesh = auto.ProcessMesh(
+    mesh=[[0, 1, 2, 3], [4, 5, 6, 7]], dim_names=["dp", "mp"]
+)
+
+
+class MLPLayer(nn.Layer):
+    def __init__(self, hidden_size=64):
+        super().__init__()
+        self.norm = nn.LayerNorm(hidden_size, epsilon=1e-5)
+        self.linear0 = nn.Linear(hidden_size, 4 * hidden_size)
+        self.linear1 = nn.Linear(4 * hidden_size, hidden_size)
+
+    def forward(self, input):
+        auto.shard_tensor(
+            self.linear0.weight, _process_mesh, shard_spec=[None, "mp"]
+        )
+        auto.shard_tensor(
+            self.linear1.weight, _process_mesh, shard_spec=["mp", None]
+        )
+        out = self.norm(input)
+        out = self.linear0(out)
+        out = F.gelu(out, approximate=True)
+        out = self.linear1(out)
+        return input + out
+
+
+def get_program(num_layers=4):
+    train_program = static.Program()
+    start_program = static.Program()
+    with static.program_guard(
+        train_program, start_program
+    ), utils.unique_name.guard():
+        input = static.data(name="input", shape=[8, 16, 64], dtype='float32')
+        auto.shard_tensor(input, _process_mesh, shard_spec=["dp", None, None])
+        out = input
+        for _ in range(num_layers):
+            out = MLPLayer()(out)
+    return train_program, start_program
+
+
+def get_dist_attrs(dist_context):
+    tensor_dist_attrs = {
+        key: str(dist_tensor.dist_attr)
+        for key, dist_tensor in dist_context._dist_tensors_for_program.items()
+    }
+    op_dist_attrs = {
+        key: str(dist_op.dist_attr)
+        for key, dist_op in dist_context._dist_ops_for_program.items()
+    }
+    return tensor_dist_attrs, op_dist_attrs
+
+
+def complete(train_program):
+    dist_context = DistributedContext()
+    completer = Completer(dist_context)
+    completer.complete_forward_annotation(train_program)
+    assert dist_context.validate_dist_attr_for_program()
+    return dist_context
+
+
+class TestIncrementalCompletion(unittest.TestCase):
+    def setUp(self):
+        completion.clear_spmd_rule_cache()
+
+    def tearDown(self):
+        completion.clear_spmd_rule_cache()
+
+    def test_same_as_full_sweep(self):
+        train_program, _ = get_program()
+        with mock.patch.dict(
+            os.environ, {"FLAGS_incremental_completion": "false"}
+        ):
+            expected = get_dist_attrs(complete(train_program.clone()))
+        completion.clear_spmd_rule_cache()
+        result = get_dist_attrs(complete(train_program.clone()))
+        self.assertEqual(result, expected)
+
+    def test_spmd_rule_cache(self):
+        train_program, _ = get_program(num_layers=1)
+        complete(train_program)
+        misses = completion.spmd_rule_cache_info()["misses"]
+        self.assertGreater(misses, 0)
+
+        # the repeated layers hit the results of the first one
+        completion.clear_spmd_rule_cache()
+        train_program, _ = get_program(num_layers=4)
+        complete(train_program)
+        cache_info = completion.spmd_rule_cache_info()
+        self.assertGreater(cache_info["hits"], 0)
+        self.assertLess(cache_info["size"], 4 * misses)
+
+        # the cached results are the same as the computed ones
+        expected = get_dist_attrs(complete(train_program.clone()))
+        completion.clear_spmd_rule_cache()
+        result = get_dist_attrs(complete(train_program.clone()))
+        self.assertEqual(result, expected)
+
+
+class TestCompletionCache(unittest.TestCase):
+    def plan(self, train_program, start_program, strategy):
+        dist_context = DistributedContext(
+            serial_main_prog=train_program,
+            serial_startup_prog=start_program,
+            strategy=strategy,
+        )
+        Planner("train", dist_context).plan()
+        return dist_context
+
+    def test_completion_cache(self):
+        train_program, start_program = get_program()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            strategy = auto.Strategy()
+            strategy.completion_cache_dir = cache_dir
+            expected = get_dist_attrs(
+                self.plan(train_program, start_program, strategy)
+            )
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # the completed dist attrs are loaded in the relaunch
+            with mock.patch.object(
+                Completer, "complete_forward_annotation"
+            ) as complete_forward_annotation:
+                result = get_dist_attrs(
+                    self.plan(train_program, start_program, strategy)
+                )
+            complete_forward_annotation.assert_not_called()
+            self.assertEqual(result, expected)
+
+            # the program changed, so it is completed again
+            train_program, start_program = get_program(num_layers=2)
+            self.plan(train_program, start_program, strategy)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.auto_parallel.static.dist_context import (
+    DistributedContext,
+)
+from paddle.distributed.auto_parallel.static.reshard import Resharder
+from paddle.distributed.fleet.meta_optimizers.common import OpRole
+
+paddle.enable_static()
+
+
+# The reshard planner only reads the process ids and the shape of the mesh,
+# and the shape and the dtype of the tensor, so the plans can be computed
+# offline, without the processes and the programs.
+class FakeProcessMesh:
+    def __init__(self, mesh):
+        mesh = np.array(mesh)
+        self.process_ids = mesh.flatten().tolist()
+        self.shape = list(mesh.shape)
+
+
+class FakeDistAttr:
+    def __init__(self, process_mesh, dims_mapping):
+        self.process_mesh = process_mesh
+        self.dims_mapping = dims_mapping
+
+
+class FakeTensor:
+    def __init__(self, shape, dtype=paddle.float32):
+        self.shape = shape
+        self.dtype = dtype
+
+
+class FakeDistTensor:
+    def __init__(self, local_shape, process_mesh, dims_mapping):
+        self.serial_tensor = FakeTensor(local_shape)
+        self.dist_attr = FakeDistAttr(process_mesh, dims_mapping)
+
+
+def get_resharder():
+    return Resharder(
+        paddle.static.Program(),
+        paddle.static.Program(),
+        0,
+        DistributedContext(),
+        [],
+    )
+
+
+def plan_str(op_desc_seq):
+    return str(dict(op_desc_seq))
+
+
+class TestReshardPlanCache(unittest.TestCase):
+    def setUp(self):
+        Resharder.clear_op_desc_seq_cache()
+        self.mesh = FakeProcessMesh([[0, 1], [2, 3]])
+        self.mesh_0 = FakeProcessMesh([0, 1])
+        self.mesh_1 = FakeProcessMesh([2, 3])
+
+    def tearDown(self):
+        Resharder.clear_op_desc_seq_cache()
+
+    def test_same_transition(self):
+        resharder = get_resharder()
+        dist_attr = [self.mesh, [-1, -1], OpRole.Backward]
+        plans = [
+            resharder.find_op_desc_seq(
+                FakeDistTensor([4, 8], self.mesh, [0, 1]), dist_attr
+            )
+            for _ in range(10)
+        ]
+        self.assertEqual(
+            Resharder.op_desc_seq_cache_info(),
+            {"hits": 9, "misses": 1, "size": 1},
+        )
+        for plan in plans[1:]:
+            self.assertEqual(plan_str(plan), plan_str(plans[0]))
+            self.assertIsNot(plan, plans[0])
+        self.assertEqual(sorted(plans[0].keys()), [0, 1, 2, 3])
+
+        # the plans are shared by the resharders
+        get_resharder().find_op_desc_seq(
+            FakeDistTensor([4, 8], self.mesh, [0, 1]), dist_attr
+        )
+        self.assertEqual(Resharder.op_desc_seq_cache_info()["hits"], 10)
+
+        # another transition, or another shape, is planned again
+        resharder.find_op_desc_seq(
+            FakeDistTensor([4, 8], self.mesh, [1, 0]), dist_attr
+        )
+        resharder.find_op_desc_seq(
+            FakeDistTensor([4, 16], self.mesh, [0, 1]), dist_attr
+        )
+        self.assertEqual(
+            Resharder.op_desc_seq_cache_info(),
+            {"hits": 10, "misses": 3, "size": 3},
+        )
+
+    def test_same_as_uncached(self):
+        transitions = [
+            ([8, 8], self.mesh, [0, -1], [self.mesh, [-1, -1]]),
+            ([8, 8], self.mesh, [-1, 1], [self.mesh, [-1, -1]]),
+            ([4, 8], self.mesh, [0, 1], [self.mesh, [1, 0]]),
+            ([8, 8], self.mesh_0, [0, -1], [self.mesh_1, [-1, -1]]),
+            ([16, 8], self.mesh_0, [-1, -1], [self.mesh_1, [0, -1]]),
+        ]
+        for local_shape, mesh, dims_mapping, dist_attr in transitions:
+            dist_attr = [*dist_attr, OpRole.Backward]
+            expected = get_resharder().find_op_desc_seq(
+                FakeDistTensor(local_shape, mesh, dims_mapping), dist_attr
+            )
+            Resharder.clear_op_desc_seq_cache()
+            for _ in range(2):
+                plan = get_resharder().find_op_desc_seq(
+                    FakeDistTensor(local_shape, mesh, dims_mapping), dist_attr
+                )
+                self.assertEqual(plan_str(plan), plan_str(expected))
+
+    def test_up_down_streams(self):
+        # the pipeline relationship is recorded for the cached plans too
+        for _ in range(2):
+            resharder = get_resharder()
+            resharder.find_op_desc_seq(
+                FakeDistTensor([8, 8], self.mesh_0, [-1, -1]),
+                [self.mesh_1, [-1, -1], OpRole.Forward],
+            )
+            up_down_streams = resharder.dist_context.up_down_streams
+            self.assertEqual(up_down_streams.downs(0), [2])
+            self.assertEqual(up_down_streams.ups(3), [1])
+        self.assertEqual(Resharder.op_desc_seq_cache_info()["hits"], 1)
+
+    def test_eviction(self):
+        cache_size = Resharder._op_desc_seq_cache_size
+        Resharder._op_desc_seq_cache_size = 2
+        try:
+            resharder = get_resharder()
+            dist_attr = [self.mesh, [-1, -1], OpRole.Backward]
+            for i in range(4):
+                resharder.find_op_desc_seq(
+                    FakeDistTensor([4, 4 * (i + 1)], self.mesh, [0, 1]),
+                    dist_attr,
+                )
+            self.assertEqual(Resharder.op_desc_seq_cache_info()["size"], 2)
+        finally:
+            Resharder._op_desc_seq_cache_size = cache_size
+
+    def test_benchmark(self):
+        # plan the transitions of many tensors on a large fake mesh, e.g.
+        # the parameters of a model
+        mesh = FakeProcessMesh(np.arange(64).reshape([8, 8]))
+        resharder = get_resharder()
+        dist_attr = [mesh, [-1, -1], OpRole.Backward]
+        num_tensors = 100
+        start = time.time()
+        for _ in range(num_tensors):
+            resharder.find_op_desc_seq(
+                FakeDistTensor([16, 16], mesh, [0, 1]), dist_attr
+            )
+        elapsed = time.time() - start
+        self.assertEqual(
+            Resharder.op_desc_seq_cache_info(),
+            {"hits": num_tensors - 1, "misses": 1, "size": 1},
+        )
+        print(f"planned {num_tensors} tensors in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    unittest.main()
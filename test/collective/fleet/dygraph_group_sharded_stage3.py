@@ -145,6 +145,9 @@ def train_mlp(
     test_minimize=False,
     save_model=False,
     exclude_test=[],
+    prefetch_layers=1,
+    prefetch_buffer_size=None,
+    reuse_params=False,
 ):
     group = paddle.distributed.new_group([0, 1])
     if opt_group:
@@ -178,6 +181,9 @@ def train_mlp(
             sync_comm=sync_comm,
             segment_size=2**15,
             exclude_layer=exclude_test,
+            prefetch_layers=prefetch_layers,
+            prefetch_buffer_size=prefetch_buffer_size,
+            reuse_params=reuse_params,
         )
 
     # check optimizer.minimize() error
@@ -263,6 +269,8 @@ def test_stage2_stage3():
         mlp10,
         mlp11,
         mlp12,
+        mlp13,
+        mlp14,
     ) = (
         MLP(),
         MLP(),
@@ -277,6 +285,8 @@ def test_stage2_stage3():
         MLP(),
         MLP(),
         MLP(),
+        MLP(),
+        MLP(),
     )
     state_dict = mlp.state_dict()
     mlp1.set_state_dict(state_dict)
@@ -291,6 +301,8 @@ def test_stage2_stage3():
     mlp10.set_state_dict(state_dict)
     mlp11.set_state_dict(state_dict)
     mlp12.set_state_dict(state_dict)
+    mlp13.set_state_dict(state_dict)
+    mlp14.set_state_dict(state_dict)
 
     # fp32
     stage2_params = train_mlp(
@@ -332,6 +344,40 @@ def test_stage2_stage3():
             atol=1e-4,
         )
 
+    # fp32 accumulate grad with prefetch and reused params
+    stage3_params_prefetch = train_mlp(
+        mlp13,
+        sharding_stage=3,
+        use_pure_fp16=False,
+        accumulate_grad=True,
+        batch_size=20,
+        opt_group=True,
+        prefetch_layers=2,
+        reuse_params=True,
+    )
+    # fp32 accumulate grad with prefetch limited by buffer size
+    stage3_params_prefetch_limit = train_mlp(
+        mlp14,
+        sharding_stage=3,
+        use_pure_fp16=False,
+        accumulate_grad=True,
+        batch_size=20,
+        opt_group=True,
+        prefetch_layers=3,
+        prefetch_buffer_size=2**20,
+    )
+    for i in range(len(stage3_params_add)):
+        np.testing.assert_allclose(
+            stage3_params_add[i].numpy(),
+            stage3_params_prefetch[i].numpy(),
+            rtol=1e-6,
+        )
+        np.testing.assert_allclose(
+            stage3_params_add[i].numpy(),
+            stage3_params_prefetch_limit[i].numpy(),
+            rtol=1e-6,
+        )
+
     # fp16
     stage2_params = train_mlp(
         mlp5, sharding_stage=2, use_pure_fp16=True, opt_group=False
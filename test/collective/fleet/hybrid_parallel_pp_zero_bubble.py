@@ -0,0 +1,116 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import nn
+from paddle.distributed import fleet
+from paddle.distributed.fleet.meta_parallel import (
+    LayerDesc,
+    PipelineLayer,
+    PipelineParallel,
+    PipelineParallelZeroBubble,
+    ZeroBubbleLinear,
+)
+
+batch_size = 16
+micro_batch_size = 2
+hidden_size = 32
+
+
+class MLPPipe(PipelineLayer):
+    def __init__(self, linear_cls, **kwargs):
+        descs = [LayerDesc(linear_cls, 16, hidden_size)]
+        for _ in range(3):
+            descs.append(LayerDesc(nn.ReLU))
+            descs.append(LayerDesc(linear_cls, hidden_size, hidden_size))
+        descs.append(LayerDesc(linear_cls, hidden_size, 10))
+        super().__init__(layers=descs, loss_fn=nn.CrossEntropyLoss(), **kwargs)
+
+
+class TestDistPPZeroBubbleTraining(unittest.TestCase):
+    def setUp(self):
+        strategy = fleet.DistributedStrategy()
+        self.pipeline_parallel_size = 2
+        strategy.hybrid_configs = {
+            "dp_degree": 1,
+            "mp_degree": 1,
+            "pp_degree": self.pipeline_parallel_size,
+        }
+        strategy.pipeline_configs = {
+            "accumulate_steps": batch_size // micro_batch_size,
+            "micro_batch_size": micro_batch_size,
+            "schedule_mode": "ZBH1",
+        }
+        fleet.init(is_collective=True, strategy=strategy)
+
+    def build_optimizer(self, model):
+        optimizer = paddle.optimizer.SGD(
+            learning_rate=0.1, parameters=model.parameters()
+        )
+        return fleet.distributed_optimizer(optimizer)
+
+    def check_pp_model(self, use_amp=False):
+        paddle.seed(1024)
+        model_a = MLPPipe(nn.Linear, num_stages=self.pipeline_parallel_size)
+        model_b = MLPPipe(
+            ZeroBubbleLinear, num_stages=self.pipeline_parallel_size
+        )
+        for param_a, param_b in zip(model_a.parameters(), model_b.parameters()):
+            param_b.set_value(param_a)
+
+        hcg = fleet.get_hybrid_communicate_group()
+        model_a = PipelineParallel(
+            model_a, hcg, strategy=fleet.fleet._user_defined_strategy
+        )
+        model_b = fleet.distributed_model(model_b)
+        self.assertIsInstance(model_b, PipelineParallelZeroBubble)
+        optimizer_a = self.build_optimizer(model_a)
+        optimizer_b = self.build_optimizer(model_b)
+        # the linear layers run in float16 and keep the float32 inputs
+        rtol, atol = (1e-3, 1e-4) if use_amp else (1e-5, 1e-6)
+
+        np.random.seed(1024)
+        for _ in range(5):
+            x = paddle.to_tensor(
+                np.random.random([batch_size, 16]).astype('float32')
+            )
+            y = paddle.to_tensor(
+                np.random.randint(0, 10, [batch_size, 1]).astype('int64')
+            )
+            with paddle.amp.auto_cast(enable=use_amp, level='O1'):
+                loss_a = model_a.train_batch([x, y], optimizer_a)
+                loss_b = model_b.train_batch([x, y], optimizer_b)
+            np.testing.assert_allclose(
+                loss_a.numpy(), loss_b.numpy(), rtol=rtol, atol=atol
+            )
+
+        for param_a, param_b in zip(model_a.parameters(), model_b.parameters()):
+            self.assertEqual(param_b.dtype, paddle.float32)
+            np.testing.assert_allclose(
+                param_a.numpy(), param_b.numpy(), rtol=rtol, atol=atol
+            )
+
+    def test_pp_model(self):
+        self.check_pp_model()
+
+    def test_pp_model_amp(self):
+        self.check_pp_model(use_amp=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet.recompute import ActivationOffloader
+from paddle.distributed.fleet.utils import recompute
+
+
+def get_block(input_size):
+    return paddle.nn.Sequential(
+        paddle.nn.Linear(input_size, input_size),
+        paddle.nn.GELU(),
+        paddle.nn.Linear(input_size, input_size),
+        paddle.nn.Tanh(),
+    )
+
+
+class Model(paddle.nn.Layer):
+    def __init__(self, input_size=64, num_blocks=4):
+        super().__init__()
+        self.blocks = paddle.nn.LayerList(
+            [get_block(input_size) for _ in range(num_blocks)]
+        )
+
+    def forward(
+        self, x, offloader=None, offload_blocks=[], recompute_blocks=[]
+    ):
+        for i, block in enumerate(self.blocks):
+            if i in offload_blocks and i in recompute_blocks:
+                x = offloader(recompute, block, x)
+            elif i in offload_blocks:
+                x = offloader(block, x)
+            elif i in recompute_blocks:
+                x = recompute(block, x)
+            else:
+                x = block(x)
+        return x
+
+
+@unittest.skipIf(
+    not paddle.is_compiled_with_cuda(), "activation offload requires GPU"
+)
+class TestActivationOffload(unittest.TestCase):
+    def run_model(self, offloader=None, offload_blocks=[], recompute_blocks=[]):
+        paddle.seed(2024)
+        model = Model()
+        x = paddle.rand([32, 64])
+        x.stop_gradient = False
+        losses = []
+        for _ in range(3):
+            y = model(x, offloader, offload_blocks, recompute_blocks)
+            loss = y.mean()
+            if offloader is not None and offload_blocks:
+                self.assertGreater(offloader.offload_size, 0)
+            loss.backward()
+            losses.append(loss.item())
+        grads = [p.grad.numpy() for p in model.parameters()]
+        grads.append(x.grad.numpy())
+        return losses, grads
+
+    def check(self, result, expected):
+        np.testing.assert_allclose(result[0], expected[0], rtol=1e-6)
+        for grad, expected_grad in zip(result[1], expected[1]):
+            np.testing.assert_allclose(grad, expected_grad, rtol=1e-6)
+
+    def test_offload(self):
+        expected = self.run_model()
+        for prefetch_blocks in [0, 1, 2]:
+            offloader = ActivationOffloader(
+                min_tensor_size=0, prefetch_blocks=prefetch_blocks
+            )
+            self.check(
+                self.run_model(offloader, offload_blocks=[0, 1, 2, 3]),
+                expected,
+            )
+            gc.collect()
+            self.assertEqual(offloader.offload_size, 0)
+
+    def test_mix_with_recompute(self):
+        expected = self.run_model()
+        offloader = ActivationOffloader(min_tensor_size=0)
+        self.check(
+            self.run_model(
+                offloader, offload_blocks=[0, 2, 3], recompute_blocks=[1, 3]
+            ),
+            expected,
+        )
+
+    def test_budget(self):
+        model = Model()
+        x = paddle.rand([32, 64])
+        offloader = ActivationOffloader(
+            max_offload_size=32 * 64 * 4 * 3, min_tensor_size=0
+        )
+        y = model(x, offloader, offload_blocks=[0, 1, 2, 3])
+        self.assertGreater(offloader.offload_size, 0)
+        self.assertLessEqual(offloader.offload_size, offloader.max_offload_size)
+        y.mean().backward()
+
+    def test_memory_reuse(self):
+        def fill_freed_memory(*args):
+            # reuse the freed memory at once, while the copies on the side
+            # stream may be still running
+            garbage = [
+                paddle.full([2048, 1024], float("nan")) for _ in range(8)
+            ]
+            del garbage
+
+        def run(offloader=None):
+            paddle.seed(2024)
+            model = Model(input_size=1024)
+            x = paddle.rand([2048, 1024])
+            x.stop_gradient = False
+            y = x
+            for block in model.blocks:
+                y = offloader(block, y) if offloader else block(y)
+                y.register_hook(fill_freed_memory)
+            fill_freed_memory()
+            y.mean().backward()
+            return [p.grad.numpy() for p in model.parameters()]
+
+        expected = run()
+        offloader = ActivationOffloader(min_tensor_size=0)
+        for grad, expected_grad in zip(run(offloader), expected):
+            self.assertFalse(np.isnan(grad).any())
+            np.testing.assert_allclose(grad, expected_grad, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
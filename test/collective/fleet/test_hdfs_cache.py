@@ -0,0 +1,195 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from paddle.distributed.fleet.utils.fs import HDFSClient
+
+# A fake hadoop client, which runs the commands on a local directory, and
+# logs the commands it runs.
+FAKE_HADOOP = '''#!{python}
+import os, shutil, sys
+
+root, log = {root!r}, {log!r}
+args = [a for a in sys.argv[2:] if not a.startswith("-D")]
+with open(log, "a") as f:
+    f.write(" ".join(args) + "\\n")
+
+def local(path):
+    return os.path.join(root, path.split(":", 1)[-1].lstrip("/"))
+
+cmd, paths = args[0], [a for a in args[1:] if not a.startswith("-")]
+if cmd == "-test":
+    check = os.path.isdir if args[1] == "-d" else os.path.exists
+    sys.exit(0 if check(local(paths[0])) else 1)
+elif cmd == "-ls" and args[1] == "-d":
+    for path in paths:
+        p = local(path)
+        if os.path.exists(p):
+            mode = "drwxr-xr-x" if os.path.isdir(p) else "-rw-r--r--"
+            print(mode, "3 user group 0 2024-01-01 00:00", path)
+        else:
+            print(f"ls: `{{path}}': No such file or directory", file=sys.stderr)
+    sys.exit(0 if all(os.path.exists(local(p)) for p in paths) else 1)
+elif cmd == "-ls":
+    p = local(paths[0])
+    if not os.path.exists(p):
+        sys.exit(1)
+    names = sorted(os.listdir(p)) if os.path.isdir(p) else [""]
+    for name in names:
+        full = os.path.join(p, name)
+        mode = "drwxr-xr-x" if os.path.isdir(full) else "-rw-r--r--"
+        print(mode, "3 user group 0 2024-01-01 00:00",
+              os.path.join(paths[0], name))
+elif cmd == "-mkdir":
+    os.makedirs(local(paths[0]), exist_ok=True)
+elif cmd == "-touchz":
+    open(local(paths[0]), "w").close()
+elif cmd == "-mv":
+    os.rename(local(paths[0]), local(paths[1]))
+elif cmd == "-rm":
+    os.remove(local(paths[0]))
+elif cmd == "-rmr":
+    shutil.rmtree(local(paths[0]))
+elif cmd == "-put":
+    dst = local(paths[1])
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(paths[0]))
+    shutil.copy(paths[0], dst)
+else:
+    sys.exit(255)
+'''
+
+
+class TestHDFSClientCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "hdfs")
+        self.log = os.path.join(self.temp_dir.name, "hadoop.log")
+        self.hadoop_home = os.path.join(self.temp_dir.name, "hadoop")
+        os.makedirs(self.root)
+        os.makedirs(os.path.join(self.hadoop_home, "bin"))
+        hadoop_bin = os.path.join(self.hadoop_home, "bin", "hadoop")
+        with open(hadoop_bin, "w") as f:
+            f.write(
+                FAKE_HADOOP.format(
+                    python=sys.executable, root=self.root, log=self.log
+                )
+            )
+        os.chmod(hadoop_bin, 0o755)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_client(self, **kwargs):
+        return HDFSClient(
+            self.hadoop_home,
+            {"fs.default.name": "hdfs://localhost:9000"},
+            time_out=5 * 1000,
+            sleep_inter=100,
+            **kwargs,
+        )
+
+    def num_cmds(self):
+        if not os.path.exists(self.log):
+            return 0
+        with open(self.log) as f:
+            return len(f.readlines())
+
+    def check_ops(self, fs):
+        fs.mkdirs("hdfs:/a/b")
+        self.assertTrue(fs.is_exist("hdfs:/a/b"))
+        self.assertTrue(fs.is_dir("hdfs:/a"))
+        fs.touch("hdfs:/a/f")
+        self.assertTrue(fs.is_file("hdfs:/a/f"))
+        self.assertEqual(fs.ls_dir("hdfs:/a"), (["b"], ["f"]))
+        fs.mv("hdfs:/a/f", "hdfs:/a/g")
+        self.assertFalse(fs.is_exist("hdfs:/a/f"))
+        self.assertEqual(fs.ls_dir("hdfs:/a"), (["b"], ["g"]))
+        fs.delete("hdfs:/a/b")
+        self.assertFalse(fs.is_exist("hdfs:/a/b"))
+        self.assertEqual(fs.list_dirs("hdfs:/a"), [])
+        self.assertEqual(
+            fs.batch_is_exist(["hdfs:/a/g", "hdfs:/a/b", "hdfs:/a"]),
+            [True, False, True],
+        )
+        fs.delete("hdfs:/a")
+        self.assertFalse(fs.is_exist("hdfs:/a/g"))
+
+    def test_ops(self):
+        for kwargs in [{}, {"cache_ttl": 60}]:
+            fs = self.get_client(**kwargs)
+            self.check_ops(fs)
+
+    def test_cache(self):
+        fs = self.get_client(cache_ttl=60)
+        fs.mkdirs("hdfs:/a/b")
+        fs.touch("hdfs:/a/f")
+        self.assertTrue(fs.is_dir("hdfs:/a"))
+        fs.ls_dir("hdfs:/a")
+        num_cmds = self.num_cmds()
+        for _ in range(3):
+            self.assertTrue(fs.is_exist("hdfs:/a"))
+            self.assertEqual(fs.ls_dir("hdfs:/a"), (["b"], ["f"]))
+            # answered by the listing of the parent
+            self.assertTrue(fs.is_dir("hdfs:/a/b"))
+            self.assertTrue(fs.is_file("hdfs:/a/f"))
+        self.assertEqual(self.num_cmds(), num_cmds)
+
+        # the modifications of the others are seen after the ttl
+        fs = self.get_client(cache_ttl=0.5)
+        self.assertFalse(fs.is_exist("hdfs:/c"))
+        os.makedirs(os.path.join(self.root, "c"))
+        self.assertFalse(fs.is_exist("hdfs:/c"))
+        time.sleep(0.6)
+        self.assertTrue(fs.is_exist("hdfs:/c"))
+
+    def test_batch_is_exist(self):
+        fs = self.get_client(cache_ttl=60)
+        fs.mkdirs("hdfs:/a/d")
+        paths = [f"hdfs:/a/{i}" for i in range(8)]
+        for path in paths[:4]:
+            fs.touch(path)
+
+        # one command for all the paths
+        num_cmds = self.num_cmds()
+        paths += ["hdfs:/a/d", "hdfs:/a/1"]
+        self.assertEqual(
+            fs.batch_is_exist(paths), [True] * 4 + [False] * 4 + [True] * 2
+        )
+        self.assertEqual(self.num_cmds(), num_cmds + 1)
+
+        # and the results are cached, with the types of the paths
+        self.assertTrue(fs.is_dir("hdfs:/a/d"))
+        self.assertTrue(fs.is_file("hdfs:/a/0"))
+        self.assertFalse(fs.is_exist("hdfs:/a/7"))
+        self.assertEqual(
+            fs.batch_is_exist(paths[2:6]), [True] * 2 + [False] * 2
+        )
+        self.assertEqual(self.num_cmds(), num_cmds + 1)
+
+        # a command for every 100 paths
+        fs = self.get_client()
+        num_cmds = self.num_cmds()
+        paths = [f"hdfs:/a/{i}" for i in range(250)]
+        self.assertEqual(fs.batch_is_exist(paths), [True] * 4 + [False] * 246)
+        self.assertEqual(self.num_cmds(), num_cmds + 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
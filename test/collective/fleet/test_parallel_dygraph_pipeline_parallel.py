@@ -65,6 +65,9 @@ class TestHybridPipeParallel(TestMultipleAccelerators):
             'hybrid_parallel_pp_return_micro_batch_loss.py'
         )
 
+    def test_hybrid_parallel_pp_zero_bubble(self):
+        self.run_mnist_2accelerators('hybrid_parallel_pp_zero_bubble.py')
+
 
 class TestFakeMicroDataSet(unittest.TestCase):
     def test_fake_micro_data_set(self):
@@ -113,5 +116,45 @@ class TestFakeMicroDataSet(unittest.TestCase):
         self.assertTrue(y is None)
 
 
+class TestZeroBubbleLinear(unittest.TestCase):
+    def test_deferred_weight_grad(self):
+        import numpy as np
+
+        from paddle.distributed.fleet.meta_parallel import (
+            WeightGradStore,
+            ZeroBubbleLinear,
+        )
+
+        paddle.seed(2024)
+        linear = ZeroBubbleLinear(4, 3)
+        ref_linear = paddle.nn.Linear(4, 3)
+        ref_linear.weight.set_value(linear.weight)
+        ref_linear.bias.set_value(linear.bias)
+
+        x = paddle.randn([2, 5, 4])
+        x.stop_gradient = False
+        ref_x = x.detach()
+        ref_x.stop_gradient = False
+        ref_linear(ref_x).sum().backward()
+
+        WeightGradStore.enabled = True
+        linear(x).sum().backward()
+        WeightGradStore.enabled = False
+        WeightGradStore.flush()
+        # only the input gradient is computed in backward
+        self.assertIsNone(linear.weight.grad)
+        np.testing.assert_allclose(x.grad.numpy(), ref_x.grad.numpy())
+
+        WeightGradStore.pop()
+        self.assertEqual(WeightGradStore.size(), 0)
+        np.testing.assert_allclose(
+            linear.weight.grad.numpy(), ref_linear.weight.grad.numpy()
+        )
+        np.testing.assert_allclose(
+            linear.bias.grad.numpy(), ref_linear.bias.grad.numpy()
+        )
+        WeightGradStore.clear()
+
+
 if __name__ == "__main__":
     unittest.main()
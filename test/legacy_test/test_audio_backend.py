@@ -12,12 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import tempfile
 import unittest
 
 import numpy as np
 import soundfile
 
 import paddle.audio
+from paddle.audio.backends import wave_backend
 
 
 class TestAudioBackends(unittest.TestCase):
@@ -158,6 +160,71 @@ class TestAudioBackends(unittest.TestCase):
         if os.path.exists(wave_wav_path):
             os.remove(wave_wav_path)
 
+    def save_stereo_wav(self, temp_dir):
+        wav_path = os.path.join(temp_dir, "stereo_test.wav")
+        waveform = np.random.uniform(-0.5, 0.5, [2, 1000]).astype('float32')
+        paddle.audio.save(wav_path, paddle.to_tensor(waveform), self.sr)
+        wav_data, _ = wave_backend.load(wav_path)
+        return wav_path, wav_data.numpy()
+
+    def test_partial_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wav_path, wav_data = self.save_stereo_wav(temp_dir)
+
+            part, sr = wave_backend.load(
+                wav_path, frame_offset=100, num_frames=300
+            )
+            self.assertEqual(sr, self.sr)
+            np.testing.assert_array_equal(part.numpy(), wav_data[:, 100:400])
+
+            part, _ = wave_backend.load(
+                wav_path, frame_offset=900, channels_first=False
+            )
+            np.testing.assert_array_equal(part.numpy(), wav_data[:, 900:].T)
+
+            part, _ = wave_backend.load(
+                wav_path, frame_offset=950, num_frames=100
+            )
+            self.assertEqual(part.shape, [2, 50])
+
+    def test_stream(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wav_path, wav_data = self.save_stereo_wav(temp_dir)
+
+            chunks = list(wave_backend.stream(wav_path, 300, 100))
+            self.assertEqual(
+                [chunk.shape[1] for chunk in chunks], [300, 300, 300, 300, 200]
+            )
+            for i, chunk in enumerate(chunks):
+                np.testing.assert_array_equal(
+                    chunk.numpy(), wav_data[:, i * 200 : i * 200 + 300]
+                )
+
+            chunks = list(
+                wave_backend.stream(
+                    wav_path, 400, frame_offset=100, num_frames=500
+                )
+            )
+            self.assertEqual([chunk.shape[1] for chunk in chunks], [400, 100])
+            np.testing.assert_array_equal(
+                np.concatenate([chunk.numpy() for chunk in chunks], axis=1),
+                wav_data[:, 100:600],
+            )
+
+            with self.assertRaises(ValueError):
+                next(wave_backend.stream(wav_path, 100, 100))
+
+    def test_index_windows(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            wav_path, _ = self.save_stereo_wav(temp_dir)
+            windows = wave_backend.index_windows([wav_path, wav_path], 400, 300)
+            np.testing.assert_array_equal(
+                windows,
+                [[0, 0], [0, 300], [0, 600], [1, 0], [1, 300], [1, 600]],
+            )
+            windows = wave_backend.index_windows([wav_path], 2000)
+            self.assertEqual(windows.shape, (0, 2))
+
 
 if __name__ == '__main__':
     unittest.main()
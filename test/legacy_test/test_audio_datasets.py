@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import itertools
+import os
+import tempfile
 import unittest
+import wave
 
 import numpy as np
 from parameterized import parameterized
@@ -116,5 +119,79 @@ class TestAudioDatasets(unittest.TestCase):
         self.assertTrue(0 <= elem[1] <= 2)
 
 
+class TestAudioFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = []
+        for i, num_samples in enumerate([4000, 3700, 4000, 3000]):
+            file = os.path.join(self.temp_dir.name, f'{i}.wav')
+            samples = (np.random.randn(num_samples) * 1000).astype('int16')
+            with wave.open(file, 'wb') as f:
+                f.setnchannels(1)
+                f.setsampwidth(2)
+                f.setframerate(8000)
+                f.writeframes(samples.tobytes())
+            self.files.append(file)
+        self.labels = [0, 1, 0, 1]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_cache(self):
+        cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        dataset = paddle.audio.datasets.dataset.AudioClassificationDataset(
+            self.files, self.labels, feat_type='mfcc', n_mfcc=20
+        )
+        cached_dataset = (
+            paddle.audio.datasets.dataset.AudioClassificationDataset(
+                self.files,
+                self.labels,
+                feat_type='mfcc',
+                cache_dir=cache_dir,
+                n_mfcc=20,
+            )
+        )
+        # the waveforms of different lengths are padded to a batch
+        cached_dataset.extract_features(batch_size=2, buffer_size=3)
+        self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+        for idx in range(4):
+            feat, label = dataset[idx]
+            cached_feat, cached_label = cached_dataset[idx]
+            self.assertEqual(label, cached_label)
+            np.testing.assert_allclose(
+                feat.numpy(), cached_feat.numpy(), rtol=1e-4, atol=1e-4
+            )
+
+        # the cache is keyed on the feature config
+        dataset = paddle.audio.datasets.dataset.AudioClassificationDataset(
+            self.files,
+            self.labels,
+            feat_type='mfcc',
+            cache_dir=cache_dir,
+            n_mfcc=13,
+        )
+        self.assertEqual(dataset[0][0].shape[0], 13)
+        self.assertEqual(len(os.listdir(cache_dir)), 5)
+
+    def test_feature_extractors(self):
+        dataset_module = paddle.audio.datasets.dataset
+        for n_mfcc in range(10, 30):
+            dataset_module._get_feature_extractor(
+                'mfcc', 8000, {'n_mfcc': n_mfcc}
+            )
+        self.assertEqual(
+            len(dataset_module._feature_extractors),
+            dataset_module._max_feature_extractors,
+        )
+
+    def test_raw(self):
+        dataset = paddle.audio.datasets.dataset.AudioClassificationDataset(
+            self.files, self.labels, cache_dir=self.temp_dir.name
+        )
+        dataset.extract_features()
+        self.assertEqual(dataset[3][0].shape, [3000])
+
+
 if __name__ == '__main__':
     unittest.main()
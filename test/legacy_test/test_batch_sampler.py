@@ -19,7 +19,9 @@ import numpy as np
 
 from paddle.io import (
     BatchSampler,
+    BucketBatchSampler,
     Dataset,
+    DistributedBucketBatchSampler,
     RandomSampler,
     Sampler,
     SequenceSampler,
@@ -327,5 +329,144 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+class TestBucketBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.lengths = np.random.randint(1, 100, [1000])
+        self.max_tokens = 512
+        self.batch_size = None
+        self.bucket_size = None
+        self.shuffle = False
+
+    def init_batch_sampler(self):
+        return BucketBatchSampler(
+            self.lengths,
+            max_tokens=self.max_tokens,
+            batch_size=self.batch_size,
+            bucket_size=self.bucket_size,
+            shuffle=self.shuffle,
+        )
+
+    def check_batches(self, batches):
+        indices = [idx for batch in batches for idx in batch]
+        self.assertEqual(sorted(indices), list(range(len(self.lengths))))
+        for batch in batches:
+            max_len = self.lengths[batch].max()
+            if self.max_tokens is not None and len(batch) > 1:
+                self.assertLessEqual(max_len * len(batch), self.max_tokens)
+            if self.batch_size is not None:
+                self.assertLessEqual(len(batch), self.batch_size)
+
+    def test_main(self):
+        bs = self.init_batch_sampler()
+        batches = list(bs)
+        self.assertEqual(len(batches), len(bs))
+        self.check_batches(batches)
+
+        # the padding is much less than random batches
+        padded = sum(self.lengths[b].max() * len(b) for b in batches)
+        self.assertLess(padded, self.lengths.sum() * 1.5)
+
+    def test_epoch(self):
+        bs = self.init_batch_sampler()
+        first = list(bs)
+        second = list(bs)
+        self.assertEqual(first == second, not self.shuffle)
+        bs.set_epoch(0)
+        self.assertEqual(list(bs), first)
+
+
+class TestBucketBatchSamplerShuffle(TestBucketBatchSampler):
+    def setUp(self):
+        self.lengths = np.random.randint(1, 100, [1000])
+        self.max_tokens = 512
+        self.batch_size = 16
+        self.bucket_size = 200
+        self.shuffle = True
+
+
+class TestBucketBatchSamplerBatchSize(TestBucketBatchSampler):
+    def setUp(self):
+        self.lengths = np.random.randint(1, 100, [1000])
+        self.max_tokens = None
+        self.batch_size = 16
+        self.bucket_size = None
+        self.shuffle = True
+
+
+class TestBucketBatchSamplerLongSample(unittest.TestCase):
+    def test_main(self):
+        bs = BucketBatchSampler([5, 12, 3, 100, 11], max_tokens=24)
+        self.assertEqual(list(bs), [[2, 0], [4, 1], [3]])
+
+        class LengthDataset(Dataset):
+            def get_lengths(self):
+                return np.array([3, 1, 2])
+
+        bs = BucketBatchSampler(LengthDataset(), batch_size=2)
+        self.assertEqual(list(bs), [[1, 2], [0]])
+
+    def test_raise(self):
+        with self.assertRaises(AssertionError):
+            BucketBatchSampler([1, 2, 3])
+        with self.assertRaises(AssertionError):
+            BucketBatchSampler([1, 2, 3], max_tokens=0)
+
+
+class TestDistributedBucketBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.lengths = np.random.randint(1, 100, [1000])
+        self.nranks = 4
+        self.drop_last = False
+
+    def test_main(self):
+        global_batches = list(
+            BucketBatchSampler(
+                self.lengths, max_tokens=512, bucket_size=100, shuffle=True
+            )
+        )
+        rank_batches = []
+        for rank in range(self.nranks):
+            bs = DistributedBucketBatchSampler(
+                self.lengths,
+                max_tokens=512,
+                num_replicas=self.nranks,
+                rank=rank,
+                bucket_size=100,
+                shuffle=True,
+                drop_last=self.drop_last,
+            )
+            batches = list(bs)
+            self.assertEqual(len(batches), len(bs))
+            rank_batches.append(batches)
+
+        # every rank gets the same number of mini-batches
+        num_batches = len(rank_batches[0])
+        for batches in rank_batches:
+            self.assertEqual(len(batches), num_batches)
+        if self.drop_last:
+            self.assertEqual(num_batches, len(global_batches) // self.nranks)
+        else:
+            self.assertEqual(
+                num_batches, -(-len(global_batches) // self.nranks)
+            )
+
+        # the mini-batches are dispatched to the ranks in turn
+        dispatched = [
+            rank_batches[i % self.nranks][i // self.nranks]
+            for i in range(num_batches * self.nranks)
+        ]
+        num_global = min(len(dispatched), len(global_batches))
+        self.assertEqual(dispatched[:num_global], global_batches[:num_global])
+
+
+class TestDistributedBucketBatchSamplerDropLast(
+    TestDistributedBucketBatchSampler
+):
+    def setUp(self):
+        self.lengths = np.random.randint(1, 100, [1000])
+        self.nranks = 3
+        self.drop_last = True
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,8 +10,12 @@
 # distributed under the License is distributed on an "AS IS" BASIS,
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
+import io
+import sys
 import unittest
 
+import numpy as np
+
 from paddle.distributed import fleet
 
 
@@ -186,5 +190,94 @@ class TestMultiSlotDataGeneratorZip(unittest.TestCase):
         my_ms_dg.run_from_memory()
 
 
+class MyLineDataGenerator(fleet.MultiSlotDataGenerator):
+    def generate_sample(self, line):
+        def data_iter():
+            elements = line.split()
+            words = [int(x) for x in elements[1:]]
+            yield ("words", words), ("score", [float(elements[0])])
+
+        return data_iter
+
+
+class MyBatchDataGenerator(fleet.MultiSlotDataGenerator):
+    def generate_sample_batch(self, lines):
+        words = [line.split()[1:] for line in lines]
+        lengths = [len(w) for w in words]
+        values = np.array(sum(words, []), dtype="int64")
+        scores = np.array([float(line.split()[0]) for line in lines])
+        return [("words", (values, lengths)), ("score", scores)]
+
+
+class MyBatchStringDataGenerator(fleet.MultiSlotStringDataGenerator):
+    def generate_sample_batch(self, lines):
+        return [("words", np.array([line.split() for line in lines]))]
+
+
+class TestMultiSlotDataGeneratorBatch(unittest.TestCase):
+    def run_generator(self, generator, lines, run_func):
+        stdin, stdout = sys.stdin, sys.stdout
+        sys.stdin = io.StringIO("".join(lines))
+        sys.stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        try:
+            run_func(generator)
+            sys.stdout.flush()
+            return sys.stdout.buffer.getvalue().decode()
+        finally:
+            sys.stdin, sys.stdout = stdin, stdout
+
+    def test_batch(self):
+        lines = [
+            f"{i * 0.5} "
+            + " ".join(str(i + j) for j in range(i % 3 + 1))
+            + "\n"
+            for i in range(50)
+        ]
+        expected = self.run_generator(
+            MyLineDataGenerator(), lines, lambda g: g.run_from_stdin()
+        )
+        self.assertEqual(expected.splitlines()[3], "1 3 1 1.5")
+        for num_workers in [1, 3]:
+            generator = MyBatchDataGenerator()
+            output = self.run_generator(
+                generator,
+                lines,
+                lambda g: g.run_from_stdin_batch(
+                    lines_per_batch=8, num_workers=num_workers
+                ),
+            )
+            self.assertEqual(output, expected)
+        generator = MyBatchDataGenerator()
+        generator._gen_batch_str(generator.generate_sample_batch(lines))
+        self.assertEqual(
+            generator._proto_info, [("words", "uint64"), ("score", "float")]
+        )
+
+    def test_string_batch(self):
+        output = self.run_generator(
+            MyBatchStringDataGenerator(),
+            ["a b\n", "c d\n"],
+            lambda g: g.run_from_stdin_batch(),
+        )
+        self.assertEqual(output, "2 a b\n2 c d\n")
+
+    def test_errors(self):
+        generator = fleet.MultiSlotDataGenerator()
+        with self.assertRaises(ValueError):
+            generator._gen_batch_str([("words", np.zeros([2, 0]))])
+        with self.assertRaises(ValueError):
+            generator._gen_batch_str([("words", ([1, 2, 3], [1, 1]))])
+        with self.assertRaises(ValueError):
+            generator._gen_batch_str(
+                [("words", np.zeros([2, 2])), ("label", np.zeros([3]))]
+            )
+        with self.assertRaises(ValueError):
+            generator._gen_batch_str([("words", np.array(["a", "b"]))])
+        with self.assertRaises(ValueError):
+            generator._gen_batch_str([(1, np.zeros([2]))])
+        with self.assertRaises(NotImplementedError):
+            fleet.MultiSlotDataGenerator().generate_sample_batch([])
+
+
 if __name__ == '__main__':
     unittest.main()
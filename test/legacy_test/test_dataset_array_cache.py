@@ -0,0 +1,161 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+import os
+import pickle
+import struct
+import tarfile
+import tempfile
+import unittest
+
+import numpy as np
+
+from paddle.dataset.common import _load_cached_arrays
+from paddle.vision.datasets import MNIST, Cifar10
+
+
+class TestLoadCachedArrays(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temp_dir.name, 'data.gz')
+        with open(self.source, 'wb') as f:
+            f.write(b'data')
+        self.num_builds = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self):
+        self.num_builds += 1
+        return {
+            'images': np.arange(24, dtype='uint8').reshape([2, 3, 4]),
+            'labels': np.array([3, 5], dtype='int64'),
+        }
+
+    def test_cache(self):
+        prefix = os.path.join(self.temp_dir.name, 'data')
+        arrays = _load_cached_arrays(prefix, [self.source], self.build)
+        self.assertTrue(os.path.exists(prefix + '.images.npy'))
+        self.assertIsInstance(arrays['images'], np.memmap)
+
+        arrays = _load_cached_arrays(prefix, [self.source], self.build)
+        self.assertEqual(self.num_builds, 1)
+        self.assertIsInstance(arrays['images'], np.memmap)
+        np.testing.assert_array_equal(arrays['images'], self.build()['images'])
+        np.testing.assert_array_equal(arrays['labels'], [3, 5])
+
+        # the memory-mapped arrays are copy-on-write
+        arrays['labels'][0] = 0
+        arrays = _load_cached_arrays(prefix, [self.source], self.build)
+        np.testing.assert_array_equal(arrays['labels'], [3, 5])
+
+    def test_rebuild(self):
+        prefix = os.path.join(self.temp_dir.name, 'data')
+        _load_cached_arrays(prefix, [self.source], self.build)
+        mtime = os.path.getmtime(prefix + '.images.npy')
+        os.utime(self.source, (mtime + 10, mtime + 10))
+        _load_cached_arrays(prefix, [self.source], self.build)
+        self.assertEqual(self.num_builds, 2)
+
+        # the cache of another source file
+        other = os.path.join(self.temp_dir.name, 'other.gz')
+        with open(other, 'wb') as f:
+            f.write(b'other')
+        _load_cached_arrays(prefix, [other], self.build)
+        self.assertEqual(self.num_builds, 3)
+
+    def test_unwritable(self):
+        prefix = os.path.join(self.temp_dir.name, 'missing', 'data')
+        arrays = _load_cached_arrays(prefix, [self.source], self.build)
+        self.assertNotIsInstance(arrays['images'], np.memmap)
+        np.testing.assert_array_equal(arrays['labels'], [3, 5])
+
+
+class TestDatasetSlice(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(0)
+
+        # the MNIST files of 5 images of 4 x 4
+        self.image_path = os.path.join(self.temp_dir.name, 'images.gz')
+        self.label_path = os.path.join(self.temp_dir.name, 'labels.gz')
+        images = rng.randint(0, 256, [5, 4, 4]).astype('uint8')
+        with gzip.open(self.image_path, 'wb') as f:
+            f.write(struct.pack('>IIII', 2051, 5, 4, 4) + images.tobytes())
+        with gzip.open(self.label_path, 'wb') as f:
+            f.write(struct.pack('>II', 2049, 5) + bytes(range(5)))
+
+        # the Cifar-10 archive of 5 images
+        self.data_file = os.path.join(self.temp_dir.name, 'cifar.tar.gz')
+        batch = pickle.dumps(
+            {
+                b'data': rng.randint(0, 256, [5, 3 * 32 * 32]).astype('uint8'),
+                b'labels': list(range(5)),
+            }
+        )
+        with tarfile.open(self.data_file, 'w:gz') as tar:
+            info = tarfile.TarInfo('cifar-10-batches-py/data_batch_1')
+            info.size = len(batch)
+            tar.addfile(info, io.BytesIO(batch))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_datasets(self, backend, transform):
+        return [
+            MNIST(
+                image_path=self.image_path,
+                label_path=self.label_path,
+                transform=transform,
+                download=False,
+                backend=backend,
+            ),
+            Cifar10(
+                data_file=self.data_file,
+                transform=transform,
+                download=False,
+                backend=backend,
+            ),
+        ]
+
+    def test_slice(self):
+        for backend, transform in [
+            ('cv2', None),
+            ('cv2', lambda image: image * 2),
+            ('pil', np.asarray),
+        ]:
+            for dataset in self.get_datasets(backend, transform):
+                for indices in [slice(1, 4), [4, 0], slice(None, None, -2)]:
+                    samples = dataset[indices]
+                    expected = [
+                        dataset[i] for i in np.arange(len(dataset))[indices]
+                    ]
+                    # the same layout as the samples on every path
+                    self.assertIsInstance(samples, list)
+                    self.assertEqual(len(samples), len(expected))
+                    for sample, expected_sample in zip(samples, expected):
+                        self.assertEqual(len(sample), 2)
+                        for value, expected_value in zip(
+                            sample, expected_sample
+                        ):
+                            value = np.asarray(value)
+                            expected_value = np.asarray(expected_value)
+                            self.assertEqual(value.dtype, expected_value.dtype)
+                            np.testing.assert_array_equal(value, expected_value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+
+import numpy as np
+
+from paddle.dataset.common import _map_in_chunks, _RaggedArray
+from paddle.text.datasets import Imdb
+
+
+def _sum_chunk(chunk):
+    return sum(chunk)
+
+
+class TestRaggedArray(unittest.TestCase):
+    def test_sequences(self):
+        seqs = [[1, 2, 3], [], [4], [5, 6]]
+        ragged = _RaggedArray.from_sequences(seqs)
+        self.assertEqual(len(ragged), 4)
+        self.assertEqual(ragged.values.dtype, np.int32)
+        np.testing.assert_array_equal(ragged.offsets, [0, 3, 3, 4, 6])
+        np.testing.assert_array_equal(ragged.lengths, [3, 0, 1, 2])
+        for i, seq in enumerate(seqs):
+            np.testing.assert_array_equal(ragged[i], seq)
+        # the items are views of the flat values
+        self.assertTrue(np.shares_memory(ragged[3], ragged.values))
+
+    def test_arrays(self):
+        ragged = _RaggedArray.from_sequences([[1, 2], [3]], dtype='int64')
+        arrays = ragged.to_arrays('docs')
+        self.assertEqual(sorted(arrays.keys()), ['docs_offsets', 'docs_values'])
+        ragged = _RaggedArray.from_arrays(arrays, 'docs')
+        np.testing.assert_array_equal(ragged[0], [1, 2])
+        np.testing.assert_array_equal(ragged[1], [3])
+
+    def test_map_in_chunks(self):
+        items = list(range(100))
+        results = _map_in_chunks(_sum_chunk, items, chunk_size=16)
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results[0], sum(range(16)))
+        self.assertEqual(sum(results), sum(items))
+        self.assertEqual(_map_in_chunks(_sum_chunk, []), [])
+
+        # the chunks are mapped by spawned processes only if asked
+        self.assertEqual(
+            _map_in_chunks(_sum_chunk, items, chunk_size=16, num_workers=2),
+            results,
+        )
+
+
+class TestImdbCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.temp_dir.name, 'imdb.tar.gz')
+        docs = {
+            'aclImdb/train/pos/0.txt': b'A good movie, good!\n',
+            'aclImdb/train/neg/0.txt': b'A bad movie.\n',
+            'aclImdb/train/neg/1.txt': b'So bad, bad, bad.\n',
+            'aclImdb/test/pos/0.txt': b'Good.\n',
+        }
+        with tarfile.open(self.data_file, 'w:gz') as tar:
+            for name, text in docs.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(text)
+                tar.addfile(info, io.BytesIO(text))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_imdb(self):
+        for _ in range(2):
+            imdb = Imdb(data_file=self.data_file, mode='train', cutoff=1)
+            self.assertIsInstance(imdb.docs.values, np.memmap)
+            # words of frequency > 1, in descending order of frequency
+            self.assertEqual(
+                imdb.word_idx,
+                {b'bad': 0, b'good': 1, b'a': 2, b'movie': 3, '<unk>': 4},
+            )
+            self.assertEqual(len(imdb), 3)
+            np.testing.assert_array_equal(imdb.get_lengths(), [4, 3, 4])
+
+            doc, label = imdb[0]
+            self.assertEqual(doc.dtype, np.int32)
+            np.testing.assert_array_equal(doc, [2, 1, 3, 1])
+            np.testing.assert_array_equal(label, [0])
+            doc, label = imdb[2]
+            np.testing.assert_array_equal(doc, [4, 0, 0, 0])
+            np.testing.assert_array_equal(label, [1])
+
+        self.assertTrue(os.path.exists(self.data_file + '.train.1.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
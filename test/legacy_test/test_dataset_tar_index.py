@@ -0,0 +1,112 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import pickle
+import tarfile
+import tempfile
+import unittest
+
+from paddle.dataset.common import TarIndex
+
+MEMBERS = {
+    './data/b.txt': b'b' * 3000,
+    'data/a.txt': b'a' * 100,
+    'data/empty.txt': b'',
+}
+
+
+class TestTarIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_archive(self, name, mode):
+        path = os.path.join(self.temp_dir.name, name)
+        with tarfile.open(path, mode) as tar:
+            info = tarfile.TarInfo('data')
+            info.type = tarfile.DIRTYPE
+            tar.addfile(info)
+            for member, data in MEMBERS.items():
+                info = tarfile.TarInfo(member)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return path
+
+    def check_index(self, index):
+        self.assertEqual(index.names(), list(MEMBERS.keys()))
+        self.assertEqual(len(index), 3)
+        self.assertNotIn('data', index)
+        for name in reversed(index.names()):
+            self.assertEqual(index.read(name), MEMBERS[name])
+        self.assertEqual(index.open('data/a.txt').read(), MEMBERS['data/a.txt'])
+        with self.assertRaises(KeyError):
+            index.read('data/c.txt')
+
+    def test_tar(self):
+        path = self.create_archive('data.tar', 'w')
+        with TarIndex(path) as index:
+            self.check_index(index)
+        self.assertTrue(os.path.exists(path + '.index'))
+
+        # load the persisted index
+        with TarIndex(path) as index:
+            self.check_index(index)
+            with pickle.loads(pickle.dumps(index)) as copied:
+                self.check_index(copied)
+
+    def test_compressed(self):
+        path = self.create_archive('data.tar.gz', 'w:gz')
+        with TarIndex(path) as index:
+            self.check_index(index)
+        self.assertFalse(os.path.exists(path + '.tar'))
+
+        with TarIndex(path, decompress=True) as index:
+            self.check_index(index)
+        self.assertTrue(tarfile.is_tarfile(path + '.tar'))
+
+    def test_outdated_index(self):
+        path = self.create_archive('data.tar', 'w')
+        TarIndex(path).close()
+        with tarfile.open(path, 'a') as tar:
+            info = tarfile.TarInfo('data/d.txt')
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b'd'))
+        os.utime(path, ns=(0, 0))
+        with TarIndex(path) as index:
+            self.assertEqual(index.read('data/d.txt'), b'd')
+
+    @unittest.skipIf(not hasattr(os, 'fork'), 'fork is not supported')
+    def test_fork(self):
+        path = self.create_archive('data.tar', 'w')
+        index = TarIndex(path)
+        self.assertEqual(index.read('data/a.txt'), MEMBERS['data/a.txt'])
+        pid = os.fork()
+        if pid == 0:
+            os._exit(
+                0
+                if index.read('./data/b.txt') == MEMBERS['./data/b.txt']
+                else 1
+            )
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(status, 0)
+        self.assertEqual(index.read('data/a.txt'), MEMBERS['data/a.txt'])
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import http.server
 import os
+import re
+import tempfile
+import threading
 import unittest
 
+from paddle.utils import download
 from paddle.utils.download import get_path_from_url, get_weights_path_from_url
 
 
@@ -141,5 +147,138 @@ class TestDownload(unittest.TestCase):
                 )
 
 
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        data = server.data
+        match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        with server.lock:
+            server.requests.append(self.headers.get('Range'))
+        if match and server.support_range:
+            start = int(match.group(1))
+            end = int(match.group(2) or len(data) - 1)
+            body = data[start : end + 1]
+            self.send_response(206)
+            self.send_header(
+                'Content-Range', f'bytes {start}-{end}/{len(data)}'
+            )
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        with server.lock:
+            fail = server.num_failures > 0 and len(body) > 1
+            server.num_failures -= fail
+        if fail:
+            # close the connection in the middle of the body
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRangedDownload(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), _RangeHandler
+        )
+        self.server.data = os.urandom(300 * 1024 + 7)
+        self.server.support_range = True
+        self.server.num_failures = 0
+        self.server.requests = []
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/data.bin'
+        self.md5sum = hashlib.md5(self.server.data).hexdigest()
+
+        self.configs = (
+            download.DOWNLOAD_CHUNK_SIZE,
+            download.DOWNLOAD_MIN_PART_SIZE,
+            download.DOWNLOAD_STATE_INTERVAL,
+        )
+        download.DOWNLOAD_CHUNK_SIZE = 4096
+        download.DOWNLOAD_MIN_PART_SIZE = 64 * 1024
+        download.DOWNLOAD_STATE_INTERVAL = 1
+
+    def tearDown(self):
+        (
+            download.DOWNLOAD_CHUNK_SIZE,
+            download.DOWNLOAD_MIN_PART_SIZE,
+            download.DOWNLOAD_STATE_INTERVAL,
+        ) = self.configs
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+
+    def check_file(self, fullname):
+        with open(fullname, 'rb') as f:
+            self.assertEqual(f.read(), self.server.data)
+        self.assertFalse(os.path.exists(fullname + '_tmp'))
+        self.assertFalse(os.path.exists(fullname + '_tmp.json'))
+
+    def test_ranged(self):
+        fullname = download._download(self.url, self.temp_dir.name, self.md5sum)
+        self.check_file(fullname)
+        # the probe and one request per part
+        self.assertEqual(len(self.server.requests), 1 + 4)
+        self.assertTrue(os.path.exists(fullname + '.md5'))
+
+        # verified by the md5 record without downloading again
+        download._download(self.url, self.temp_dir.name, self.md5sum)
+        self.assertEqual(len(self.server.requests), 1 + 4)
+
+    def test_resume(self):
+        self.server.num_failures = 4
+        fullname = os.path.join(self.temp_dir.name, 'data.bin')
+        self.assertFalse(download._get_download(self.url, fullname))
+        self.assertTrue(os.path.exists(fullname + '_tmp.json'))
+
+        self.server.requests.clear()
+        download._get_download(self.url, fullname, self.md5sum)
+        self.check_file(fullname)
+        # the parts restart from the downloaded bytes
+        num_bytes = 0
+        for request in self.server.requests[1:]:
+            start, end = map(int, re.findall(r'\d+', request))
+            num_bytes += end - start + 1
+        self.assertLess(num_bytes, len(self.server.data))
+
+    def test_no_range(self):
+        self.server.support_range = False
+        fullname = download._download(self.url, self.temp_dir.name, self.md5sum)
+        self.check_file(fullname)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_md5_mismatch(self):
+        with self.assertRaises(RuntimeError):
+            download._download(self.url, self.temp_dir.name, '0' * 32)
+        fullname = os.path.join(self.temp_dir.name, 'data.bin')
+        self.assertFalse(os.path.exists(fullname))
+        self.assertFalse(os.path.exists(fullname + '_tmp'))
+
+    def test_concurrent(self):
+        results = []
+
+        def run():
+            results.append(
+                download._download(self.url, self.temp_dir.name, self.md5sum)
+            )
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(set(results)), 1)
+        self.check_file(results[0])
+        # only one of the processes downloads the file
+        self.assertEqual(len(self.server.requests), 1 + 4)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -18,6 +18,8 @@ import paddle
 from paddle.distributed.fleet.utils.tensor_fusion_helper import (
     HOOK_ACTION,
     FusedCommBuffer,
+    assign_group_by_size,
+    get_ramp_group_sizes,
 )
 
 
@@ -48,5 +50,50 @@ class TestFusedCommBufferGradChecker(unittest.TestCase):
             pass
 
 
+class TestFusedCommBufferBuckets(unittest.TestCase):
+    def test_ramp_group_sizes(self):
+        self.assertEqual(get_ramp_group_sizes(64), [8, 16, 32, 64])
+        self.assertEqual(get_ramp_group_sizes(64, 1), [32, 64])
+
+    def test_assign_group_by_size(self):
+        # each param is 400 bytes
+        params = [paddle.nn.Linear(10, 10).weight for _ in range(8)]
+        var_groups = assign_group_by_size(params, 800)
+        self.assertEqual([len(g) for g in var_groups.values()], [2, 2, 2, 2])
+        var_groups = assign_group_by_size(params, get_ramp_group_sizes(1600))
+        self.assertEqual([len(g) for g in var_groups.values()], [1, 1, 2, 4])
+        # the groups follow the order of the params
+        reordered = params[::-1]
+        var_groups = assign_group_by_size(reordered, [400, 1600])
+        self.assertEqual(var_groups[0], [params[-1]])
+        self.assertEqual(var_groups[1], reordered[1:5])
+
+    def test_ready_times(self):
+        linear = paddle.nn.Linear(10, 10)
+        w = linear.weight
+        b = linear.bias
+        w.main_grad = None
+        b.main_grad = None
+        buffer = FusedCommBuffer(
+            id=0,
+            params=[w, b],
+            comm_group=None,
+            acc_steps=2,
+            act=HOOK_ACTION.ALL_REDUCE,
+        )
+        self.assertIsNone(buffer.comm_stats)
+        buffer.add_grad(w, use_comm=False)
+        first_ready_time = buffer._step_times["first_ready_time"]
+        for param in [b, w, b]:
+            buffer.add_grad(param, use_comm=False)
+            self.assertEqual(
+                buffer._step_times["first_ready_time"], first_ready_time
+            )
+        self.assertTrue(buffer._all_params_checked_in)
+        self.assertGreaterEqual(
+            buffer._step_times["ready_time"], first_ready_time
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,150 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.geometric import GraphStore, NeighborLoader
+
+
+class TestGraphStore(unittest.TestCase):
+    def setUp(self):
+        self.num_nodes = 50
+        edges = np.random.randint(0, self.num_nodes, [2, 400])
+        # remove the duplicated edges
+        edges = np.unique(edges, axis=1)
+        self.src, self.dst = edges
+        self.edge_set = set(zip(self.src.tolist(), self.dst.tolist()))
+        self.feat = np.random.rand(self.num_nodes, 8).astype('float32')
+        self.label = np.arange(self.num_nodes).astype('int64')
+        self.graph = GraphStore.from_edges(
+            self.src,
+            self.dst,
+            num_nodes=self.num_nodes,
+            node_feat=self.feat,
+            node_label=self.label,
+        )
+
+    def check_batch(self, batch, seeds, sample_sizes):
+        nodes = batch['nodes']
+        np.testing.assert_array_equal(nodes[: len(seeds)], seeds)
+        self.assertEqual(len(np.unique(nodes)), len(nodes))
+        np.testing.assert_array_equal(batch['x'], self.feat[nodes])
+        np.testing.assert_array_equal(batch['y'], self.label[seeds])
+
+        # every hop samples the neighbors of all the nodes before it
+        num_nodes = len(seeds)
+        for (src, dst), num_dst, size in zip(
+            batch['edges'], batch['num_dst_nodes'], sample_sizes
+        ):
+            self.assertEqual(num_dst, num_nodes)
+            self.assertTrue(np.all(dst < num_dst))
+            num_nodes = max(num_nodes, src.max() + 1 if len(src) else 0)
+            for s, d in zip(src, dst):
+                self.assertIn((nodes[s], nodes[d]), self.edge_set)
+            for d in range(num_dst):
+                degree = np.sum(self.dst == nodes[d])
+                expected = degree if size < 0 else min(degree, size)
+                self.assertEqual(np.sum(dst == d), expected)
+                # sampled without replacement
+                self.assertEqual(len(np.unique(src[dst == d])), expected)
+
+    def test_csc(self):
+        self.assertEqual(self.graph.num_nodes, self.num_nodes)
+        self.assertEqual(self.graph.num_edges, len(self.src))
+        for v in range(self.num_nodes):
+            start, end = self.graph.colptr[v], self.graph.colptr[v + 1]
+            np.testing.assert_array_equal(
+                np.sort(self.graph.row[start:end]),
+                np.sort(self.src[self.dst == v]),
+            )
+
+    def test_sample(self):
+        seeds = np.array([3, 7, 11, 0])
+        for sample_sizes in ([3, 2], [-1], [2, -1, 1]):
+            batch = self.graph.sample(seeds, sample_sizes)
+            self.assertEqual(batch['batch_size'], 4)
+            self.assertEqual(len(batch['edges']), len(sample_sizes))
+            self.check_batch(batch, seeds, sample_sizes)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.graph.save(path)
+            self.assertTrue(os.path.exists(os.path.join(path, 'row.npy')))
+            graph = GraphStore.load(path)
+            self.assertIsInstance(graph.row, np.memmap)
+            np.testing.assert_array_equal(graph.colptr, self.graph.colptr)
+            batch = graph.sample([1, 2], [4])
+            self.check_batch(batch, [1, 2], [4])
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            GraphStore([0, 1], [0, 1])
+        with self.assertRaises(ValueError):
+            GraphStore([0, 1], [0, 1, 2], node_feat=np.zeros([3, 2]))
+        with self.assertRaises(TypeError):
+            NeighborLoader(None, [2])
+
+
+class TestNeighborLoader(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.num_nodes = 30
+        src = np.random.randint(0, self.num_nodes, [200])
+        dst = np.random.randint(0, self.num_nodes, [200])
+        self.feat = np.random.rand(self.num_nodes, 4).astype('float32')
+        self.graph = GraphStore.from_edges(
+            src, dst, num_nodes=self.num_nodes, node_feat=self.feat
+        )
+
+    def run_loader(self, num_workers):
+        input_nodes = np.arange(0, self.num_nodes, 2)
+        loader = NeighborLoader(
+            self.graph,
+            [3, 2],
+            input_nodes=input_nodes,
+            batch_size=4,
+            shuffle=True,
+            num_workers=num_workers,
+        )
+        seeds = []
+        for batch in loader:
+            batch_size = batch['batch_size']
+            nodes = batch['nodes'].numpy()
+            seeds.extend(nodes[:batch_size].tolist())
+            np.testing.assert_allclose(batch['x'].numpy(), self.feat[nodes])
+
+            x = batch['x']
+            for (src, dst), out_size in zip(
+                batch['edges'][::-1], batch['num_dst_nodes'][::-1]
+            ):
+                x = paddle.geometric.send_u_recv(
+                    x, src, dst, reduce_op='sum', out_size=out_size
+                )
+            self.assertEqual(x.shape, [batch_size, 4])
+        self.assertEqual(sorted(seeds), input_nodes.tolist())
+
+    def test_loader(self):
+        self.run_loader(num_workers=0)
+
+    def test_loader_workers(self):
+        self.run_loader(num_workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
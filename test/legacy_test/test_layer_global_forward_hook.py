@@ -0,0 +1,129 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import pickle
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.nn.utils import (
+    register_layer_forward_post_hook,
+    register_layer_forward_pre_hook,
+)
+
+
+class SimpleNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear1 = paddle.nn.Linear(4, 4)
+        self.linear2 = paddle.nn.Linear(4, 2)
+
+    def forward(self, x):
+        return self.linear2(self.linear1(x))
+
+
+class TestLayerGlobalForwardHook(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.net = SimpleNet()
+        self.x = paddle.rand([3, 4])
+
+    def test_global_pre_hook(self):
+        called = []
+
+        def pre_hook(layer, inputs):
+            called.append(type(layer).__name__)
+
+        handle = register_layer_forward_pre_hook(pre_hook)
+        self.net(self.x)
+        handle.remove()
+        self.assertEqual(called, ['SimpleNet', 'Linear', 'Linear'])
+
+        called.clear()
+        self.net(self.x)
+        self.assertEqual(called, [])
+
+    def test_global_post_hook_modify_output(self):
+        expected = self.net.linear2(self.net.linear1(self.x)).numpy()
+
+        def post_hook(layer, inputs, outputs):
+            if isinstance(layer, SimpleNet):
+                return outputs * 2
+
+        handle = register_layer_forward_post_hook(post_hook)
+        out = self.net(self.x)
+        handle.remove()
+        np.testing.assert_allclose(out.numpy(), expected * 2, rtol=1e-6)
+        np.testing.assert_allclose(self.net(self.x).numpy(), expected)
+
+    def test_global_hooks_run_before_layer_hooks(self):
+        order = []
+        linear = self.net.linear1
+        local_handle = linear.register_forward_pre_hook(
+            lambda layer, inputs: order.append('local')
+        )
+        global_handle = register_layer_forward_pre_hook(
+            lambda layer, inputs: (
+                order.append('global') if layer is linear else None
+            )
+        )
+        linear(self.x)
+        global_handle.remove()
+        local_handle.remove()
+        self.assertEqual(order, ['global', 'local'])
+
+    def test_call_plan_updated_by_hook_dict_mutation(self):
+        linear = self.net.linear1
+        linear(self.x)
+        self.assertEqual(linear._get_forward_call_plan()[1:], ((), ()))
+
+        called = []
+        handle = linear.register_forward_post_hook(
+            lambda layer, inputs, outputs: called.append(1)
+        )
+        linear(self.x)
+        self.assertEqual(len(called), 1)
+
+        # hooks removed by mutating the dict directly are also observed
+        del linear._forward_post_hooks[handle._hook_id]
+        linear(self.x)
+        self.assertEqual(len(called), 1)
+
+    def test_deepcopy_keeps_hooks(self):
+        called = []
+        self.net.register_forward_pre_hook(
+            lambda layer, inputs: called.append(1)
+        )
+        self.net(self.x)
+        net_copy = copy.deepcopy(self.net)
+        net_copy(self.x)
+        self.assertEqual(len(called), 2)
+
+    def test_pickle_without_global_hooks(self):
+        # the call plans holding the global hooks are not pickled
+        handle = register_layer_forward_pre_hook(lambda layer, inputs: None)
+        self.net(self.x)
+        net = pickle.loads(pickle.dumps(self.net))
+        handle.remove()
+        self.assertNotIn('_forward_call_plan', net.__dict__)
+        self.assertNotIn('_forward_call_plan', net.linear1.__dict__)
+        np.testing.assert_allclose(
+            net(self.x).numpy(), self.net(self.x).numpy(), rtol=1e-6
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
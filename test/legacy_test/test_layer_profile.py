@@ -0,0 +1,126 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle import nn
+
+
+class LeNet(nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.features = nn.Sequential(
+            nn.Conv2D(1, 6, 3, stride=1, padding=1),
+            nn.ReLU(),
+            nn.MaxPool2D(2, 2),
+        )
+        self.fc = nn.Linear(6 * 14 * 14, 10)
+
+    def forward(self, x):
+        x = self.features(x)
+        x = paddle.flatten(x, 1)
+        return self.fc(x)
+
+
+class TestLayerProfile(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.net = LeNet()
+
+    def test_forward(self):
+        result = paddle.hapi.layer_profile(
+            self.net, (2, 1, 28, 28), repeat=2, print_detail=False
+        )
+        self.assertEqual(
+            list(result.keys()),
+            ['features.0', 'features.1', 'features.2', 'fc'],
+        )
+        fc = result['fc']
+        self.assertEqual(fc['type'], 'Linear')
+        self.assertEqual(fc['input_shape'], [2, 1176])
+        self.assertEqual(fc['output_shape'], [2, 10])
+        self.assertEqual(fc['params'], 1176 * 10 + 10)
+        self.assertEqual(fc['flops'], 1176 * 2 * 10)
+        self.assertEqual(fc['activation_bytes'], 2 * 10 * 4)
+        self.assertIsNone(fc['backward_time'])
+        for record in result.values():
+            self.assertGreater(record['forward_time'], 0)
+        self.assertTrue(self.net.training)
+
+    def test_backward(self):
+        x = paddle.rand([2, 1, 28, 28])
+        result = paddle.hapi.layer_profile(
+            self.net,
+            input=x,
+            backward=True,
+            repeat=2,
+            sort_by='forward_time',
+            print_detail=True,
+        )
+        # the input fed by user does not require gradient
+        self.assertIsNone(result['features.0']['backward_time'])
+        self.assertGreater(result['fc']['backward_time'], 0)
+        for param in self.net.parameters():
+            self.assertIsNone(param.grad)
+
+    def test_restore_state(self):
+        x = paddle.rand([2, 1, 28, 28])
+        self.net(x).sum().backward()
+        grads = [p.grad.numpy() for p in self.net.parameters()]
+        self.net.features.eval()
+        for backward in [False, True]:
+            paddle.hapi.layer_profile(
+                self.net,
+                (2, 1, 28, 28),
+                backward=backward,
+                repeat=2,
+                print_detail=False,
+            )
+            self.assertTrue(self.net.training)
+            self.assertFalse(self.net.features.training)
+            self.assertFalse(self.net.features[0].training)
+            self.assertTrue(self.net.fc.training)
+            for param, grad in zip(self.net.parameters(), grads):
+                np.testing.assert_array_equal(param.grad.numpy(), grad)
+
+    def test_custom_ops(self):
+        def count_max_pool(m, x, y):
+            m.total_ops += int(y.numel())
+
+        result = paddle.hapi.layer_profile(
+            self.net,
+            [(1, 1, 28, 28)],
+            custom_ops={nn.MaxPool2D: count_max_pool},
+            repeat=1,
+            print_detail=False,
+        )
+        self.assertEqual(result['features.2']['flops'], 6 * 14 * 14)
+        self.assertNotIn('total_ops', self.net.features[2]._buffers)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            paddle.hapi.layer_profile(self.net)
+        with self.assertRaises(ValueError):
+            paddle.hapi.layer_profile(
+                self.net, (1, 1, 28, 28), sort_by='unknown'
+            )
+        with self.assertRaises(TypeError):
+            paddle.hapi.layer_profile(lambda x: x, (1, 1, 28, 28))
+
+
+if __name__ == '__main__':
+    unittest.main()
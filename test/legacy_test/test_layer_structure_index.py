@@ -0,0 +1,170 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+
+import paddle
+
+
+class Block(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(4, 4)
+        self.norm = paddle.nn.BatchNorm1D(4)
+        self.register_buffer(
+            "step", paddle.zeros([1], dtype='int64'), persistable=True
+        )
+        self.register_buffer("cache", paddle.zeros([4]), persistable=False)
+
+    def forward(self, x):
+        return self.norm(self.linear(x))
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.blocks = paddle.nn.LayerList([Block() for _ in range(3)])
+        self.head = paddle.nn.Linear(4, 2)
+
+    def forward(self, x):
+        for block in self.blocks:
+            x = block(x)
+        return self.head(x)
+
+
+class TestLayerStructureIndex(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.net = Net()
+
+    def check_state_dict_keys(self, expected_num):
+        state_dict = self.net.state_dict()
+        names, tensors = self.net.flat_state_dict()
+        self.assertEqual(list(state_dict.keys()), list(names))
+        self.assertEqual(len(names), expected_num)
+        for name, tensor in zip(names, tensors):
+            self.assertIs(state_dict[name], tensor)
+
+    def test_state_dict_matches_flat_view(self):
+        # each block: linear(2) + norm(4) + step(1), head: 2
+        self.check_state_dict_keys(3 * 7 + 2)
+        self.assertIn('blocks.1.norm._mean', self.net.state_dict())
+        self.assertNotIn('blocks.1.cache', self.net.state_dict())
+        self.assertIn('blocks.1.cache', self.net.to_static_state_dict())
+
+    def test_cache_reused(self):
+        names, tensors = self.net.flat_state_dict()
+        self.assertIs(self.net.flat_state_dict()[1], tensors)
+
+    def test_invalidated_by_structure_change(self):
+        self.net.extra = paddle.nn.Linear(2, 2)
+        self.check_state_dict_keys(3 * 7 + 4)
+        self.assertIn('extra.weight', dict(self.net.named_parameters()))
+
+        del self.net.extra
+        self.check_state_dict_keys(3 * 7 + 2)
+
+        del self.net.blocks[0]
+        self.check_state_dict_keys(2 * 7 + 2)
+        self.assertIn('blocks.0.linear.weight', self.net.state_dict())
+
+        self.net.head.register_buffer("scale", paddle.ones([1]))
+        self.check_state_dict_keys(2 * 7 + 3)
+
+        self.net.add_sublayer("tail", paddle.nn.Linear(2, 2))
+        self.assertEqual(
+            [name for name, _ in self.net.named_sublayers()][-1], "tail"
+        )
+
+    def test_invalidated_per_layer(self):
+        names, tensors = self.net.flat_state_dict()
+
+        # the changes of the other layers don't invalidate the index
+        other = Net()
+        other.blocks[0].step = paddle.ones([1], dtype='int64')
+        other.head.weight = other.head.create_parameter([4, 2])
+        self.assertIs(self.net.flat_state_dict()[1], tensors)
+
+        # reassigning the same parameter doesn't invalidate it
+        self.net.head.weight = self.net.head.weight
+        self.assertIs(self.net.flat_state_dict()[1], tensors)
+
+        # the changes of the sublayers reach the ancestors
+        block_tensors = self.net.blocks[1].flat_state_dict()[1]
+        weight = self.net.blocks[1].linear.create_parameter([4, 4])
+        self.net.blocks[1].linear.weight = weight
+        self.assertIsNot(self.net.flat_state_dict()[1], tensors)
+        self.assertIsNot(self.net.blocks[1].flat_state_dict()[1], block_tensors)
+        self.assertIs(self.net.state_dict()['blocks.1.linear.weight'], weight)
+
+    def test_buffer_persistable_changed(self):
+        block = self.net.blocks[1]
+        self.assertNotIn('blocks.1.cache', self.net.state_dict())
+
+        # register the same tensors again with the other flags
+        block.register_buffer("cache", block.cache, persistable=True)
+        self.assertIn('blocks.1.cache', self.net.state_dict())
+        self.check_state_dict_keys(3 * 7 + 3)
+        block.register_buffer("step", block.step, persistable=False)
+        self.assertNotIn('blocks.1.step', self.net.state_dict())
+        self.check_state_dict_keys(3 * 7 + 2)
+
+        # a deleted buffer is persistable again when it is registered
+        del block.cache
+        block.register_buffer("cache", paddle.zeros([4]))
+        self.assertIn('blocks.1.cache', self.net.state_dict())
+
+    def test_copied_layer(self):
+        self.net.flat_state_dict()
+        net = copy.deepcopy(self.net)
+        names, tensors = net.flat_state_dict()
+        self.assertEqual(names, self.net.flat_state_dict()[0])
+        net.blocks[0].linear.weight = net.blocks[0].linear.create_parameter(
+            [4, 4]
+        )
+        self.assertIsNot(net.flat_state_dict()[1], tensors)
+
+    def test_prefix_and_detach(self):
+        state_dict = self.net.state_dict(
+            structured_name_prefix="model.", keep_vars=False
+        )
+        self.assertIn('model.head.weight', state_dict)
+        self.assertTrue(state_dict['model.head.weight'].stop_gradient)
+
+        names = [name for name, _ in self.net.named_parameters(prefix='m')]
+        self.assertEqual(names[-1], 'm.head.bias')
+        names = [name for name, _ in self.net.named_sublayers(prefix='m')]
+        self.assertEqual(names[0], 'm.blocks')
+
+    def test_shared_parameters(self):
+        self.net.tied = self.net.head
+        params = self.net.parameters()
+        self.assertEqual(len(params), len({id(p) for p in params}))
+        self.assertIn('tied.weight', self.net.state_dict())
+
+    def test_state_dict_hook(self):
+        def hook(state_dict):
+            state_dict['extra'] = paddle.ones([1])
+            return state_dict
+
+        handle = self.net.blocks[0].register_state_dict_hook(hook)
+        self.assertIn('extra', self.net.state_dict())
+        self.assertNotIn('extra', self.net.state_dict(use_hook=False))
+        handle.remove()
+        self.assertNotIn('extra', self.net.state_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+import sys
+import unittest
+
+LAZY_SUBMODULES = [
+    'audio',
+    'dataset',
+    'geometric',
+    'hub',
+    'onnx',
+    'quantization',
+    'sparse',
+    'text',
+    'vision',
+]
+
+
+def run_python(code, env=None):
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+
+class TestLazyImportSubmodules(unittest.TestCase):
+    def test_not_imported_eagerly(self):
+        code = (
+            "import sys\n"
+            "import paddle\n"
+            f"for name in {LAZY_SUBMODULES}:\n"
+            "    assert 'paddle.' + name not in sys.modules, name\n"
+            "assert 'paddle.utils.download' not in sys.modules\n"
+        )
+        result = run_python(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_attribute_access(self):
+        code = (
+            "import sys\n"
+            "import paddle\n"
+            "model = paddle.vision.models.LeNet()\n"
+            "assert 'paddle.vision' in sys.modules\n"
+            "assert 'vision' in dir(paddle)\n"
+            "from paddle import text\n"
+            "assert text is paddle.text\n"
+            "assert callable(paddle.utils.download.get_path_from_url)\n"
+            "assert callable(paddle.hub.load)\n"
+            "assert not hasattr(paddle, 'not_exist_submodule')\n"
+        )
+        result = run_python(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_disable_lazy_import(self):
+        code = (
+            "import sys\nimport paddle\nassert 'paddle.vision' in sys.modules\n"
+        )
+        env = dict(os.environ, PADDLE_LAZY_IMPORT='0')
+        result = run_python(code, env=env)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,295 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+from paddle.distributed.auto_tuner.pipeline_simulator import (
+    PipelineSimulator,
+    get_job_list,
+)
+from paddle.distributed.auto_tuner.prune import prune_by_pipeline_simulation
+
+
+class TestJobList(unittest.TestCase):
+    def check_jobs(self, schedule_mode, num_stages, num_micro_batches, vpp):
+        for stage_id in range(num_stages):
+            job_list = get_job_list(
+                schedule_mode, stage_id, num_stages, num_micro_batches, vpp
+            )
+            forward_jobs = [job for job in job_list if job[0] == "forward"]
+            backward_jobs = [
+                job for job in job_list if job[0] in ["backward", "backward_b"]
+            ]
+            expected = sorted(
+                (chunk_id, i)
+                for chunk_id in range(vpp)
+                for i in range(num_micro_batches)
+            )
+            self.assertEqual(sorted(job[1:] for job in forward_jobs), expected)
+            self.assertEqual(sorted(job[1:] for job in backward_jobs), expected)
+            # the micro batches run in order in each chunk
+            for jobs in [forward_jobs, backward_jobs]:
+                for chunk_id in range(vpp):
+                    ids = [job[2] for job in jobs if job[1] == chunk_id]
+                    self.assertEqual(ids, list(range(num_micro_batches)))
+
+    def test_schedules(self):
+        self.check_jobs("FThenB", 4, 8, 1)
+        self.check_jobs("FThenB", 4, 6, 2)
+        self.check_jobs("1F1B", 4, 8, 1)
+        self.check_jobs("1F1B", 4, 2, 1)
+        self.check_jobs("ZBH1", 4, 8, 1)
+        self.check_jobs("VPP", 4, 8, 2)
+        self.check_jobs("VPP", 4, 10, 3)
+
+    def test_1f1b(self):
+        job_list = get_job_list("1F1B", 2, 4, 4)
+        self.assertEqual(
+            [(job[0], job[2]) for job in job_list],
+            [
+                ("forward", 0),
+                ("forward", 1),
+                ("backward", 0),
+                ("forward", 2),
+                ("backward", 1),
+                ("forward", 3),
+                ("backward", 2),
+                ("backward", 3),
+            ],
+        )
+
+    def test_zero_bubble(self):
+        job_list = get_job_list("ZBH1", 2, 4, 4)
+        self.assertEqual(
+            [(job[0], job[2]) for job in job_list],
+            [
+                ("forward", 0),
+                ("forward", 1),
+                ("backward_b", 0),
+                ("forward", 2),
+                ("backward_b", 1),
+                ("forward", 3),
+                ("backward", 2),
+                ("backward", 3),
+                ("backward_w", 0),
+                ("backward_w", 1),
+            ],
+        )
+
+    def test_errors(self):
+        with self.assertRaises(AssertionError):
+            get_job_list("GPipe", 0, 4, 8)
+        with self.assertRaises(AssertionError):
+            get_job_list("1F1B", 0, 4, 8, vpp_degree=2)
+        with self.assertRaises(AssertionError):
+            get_job_list("VPP", 0, 4, 2, vpp_degree=2)
+
+
+class TestPipelineSimulator(unittest.TestCase):
+    def test_1f1b(self):
+        for num_stages, num_micro_batches in [(4, 8), (8, 8), (2, 16)]:
+            result = PipelineSimulator(
+                num_stages, num_micro_batches, schedule_mode="1F1B"
+            ).simulate()
+            # each micro batch costs 1 for forward and 2 for backward
+            self.assertAlmostEqual(
+                result.step_time, 3 * (num_micro_batches + num_stages - 1)
+            )
+            self.assertAlmostEqual(
+                result.bubble_ratio,
+                (num_stages - 1) / (num_micro_batches + num_stages - 1),
+            )
+            self.assertEqual(
+                result.peak_memory,
+                [num_stages - i for i in range(num_stages)],
+            )
+
+    def test_fthenb(self):
+        result = PipelineSimulator(4, 8, schedule_mode="FThenB").simulate()
+        self.assertAlmostEqual(result.step_time, 33)
+        self.assertEqual(result.peak_memory, [8] * 4)
+
+    def test_interleave(self):
+        # the bubble is reduced by vpp_degree times
+        result = PipelineSimulator(
+            4, 8, schedule_mode="VPP", vpp_degree=2
+        ).simulate()
+        self.assertAlmostEqual(result.step_time, 24 + 9 / 2)
+        result = PipelineSimulator(
+            4, 8, schedule_mode="VPP", vpp_degree=1
+        ).simulate()
+        self.assertAlmostEqual(result.step_time, 33)
+
+    def test_zero_bubble(self):
+        result_1f1b = PipelineSimulator(4, 8, schedule_mode="1F1B").simulate()
+        result_zb = PipelineSimulator(4, 8, schedule_mode="ZBH1").simulate()
+        self.assertAlmostEqual(result_zb.step_time, 30)
+        self.assertLess(result_zb.bubble_ratio, result_1f1b.bubble_ratio)
+        # the weight gradients are computed after the input gradients
+        for jobs in result_zb.timeline:
+            end_times = {
+                job[2]: job[4] for job in jobs if job[0] == "backward_b"
+            }
+            for job in jobs:
+                if job[0] == "backward_w":
+                    self.assertGreaterEqual(job[3], end_times[job[2]])
+
+    def test_costs(self):
+        # the slowest stage dominates the step
+        result = PipelineSimulator(
+            4,
+            8,
+            forward_time=[1, 1, 2, 1],
+            backward_time=[1, 1, 2, 1],
+            weight_grad_time=[1, 1, 2, 1],
+            comm_time=0.5,
+        ).simulate()
+        self.assertGreaterEqual(result.step_time, 8 * 6)
+        for jobs in result.timeline:
+            for prev, job in zip(jobs, jobs[1:]):
+                self.assertGreaterEqual(job[3], prev[4])
+        with self.assertRaises(AssertionError):
+            PipelineSimulator(4, 8, forward_time=[1, 2])
+
+    def test_chrome_trace(self):
+        result = PipelineSimulator(
+            4, 8, schedule_mode="VPP", vpp_degree=2
+        ).simulate()
+        with tempfile.TemporaryDirectory() as path:
+            trace_file = os.path.join(path, "pipeline_profile.json")
+            result.to_chrome_trace(trace_file)
+            with open(trace_file) as f:
+                trace = json.load(f)
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), 4 * 8 * 2 * 2)
+        self.assertEqual(events[0]["name"], "F0_VP0")
+        self.assertEqual({event["tid"] for event in events}, {1, 2, 3, 4})
+
+
+class TestPruneByPipelineSimulation(unittest.TestCase):
+    def test_prune(self):
+        tuner_cfg = {
+            "model_cfg": {"global_batch_size": 16},
+            "max_bubble_ratio": 0.2,
+            "pipeline_cost": {"forward_time": 1.0, "backward_time": 2.0},
+        }
+        cur_cfg = {
+            "dp_degree": 1,
+            "mp_degree": 1,
+            "pp_degree": 4,
+            "vpp_degree": 1,
+            "sharding_degree": 1,
+            "sharding_stage": 1,
+            "micro_batch_size": 1,
+            "use_recompute": False,
+            "recompute_granularity": None,
+        }
+        # bubble ratio of 16 micro batches is 3 / 19
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        # bubble ratio of 8 micro batches is 3 / 11
+        cur_cfg["micro_batch_size"] = 2
+        self.assertTrue(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        cur_cfg["vpp_degree"] = 2
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        tuner_cfg.pop("max_bubble_ratio")
+        cur_cfg["vpp_degree"] = 1
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+
+    def test_layer_costs(self):
+        tuner_cfg = {
+            "model_cfg": {"global_batch_size": 8, "num_layers": 8},
+            "max_bubble_ratio": 0.3,
+            # one value per layer, the last stage of pp 4 is 3 times slower
+            "pipeline_cost": {
+                "forward_time": [1.0] * 6 + [3.0] * 2,
+                "backward_time": 2.0,
+            },
+        }
+        cur_cfg = {
+            "dp_degree": 1,
+            "mp_degree": 1,
+            "pp_degree": 2,
+            "vpp_degree": 1,
+            "sharding_degree": 1,
+            "sharding_stage": 1,
+            "micro_batch_size": 1,
+            "use_recompute": False,
+            "recompute_granularity": None,
+        }
+        for pp_degree, vpp_degree, pruned in [
+            (2, 1, False),
+            (4, 1, True),
+            (2, 2, False),
+            (8, 1, True),
+        ]:
+            cur_cfg["pp_degree"] = pp_degree
+            cur_cfg["vpp_degree"] = vpp_degree
+            self.assertEqual(
+                prune_by_pipeline_simulation(tuner_cfg, cur_cfg), pruned
+            )
+
+        # skipped if the costs match neither the stages nor the layers
+        cur_cfg["pp_degree"] = 3
+        cur_cfg["vpp_degree"] = 1
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        tuner_cfg["pipeline_cost"]["forward_time"] = [1.0, 1.0, 1.0]
+        tuner_cfg["max_bubble_ratio"] = 0.0
+        self.assertTrue(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        cur_cfg["pp_degree"] = 4
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+
+    def test_schedule_mode(self):
+        tuner_cfg = {
+            "model_cfg": {"global_batch_size": 8},
+            "max_bubble_ratio": 0.2,
+            "pipeline_schedule_mode": "ZBH1",
+        }
+        cur_cfg = {
+            "dp_degree": 1,
+            "mp_degree": 1,
+            "pp_degree": 4,
+            "vpp_degree": 1,
+            "sharding_degree": 1,
+            "sharding_stage": 1,
+            "micro_batch_size": 1,
+            "use_recompute": False,
+            "recompute_granularity": None,
+        }
+        # ZB-H1 fills the bubbles of the cooldown phase, 0.2 against 0.2727
+        # of 1F1B
+        self.assertFalse(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+        tuner_cfg["pipeline_schedule_mode"] = "1F1B"
+        self.assertTrue(prune_by_pipeline_simulation(tuner_cfg, cur_cfg))
+
+        # the model chunks run the interleaved schedule, which is FThenB
+        # with less than 2 * pp_degree micro batches
+        for schedule_mode in ["1F1B", "ZBH1"]:
+            tuner_cfg["pipeline_schedule_mode"] = schedule_mode
+            for vpp_degree, micro_batch_size, pruned in [
+                (2, 1, False),
+                (2, 2, True),
+                (4, 1, False),
+            ]:
+                cur_cfg["vpp_degree"] = vpp_degree
+                cur_cfg["micro_batch_size"] = micro_batch_size
+                self.assertEqual(
+                    prune_by_pipeline_simulation(tuner_cfg, cur_cfg), pruned
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,7 @@ from PIL import Image
 
 import paddle
 import paddle.vision.transforms.functional as F
+import paddle.vision.transforms.functional_tensor as F_t
 from paddle.vision import image_load, set_image_backend
 from paddle.vision.datasets import DatasetFolder
 from paddle.vision.transforms import transforms
@@ -1238,5 +1239,282 @@ class TestFunctional(unittest.TestCase):
         self.assertTrue(test_adjust_hue(batch_tensor))
 
 
+class TestBatchedTransforms(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.images = paddle.rand([4, 3, 32, 40])
+
+    def test_compose(self):
+        trans = transforms.Compose(
+            [
+                transforms.RandomResizedCrop((24, 28)),
+                transforms.RandomHorizontalFlip(),
+                transforms.RandomVerticalFlip(),
+                transforms.ColorJitter(0.4, 0.4, 0.4, 0.1),
+                transforms.RandomAffine(
+                    15, translate=(0.1, 0.1), scale=(0.9, 1.1), shear=5
+                ),
+                transforms.RandomRotation(10),
+                transforms.Resize((20, 20)),
+                transforms.CenterCrop(16),
+                transforms.Grayscale(3),
+                transforms.Normalize(0.5, 0.5),
+            ],
+            batched=True,
+        )
+        labels = np.arange(4)
+        images, out_labels = trans((self.images, labels))
+        self.assertEqual(images.shape, [4, 3, 16, 16])
+        np.testing.assert_array_equal(out_labels, labels)
+
+    def test_numpy_batch(self):
+        images = (np.random.rand(2, 8, 10, 3) * 255).astype('uint8')
+        trans = transforms.Compose(
+            [transforms.ToTensor(), transforms.RandomHorizontalFlip(0.0)],
+            batched=True,
+        )
+        out = trans(images)
+        self.assertEqual(out.shape, [2, 3, 8, 10])
+        np.testing.assert_allclose(
+            out.numpy(), images.transpose((0, 3, 1, 2)) / 255.0, rtol=1e-6
+        )
+
+    def test_numpy_batch_before_to_tensor(self):
+        # the transforms before ToTensor work on the H and W axes of the
+        # collated HWC images
+        images = (np.random.rand(2, 8, 12, 3) * 255).astype('uint8')
+        trans = transforms.Compose(
+            [
+                transforms.CenterCrop((6, 8)),
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.ToTensor(),
+                transforms.Normalize(0.5, 0.5),
+            ],
+            batched=True,
+        )
+        out = trans(images)
+        self.assertEqual(out.shape, [2, 3, 6, 8])
+        expected = images[:, 1:7, 2:10, :][:, :, ::-1, :]
+        expected = (expected.transpose((0, 3, 1, 2)) / 255.0 - 0.5) / 0.5
+        np.testing.assert_allclose(out.numpy(), expected, rtol=1e-5)
+
+        trans = transforms.Compose(
+            [
+                transforms.RandomResizedCrop((5, 7)),
+                transforms.RandomHorizontalFlip(),
+                transforms.ToTensor(data_format='HWC'),
+            ],
+            batched=True,
+        )
+        self.assertEqual(trans(images).shape, [2, 5, 7, 3])
+
+        trans = transforms.Compose(
+            [transforms.Normalize(0.5, 0.5), transforms.ToTensor()],
+            batched=True,
+        )
+        with self.assertRaises(ValueError):
+            trans(images)
+
+    def test_fallback(self):
+        trans = transforms.Compose(
+            [transforms.Pad(2), transforms.RandomCrop(30)], batched=True
+        )
+        self.assertEqual(trans(self.images).shape, [4, 3, 30, 30])
+        with self.assertRaises(ValueError):
+            trans(self.images[0])
+
+    def test_flip(self):
+        np.testing.assert_allclose(
+            transforms.RandomHorizontalFlip(1.0)
+            ._apply_batch_image(self.images)
+            .numpy(),
+            F.hflip(self.images).numpy(),
+        )
+        np.testing.assert_allclose(
+            transforms.RandomVerticalFlip(0.0)
+            ._apply_batch_image(self.images)
+            .numpy(),
+            self.images.numpy(),
+        )
+
+    def test_affine(self):
+        angles = [10.0, -20.0, 30.0, 0.0]
+        translates = [[2, 3], [0, 0], [-4, 1], [1, -1]]
+        scales = [1.0, 0.8, 1.2, 1.0]
+        shears = [[5.0, 0.0], [0.0, 0.0], [-3.0, 2.0], [0.0, 0.0]]
+        matrix = F_t._get_batched_affine_matrix(
+            [0.0, 0.0],
+            np.array(angles),
+            np.array(translates, dtype='float64'),
+            np.array(scales),
+            np.array(shears),
+        )
+        batch_result = F_t.batched_affine(self.images, matrix, fill=0)
+        for i, image in enumerate(self.images.unbind(0)):
+            expected = F.affine(
+                image, angles[i], translates[i], scales[i], shears[i], fill=0
+            )
+            np.testing.assert_allclose(
+                batch_result[i].numpy(), expected.numpy(), atol=1e-5
+            )
+
+    def test_resized_crop(self):
+        boxes = np.array([[0, 0, 32, 40], [4, 6, 8, 10]] * 2)
+        result = F_t.batched_resized_crop(
+            self.images, boxes, (32, 40), 'nearest'
+        )
+        np.testing.assert_allclose(
+            result[0].numpy(), self.images[0].numpy(), atol=1e-6
+        )
+        crop = F_t.batched_resized_crop(self.images, boxes, (8, 10), 'nearest')
+        np.testing.assert_allclose(
+            crop[1].numpy(),
+            self.images[1, :, 4:12, 6:16].numpy(),
+            atol=1e-6,
+        )
+
+    def test_color(self):
+        factors = [0.5, 1.0, 1.5, 0.8]
+        for batched_fn, fn in (
+            (F_t.batched_adjust_brightness, F.adjust_brightness),
+            (F_t.batched_adjust_contrast, F.adjust_contrast),
+            (F_t.batched_adjust_saturation, F.adjust_saturation),
+        ):
+            batch_result = batched_fn(self.images, factors)
+            for i, image in enumerate(self.images.unbind(0)):
+                np.testing.assert_allclose(
+                    batch_result[i].numpy(),
+                    fn(image, factors[i]).numpy(),
+                    atol=1e-5,
+                )
+
+        hue_factors = [-0.2, 0.0, 0.1, 0.4]
+        batch_result = F_t.batched_adjust_hue(self.images, hue_factors)
+        for i, image in enumerate(self.images.unbind(0)):
+            np.testing.assert_allclose(
+                batch_result[i].numpy(),
+                F.adjust_hue(image, hue_factors[i]).numpy(),
+                atol=1e-5,
+            )
+
+
+class TestFusedTransforms(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.images = paddle.rand([4, 3, 32, 40])
+
+    def test_warp(self):
+        geometric = [
+            transforms.Resize((24, 30)),
+            transforms.CenterCrop((20, 24)),
+            transforms.RandomHorizontalFlip(1.0),
+            transforms.RandomVerticalFlip(1.0),
+        ]
+        expected = transforms.Compose(geometric, batched=True)(self.images)
+        fused = transforms.Compose(geometric, batched=True, fuse=True)
+        np.testing.assert_allclose(
+            fused(self.images).numpy(), expected.numpy(), atol=1e-5
+        )
+
+    def test_identity(self):
+        trans = transforms.Compose(
+            [
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.RandomHorizontalFlip(1.0),
+                transforms.CenterCrop((32, 40)),
+            ],
+            batched=True,
+            fuse=True,
+        )
+        np.testing.assert_array_equal(
+            trans(self.images).numpy(), self.images.numpy()
+        )
+
+    def test_pixel_affine(self):
+        num, channels = self.images.shape[:2]
+        eye = np.tile(np.eye(channels), (num, 1, 1))
+        gray = np.tile(F_t._get_gray_weights(channels), (channels, 1))
+        zeros = np.zeros((num, channels))
+        steps = [
+            (0.8 * eye, zeros, None, True),
+            (0.7 * eye, zeros, np.full((num, channels), 0.3), True),
+            (0.6 * eye + 0.4 * gray, zeros, None, True),
+        ]
+        color = None
+        for step in steps:
+            color = F_t._compose_pixel_affine(color, step, self.images)
+        normalize = F_t._compose_pixel_affine(
+            None, (eye / 0.5, zeros - 1.0, None, False), self.images
+        )
+        result = F_t.fused_pixel_affine(self.images, color, normalize)
+
+        for i, image in enumerate(self.images.unbind(0)):
+            expected = F.adjust_brightness(image, 0.8)
+            expected = F.adjust_contrast(expected, 0.7)
+            expected = F.adjust_saturation(expected, 0.6)
+            expected = F.normalize(expected, 0.5, 0.5)
+            np.testing.assert_allclose(
+                result[i].numpy(), expected.numpy(), atol=1e-5
+            )
+
+    def test_compose(self):
+        trans = transforms.Compose(
+            [
+                transforms.RandomResizedCrop((24, 28)),
+                transforms.RandomHorizontalFlip(),
+                transforms.RandomRotation(10),
+                transforms.Resize((20, 20)),
+                transforms.ColorJitter(0.4, 0.4, 0.4),
+                transforms.Normalize(
+                    [0.485, 0.456, 0.406], [0.229, 0.224, 0.225]
+                ),
+                transforms.Transpose((1, 2, 0)),
+            ],
+            batched=True,
+            fuse=True,
+        )
+        labels = np.arange(4)
+        images, out_labels = trans((self.images, labels))
+        self.assertEqual(images.shape, [4, 20, 20, 3])
+        np.testing.assert_array_equal(out_labels, labels)
+
+    def test_scalar_normalize(self):
+        for num_channels in [1, 3]:
+            images = self.images[:, :num_channels]
+            for normalize in [
+                transforms.Normalize(0.5, 0.5),
+                transforms.Normalize([0.5], [0.5]),
+            ]:
+                # the scalars are fused too
+                self.assertIsNotNone(
+                    normalize._get_pixel_affine(4, num_channels)
+                )
+                expected = (images.numpy() - 0.5) / 0.5
+                for fuse in [False, True]:
+                    trans = transforms.Compose(
+                        [transforms.BrightnessTransform(0.0), normalize],
+                        batched=True,
+                        fuse=fuse,
+                    )
+                    np.testing.assert_allclose(
+                        trans(images).numpy(), expected, atol=1e-5
+                    )
+
+    def test_sample(self):
+        trans = transforms.Compose(
+            [
+                transforms.Resize(16),
+                transforms.CenterCrop(16),
+                transforms.Normalize(0.5, 0.5),
+            ],
+            fuse=True,
+        )
+        image, label = trans((self.images[0], 1))
+        self.assertEqual(image.shape, [3, 16, 16])
+        self.assertEqual(label, 1)
+        expected = transforms.Compose(trans.transforms)(self.images[0])
+        np.testing.assert_allclose(image.numpy(), expected.numpy(), atol=1e-5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,289 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from paddle.distributed.ps._sparse_client import SparseTableClient
+
+DIM = 8
+
+
+class LocalSparseServer:
+    """
+    An in-process stand-in of the sparse tables of the parameter server,
+    which applies SGD to the pushed gradients, and simulates the latency of
+    the requests.
+    """
+
+    def __init__(self, lr=0.1, latency=0.0, row_latency=0.0):
+        self.lr = lr
+        self.latency = latency
+        self.row_latency = row_latency
+        self.tables = {}
+        self.num_requests = 0
+        self.pulled_rows = 0
+        self.pushed_rows = 0
+        self.lock = threading.Lock()
+
+    def _wait(self, num_rows):
+        with self.lock:
+            self.num_requests += 1
+        if self.latency or self.row_latency:
+            time.sleep(self.latency + self.row_latency * num_rows)
+
+    def _get_row(self, table_id, key):
+        table = self.tables.setdefault(table_id, {})
+        if key not in table:
+            table[key] = np.random.RandomState(key % 2**32).rand(DIM)
+        return table[key]
+
+    def pull_sparse(self, table_id, keys):
+        self._wait(len(keys))
+        with self.lock:
+            self.pulled_rows += len(keys)
+            return np.array(
+                [self._get_row(table_id, k) for k in keys.tolist()]
+            ).reshape([-1, DIM])
+
+    def push_sparse(self, table_id, keys, grads):
+        self._wait(len(keys))
+        with self.lock:
+            self.pushed_rows += len(keys)
+            for key, grad in zip(keys.tolist(), grads):
+                row = self._get_row(table_id, key)
+                self.tables[table_id][key] = row - self.lr * grad
+
+
+def get_power_law_keys(rng, batch_size, num_keys=100000):
+    return (rng.zipf(1.2, batch_size) - 1) % num_keys
+
+
+def run_trainer(args):
+    use_client, num_threads, num_steps, seed = args
+    server = LocalSparseServer(latency=0.001, row_latency=1e-6)
+    client = SparseTableClient(server, max_staleness=4) if use_client else None
+
+    def train(thread_id):
+        rng = np.random.RandomState(seed * 100 + thread_id)
+        for _ in range(num_steps):
+            keys = get_power_law_keys(rng, 1024)
+            if client is not None:
+                rows = client.pull(0, keys)
+                client.push(0, keys, rows * 0.01)
+            else:
+                rows = server.pull_sparse(0, keys)
+                server.push_sparse(0, keys, rows * 0.01)
+
+    start = time.time()
+    threads = [
+        threading.Thread(target=train, args=(i,)) for i in range(num_threads)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return (
+        time.time() - start,
+        server.num_requests,
+        server.pulled_rows + server.pushed_rows,
+    )
+
+
+class TestSparseTableClient(unittest.TestCase):
+    def test_pull_push(self):
+        server = LocalSparseServer()
+        expected_server = LocalSparseServer()
+        client = SparseTableClient(server)
+        rng = np.random.RandomState(0)
+        for _ in range(10):
+            keys = get_power_law_keys(rng, 64, num_keys=100)
+            rows = client.pull(0, keys)
+            np.testing.assert_allclose(
+                rows, expected_server.pull_sparse(0, keys)
+            )
+            grads = rng.rand(len(keys), DIM)
+            client.push(0, keys, grads)
+            expected_server.push_sparse(0, keys, grads)
+        for table_id in [0, 1]:
+            keys = np.arange(100)
+            np.testing.assert_allclose(
+                client.pull(table_id, keys),
+                expected_server.pull_sparse(table_id, keys),
+            )
+
+        # the keys are deduplicated
+        stats = client.stats
+        self.assertEqual(stats["push_keys"], 640)
+        self.assertLess(stats["pushed_rows"], 640)
+        self.assertEqual(stats["pushed_rows"], server.pushed_rows)
+        self.assertEqual(stats["pulled_rows"], server.pulled_rows)
+        self.assertEqual(client.pull(0, []).shape, (0, DIM))
+        client.push(0, [], np.zeros([0, DIM]))
+        client.flush()
+        self.assertEqual(client.stats["pushed_rows"], server.pushed_rows)
+
+    def test_cache(self):
+        server = LocalSparseServer()
+        client = SparseTableClient(server, cache_size=4, max_staleness=1)
+        client.pull(0, [1, 2, 3])
+        client.pull(0, [1, 2, 3, 4])
+        self.assertEqual(server.pulled_rows, 4)
+        self.assertEqual(client.stats["cache_hits"], 3)
+
+        # the least frequently used rows are evicted
+        client.pull(0, [1, 2, 5])
+        client.pull(0, [1, 2])
+        self.assertEqual(server.pulled_rows, 5)
+        self.assertEqual(len(client._get_table(0).cache), 3)
+
+        # the cached rows are pulled again after max_staleness pushes
+        client.push(0, [1], np.ones([1, DIM]))
+        rows = client.pull(0, [1])
+        self.assertEqual(server.pulled_rows, 5)
+        client.push(0, [2], np.ones([1, DIM]))
+        np.testing.assert_allclose(client.pull(0, [1]), rows - 0.1)
+        self.assertEqual(server.pulled_rows, 6)
+
+        # at least one row is kept for a small cache
+        server = LocalSparseServer()
+        client = SparseTableClient(server, cache_size=1, max_staleness=1)
+        client.pull(0, [1])
+        client.pull(0, [2])
+        client.pull(0, [2])
+        self.assertEqual(server.pulled_rows, 2)
+        self.assertEqual(len(client._get_table(0).cache), 1)
+
+        # no cache
+        server = LocalSparseServer()
+        client = SparseTableClient(server, cache_size=0)
+        client.pull(0, [1, 2, 1])
+        client.pull(0, [1, 2])
+        self.assertEqual(server.pulled_rows, 4)
+
+    def test_push_batch(self):
+        server = LocalSparseServer()
+        client = SparseTableClient(server, push_batch_rows=20)
+        for i in range(4):
+            client.push(0, [1, 2, i], np.ones([3, DIM]))
+        self.assertEqual(client.stats["push_requests"], 0)
+        client.flush()
+        self.assertEqual(client.stats["push_requests"], 1)
+        self.assertEqual(client.stats["pushed_rows"], 4)
+        np.testing.assert_allclose(
+            server.tables[0][1],
+            np.random.RandomState(1).rand(DIM) - 0.1 * 5,
+        )
+
+    def test_merged_pulls(self):
+        server = LocalSparseServer(latency=0.01)
+        client = SparseTableClient(server, cache_size=0)
+        num_threads = 8
+        results = [None] * num_threads
+        keys = [np.arange(i, i + 16) for i in range(num_threads)]
+
+        def pull(i):
+            for _ in range(4):
+                results[i] = client.pull(0, keys[i])
+
+        threads = [
+            threading.Thread(target=pull, args=(i,)) for i in range(num_threads)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i in range(num_threads):
+            np.testing.assert_allclose(
+                results[i], LocalSparseServer().pull_sparse(0, keys[i])
+            )
+        self.assertLess(server.num_requests, num_threads * 4)
+
+    def test_error(self):
+        class FailedServer(LocalSparseServer):
+            def pull_sparse(self, table_id, keys):
+                raise RuntimeError("pull failed")
+
+        client = SparseTableClient(FailedServer())
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                client.pull(0, [1, 2])
+
+    def test_error_of_merged_pulls(self):
+        class WrongServer(LocalSparseServer):
+            def pull_sparse(self, table_id, keys):
+                rows = super().pull_sparse(table_id, keys)
+                if self.num_requests % 2 == 0:
+                    return rows[:-1]
+                return rows
+
+        client = SparseTableClient(WrongServer(latency=0.01), cache_size=0)
+        num_threads = 8
+        errors = [0] * num_threads
+
+        def pull(i):
+            for _ in range(4):
+                try:
+                    client.pull(0, np.arange(i, i + 16))
+                except ValueError:
+                    errors[i] += 1
+
+        threads = [
+            threading.Thread(target=pull, args=(i,)) for i in range(num_threads)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+            self.assertFalse(t.is_alive())
+        # all the threads waiting for a wrong pull raise the error, and the
+        # pulls after it are still served
+        self.assertGreater(sum(errors), 0)
+        self.assertLess(sum(errors), num_threads * 4)
+        self.assertFalse(client._get_table(0).pulling)
+
+
+class TestSparseTableClientBenchmark(unittest.TestCase):
+    def test_benchmark(self):
+        # each process is a trainer with its own in-process server
+        num_trainers, num_threads, num_steps = 2, 4, 10
+        ctx = multiprocessing.get_context("fork")
+        results = {}
+        for use_client in [False, True]:
+            with ctx.Pool(num_trainers) as pool:
+                results[use_client] = pool.map(
+                    run_trainer,
+                    [
+                        (use_client, num_threads, num_steps, i)
+                        for i in range(num_trainers)
+                    ],
+                )
+        # the power law keys are mostly hit or deduplicated, and the pulls
+        # are merged
+        self.assertLess(
+            sum(r[1] for r in results[True]),
+            sum(r[1] for r in results[False]),
+        )
+        self.assertLess(
+            sum(r[2] for r in results[True]),
+            sum(r[2] for r in results[False]) / 2,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
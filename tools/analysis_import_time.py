@@ -0,0 +1,128 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Break down the time of `import paddle` per submodule.
+
+Usage:
+    python tools/analysis_import_time.py [--depth 2] [--top 30]
+
+It runs `import paddle` in a fresh interpreter with `-X importtime`, and
+reports the time spent in the modules under every `paddle.xxx` prefix of
+the given depth, plus the time of the first access of each lazily loaded
+submodule of `paddle`.
+"""
+
+import argparse
+import collections
+import re
+import subprocess
+import sys
+
+_IMPORT_TIME_RE = re.compile(
+    r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$'
+)
+
+LAZY_SUBMODULES = [
+    'audio',
+    'dataset',
+    'geometric',
+    'hub',
+    'onnx',
+    'quantization',
+    'sparse',
+    'text',
+    'vision',
+]
+
+
+def run_import_time(code):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(
+                (name, len(indent) // 2, int(self_us), int(cumulative_us))
+            )
+    return records
+
+
+def breakdown_by_submodule(records, depth):
+    """
+    Sum the self import time of all modules under each `paddle.xxx` prefix
+    of the given depth, so that nested imports are counted exactly once.
+    """
+    self_time = collections.Counter()
+    for name, _, self_us, _ in records:
+        parts = name.split('.')
+        if parts[0] != 'paddle':
+            key = '<third party>'
+        else:
+            key = '.'.join(parts[: depth + 1])
+        self_time[key] += self_us
+    return self_time
+
+
+def measure_lazy_submodules():
+    result = {}
+    for name in LAZY_SUBMODULES:
+        records = run_import_time(f'import paddle; paddle.{name}')
+        # the cumulative time also counts the third party modules that are
+        # first imported by this submodule, e.g. httpx
+        result[name] = next(
+            cumulative_us
+            for module, _, _, cumulative_us in records
+            if module == f'paddle.{name}'
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--top', type=int, default=30)
+    parser.add_argument(
+        '--skip-lazy',
+        action='store_true',
+        help='do not measure the first access of lazy submodules',
+    )
+    args = parser.parse_args()
+
+    records = run_import_time('import paddle')
+    total_us = max(
+        cumulative_us
+        for name, _, _, cumulative_us in records
+        if name == 'paddle'
+    )
+    print(f'import paddle: {total_us / 1e6:.3f} s')
+    print(f'{"module":<48}{"self time (s)":>16}{"ratio":>10}')
+    breakdown = breakdown_by_submodule(records, args.depth)
+    for name, self_us in breakdown.most_common(args.top):
+        print(f'{name:<48}{self_us / 1e6:>16.3f}{self_us / total_us:>10.1%}')
+
+    if not args.skip_lazy:
+        print()
+        print(f'{"lazy submodule":<48}{"first access (s)":>16}')
+        for name, cumulative_us in measure_lazy_submodules().items():
+            print(f'{"paddle." + name:<48}{cumulative_us / 1e6:>16.3f}')
+
+
+if __name__ == '__main__':
+    main()
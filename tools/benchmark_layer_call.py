@@ -0,0 +1,75 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import time
+
+import paddle
+from paddle.nn.utils import register_layer_forward_pre_hook
+
+# Measure the Python overhead of nn.Layer.__call__ per sublayer call, with
+# no hooks, with per-layer hooks and with a single global hook.
+#
+# Usage:
+#     python tools/benchmark_layer_call.py --num_layers 2000 --iters 50
+
+
+class Identity(paddle.nn.Layer):
+    def forward(self, x):
+        return x
+
+
+def timeit_layer_call(layers, x, iters):
+    start = time.perf_counter()
+    for _ in range(iters):
+        for layer in layers:
+            layer(x)
+    elapse = time.perf_counter() - start
+    return elapse / (iters * len(layers))
+
+
+def noop_pre_hook(layer, inputs):
+    return None
+
+
+def main(num_layers=2000, iters=50):
+    paddle.disable_static()
+    x = paddle.zeros([1])
+    layers = [Identity() for _ in range(num_layers)]
+    print(
+        f"no hooks:         {timeit_layer_call(layers, x, iters) * 1e6:.3f} us/call"
+    )
+
+    handles = [
+        layer.register_forward_pre_hook(noop_pre_hook) for layer in layers
+    ]
+    print(
+        f"per-layer hooks:  {timeit_layer_call(layers, x, iters) * 1e6:.3f} us/call"
+    )
+    for handle in handles:
+        handle.remove()
+
+    handle = register_layer_forward_pre_hook(noop_pre_hook)
+    print(
+        f"global hook:      {timeit_layer_call(layers, x, iters) * 1e6:.3f} us/call"
+    )
+    handle.remove()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_layers", type=int, default=2000)
+    parser.add_argument("--iters", type=int, default=50)
+    args = parser.parse_args()
+    main(args.num_layers, args.iters)